@@ -1,4 +1,5 @@
 import asyncio
+import atexit
 import os
 import subprocess
 import sys
@@ -8,6 +9,8 @@ from typing import Any
 import uvicorn
 
 from webhook_server.libs.config import Config
+from webhook_server.utils.check_cgroups import BACKEND_AUTO, BACKEND_CGROUP, prepare_cgroup_root
+from webhook_server.utils.check_runners import DEFAULT_MAX_JOBS, local_runner_endpoints
 from webhook_server.utils.github_repository_and_webhook_settings import repository_and_webhook_settings
 from webhook_server.web.tool_server import TOOL_SERVER_PORT, start_tool_server
 
@@ -18,6 +21,8 @@ _port = _root_config.get("port", 5000)
 _max_workers = _root_config.get("max-workers", 10)
 _webhook_secret = _root_config.get("webhook-secret")
 _dev_mode = os.environ.get("WEBHOOK_SERVER_DEV_MODE", "").lower() in ("1", "true", "yes")
+_check_limits = _root_config.get("check-limits") or {}
+_check_runners = _root_config.get("check-runners") or {}
 
 
 def run_podman_cleanup() -> None:
@@ -45,9 +50,51 @@ def run_podman_cleanup() -> None:
         print(f"ℹ️  Podman cleanup script not found at {cleanup_script}")
 
 
+def run_cgroup_setup() -> None:
+    """Create the cgroup check commands run in, before the workers start (see ``check-limits``)."""
+    if not _check_limits.get("enabled", True) or _check_limits.get("cgroup-root"):
+        return
+    if _check_limits.get("backend", BACKEND_AUTO) not in (BACKEND_AUTO, BACKEND_CGROUP):
+        return
+
+    checks_cgroup = prepare_cgroup_root()
+    if checks_cgroup:
+        print(f"✅ Check resource limits: using cgroup {checks_cgroup}")
+    else:
+        print("ℹ️  Check resource limits: cgroup v2 is not delegated to this container, checks run without limits")
+
+
+def start_check_runners() -> None:
+    """Start the local check runner processes configured in ``check-runners``; they stop with the server."""
+    max_jobs = str(_check_runners.get("max-jobs", DEFAULT_MAX_JOBS))
+    runners = [
+        subprocess.Popen([
+            sys.executable,
+            "-m",
+            "webhook_server.utils.check_runners",
+            "--listen",
+            endpoint,
+            "--max-jobs",
+            max_jobs,
+        ])
+        for endpoint in local_runner_endpoints(config=_check_runners, data_dir=_config.data_dir)
+    ]
+    if not runners:
+        return
+
+    def _stop_check_runners() -> None:
+        for runner in runners:
+            runner.terminate()
+
+    atexit.register(_stop_check_runners)
+    print(f"✅ Started {len(runners)} check runner process(es), {max_jobs} jobs each")
+
+
 if __name__ == "__main__":
     # Run Podman cleanup before starting the application
     run_podman_cleanup()
+    run_cgroup_setup()
+    start_check_runners()
 
     result = asyncio.run(repository_and_webhook_settings(webhook_secret=_webhook_secret))
 
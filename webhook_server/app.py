@@ -42,11 +42,22 @@ from webhook_server.utils.app_utils import (
     parse_datetime_string,
     verify_signature,
 )
+from webhook_server.utils.cache_manager import DEFAULT_CACHE_MAX_SIZE_GB, cache_manager
+from webhook_server.utils.check_cgroups import check_cgroups
+from webhook_server.utils.check_runners import check_runner_endpoints, check_runners
+from webhook_server.utils.container_build_cache import (
+    DEFAULT_MAX_AGE_HOURS,
+    DEFAULT_PRUNE_INTERVAL_MINUTES,
+    container_build_cache,
+)
 from webhook_server.utils.context import clear_context, create_context
 from webhook_server.utils.helpers import (
     get_logger_with_params,
     prepare_log_prefix,
 )
+from webhook_server.utils.job_scheduler import job_scheduler
+from webhook_server.utils.merge_eligibility import merge_eligibility_states
+from webhook_server.utils.process_groups import process_reaper
 from webhook_server.utils.structured_logger import write_webhook_log
 from webhook_server.web.log_viewer import LogViewerController
 
@@ -61,6 +72,8 @@ LOGGER = get_logger_with_params()
 
 _lifespan_http_client: httpx.AsyncClient | None = None
 _background_tasks: set[asyncio.Task[Any]] = set()
+_process_reaper_task: asyncio.Task[None] | None = None
+_cache_scan_task: asyncio.Task[None] | None = None
 
 # MCP Globals — StreamableHTTPSessionManager is assigned on successful lazy import
 http_transport: Any | None = None
@@ -138,9 +151,22 @@ async def require_trusted_network(request: Request) -> None:
         )
 
 
+async def _run_cache_maintenance() -> None:
+    """Reap temp clones leaked by previous runs and bring the cache dir under its high-water mark."""
+    try:
+        await cache_manager.reap_orphaned_temp_dirs(logger=LOGGER, log_prefix="[cache]")
+        await cache_manager.scan(logger=LOGGER, log_prefix="[cache]")
+        await cache_manager.evict(logger=LOGGER, log_prefix="[cache]")
+        LOGGER.info(f"Cache maintenance complete: {cache_manager.usage().as_dict()}")
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        LOGGER.exception("Cache maintenance failed")
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
-    global _lifespan_http_client, http_transport, mcp, _background_tasks
+    global _lifespan_http_client, http_transport, mcp, _background_tasks, _process_reaper_task, _cache_scan_task
     _lifespan_http_client = httpx.AsyncClient(timeout=HTTP_TIMEOUT_SECONDS)
 
     # Apply filter to MCP logger to suppress client disconnect noise
@@ -240,6 +266,87 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
                 "Check network connectivity to GitHub/Cloudflare API endpoints."
             )
 
+        # Cache housekeeping runs in the background so large cache dirs do not delay startup
+        try:
+            cache_max_size_gb = root_config.get("cache-max-size-gb", DEFAULT_CACHE_MAX_SIZE_GB)
+            if not isinstance(cache_max_size_gb, (int, float)) or cache_max_size_gb <= 0:
+                cache_max_size_gb = DEFAULT_CACHE_MAX_SIZE_GB
+            cache_manager.configure(
+                root_dir=os.path.join(config.data_dir, "cache"),
+                max_bytes=int(cache_max_size_gb * 1024**3),
+            )
+            maintenance_task = asyncio.create_task(_run_cache_maintenance())
+            _background_tasks.add(maintenance_task)
+            maintenance_task.add_done_callback(_background_tasks.discard)
+            _cache_scan_task = asyncio.create_task(cache_manager.run(logger=LOGGER))
+        except Exception:
+            LOGGER.exception("Cache maintenance failed to start; continuing without cache maintenance")
+
+        # Kill processes left running by finished commands (daemonized or re-grouped grandchildren)
+        try:
+            _process_reaper_task = asyncio.create_task(process_reaper.run(logger=LOGGER))
+        except Exception:
+            LOGGER.exception("Orphaned process reaper failed to start")
+
+        # All workers share one CI budget through a state file under the data dir
+        try:
+            scheduler_config = root_config.get("ci-scheduler") or {}
+            if scheduler_config.get("enabled", True):
+                job_scheduler.configure(
+                    state_dir=os.path.join(config.data_dir, "ci-scheduler"),
+                    cpu_slots=scheduler_config.get("cpu-slots", 0),
+                    memory_mb=scheduler_config.get("memory-mb", 0),
+                    check_resources=scheduler_config.get("check-resources"),
+                )
+                LOGGER.info(
+                    f"CI scheduler: {job_scheduler.cpu_slots} CPU slots, {job_scheduler.memory_mb} MiB memory budget"
+                )
+        except Exception:
+            LOGGER.exception("CI scheduler configuration failed; checks will run without admission control")
+            job_scheduler.clear()
+
+        # Every worker sees the events of every pull request through the shared merge-eligibility state
+        try:
+            merge_eligibility_states.configure(state_dir=os.path.join(config.data_dir, "merge-eligibility"))
+        except Exception:
+            LOGGER.exception("Merge-eligibility state configuration failed; keeping it per worker process")
+            merge_eligibility_states.clear()
+
+        # Layer cache pruning and PR build dedup for run_build_container
+        try:
+            container_cache_config = root_config.get("container-build-cache") or {}
+            if container_cache_config.get("enabled", True):
+                container_build_cache.configure(
+                    max_age_hours=container_cache_config.get("max-age-hours", DEFAULT_MAX_AGE_HOURS),
+                    prune_interval_minutes=container_cache_config.get(
+                        "prune-interval-minutes", DEFAULT_PRUNE_INTERVAL_MINUTES
+                    ),
+                )
+        except Exception:
+            LOGGER.exception("Container build cache configuration failed; builds will not be deduplicated")
+            container_build_cache.clear()
+
+        # Per-check cgroups: CPU/memory/pids limits and resource accounting for check commands
+        try:
+            backend = check_cgroups.configure_from_config(root_config.get("check-limits"))
+            LOGGER.info(f"Check resource limits backend: {backend}")
+        except Exception:
+            LOGGER.exception("Check resource limits configuration failed; checks will run without limits")
+            check_cgroups.clear()
+
+        # Check commands run in the check runner processes when check-runners is enabled
+        try:
+            runner_config = root_config.get("check-runners") or {}
+            check_runners.configure(
+                endpoints=check_runner_endpoints(config=runner_config, data_dir=config.data_dir),
+                token=runner_config.get("token", ""),
+            )
+            if check_runners.enabled:
+                LOGGER.info(f"Check runners: {', '.join(check_runners.endpoints)}")
+        except Exception:
+            LOGGER.exception("Check runner configuration failed; checks will run in the webhook server")
+            check_runners.clear()
+
         # Initialize MCP session manager if enabled and configured
         if MCP_SERVER_ENABLED and http_transport is not None and mcp is not None:
             try:
@@ -308,6 +415,16 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
                 http_transport._manager_started = False
             http_transport._manager_task = None
 
+        if _process_reaper_task is not None:
+            _process_reaper_task.cancel()
+            await asyncio.gather(_process_reaper_task, return_exceptions=True)
+            _process_reaper_task = None
+
+        if _cache_scan_task is not None:
+            _cache_scan_task.cancel()
+            await asyncio.gather(_cache_scan_task, return_exceptions=True)
+            _cache_scan_task = None
+
         # Optionally wait for pending background tasks for graceful shutdown
         if _background_tasks:
             LOGGER.info(f"Waiting for {len(_background_tasks)} pending background task(s) to complete...")
@@ -335,6 +452,26 @@ def healthcheck() -> dict[str, Any]:
     return {"status": requests.codes.ok, "message": "Alive"}
 
 
+@FASTAPI_APP.get(
+    f"{APP_URL_ROOT_PATH}/cache/usage",
+    operation_id="get_cache_usage",
+    dependencies=[Depends(require_trusted_network)],
+)
+def get_cache_usage() -> dict[str, Any]:
+    """Return data-dir cache disk usage and evictions, plus this worker's container build figures."""
+    return {**cache_manager.usage().as_dict(), "container_builds": container_build_cache.stats.as_dict()}
+
+
+@FASTAPI_APP.get(
+    f"{APP_URL_ROOT_PATH}/ci-scheduler/usage",
+    operation_id="get_ci_scheduler_usage",
+    dependencies=[Depends(require_trusted_network)],
+)
+async def get_ci_scheduler_usage() -> dict[str, Any]:
+    """Return the CI scheduler budget and the check jobs currently running or waiting for admission."""
+    return (await job_scheduler.usage()).as_dict()
+
+
 @FASTAPI_APP.post(
     APP_URL_ROOT_PATH,
     operation_id="process_webhook",
@@ -30,6 +30,8 @@ from webhook_server.libs.handlers.owners_files_handler import OwnersFileHandler
 from webhook_server.libs.handlers.pull_request_handler import PullRequestHandler
 from webhook_server.libs.handlers.pull_request_review_handler import PullRequestReviewHandler
 from webhook_server.libs.handlers.push_handler import PushHandler
+from webhook_server.utils.check_policy import CheckPolicy
+from webhook_server.utils.check_run_registry import check_run_registry
 from webhook_server.utils.constants import (
     BUILD_CONTAINER_STR,
     BUILTIN_CHECK_NAMES,
@@ -61,7 +63,13 @@ from webhook_server.utils.helpers import (
     prepare_log_prefix,
     run_command,
 )
+from webhook_server.utils.label_catalog import repository_label_catalog
+from webhook_server.utils.merge_eligibility import merge_eligibility_states
+from webhook_server.utils.path_filters import PathFilter
+from webhook_server.utils.required_checks_cache import required_checks_cache
+from webhook_server.utils.shared_clones import SharedClone, shared_clones
 from webhook_server.utils.staleness import MergeCheckDebouncer, is_stale_for_pr
+from webhook_server.utils.worktree_pool import DEFAULT_WORKTREE_POOL_SIZE, worktree_pools
 
 _SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
 _WELCOME_EXTRA_INFO_MAX_BYTES: int = 10240
@@ -224,6 +232,7 @@ class GithubWebhook:
         # This prevents predictable paths and ensures isolation between concurrent webhook handlers
         self.clone_repo_dir: str = tempfile.mkdtemp(prefix=f"github-webhook-{self.repository_name}-")
         self._repo_cloned: bool = False  # Track if repository has been cloned
+        self._shared_clone: SharedClone | None = None  # Set when clone_repo_dir is shared with other webhooks
         # Note: auto-verified users from API users are initialized in process()
         # because the method is async and requires asyncio.to_thread() for blocking calls
 
@@ -314,6 +323,10 @@ class GithubWebhook:
         Clones the repository to self.clone_repo_dir.
         Handlers create isolated worktrees from this single clone for their operations.
 
+        For pull requests with a known head SHA the clone is shared through
+        ``shared_clones``: concurrent webhooks for the same PR head await one clone
+        and ``self.clone_repo_dir`` is switched to that shared directory.
+
         Args:
             pull_request: PullRequest object (for PR events)
             checkout_ref: Git ref to checkout (for push events, e.g., "refs/tags/v11.0.104")
@@ -339,82 +352,9 @@ class GithubWebhook:
             )
 
         try:
-            github_token = self.token
-            clone_url = await github_api_call(
-                lambda: self.repository.clone_url, logger=self.logger, log_prefix=self.log_prefix
-            )
-            clone_url_with_token = clone_url.replace("https://", f"https://{github_token}@")
-
-            rc, _, err = await run_command(
-                command=f"git clone {clone_url_with_token} {self.clone_repo_dir}",
-                log_prefix=self.log_prefix,
-                redact_secrets=[github_token],
-                mask_sensitive=self.mask_sensitive,
-            )
-
-            def redact_output(value: str) -> str:
-                return _redact_secrets(value or "", [github_token], mask_sensitive=self.mask_sensitive)
-
-            if not rc:
-                redacted_err = redact_output(err)
-                self.logger.error(f"{self.log_prefix} Failed to clone repository: {redacted_err}")
-                raise RuntimeError(f"Failed to clone repository: {redacted_err}")
-
-            # Configure git user
-            git_cmd = f"git -C {self.clone_repo_dir}"
-            owner_login = await github_api_call(
-                lambda: self.repository.owner.login, logger=self.logger, log_prefix=self.log_prefix
-            )
-            rc, _, _ = await run_command(
-                command=f"{git_cmd} config user.name '{owner_login}'",
-                log_prefix=self.log_prefix,
-                mask_sensitive=self.mask_sensitive,
-            )
-            if not rc:
-                self.logger.warning(f"{self.log_prefix} Failed to configure git user.name")
-
-            rc, _, _ = await run_command(
-                command=f"{git_cmd} config user.email '{owner_login}@users.noreply.github.com'",
-                log_prefix=self.log_prefix,
-                mask_sensitive=self.mask_sensitive,
-            )
-            if not rc:
-                self.logger.warning(f"{self.log_prefix} Failed to configure git user.email")
-
-            # Fetch only what's needed instead of all refs
             if pull_request:
-                # Fetch the base branch first (needed for checkout)
-                base_ref = await github_api_call(
-                    lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix
-                )
-                rc, _, err = await run_command(
-                    command=f"{git_cmd} fetch origin {base_ref}",
-                    log_prefix=self.log_prefix,
-                    mask_sensitive=self.mask_sensitive,
-                )
-                if not rc:
-                    redacted_err = redact_output(err)
-                    self.logger.error(f"{self.log_prefix} Failed to fetch base branch {base_ref}: {redacted_err}")
-                    raise RuntimeError(f"Failed to fetch base branch {base_ref}: {redacted_err}")
-
-                # Fetch only this specific PR's ref
-                pr_number = await github_api_call(
-                    lambda: pull_request.number, logger=self.logger, log_prefix=self.log_prefix
-                )
-                rc, _, err = await run_command(
-                    command=f"{git_cmd} fetch origin +refs/pull/{pr_number}/head:refs/remotes/origin/pr/{pr_number}",
-                    log_prefix=self.log_prefix,
-                    mask_sensitive=self.mask_sensitive,
-                )
-                if not rc:
-                    redacted_err = redact_output(err)
-                    self.logger.error(f"{self.log_prefix} Failed to fetch PR {pr_number} ref: {redacted_err}")
-                    raise RuntimeError(f"Failed to fetch PR {pr_number} ref: {redacted_err}")
-
-                # Fetch payload SHAs explicitly to handle force-push race condition
-                # The webhook payload SHAs may differ from the current PR ref if the PR
-                # was force-pushed between webhook delivery and processing
-                # Validate SHA format first — reset invalid SHAs so the fetch is skipped
+                # Validate SHA format first — reset invalid SHAs so they are neither
+                # used as the shared clone key nor fetched
                 for sha_attr in ("pr_base_sha", "pr_head_sha"):
                     sha = getattr(self, sha_attr)
                     if not isinstance(sha, str) or (sha and not _SHA_PATTERN.match(sha)):
@@ -423,63 +363,32 @@ class GithubWebhook:
                         )
                         setattr(self, sha_attr, "")
 
-                if self.pr_base_sha and self.pr_head_sha:
-                    for sha in (self.pr_base_sha, self.pr_head_sha):
-                        # Check if SHA exists in clone
-                        rc_check, _, _ = await run_command(
-                            command=f"{git_cmd} cat-file -e {sha}^{{commit}}",
-                            log_prefix=self.log_prefix,
-                            verify_stderr=False,
-                            mask_sensitive=self.mask_sensitive,
-                        )
-                        if not rc_check:
-                            self.logger.debug(
-                                f"{self.log_prefix} Payload SHA {sha[:7]} not in clone, fetching explicitly"
-                            )
-                            rc_fetch, _, _ = await run_command(
-                                command=f"{git_cmd} fetch origin {sha}",
-                                log_prefix=self.log_prefix,
-                                redact_secrets=[github_token],
-                                mask_sensitive=self.mask_sensitive,
-                            )
-                            if not rc_fetch:
-                                self.logger.warning(
-                                    f"{self.log_prefix} Failed to fetch payload SHA {sha[:7]} — "
-                                    f"git diff may fail if this SHA is unreachable"
-                                )
-            else:
-                # For push events (tags only - branch pushes skip cloning)
-                # checkout_ref guaranteed to be non-None by validation at function start
-                tag_name = checkout_ref.replace("refs/tags/", "")  # type: ignore[union-attr]
-                fetch_refspec = f"refs/tags/{tag_name}:refs/tags/{tag_name}"
-                rc, _, _ = await run_command(
-                    command=f"{git_cmd} fetch origin {fetch_refspec}",
-                    log_prefix=self.log_prefix,
-                    mask_sensitive=self.mask_sensitive,
-                )
-                if not rc:
-                    self.logger.warning(f"{self.log_prefix} Failed to fetch tag {checkout_ref}")
-
-            # Determine checkout target
-            if pull_request:
+            if pull_request and self.pr_head_sha:
                 checkout_target = await github_api_call(
                     lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix
                 )
+                pr_number = await github_api_call(
+                    lambda: pull_request.number, logger=self.logger, log_prefix=self.log_prefix
+                )
+                own_dir = self.clone_repo_dir
+                self._shared_clone = await shared_clones.acquire(
+                    key=(self.repository_full_name, self.pr_head_sha, checkout_target, pr_number),
+                    path=own_dir,
+                    clone=lambda clone_dir: self._clone_into(clone_dir=clone_dir, pull_request=pull_request),
+                    logger=self.logger,
+                    log_prefix=self.log_prefix,
+                )
+                if self._shared_clone.path != own_dir:
+                    # Joined a clone started by another webhook; our own temp dir is unused
+                    self.clone_repo_dir = self._shared_clone.path
+                    await asyncio.to_thread(shutil.rmtree, own_dir, ignore_errors=True)
             else:
-                # For push events (tags only - branch pushes skip cloning)
-                # checkout_ref guaranteed to be non-None by validation at function start
-                checkout_target = checkout_ref.replace("refs/tags/", "")  # type: ignore[union-attr]
+                checkout_target = await self._clone_into(
+                    clone_dir=self.clone_repo_dir, pull_request=pull_request, checkout_ref=checkout_ref
+                )
 
-            # Checkout target branch/tag
-            rc, _, err = await run_command(
-                command=f"{git_cmd} checkout {checkout_target}",
-                log_prefix=self.log_prefix,
-                mask_sensitive=self.mask_sensitive,
-            )
-            if not rc:
-                redacted_err = redact_output(err)
-                self.logger.error(f"{self.log_prefix} Failed to checkout {checkout_target}: {redacted_err}")
-                raise RuntimeError(f"Failed to checkout {checkout_target}: {redacted_err}")
+            if pull_request:
+                await self._fetch_payload_shas()
 
             self._repo_cloned = True
             self.logger.info(f"{self.log_prefix} Repository cloned to {self.clone_repo_dir} (ref: {checkout_target})")
@@ -501,16 +410,183 @@ class GithubWebhook:
                 self.ctx.fail_step("repo_clone", ex, traceback.format_exc())
             raise RuntimeError(f"Repository clone failed: {ex}") from ex
 
-    async def _recheck_merge_eligibility(self, pull_request: PullRequest) -> None:
-        """Clone repo and re-evaluate can-be-merged for the PR.
+    async def _clone_into(
+        self,
+        clone_dir: str,
+        pull_request: PullRequest | None = None,
+        checkout_ref: str | None = None,
+    ) -> str:
+        """Clone the repository into *clone_dir*, fetch the refs the webhook needs and check out the target.
+
+        Returns:
+            The checked out branch (PR base ref) or tag name.
+
+        Raises:
+            RuntimeError: If a required git step fails
+        """
+        github_token = self.token
+        clone_url = await github_api_call(
+            lambda: self.repository.clone_url, logger=self.logger, log_prefix=self.log_prefix
+        )
+        clone_url_with_token = clone_url.replace("https://", f"https://{github_token}@")
+
+        rc, _, err = await run_command(
+            command=f"git clone {clone_url_with_token} {clone_dir}",
+            log_prefix=self.log_prefix,
+            redact_secrets=[github_token],
+            mask_sensitive=self.mask_sensitive,
+        )
+
+        def redact_output(value: str) -> str:
+            return _redact_secrets(value or "", [github_token], mask_sensitive=self.mask_sensitive)
+
+        if not rc:
+            redacted_err = redact_output(err)
+            self.logger.error(f"{self.log_prefix} Failed to clone repository: {redacted_err}")
+            raise RuntimeError(f"Failed to clone repository: {redacted_err}")
+
+        # Configure git user
+        git_cmd = f"git -C {clone_dir}"
+        owner_login = await github_api_call(
+            lambda: self.repository.owner.login, logger=self.logger, log_prefix=self.log_prefix
+        )
+        rc, _, _ = await run_command(
+            command=f"{git_cmd} config user.name '{owner_login}'",
+            log_prefix=self.log_prefix,
+            mask_sensitive=self.mask_sensitive,
+        )
+        if not rc:
+            self.logger.warning(f"{self.log_prefix} Failed to configure git user.name")
+
+        rc, _, _ = await run_command(
+            command=f"{git_cmd} config user.email '{owner_login}@users.noreply.github.com'",
+            log_prefix=self.log_prefix,
+            mask_sensitive=self.mask_sensitive,
+        )
+        if not rc:
+            self.logger.warning(f"{self.log_prefix} Failed to configure git user.email")
+
+        # Fetch only what's needed instead of all refs
+        if pull_request:
+            # Fetch the base branch first (needed for checkout)
+            base_ref = await github_api_call(
+                lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix
+            )
+            rc, _, err = await run_command(
+                command=f"{git_cmd} fetch origin {base_ref}",
+                log_prefix=self.log_prefix,
+                mask_sensitive=self.mask_sensitive,
+            )
+            if not rc:
+                redacted_err = redact_output(err)
+                self.logger.error(f"{self.log_prefix} Failed to fetch base branch {base_ref}: {redacted_err}")
+                raise RuntimeError(f"Failed to fetch base branch {base_ref}: {redacted_err}")
+
+            # Fetch only this specific PR's ref
+            pr_number = await github_api_call(
+                lambda: pull_request.number, logger=self.logger, log_prefix=self.log_prefix
+            )
+            rc, _, err = await run_command(
+                command=f"{git_cmd} fetch origin +refs/pull/{pr_number}/head:refs/remotes/origin/pr/{pr_number}",
+                log_prefix=self.log_prefix,
+                mask_sensitive=self.mask_sensitive,
+            )
+            if not rc:
+                redacted_err = redact_output(err)
+                self.logger.error(f"{self.log_prefix} Failed to fetch PR {pr_number} ref: {redacted_err}")
+                raise RuntimeError(f"Failed to fetch PR {pr_number} ref: {redacted_err}")
+        else:
+            # For push events (tags only - branch pushes skip cloning)
+            # checkout_ref guaranteed to be non-None by validation at function start
+            tag_name = checkout_ref.replace("refs/tags/", "")  # type: ignore[union-attr]
+            fetch_refspec = f"refs/tags/{tag_name}:refs/tags/{tag_name}"
+            rc, _, _ = await run_command(
+                command=f"{git_cmd} fetch origin {fetch_refspec}",
+                log_prefix=self.log_prefix,
+                mask_sensitive=self.mask_sensitive,
+            )
+            if not rc:
+                self.logger.warning(f"{self.log_prefix} Failed to fetch tag {checkout_ref}")
+
+        # Determine checkout target
+        if pull_request:
+            checkout_target = await github_api_call(
+                lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix
+            )
+        else:
+            # For push events (tags only - branch pushes skip cloning)
+            # checkout_ref guaranteed to be non-None by validation at function start
+            checkout_target = checkout_ref.replace("refs/tags/", "")  # type: ignore[union-attr]
+
+        # Checkout target branch/tag
+        rc, _, err = await run_command(
+            command=f"{git_cmd} checkout {checkout_target}",
+            log_prefix=self.log_prefix,
+            mask_sensitive=self.mask_sensitive,
+        )
+        if not rc:
+            redacted_err = redact_output(err)
+            self.logger.error(f"{self.log_prefix} Failed to checkout {checkout_target}: {redacted_err}")
+            raise RuntimeError(f"Failed to checkout {checkout_target}: {redacted_err}")
+
+        return checkout_target
+
+    async def _fetch_payload_shas(self) -> None:
+        """Fetch payload SHAs explicitly to handle force-push race condition.
+
+        The webhook payload SHAs may differ from the current PR ref if the PR
+        was force-pushed between webhook delivery and processing.  This runs for
+        every webhook, including ones that joined a shared clone.
+        """
+        if not (self.pr_base_sha and self.pr_head_sha):
+            return
+
+        git_cmd = f"git -C {self.clone_repo_dir}"
+        for sha in (self.pr_base_sha, self.pr_head_sha):
+            # Check if SHA exists in clone
+            rc_check, _, _ = await run_command(
+                command=f"{git_cmd} cat-file -e {sha}^{{commit}}",
+                log_prefix=self.log_prefix,
+                verify_stderr=False,
+                mask_sensitive=self.mask_sensitive,
+            )
+            if not rc_check:
+                self.logger.debug(f"{self.log_prefix} Payload SHA {sha[:7]} not in clone, fetching explicitly")
+                rc_fetch, _, _ = await run_command(
+                    command=f"{git_cmd} fetch origin {sha}",
+                    log_prefix=self.log_prefix,
+                    redact_secrets=[self.token],
+                    mask_sensitive=self.mask_sensitive,
+                )
+                if not rc_fetch:
+                    self.logger.warning(
+                        f"{self.log_prefix} Failed to fetch payload SHA {sha[:7]} — "
+                        f"git diff may fail if this SHA is unreachable"
+                    )
+
+    async def _merge_check_owners_file_handler(self, pull_request: PullRequest) -> OwnersFileHandler:
+        """OWNERS data for merge-eligibility events, cloning the repository only when it is not cached.
 
-        Clone required: check_if_can_be_merged evaluates ALL conditions
-        (approvals, OWNERS, labels, checks, conversations) on every call,
-        and OWNERS file processing requires a local checkout.
+        The changed files come from the diff cache and the OWNERS data from the cache
+        keyed by the base branch tree, both filled by the clone of an earlier webhook.
         """
+        base_ref = await github_api_call(lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix)
+        owners_file_handler = await OwnersFileHandler(github_webhook=self).initialize_from_cache(base_ref=base_ref)
+        if owners_file_handler is not None:
+            self.logger.debug(f"{self.log_prefix} OWNERS data and changed files are cached, skipping clone")
+            return owners_file_handler
+
         await self._clone_repository(pull_request=pull_request)
-        owners_file_handler = OwnersFileHandler(github_webhook=self)
-        owners_file_handler = await owners_file_handler.initialize()
+        return await OwnersFileHandler(github_webhook=self).initialize()
+
+    async def _recheck_merge_eligibility(self, pull_request: PullRequest) -> None:
+        """Re-evaluate can-be-merged for the PR.
+
+        check_if_can_be_merged evaluates ALL conditions (approvals, OWNERS,
+        labels, checks, conversations) on every call; the OWNERS data comes
+        from the cache when possible, so the repository is cloned only on a miss.
+        """
+        owners_file_handler = await self._merge_check_owners_file_handler(pull_request=pull_request)
         await PullRequestHandler(github_webhook=self, owners_file_handler=owners_file_handler).check_if_can_be_merged(
             pull_request=pull_request
         )
@@ -532,6 +608,11 @@ class GithubWebhook:
         )
 
     async def process(self) -> Any:
+        # Keep the merge-eligibility state of open pull requests current from the payload — no API calls.
+        await merge_eligibility_states.observe_event(
+            repo_full_name=self.repository_full_name, event=self.github_event, hook_data=self.hook_data
+        )
+
         # Early exit for pull_request_review_thread events that don't need processing.
         # Must run BEFORE get_api_users() to avoid
         # burning rate limit on get_user() calls for skipped events.
@@ -570,6 +651,32 @@ class GithubWebhook:
                 await self._update_context_metrics()
                 return None
 
+        # Label events only keep the cached repository label catalog current — no API calls needed.
+        if self.github_event == "label":
+            if self.ctx:
+                self.ctx.start_step("webhook_routing", event_type=self.github_event)
+            repository_label_catalog.observe_event(repo_full_name=self.repository_full_name, hook_data=self.hook_data)
+            self.logger.info(
+                f"{self.log_prefix} "
+                f"Webhook processing completed successfully: label "
+                f"(action={self.hook_data.get('action')}) - no metrics collected",
+            )
+            await self._update_context_metrics()
+            return None
+
+        # Branch protection rule events only invalidate the cached required status checks — no API calls needed.
+        if self.github_event == "branch_protection_rule":
+            if self.ctx:
+                self.ctx.start_step("webhook_routing", event_type=self.github_event)
+            required_checks_cache.observe_event(repo_full_name=self.repository_full_name, hook_data=self.hook_data)
+            self.logger.info(
+                f"{self.log_prefix} "
+                f"Webhook processing completed successfully: branch_protection_rule "
+                f"(action={self.hook_data.get('action')}) - no metrics collected",
+            )
+            await self._update_context_metrics()
+            return None
+
         # Initialize auto-verified users from API users (async operation)
         api_users = await self.get_api_users()
         self.auto_verified_and_merged_users.extend(user for user in api_users if user is not None)
@@ -743,9 +850,9 @@ class GithubWebhook:
                 return None
 
             # Clone repository for local file processing (OWNERS, changed files)
-            # For check_run, status, and pull_request_review_thread events,
-            # cloning happens later only when needed (inside their respective handlers)
-            if self.github_event not in ("check_run", "status", "pull_request_review_thread"):
+            # For merge-eligibility events (check_run, status, pull_request_review_thread, pull_request_review),
+            # cloning happens later only when the OWNERS data or changed files are not cached
+            if self.github_event not in ("check_run", "status", "pull_request_review_thread", "pull_request_review"):
                 await self._clone_repository(pull_request=pull_request)
 
             if self.github_event == "issue_comment":
@@ -777,8 +884,7 @@ class GithubWebhook:
                 return None
 
             elif self.github_event == "pull_request_review":
-                owners_file_handler = OwnersFileHandler(github_webhook=self)
-                owners_file_handler = await owners_file_handler.initialize()
+                owners_file_handler = await self._merge_check_owners_file_handler(pull_request=pull_request)
 
                 await PullRequestReviewHandler(
                     github_webhook=self, owners_file_handler=owners_file_handler
@@ -794,6 +900,11 @@ class GithubWebhook:
                 return None
 
             elif self.github_event == "check_run":
+                # Keep the IDs of our check runs so later transitions edit them in place
+                check_run_registry.observe_event(
+                    repo_full_name=self.repository_full_name, hook_data=self.hook_data, app_id=self.github_app_id
+                )
+
                 # Check if we need to process this check_run
                 action = self.hook_data.get("action", "")
                 if action != "completed":
@@ -838,11 +949,8 @@ class GithubWebhook:
                     await self._update_context_metrics()
                     return None
 
-                # Only clone repository when we actually need it (action is completed and processing is needed)
-                await self._clone_repository(pull_request=pull_request)
-
-                owners_file_handler = OwnersFileHandler(github_webhook=self)
-                owners_file_handler = await owners_file_handler.initialize()
+                # Only clone repository when we actually need it (OWNERS data or changed files not cached)
+                owners_file_handler = await self._merge_check_owners_file_handler(pull_request=pull_request)
                 handled = await CheckRunHandler(
                     github_webhook=self, owners_file_handler=owners_file_handler
                 ).process_pull_request_check_run_webhook_data(pull_request=pull_request)
@@ -1037,6 +1145,52 @@ class GithubWebhook:
             value="custom-check-runs", return_on_none=[], extra_dict=repository_config
         )
         self.custom_check_runs: list[dict[str, Any]] = self._validate_custom_check_runs(raw_custom_checks)
+        # Path filters and policies of custom checks are read from this one validated list
+        _custom_checks = [
+            check
+            for check in (self.custom_check_runs if isinstance(self.custom_check_runs, list) else [])
+            if isinstance(check, dict) and isinstance(check.get("name"), str)
+        ]
+
+        # Built-in checks take their path filters from check-paths, custom checks from their own entry
+        _check_paths = self.config.get_value(value="check-paths", return_on_none={}, extra_dict=repository_config)
+        self.check_path_filters: dict[str, PathFilter] = {}
+        for check_name, filter_config in (_check_paths if isinstance(_check_paths, dict) else {}).items():
+            if check_name not in (TOX_STR, PRE_COMMIT_STR, BUILD_CONTAINER_STR, PYTHON_MODULE_INSTALL_STR):
+                self.logger.warning(f"check-paths: '{check_name}' is not a path-filterable built-in check, ignoring")
+                continue
+            if path_filter := PathFilter.from_config(filter_config):
+                self.check_path_filters[check_name] = path_filter
+        for custom_check in _custom_checks:
+            if path_filter := PathFilter.from_config(custom_check):
+                self.check_path_filters[custom_check["name"]] = path_filter
+
+        # Timeout, output limit and retries: check-policies.default, then the check's own entry
+        _check_policies = self.config.get_value(value="check-policies", return_on_none={}, extra_dict=repository_config)
+        if not isinstance(_check_policies, dict):
+            _check_policies = {}
+        default_policy = CheckPolicy.from_config(_check_policies.get("default"))
+        self.check_policies: dict[str, CheckPolicy] = {
+            check_name: CheckPolicy.from_config(_check_policies.get(check_name), base=default_policy)
+            for check_name in (TOX_STR, PRE_COMMIT_STR, BUILD_CONTAINER_STR, PYTHON_MODULE_INSTALL_STR)
+        }
+        for check_name in _check_policies:
+            if check_name != "default" and check_name not in self.check_policies:
+                self.logger.warning(f"check-policies: '{check_name}' is not a built-in check, ignoring")
+        for custom_check in _custom_checks:
+            self.check_policies[custom_check["name"]] = CheckPolicy.from_config(custom_check, base=default_policy)
+
+        _worktree_pool_size = self.config.get_value(
+            value="worktree-pool-size", return_on_none=DEFAULT_WORKTREE_POOL_SIZE, extra_dict=repository_config
+        )
+        self.worktree_pool_size: int = (
+            _worktree_pool_size
+            if isinstance(_worktree_pool_size, int) and _worktree_pool_size > 0
+            else DEFAULT_WORKTREE_POOL_SIZE
+        )
+        self.check_result_cache: bool = self.config.get_value(
+            value="check-result-cache", return_on_none=True, extra_dict=repository_config
+        )
 
         _auto_users = self.config.get_value(
             value="auto-verified-and-merged-users", return_on_none=[], extra_dict=repository_config
@@ -1491,7 +1645,7 @@ class GithubWebhook:
             pr_number: The pull request number.
 
         Returns:
-            List of dicts with keys: path, line, url, isOutdated for each
+            List of dicts with keys: id, path, line, url, isOutdated for each
             unresolved thread.
 
         Raises:
@@ -1509,6 +1663,7 @@ class GithubWebhook:
                   endCursor
                 }
                 nodes {
+                  id
                   isResolved
                   isOutdated
                   comments(first: 1) {
@@ -1606,6 +1761,7 @@ class GithubWebhook:
                         comments = thread.get("comments", {}).get("nodes", [])
                         first_comment = comments[0] if comments else {}
                         unresolved_threads.append({
+                            "id": thread.get("id"),
                             "path": first_comment.get("path"),
                             "line": first_comment.get("line"),
                             "url": first_comment.get("url"),
@@ -1706,7 +1862,26 @@ class GithubWebhook:
 
         Explicitly removes the temporary clone directory. This should be called
         when the GithubWebhook instance is no longer needed.
+
+        A shared clone is only released here; the last webhook holding it removes it.
         """
+        if self._shared_clone is not None:
+            shared_clone, self._shared_clone = self._shared_clone, None
+            # The directory may still be in use by other webhooks; never remove it directly
+            self.clone_repo_dir = ""
+            try:
+                await shared_clones.release(shared=shared_clone, logger=self.logger, log_prefix=self.log_prefix)
+            except Exception as ex:
+                self.logger.warning(f"{self.log_prefix} Failed to release shared clone: {ex}")
+            return
+
+        if self.clone_repo_dir:
+            # Pooled worktrees live next to the clone and must be removed while the clone still exists
+            try:
+                await worktree_pools.close(repo_dir=self.clone_repo_dir, logger=self.logger, log_prefix=self.log_prefix)
+            except Exception as ex:
+                self.logger.warning(f"{self.log_prefix} Failed to cleanup worktree pool: {ex}")
+
         if self.clone_repo_dir and os.path.exists(self.clone_repo_dir):
             try:
                 # Use to_thread for blocking I/O operation
@@ -1850,6 +2025,9 @@ class GithubWebhook:
         here to prevent accumulating stale repositories on disk.
         """
         clone_repo_dir = getattr(self, "clone_repo_dir", None)
+        if getattr(self, "_shared_clone", None) is not None:
+            # Shared with other webhooks; removed by the registry when the last holder releases it
+            return
         if clone_repo_dir and os.path.exists(clone_repo_dir):
             try:
                 shutil.rmtree(clone_repo_dir, ignore_errors=True)
@@ -1,37 +1,52 @@
 import asyncio
 import logging
+from collections.abc import Iterable, Sequence
 from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
 
-from github.CheckRun import CheckRun
-from github.CommitStatus import CommitStatus
+from github.GithubException import GithubException
 from github.PullRequest import PullRequest
 from github.Repository import Repository
 
 from webhook_server.libs.handlers.labels_handler import LabelsHandler
 from webhook_server.libs.handlers.owners_files_handler import OwnersFileHandler
+from webhook_server.utils.check_result_cache import CachedCheckResult
+from webhook_server.utils.check_run_registry import check_run_registry
 from webhook_server.utils.constants import (
     AUTOMERGE_LABEL_STR,
     BUILD_CONTAINER_STR,
     CAN_BE_MERGED_STR,
+    COMMAND_RETEST_STR,
     CONVENTIONAL_TITLE_STR,
     FAILURE_STR,
     IN_PROGRESS_STR,
+    NEUTRAL_STR,
     PYTHON_MODULE_INSTALL_STR,
     QUEUED_STR,
     SECURITY_COMMITTER_IDENTITY_STR,
     SECURITY_SUSPICIOUS_PATHS_STR,
     SUCCESS_STR,
+    TIMED_OUT_STR,
     TOX_STR,
     VERIFIED_LABEL_STR,
 )
 from webhook_server.utils.github_retry import github_api_call
 from webhook_server.utils.helpers import strip_ansi_codes
+from webhook_server.utils.merge_eligibility import CheckRunSnapshot, StatusSnapshot, merge_eligibility_states
+from webhook_server.utils.path_filters import PathFilter
+from webhook_server.utils.required_checks_cache import required_checks_cache
 
 if TYPE_CHECKING:
     from webhook_server.libs.github_api import GithubWebhook
     from webhook_server.utils.context import WebhookContext
 
 
+# Concurrent check run writes when queuing the checks of a new head; GitHub answers bursts of
+# content-creating requests with secondary rate limits, so the fan-out stays small
+QUEUE_CHECKS_CONCURRENCY: int = 8
+# With fewer requests left on the app token, checks are queued one at a time
+QUEUE_CHECKS_LOW_RATE_LIMIT: int = 100
+
+
 class CheckRunOutput(TypedDict, total=False):
     """TypedDict for check run output parameter."""
 
@@ -157,6 +172,92 @@ class CheckRunHandler:
         """
         await self.set_check_run_status(check_run=name, conclusion=FAILURE_STR, output=output)
 
+    async def set_check_timed_out(self, name: str, output: CheckRunOutput | None = None) -> None:
+        """Set check run to timed out.
+
+        Used when a check command exceeds its configured ``timeout`` and is killed.
+
+        Args:
+            name: The name of the check run (e.g., TOX_STR, PRE_COMMIT_STR, or custom check name)
+            output: Optional output dictionary with title, summary, and text fields
+        """
+        await self.set_check_run_status(check_run=name, conclusion=TIMED_OUT_STR, output=output)
+
+    async def set_check_cached(self, name: str, result: CachedCheckResult) -> None:
+        """Publish a cached result for a check that already ran on an identical merged tree.
+
+        Args:
+            name: The name of the check run (e.g., TOX_STR, PRE_COMMIT_STR, or custom check name)
+            result: The cached result to republish
+        """
+        output: CheckRunOutput = {
+            "title": f"{result.title} (cached)",
+            "summary": (
+                f"Cached result: this check already passed on identical merged code "
+                f"(commit {result.head_sha[:7]}, tree {result.tree_sha[:7]}). "
+                f"Comment `/{COMMAND_RETEST_STR} {name} --force` to run it again."
+            ),
+            "text": result.text,
+        }
+        await self.set_check_run_status(check_run=name, conclusion=result.conclusion, output=output)
+
+    async def set_check_skipped(self, name: str, path_filter: PathFilter) -> None:
+        """Complete a check as neutral because none of the PR's changed files match its path filter.
+
+        Args:
+            name: The name of the check run (e.g., TOX_STR, PRE_COMMIT_STR, or custom check name)
+            path_filter: The check's ``paths``/``paths-ignore`` rules
+        """
+        output: CheckRunOutput = {
+            "title": "Skipped: no relevant changes",
+            "summary": (
+                f"None of the changed files match this check's path filter ({path_filter.describe()}). "
+                f"Comment `/{COMMAND_RETEST_STR} {name}` to run it anyway."
+            ),
+            "text": None,
+        }
+        await self.set_check_run_status(check_run=name, conclusion=NEUTRAL_STR, output=output)
+
+    async def queue_checks(self, names: Iterable[str], skipped_checks: dict[str, PathFilter] | None = None) -> None:
+        """Queue the check runs of the current head concurrently, within a bounded parallelism budget.
+
+        Checks in *skipped_checks* are completed as neutral instead.  Each created
+        check run is recorded in the check run registry, so the later transitions
+        edit it in place.
+
+        Args:
+            names: All checks that apply to the pull request; duplicates are queued once
+            skipped_checks: Checks whose path filter matches none of the changed files
+        """
+        skipped_checks = skipped_checks or {}
+        check_names = list(dict.fromkeys(names))
+        semaphore = asyncio.Semaphore(self._queue_checks_concurrency())
+
+        async def _queue(name: str) -> None:
+            async with semaphore:
+                if name in skipped_checks:
+                    await self.set_check_skipped(name=name, path_filter=skipped_checks[name])
+                else:
+                    await self.set_check_queued(name=name)
+
+        self.logger.debug(f"{self.log_prefix} Queuing check runs: {', '.join(check_names)}")
+        results = await asyncio.gather(*(_queue(name) for name in check_names), return_exceptions=True)
+        for name, result in zip(check_names, results, strict=True):
+            if isinstance(result, Exception):
+                self.logger.error(f"{self.log_prefix} Failed to queue check run {name}: {result}")
+
+    def _queue_checks_concurrency(self) -> int:
+        """Parallelism for queue_checks(), reduced when the app token is low on requests."""
+        # Updated from the headers of every response, so reading it costs no request
+        requester = getattr(self.github_webhook.repository_by_github_app, "requester", None)
+        rate_limiting = getattr(requester, "rate_limiting", None)
+        # (remaining, limit), (-1, -1) until the first response
+        remaining = rate_limiting[0] if isinstance(rate_limiting, tuple) else -1
+        if isinstance(remaining, int) and 0 <= remaining < QUEUE_CHECKS_LOW_RATE_LIMIT:
+            self.logger.debug(f"{self.log_prefix} {remaining} API requests left, queuing check runs one at a time")
+            return 1
+        return QUEUE_CHECKS_CONCURRENCY
+
     async def set_check_run_status(
         self,
         check_run: str,
@@ -182,12 +283,7 @@ class CheckRunHandler:
             self.logger.debug(
                 f"{self.log_prefix} Setting check run for {check_run}, status={status}, conclusion={conclusion}"
             )
-            await github_api_call(
-                self.github_webhook.repository_by_github_app.create_check_run,
-                **kwargs,
-                logger=self.logger,
-                log_prefix=self.log_prefix,
-            )
+            await self._create_or_update_check_run(kwargs=kwargs)
             if conclusion in (SUCCESS_STR, IN_PROGRESS_STR):
                 self.logger.info(msg)
             return
@@ -198,31 +294,114 @@ class CheckRunHandler:
             self.logger.exception(f"{self.log_prefix} Failed to set check run status for {check_run}")
             kwargs["conclusion"] = FAILURE_STR
             kwargs["status"] = "completed"
-            await github_api_call(
-                self.github_webhook.repository_by_github_app.create_check_run,
-                **kwargs,
-                logger=self.logger,
-                log_prefix=self.log_prefix,
-            )
+            await self._create_or_update_check_run(kwargs=kwargs)
+
+    async def _create_or_update_check_run(self, kwargs: dict[str, Any]) -> None:
+        """Edit the check run of this check and commit in place, creating it when its ID is unknown or stale."""
+        repository = self.github_webhook.repository_by_github_app
+        repo_full_name = self.github_webhook.repository_full_name
+        name, head_sha = kwargs["name"], kwargs["head_sha"]
+        completed = kwargs.get("status") == "completed"
+
+        check_run_id = check_run_registry.get(repo_full_name=repo_full_name, head_sha=head_sha, name=name)
+        if check_run_id is not None:
+            edit_kwargs = {key: value for key, value in kwargs.items() if key not in ("name", "head_sha")}
+            try:
+                await github_api_call(
+                    lambda: repository.get_check_run(check_run_id).edit(**edit_kwargs),
+                    logger=self.logger,
+                    log_prefix=self.log_prefix,
+                )
+                check_run_registry.record(
+                    repo_full_name=repo_full_name,
+                    head_sha=head_sha,
+                    name=name,
+                    check_run_id=check_run_id,
+                    completed=completed,
+                )
+                await self._record_merge_eligibility(kwargs=kwargs, check_run_id=check_run_id)
+                return
+            except GithubException as ex:
+                self.logger.debug(
+                    f"{self.log_prefix} Failed to update check run {name} ({check_run_id}), creating a new one: {ex}"
+                )
+                check_run_registry.forget(repo_full_name=repo_full_name, head_sha=head_sha, name=name)
+
+        created = await github_api_call(
+            repository.create_check_run,
+            **kwargs,
+            logger=self.logger,
+            log_prefix=self.log_prefix,
+        )
+        check_run_registry.record(
+            repo_full_name=repo_full_name,
+            head_sha=head_sha,
+            name=name,
+            check_run_id=getattr(created, "id", None),
+            completed=completed,
+        )
+        await self._record_merge_eligibility(kwargs=kwargs, check_run_id=getattr(created, "id", None))
+
+    async def _record_merge_eligibility(self, kwargs: dict[str, Any], check_run_id: object) -> None:
+        """Write our check run transition through to the merge-eligibility state, ahead of its webhook."""
+        await merge_eligibility_states.record_check_run(
+            repo_full_name=self.github_webhook.repository_full_name,
+            head_sha=kwargs["head_sha"],
+            check_run=CheckRunSnapshot(
+                name=kwargs["name"],
+                status=kwargs.get("status", QUEUED_STR),
+                conclusion=kwargs.get("conclusion"),
+                id=check_run_id if isinstance(check_run_id, int) and not isinstance(check_run_id, bool) else 0,
+            ),
+        )
 
-    def _redact_output(self, text: str) -> str:
-        """Replace sensitive tokens, passwords, and credentials with *****."""
-        _hased_str = "*****"
+    async def set_check_live_output(self, name: str, title: str, tail: str, interval: float) -> bool:
+        """Show the latest output of a running check on its in-progress check run.
+
+        Only check runs whose ID is registered are updated; no check run is created
+        for live output.  Returns False when the check run is unknown.
+        """
+        check_run_id = check_run_registry.get(
+            repo_full_name=self.github_webhook.repository_full_name,
+            head_sha=self.github_webhook.last_commit.sha,
+            name=name,
+        )
+        if check_run_id is None:
+            return False
+
+        output: dict[str, Any] = {
+            "title": f"{title} (running)",
+            "summary": f"Last {len(tail)} characters of output, updated every {interval:.0f}s",
+            "text": f"```\n{self._redact_output(strip_ansi_codes(tail))}\n```",
+        }
+        repository = self.github_webhook.repository_by_github_app
+        await github_api_call(
+            lambda: repository.get_check_run(check_run_id).edit(status=IN_PROGRESS_STR, output=output),
+            logger=self.logger,
+            log_prefix=self.log_prefix,
+        )
+        return True
+
+    def output_secrets(self) -> list[str]:
+        """Tokens, passwords and credentials that must never appear in check run output."""
+        secrets: list[str] = []
 
         pypi_config = self.github_webhook.pypi
         if isinstance(pypi_config, dict):
-            pypi_token = pypi_config.get("token")
-            if pypi_token:
-                text = text.replace(pypi_token, _hased_str)
+            secrets.append(pypi_config.get("token") or "")
+
+        secrets.append(getattr(self.github_webhook, "container_repository_username", None) or "")
+        secrets.append(getattr(self.github_webhook, "container_repository_password", None) or "")
+        secrets.append(self.github_webhook.token or "")
 
-        if getattr(self.github_webhook, "container_repository_username", None):
-            text = text.replace(self.github_webhook.container_repository_username, _hased_str)
+        return [secret for secret in secrets if secret and isinstance(secret, str)]
 
-        if getattr(self.github_webhook, "container_repository_password", None):
-            text = text.replace(self.github_webhook.container_repository_password, _hased_str)
+    def _redact_output(self, text: str) -> str:
+        """Replace sensitive tokens, passwords, and credentials with *****."""
+        _hased_str = "*****"
 
-        if self.github_webhook.token:
-            text = text.replace(self.github_webhook.token, _hased_str)
+        for secret in self.output_secrets():
+            text = text.replace(secret, _hased_str)
 
         return text
 
@@ -304,8 +483,8 @@ class CheckRunHandler:
     async def required_check_failed_or_no_status(
         self,
         pull_request: PullRequest,
-        last_commit_check_runs: list[CheckRun],
-        last_commit_statuses: list[CommitStatus],
+        last_commit_check_runs: Sequence[CheckRunSnapshot],
+        last_commit_statuses: Sequence[StatusSnapshot],
         check_runs_in_progress: list[str],
     ) -> str:
         failed_check_runs: list[str] = []
@@ -330,7 +509,7 @@ class CheckRunHandler:
         self.logger.debug(f"{self.log_prefix} Status details: {[(s.context, s.state) for s in last_commit_statuses]}")
 
         # Filter to latest status per context (highest ID = most recent)
-        status_by_context: dict[str, CommitStatus] = {}
+        status_by_context: dict[str, StatusSnapshot] = {}
         for status in last_commit_statuses:
             if status.context not in status_by_context or status.id > status_by_context[status.context].id:
                 status_by_context[status.context] = status
@@ -357,16 +536,16 @@ class CheckRunHandler:
                 if status.context not in failed_check_runs:
                     failed_check_runs.append(status.context)
 
+        # Skip check runs that have a corresponding success status
+        status_contexts = {status.context for status in latest_statuses if status.state == "success"}
         for check_run in last_commit_check_runs:
-            # Skip check runs that have a corresponding success status
-            status_contexts = {status.context for status in latest_statuses if status.state == "success"}
             if check_run.name in status_contexts:
                 continue
 
             if (
                 check_run.name == CAN_BE_MERGED_STR
-                or check_run.conclusion == SUCCESS_STR
-                or check_run.name not in await self.all_required_status_checks(pull_request=pull_request)
+                or check_run.conclusion in (SUCCESS_STR, NEUTRAL_STR)
+                or check_run.name not in required_checks
             ):
                 continue
 
@@ -465,18 +644,31 @@ class CheckRunHandler:
             logger=self.logger,
             log_prefix=self.log_prefix,
         )
-        pull_request_branch = await github_api_call(
-            self.repository.get_branch,
-            base_ref,
+
+        async def _fetch_branch_required_status_checks() -> list[str]:
+            pull_request_branch = await github_api_call(
+                self.repository.get_branch,
+                base_ref,
+                logger=self.logger,
+                log_prefix=self.log_prefix,
+            )
+            branch_protection = await github_api_call(
+                pull_request_branch.get_protection, logger=self.logger, log_prefix=self.log_prefix
+            )
+            return await github_api_call(
+                lambda: branch_protection.required_status_checks.contexts,
+                logger=self.logger,
+                log_prefix=self.log_prefix,
+            )
+
+        # Shared by all webhooks of this process until it expires or a branch_protection_rule event arrives
+        branch_required_status_checks = await required_checks_cache.get_or_load(
+            repo_full_name=self.github_webhook.repository_full_name,
+            branch=base_ref,
+            fetch=_fetch_branch_required_status_checks,
             logger=self.logger,
             log_prefix=self.log_prefix,
         )
-        branch_protection = await github_api_call(
-            pull_request_branch.get_protection, logger=self.logger, log_prefix=self.log_prefix
-        )
-        branch_required_status_checks = await github_api_call(
-            lambda: branch_protection.required_status_checks.contexts, logger=self.logger, log_prefix=self.log_prefix
-        )
         self.logger.debug(f"{self.log_prefix} branch_required_status_checks: {branch_required_status_checks}")
         self._branch_required_status_checks = branch_required_status_checks
         return self._branch_required_status_checks
@@ -484,16 +676,17 @@ class CheckRunHandler:
     async def required_check_in_progress(
         self,
         pull_request: PullRequest,
-        last_commit_check_runs: list[CheckRun],
+        last_commit_check_runs: Sequence[CheckRunSnapshot],
     ) -> tuple[str, list[str]]:
         self.logger.debug(f"{self.log_prefix} Check if any required check runs in progress.")
 
+        required_checks = set(await self.all_required_status_checks(pull_request=pull_request))
         check_runs_in_progress = [
             check_run.name
             for check_run in last_commit_check_runs
             if check_run.status == IN_PROGRESS_STR
             and check_run.name != CAN_BE_MERGED_STR
-            and check_run.name in await self.all_required_status_checks(pull_request=pull_request)
+            and check_run.name in required_checks
         ]
 
         # Note: Status API doesn't have an "in_progress" state - only pending (queued),
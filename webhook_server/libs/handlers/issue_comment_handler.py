@@ -34,6 +34,7 @@ from webhook_server.utils.constants import (
     COMMAND_TEST_ORACLE_STR,
     HOLD_LABEL_STR,
     REACTIONS,
+    RETEST_FORCE_FLAG,
     SECURITY_COMMITTER_IDENTITY_STR,
     SECURITY_SUSPICIOUS_PATHS_STR,
     USER_LABELS_DICT,
@@ -864,7 +865,10 @@ Adding label/s `{" ".join(cp_labels)}` for automatic cherry-pick once the PR is
             return
 
         _target_tests: list[str] = command_args.split()
-        self.logger.debug(f"{self.log_prefix} Target tests for re-test: {_target_tests}")
+        # `--force` re-runs checks even if an identical merged tree already passed them
+        force = RETEST_FORCE_FLAG in _target_tests
+        _target_tests = [_test for _test in _target_tests if _test != RETEST_FORCE_FLAG]
+        self.logger.debug(f"{self.log_prefix} Target tests for re-test: {_target_tests} (force={force})")
         _not_supported_retests: list[str] = []
         _supported_retests: list[str] = []
 
@@ -914,6 +918,7 @@ Adding label/s `{" ".join(cp_labels)}` for automatic cherry-pick once the PR is
             await self.runner_handler.run_retests(
                 supported_retests=_supported_retests,
                 pull_request=pull_request,
+                force=force,
             )
 
         if automerge:
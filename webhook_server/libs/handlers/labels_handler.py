@@ -1,11 +1,18 @@
+from __future__ import annotations
+
 import asyncio
-from typing import TYPE_CHECKING
+import bisect
+import contextlib
+import copy
+from collections.abc import AsyncGenerator, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 import webcolors
 from github.GithubException import UnknownObjectException
 from github.PullRequest import PullRequest
 from github.Repository import Repository
-from timeout_sampler import TimeoutWatch
 
 from webhook_server.libs.handlers.owners_files_handler import OwnersFileHandler
 from webhook_server.utils.constants import (
@@ -27,7 +34,10 @@ from webhook_server.utils.constants import (
     STATIC_LABELS_DICT,
     WIP_STR,
 )
+from webhook_server.utils.diff_cache import diff_stats_cache
 from webhook_server.utils.github_retry import github_api_call
+from webhook_server.utils.label_catalog import CatalogLabel, repository_label_catalog
+from webhook_server.utils.label_state import pull_request_label_state
 
 if TYPE_CHECKING:
     from webhook_server.libs.github_api import GithubWebhook
@@ -43,6 +53,43 @@ STATIC_PR_SIZE_THRESHOLDS: tuple[tuple[int | float, str, str], ...] = (
 )
 
 
+@dataclass(frozen=True, slots=True)
+class _SizeThresholdTable:
+    thresholds: tuple[tuple[int | float, str, str], ...]
+    # Upper bounds (exclusive) and the full label name of each size category
+    bounds: tuple[int | float, ...]
+    labels: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, thresholds: list[tuple[int | float, str, str]]) -> _SizeThresholdTable:
+        return cls(
+            thresholds=tuple(thresholds),
+            bounds=tuple(threshold for threshold, _, _ in thresholds),
+            labels=tuple(f"{SIZE_LABEL_PREFIX}{label_name}" for _, label_name, _ in thresholds),
+        )
+
+    def classify(self, size: int) -> str:
+        """Return the label of the first category whose threshold is above *size* (the largest one past all)."""
+        if not self.labels:
+            return f"{SIZE_LABEL_PREFIX}XL"
+        return self.labels[min(bisect.bisect_right(self.bounds, size), len(self.labels) - 1)]
+
+
+# repo_full_name -> (pr-size-thresholds config the table was compiled from, table)
+_size_threshold_tables: dict[str, tuple[Any, _SizeThresholdTable]] = {}
+
+
+@dataclass(slots=True)
+class _LabelBatch:
+    pull_request_number: int
+    # label -> wanted on the pull request, in order of the last declaration
+    changes: dict[str, bool] = field(default_factory=dict)
+
+
+# Label changes collected by LabelsHandler.label_batch(), shared with the tasks started inside it
+_label_batch: ContextVar[_LabelBatch | None] = ContextVar("label_batch", default=None)
+
+
 class LabelsHandler:
     def __init__(self, github_webhook: GithubWebhook, owners_file_handler: OwnersFileHandler) -> None:
         self.github_webhook = github_webhook
@@ -52,6 +99,11 @@ class LabelsHandler:
         self.logger = self.github_webhook.logger
         self.log_prefix: str = self.github_webhook.log_prefix
         self.repository: Repository = self.github_webhook.repository
+        self.repository_full_name: str = self.github_webhook.repository_full_name
+
+        # Every payload carries the labels as of the event; seed (or refresh) the cached state
+        if isinstance(self.hook_data, dict):
+            pull_request_label_state.observe_payload(repo_full_name=self.repository_full_name, hook_data=self.hook_data)
 
     def is_label_enabled(self, label: str) -> bool:
         """Check if a label is enabled based on configuration.
@@ -111,24 +163,159 @@ class LabelsHandler:
     async def label_exists_in_pull_request(self, pull_request: PullRequest, label: str) -> bool:
         return label in await self.pull_request_labels_names(pull_request=pull_request)
 
-    async def pull_request_labels_names(self, pull_request: PullRequest) -> list[str]:
-        labels = await github_api_call(
-            lambda: list(pull_request.get_labels()),
-            logger=self.logger,
-            log_prefix=self.log_prefix,
-        )
-        return [lb.name for lb in labels]
+    async def pull_request_labels_names(self, pull_request: PullRequest, fresh: bool = False) -> list[str]:
+        """Return the label names of the pull request.
+
+        Served from the label state cache (seeded from webhook payloads and kept
+        current by our own writes); the labels are fetched only on a miss, or
+        always when *fresh* is set, since the cache is per worker process.
+        Inside a ``label_batch()`` the changes declared so far are included.
+        """
+        names = None
+        if not fresh:
+            names = pull_request_label_state.get(repo_full_name=self.repository_full_name, number=pull_request.number)
+        if names is None:
+            labels = await github_api_call(
+                lambda: list(pull_request.get_labels()),
+                logger=self.logger,
+                log_prefix=self.log_prefix,
+            )
+            names = [lb.name for lb in labels]
+            pull_request_label_state.observe(
+                repo_full_name=self.repository_full_name, number=pull_request.number, labels=names
+            )
+
+        batch = _label_batch.get()
+        if batch is not None and batch.pull_request_number == pull_request.number:
+            names = [name for name in names if batch.changes.get(name, True)]
+            names.extend(label for label, wanted in batch.changes.items() if wanted and label not in names)
+        return names
+
+    @contextlib.asynccontextmanager
+    async def label_batch(self, pull_request: PullRequest) -> AsyncGenerator[None]:
+        """Collect the label changes made inside the block and apply them in one write on exit.
+
+        Tasks started inside the block share the batch, so concurrent handlers of
+        one webhook declare their changes without writing.  A label changed more
+        than once keeps its last declared state.  Nested batches join the outer one.
+        """
+        if _label_batch.get() is not None:
+            yield
+            return
+
+        batch = _LabelBatch(pull_request_number=pull_request.number)
+        token = _label_batch.set(batch)
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Changes declared before the failure are still applied, as they were when written one by one
+            await self._apply_label_batch(pull_request=pull_request, batch=batch)
+            raise
+        finally:
+            _label_batch.reset(token)
+
+        await self._apply_label_batch(pull_request=pull_request, batch=batch)
+
+    async def update_labels(
+        self, pull_request: PullRequest, add: Iterable[str] = (), remove: Iterable[str] = ()
+    ) -> None:
+        """Declare labels the pull request should have and should not have.
+
+        Only the difference to the current labels is written: one
+        ``remove_from_labels`` per removed label and a single ``add_to_labels``.
+        Inside a ``label_batch()`` the changes are applied when the batch ends.
+        A label in both *add* and *remove* is added.
+        """
+        changes: dict[str, bool] = dict.fromkeys((label.strip() for label in remove), False)
+        for label in add:
+            label = label.strip()
+            if self._can_add_label(label):
+                changes.pop(label, None)
+                changes[label] = True
+        if not changes:
+            return
+
+        batch = _label_batch.get()
+        if batch is not None and batch.pull_request_number == pull_request.number:
+            for label, wanted in changes.items():
+                # Re-insert so the batch keeps the order of the last declarations
+                batch.changes.pop(label, None)
+                batch.changes[label] = wanted
+            return
+
+        await self._apply_label_changes(pull_request=pull_request, changes=changes)
+
+    async def _apply_label_batch(self, pull_request: PullRequest, batch: _LabelBatch) -> None:
+        if not batch.changes:
+            return
+
+        try:
+            await self._apply_label_changes(pull_request=pull_request, changes=batch.changes)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.logger.exception(f"{self.log_prefix} Failed to apply label changes {batch.changes}")
+
+    async def _apply_label_changes(self, pull_request: PullRequest, changes: dict[str, bool]) -> None:
+        """Write the difference between *changes* and the cached labels of the pull request.
+
+        Writes to one pull request are serialized, so each diff is computed
+        against the state left by the previous write.  Without cached state the
+        declared changes are written as they are (callers checked existence).
+        Only the declared labels are written, never the whole set built from
+        cached state, so labels added meanwhile by others are kept.
+        """
+        number = pull_request.number
+        async with pull_request_label_state.write_lock(repo_full_name=self.repository_full_name, number=number):
+            current = pull_request_label_state.get(repo_full_name=self.repository_full_name, number=number)
+            if current is None:
+                to_add = [label for label, wanted in changes.items() if wanted]
+                to_remove = [label for label, wanted in changes.items() if not wanted]
+            else:
+                to_add = [label for label, wanted in changes.items() if wanted and label not in current]
+                to_remove = [label for label, wanted in changes.items() if not wanted and label in current]
+            if not to_add and not to_remove:
+                self.logger.debug(f"{self.log_prefix} Labels already up to date")
+                return
+
+            for label in to_add:
+                await self._ensure_repository_label(label=label, color=self._get_label_color(label))
+
+            try:
+                for label in to_remove:
+                    self.logger.info(f"{self.log_prefix} Removing label {label}")
+                    try:
+                        await github_api_call(
+                            pull_request.remove_from_labels, label, logger=self.logger, log_prefix=self.log_prefix
+                        )
+                    except UnknownObjectException:
+                        # Removed meanwhile (e.g. by another worker): the outcome we wanted
+                        self.logger.debug(f"{self.log_prefix} Label {label} was already removed")
+                    pull_request_label_state.record_removed(
+                        repo_full_name=self.repository_full_name, number=number, label=label
+                    )
+
+                if to_add:
+                    self.logger.info(f"{self.log_prefix} Adding pull request labels {to_add}")
+                    await github_api_call(
+                        pull_request.add_to_labels, *to_add, logger=self.logger, log_prefix=self.log_prefix
+                    )
+                    for label in to_add:
+                        pull_request_label_state.record_added(
+                            repo_full_name=self.repository_full_name, number=number, label=label
+                        )
+            except Exception:
+                pull_request_label_state.invalidate(repo_full_name=self.repository_full_name, number=number)
+                raise
 
     async def _remove_label(self, pull_request: PullRequest, label: str) -> bool:
         self.logger.debug(f"{self.log_prefix} Removing label {label}")
         try:
             if await self.label_exists_in_pull_request(pull_request=pull_request, label=label):
-                self.logger.info(f"{self.log_prefix} Removing label {label}")
-                await github_api_call(
-                    pull_request.remove_from_labels, label, logger=self.logger, log_prefix=self.log_prefix
-                )
-                success = await self.wait_for_label(pull_request=pull_request, label=label, exists=False)
-                return success
+                await self.update_labels(pull_request=pull_request, remove=[label])
+                return True
         except Exception as exp:
             self.logger.debug(f"{self.log_prefix} Failed to remove {label} label. Exception: {exp}")
             return False
@@ -145,6 +332,17 @@ class LabelsHandler:
         """
         label = label.strip()
         self.logger.debug(f"{self.log_prefix} Adding label {label}")
+        if not self._can_add_label(label):
+            return False
+
+        if await self.label_exists_in_pull_request(pull_request=pull_request, label=label):
+            self.logger.debug(f"{self.log_prefix} Label {label} already assigned")
+            return False
+
+        await self.update_labels(pull_request=pull_request, add=[label])
+        return True
+
+    def _can_add_label(self, label: str) -> bool:
         if len(label) > 49:
             self.logger.debug(f"{label} is too long, not adding.")
             return False
@@ -153,45 +351,41 @@ class LabelsHandler:
             self.logger.debug(f"{self.log_prefix} Label {label} is disabled by configuration, not adding")
             return False
 
-        if await self.label_exists_in_pull_request(pull_request=pull_request, label=label):
-            self.logger.debug(f"{self.log_prefix} Label {label} already assigned")
-            return False
+        return True
 
-        # Get the color for this label (custom or default)
-        color = self._get_label_color(label)
-        _with_color_msg = f"repository label {label} with color {color}"
+    async def _ensure_repository_label(self, label: str, color: str) -> None:
+        """Queue creation or recoloring of the repository label when the catalog says it is needed.
 
+        Reconciliation runs in the background; attaching a label that does not
+        exist yet makes GitHub create it, and the pass then fixes its color.
+        """
         try:
-            _repo_label = await github_api_call(
-                self.repository.get_label, label, logger=self.logger, log_prefix=self.log_prefix
-            )
-            await github_api_call(
-                _repo_label.edit, name=_repo_label.name, color=color, logger=self.logger, log_prefix=self.log_prefix
+            await repository_label_catalog.get_or_load(
+                repo_full_name=self.repository_full_name,
+                fetch=self._fetch_repository_labels,
+                logger=self.logger,
+                log_prefix=self.log_prefix,
             )
-            self.logger.debug(f"{self.log_prefix} Edit {_with_color_msg}")
-
-        except UnknownObjectException:
-            self.logger.debug(f"{self.log_prefix} Add {_with_color_msg}")
-            await github_api_call(
-                self.repository.create_label, name=label, color=color, logger=self.logger, log_prefix=self.log_prefix
+        except Exception as exp:
+            self.logger.debug(f"{self.log_prefix} Failed to load repository labels. Exception: {exp}")
+
+        if repository_label_catalog.needs_reconcile(repo_full_name=self.repository_full_name, name=label, color=color):
+            self.logger.debug(f"{self.log_prefix} Queue repository label {label} with color {color}")
+            repository_label_catalog.schedule_reconcile(
+                repo_full_name=self.repository_full_name,
+                name=label,
+                color=color,
+                repository=self.repository,
+                logger=self.logger,
+                log_prefix=self.log_prefix,
             )
 
-        self.logger.info(f"{self.log_prefix} Adding pull request label {label}")
-        await github_api_call(pull_request.add_to_labels, label, logger=self.logger, log_prefix=self.log_prefix)
-        return await self.wait_for_label(pull_request=pull_request, label=label, exists=True)
-
-    async def wait_for_label(self, pull_request: PullRequest, label: str, exists: bool) -> bool:
-        self.logger.debug(f"{self.log_prefix} waiting for label {label} to {'exists' if exists else 'not exists'}")
-        timeout_watch = TimeoutWatch(timeout=30)
-        while timeout_watch.remaining_time() > 0:
-            res = await self.label_exists_in_pull_request(pull_request=pull_request, label=label)
-            if res == exists:
-                return True
-
-            await asyncio.sleep(5)
-
-        self.logger.debug(f"{self.log_prefix} Label {label} {'not found' if exists else 'found'}")
-        return False
+    async def _fetch_repository_labels(self) -> list[CatalogLabel]:
+        return await github_api_call(
+            lambda: [CatalogLabel(name=lb.name, color=lb.color) for lb in self.repository.get_labels()],
+            logger=self.logger,
+            log_prefix=self.log_prefix,
+        )
 
     def _get_label_color(self, label: str) -> str:
         """Get the appropriate color for a label.
@@ -258,8 +452,20 @@ class LabelsHandler:
         Returns:
             List of tuples (threshold, label_name, color_hex) sorted by threshold.
         """
+        return list(self._pr_size_threshold_table().thresholds)
+
+    def _pr_size_threshold_table(self) -> _SizeThresholdTable:
+        """Return the compiled size thresholds of the repository, compiling them when the config changed."""
         custom_config = self.github_webhook.config.get_value("pr-size-thresholds", return_on_none=None)
+        cached = _size_threshold_tables.get(self.repository_full_name)
+        if cached is not None and cached[0] == custom_config:
+            return cached[1]
+
+        table = _SizeThresholdTable.compile(self._parse_pr_size_thresholds(custom_config))
+        _size_threshold_tables[self.repository_full_name] = (copy.deepcopy(custom_config), table)
+        return table
 
+    def _parse_pr_size_thresholds(self, custom_config: Any) -> list[tuple[int | float, str, str]]:
         if not custom_config:
             return list(STATIC_PR_SIZE_THRESHOLDS)
 
@@ -308,29 +514,44 @@ class LabelsHandler:
         return sorted_thresholds
 
     async def get_size(self, pull_request: PullRequest) -> str:
-        """Calculates size label based on additions and deletions."""
-        additions, deletions = await asyncio.gather(
-            github_api_call(lambda: pull_request.additions, logger=self.logger, log_prefix=self.log_prefix),
-            github_api_call(lambda: pull_request.deletions, logger=self.logger, log_prefix=self.log_prefix),
-        )
+        """Calculates size label based on additions and deletions.
+
+        The line counts come from the ``pull_request`` webhook payload, then from the
+        diff stats cached by OwnersFileHandler.list_changed_files(); the pull request
+        object is only read when neither has them.
+        """
+        line_counts = self._payload_line_counts(pull_request=pull_request)
+        if line_counts is None:
+            diff_stats = diff_stats_cache.get(
+                repo_full_name=self.github_webhook.repository_full_name,
+                base_sha=self.github_webhook.pr_base_sha,
+                head_sha=self.github_webhook.pr_head_sha,
+            )
+            if diff_stats is not None:
+                line_counts = diff_stats.additions, diff_stats.deletions
+        if line_counts is None:
+            line_counts = await asyncio.gather(
+                github_api_call(lambda: pull_request.additions, logger=self.logger, log_prefix=self.log_prefix),
+                github_api_call(lambda: pull_request.deletions, logger=self.logger, log_prefix=self.log_prefix),
+            )
+
+        additions, deletions = line_counts
         size = additions + deletions
         self.logger.debug(f"{self.log_prefix} PR size is {size} (additions: {additions}, deletions: {deletions})")
+        return self._pr_size_threshold_table().classify(size)
 
-        # Get custom or default thresholds
-        thresholds = self._get_custom_pr_size_thresholds()
+    def _payload_line_counts(self, pull_request: PullRequest) -> tuple[int, int] | None:
+        """Additions and deletions of *pull_request* from the webhook payload, if it carries them."""
+        payload = self.hook_data.get("pull_request") if isinstance(self.hook_data, dict) else None
+        if not isinstance(payload, dict) or payload.get("number") != pull_request.number:
+            return None
 
-        # Find the appropriate size category
-        for threshold, label_name, _ in thresholds:
-            if size < threshold:
-                return f"{SIZE_LABEL_PREFIX}{label_name}"
+        additions, deletions = payload.get("additions"), payload.get("deletions")
+        if not isinstance(additions, int) or not isinstance(deletions, int):
+            return None
 
-        # If we reach here, PR is larger than all thresholds, use the largest category
-        if thresholds:
-            _, largest_label, _ = thresholds[-1]
-            return f"{SIZE_LABEL_PREFIX}{largest_label}"
-
-        # Fallback (should not happen due to our default handling)
-        return f"{SIZE_LABEL_PREFIX}XL"
+        self.logger.debug(f"{self.log_prefix} PR changed files: {payload.get('changed_files')}")
+        return additions, deletions
 
     async def add_size_label(self, pull_request: PullRequest) -> None:
         """Add a size label to the pull request based on its additions and deletions."""
@@ -340,20 +561,15 @@ class LabelsHandler:
             self.logger.debug(f"{self.log_prefix} Size label not found")
             return
 
-        if size_label in await self.pull_request_labels_names(pull_request=pull_request):
+        labels = await self.pull_request_labels_names(pull_request=pull_request)
+        exists_size_labels = [label for label in labels if label.startswith(SIZE_LABEL_PREFIX) and label != size_label]
+        if size_label in labels and not exists_size_labels:
             return
 
-        exists_size_label = [
-            label
-            for label in await self.pull_request_labels_names(pull_request=pull_request)
-            if label.startswith(SIZE_LABEL_PREFIX)
-        ]
-
-        if exists_size_label:
-            self.logger.debug(f"{self.log_prefix} Found existing size label {exists_size_label}, removing it.")
-            await self._remove_label(pull_request=pull_request, label=exists_size_label[0])
+        if exists_size_labels:
+            self.logger.debug(f"{self.log_prefix} Found existing size label {exists_size_labels}, replacing it.")
 
-        await self._add_label(pull_request=pull_request, label=size_label)
+        await self.update_labels(pull_request=pull_request, add=[size_label], remove=exists_size_labels)
 
     async def label_by_user_comment(
         self,
@@ -438,8 +654,9 @@ class LabelsHandler:
 
             if action == ADD_STR:
                 self.logger.debug(f"{self.log_prefix} Adding reviewer label {reviewer_label}")
-                await self._add_label(pull_request=pull_request, label=reviewer_label)
-                await self._remove_label(pull_request=pull_request, label=label_to_remove)
+                async with self.label_batch(pull_request=pull_request):
+                    await self._add_label(pull_request=pull_request, label=reviewer_label)
+                    await self._remove_label(pull_request=pull_request, label=label_to_remove)
 
             if action == DELETE_STR:
                 self.logger.debug(f"{self.log_prefix} Removing reviewer label {reviewer_label}")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import re
 import shlex
 from collections.abc import Coroutine
 from pathlib import Path
@@ -16,12 +17,16 @@ from github.PullRequest import PullRequest
 from github.Repository import Repository
 
 from webhook_server.utils.constants import COMMAND_ADD_ALLOWED_USER_STR, ROOT_APPROVERS_KEY
+from webhook_server.utils.diff_cache import DiffStats, diff_stats_cache, parse_numstat
 from webhook_server.utils.github_retry import github_api_call
 from webhook_server.utils.helpers import run_command
+from webhook_server.utils.owners_cache import owners_data_cache
 
 if TYPE_CHECKING:
     from webhook_server.libs.github_api import GithubWebhook
 
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
 
 class OwnersFileHandler:
     def __init__(self, github_webhook: GithubWebhook) -> None:
@@ -43,6 +48,47 @@ class OwnersFileHandler:
             self.get_all_repository_approvers_and_reviewers(),
         )
 
+        await self._derive_approvers_and_reviewers()
+        return self
+
+    async def initialize_from_cache(self, base_ref: str) -> OwnersFileHandler | None:
+        """Initialize handler without a clone, from the cached diff and the cached OWNERS data of the base tree.
+
+        Returns None when either is not cached; the caller then clones and calls initialize().
+        """
+        repo_full_name = self.github_webhook.repository_full_name
+        diff_stats = diff_stats_cache.get(
+            repo_full_name=repo_full_name,
+            base_sha=self.github_webhook.pr_base_sha,
+            head_sha=self.github_webhook.pr_head_sha,
+        )
+        if diff_stats is None:
+            self.logger.debug(f"{self.log_prefix} Changed files of the PR are not cached")
+            return None
+
+        # Resolved on every call: a cached branch tree could lag behind pushes seen by another worker
+        branch = await github_api_call(
+            self.repository.get_branch, base_ref, logger=self.logger, log_prefix=self.log_prefix
+        )
+        tree_sha = await github_api_call(
+            lambda: branch.commit.commit.tree.sha, logger=self.logger, log_prefix=self.log_prefix
+        )
+        if not isinstance(tree_sha, str):
+            return None
+
+        owners = owners_data_cache.get(repo_full_name=repo_full_name, tree_sha=tree_sha)
+        if owners is None:
+            self.logger.debug(f"{self.log_prefix} OWNERS data of {base_ref} tree {tree_sha[:7]} is not cached")
+            return None
+
+        self.logger.debug(f"{self.log_prefix} Using cached OWNERS data of {base_ref} tree {tree_sha[:7]}")
+        self.diff_stats = diff_stats
+        self.changed_files = list(diff_stats.files)
+        self.all_repository_approvers_and_reviewers = owners
+        await self._derive_approvers_and_reviewers()
+        return self
+
+    async def _derive_approvers_and_reviewers(self) -> None:
         # Phase 2: Parallel data processing - all depend on phase 1 but independent of each other
         (
             self.all_repository_approvers,
@@ -56,8 +102,6 @@ class OwnersFileHandler:
             self.get_all_pull_request_reviewers(),
         )
 
-        return self
-
     def _ensure_initialized(self) -> None:
         if not hasattr(self, "changed_files"):
             raise RuntimeError("OwnersFileHandler.initialize() must be called before using this method")
@@ -98,6 +142,10 @@ class OwnersFileHandler:
         If the PR is force-pushed between webhook delivery and processing,
         _clone_repository() explicitly fetches payload SHAs to ensure they exist.
 
+        The diff (file list plus per-file line counts) is stored in the process-wide
+        diff_stats_cache, so later webhooks for the same base/head pair, size labeling
+        and path-filtered checks reuse it without running git diff again.
+
         Returns:
             List of changed file paths relative to repository root
 
@@ -108,15 +156,36 @@ class OwnersFileHandler:
         # SHAs are stored on the GithubWebhook instance during process():
         # - From webhook payload for pull_request events (avoids race condition with live API)
         # - From PullRequest object for other event types (issue_comment, check_run, etc.)
+        self.diff_stats = await diff_stats_cache.get_or_compute(
+            repo_full_name=self.github_webhook.repository_full_name,
+            base_sha=self.github_webhook.pr_base_sha,
+            head_sha=self.github_webhook.pr_head_sha,
+            compute=self._git_diff_stats,
+            logger=self.logger,
+            log_prefix=self.log_prefix,
+        )
+        changed_files = list(self.diff_stats.files)
+
+        self.logger.debug(f"{self.log_prefix} Changed files: {changed_files}")
+        return changed_files
+
+    async def _git_diff_stats(self) -> DiffStats:
+        """Run git diff --numstat on the cloned repository for the PR base/head SHAs.
+
+        Raises:
+            RuntimeError: If git diff command fails
+            asyncio.CancelledError: Propagates cancellation (never caught)
+        """
         base_sha = self.github_webhook.pr_base_sha
         head_sha = self.github_webhook.pr_head_sha
 
         # Run git diff command on cloned repository
         # Quote clone_repo_dir to handle paths with spaces or special characters
         # First try three-dot diff (shows changes since common ancestor)
+        # -z keeps paths unquoted and reports renames as separate old/new fields
         diff_syntax = "..."  # Track which syntax is used for accurate error reporting
         git_diff_command = (
-            f"git -C {shlex.quote(self.github_webhook.clone_repo_dir)} diff --name-only {base_sha}...{head_sha}"
+            f"git -C {shlex.quote(self.github_webhook.clone_repo_dir)} diff --numstat -z {base_sha}...{head_sha}"
         )
 
         try:
@@ -132,7 +201,7 @@ class OwnersFileHandler:
                 self.logger.warning(f"{self.log_prefix} No merge base found, falling back to two-dot diff")
                 diff_syntax = ".."  # Update to reflect the fallback syntax
                 git_diff_command = (
-                    f"git -C {shlex.quote(self.github_webhook.clone_repo_dir)} diff --name-only {base_sha}..{head_sha}"
+                    f"git -C {shlex.quote(self.github_webhook.clone_repo_dir)} diff --numstat -z {base_sha}..{head_sha}"
                 )
                 success, out, err = await run_command(
                     command=git_diff_command,
@@ -151,11 +220,12 @@ class OwnersFileHandler:
                 self.logger.error(f"{self.log_prefix} {error_msg}")
                 raise RuntimeError(error_msg)
 
-            # Parse output: split by newlines and filter empty lines
-            changed_files = [line.strip() for line in out.splitlines() if line.strip()]
-
-            self.logger.debug(f"{self.log_prefix} Changed files: {changed_files}")
-            return changed_files
+            diff_stats = parse_numstat(out)
+            self.logger.debug(
+                f"{self.log_prefix} Diff stats: {len(diff_stats.files)} files, "
+                f"+{diff_stats.additions}/-{diff_stats.deletions}"
+            )
+            return diff_stats
 
         except asyncio.CancelledError:
             # Never catch CancelledError - let it propagate
@@ -251,9 +321,10 @@ class OwnersFileHandler:
         # Find all OWNERS files via filesystem walk
         self.logger.debug(f"{self.log_prefix} Finding OWNERS files in local clone")
 
-        # Run both git commands in parallel (RULE #0)
+        # Run the git commands in parallel (RULE #0)
         git_branch_cmd = f"git -C {shlex.quote(str(clone_path))} branch --show-current"
         git_log_cmd = f"git -C {shlex.quote(str(clone_path))} log -1 --format=%H%x20%s -- OWNERS"
+        git_tree_cmd = f"git -C {shlex.quote(str(clone_path))} rev-parse HEAD^{{tree}}"
 
         branch_task = run_command(
             command=git_branch_cmd,
@@ -268,7 +339,18 @@ class OwnersFileHandler:
             mask_sensitive=self.github_webhook.mask_sensitive,
         )
 
-        (branch_success, current_branch, _), (log_success, log_output, _) = await asyncio.gather(branch_task, log_task)
+        tree_task = run_command(
+            command=git_tree_cmd,
+            log_prefix=self.log_prefix,
+            verify_stderr=False,
+            mask_sensitive=self.github_webhook.mask_sensitive,
+        )
+
+        (
+            (branch_success, current_branch, _),
+            (log_success, log_output, _),
+            (tree_success, tree_output, _),
+        ) = await asyncio.gather(branch_task, log_task, tree_task)
 
         if branch_success and current_branch.strip():
             self.logger.debug(f"{self.log_prefix} Reading OWNERS files from branch: {current_branch.strip()}")
@@ -339,6 +421,15 @@ class OwnersFileHandler:
                 self.logger.exception(f"{self.log_prefix} Invalid OWNERS file {relative_path_str}")
                 continue
 
+        # Keyed by the checked out tree, so merge-eligibility events of any PR on this base can skip the clone
+        tree_sha = tree_output.strip() if tree_success else ""
+        if _SHA_PATTERN.match(tree_sha):
+            owners_data_cache.put(
+                repo_full_name=self.github_webhook.repository_full_name,
+                tree_sha=tree_sha,
+                owners=_owners,
+            )
+
         return _owners
 
     async def get_all_repository_approvers(self) -> list[str]:
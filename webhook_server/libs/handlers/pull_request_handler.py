@@ -47,6 +47,13 @@ from webhook_server.utils.constants import (
 )
 from webhook_server.utils.github_retry import github_api_call
 from webhook_server.utils.helpers import run_command
+from webhook_server.utils.merge_eligibility import (
+    CheckRunSnapshot,
+    MergeEligibilityState,
+    StatusSnapshot,
+    merge_eligibility_states,
+)
+from webhook_server.utils.path_filters import PathFilter
 
 if TYPE_CHECKING:
     from webhook_server.libs.github_api import GithubWebhook
@@ -54,6 +61,9 @@ if TYPE_CHECKING:
 
 _background_tasks: set[asyncio.Task[None]] = set()
 
+# Evaluations of can-be-merged per trigger while other workers keep changing the merge-eligibility state
+_MERGE_EVALUATION_ATTEMPTS: int = 3
+
 
 class PullRequestHandler:
     def __init__(self, github_webhook: GithubWebhook, owners_file_handler: OwnersFileHandler):
@@ -1135,20 +1145,12 @@ For more information, please refer to the project documentation or contact the m
             )
         )
         setup_tasks.append(self.label_pull_request_by_merge_state(pull_request=pull_request))
-        setup_tasks.append(self.check_run_handler.set_check_queued(name=CAN_BE_MERGED_STR))
-
-        # Only queue built-in checks when their corresponding feature is enabled
-        if self.github_webhook.tox:
-            setup_tasks.append(self.check_run_handler.set_check_queued(name=TOX_STR))
 
-        if self.github_webhook.pre_commit:
-            setup_tasks.append(self.check_run_handler.set_check_queued(name=PRE_COMMIT_STR))
-
-        if self.github_webhook.pypi:
-            setup_tasks.append(self.check_run_handler.set_check_queued(name=PYTHON_MODULE_INSTALL_STR))
-
-        if self.github_webhook.build_and_push_container:
-            setup_tasks.append(self.check_run_handler.set_check_queued(name=BUILD_CONTAINER_STR))
+        # Checks whose path filter matches none of the changed files are completed as neutral instead of run
+        skipped_checks = self._checks_skipped_by_path_filters()
+        setup_tasks.append(
+            self.check_run_handler.queue_checks(names=self._applicable_checks(), skipped_checks=skipped_checks)
+        )
 
         if is_clean_rebase:
             # label_names is guaranteed non-None when is_clean_rebase=True (caller always provides it)
@@ -1160,25 +1162,10 @@ For more information, please refer to the project documentation or contact the m
         setup_tasks.append(self.labels_handler.add_size_label(pull_request=pull_request))
         setup_tasks.append(self.add_pull_request_owner_as_assingee(pull_request=pull_request))
 
-        if self.github_webhook.conventional_title:
-            setup_tasks.append(self.check_run_handler.set_check_queued(name=CONVENTIONAL_TITLE_STR))
-
-        # Queue security check runs
-        if self.github_webhook.security_suspicious_paths:
-            setup_tasks.append(self.check_run_handler.set_check_queued(name=SECURITY_SUSPICIOUS_PATHS_STR))
-
-        if self.github_webhook.security_committer_identity_check:
-            setup_tasks.append(self.check_run_handler.set_check_queued(name=SECURITY_COMMITTER_IDENTITY_STR))
-
-        # Queue custom check runs (same as built-in checks)
-        # Note: custom checks are validated in GithubWebhook._validate_custom_check_runs()
-        # so name is guaranteed to exist
-        for custom_check in self.github_webhook.custom_check_runs:
-            check_name = custom_check["name"]
-            setup_tasks.append(self.check_run_handler.set_check_queued(name=check_name))
-
         self.logger.info(f"{self.log_prefix} Executing setup tasks")
-        setup_results = await asyncio.gather(*setup_tasks, return_exceptions=True)
+        # Branch, size, merge-state and verified labels are written together once all setup tasks are done
+        async with self.labels_handler.label_batch(pull_request=pull_request):
+            setup_results = await asyncio.gather(*setup_tasks, return_exceptions=True)
 
         for result in setup_results:
             if isinstance(result, Exception):
@@ -1193,10 +1180,14 @@ For more information, please refer to the project documentation or contact the m
 
         ci_tasks: list[Coroutine[Any, Any, Any]] = []
 
-        ci_tasks.append(self.runner_handler.run_tox(pull_request=pull_request))
-        ci_tasks.append(self.runner_handler.run_pre_commit(pull_request=pull_request))
-        ci_tasks.append(self.runner_handler.run_install_python_module(pull_request=pull_request))
-        ci_tasks.append(self.runner_handler.run_build_container(pull_request=pull_request))
+        if TOX_STR not in skipped_checks:
+            ci_tasks.append(self.runner_handler.run_tox(pull_request=pull_request))
+        if PRE_COMMIT_STR not in skipped_checks:
+            ci_tasks.append(self.runner_handler.run_pre_commit(pull_request=pull_request))
+        if PYTHON_MODULE_INSTALL_STR not in skipped_checks:
+            ci_tasks.append(self.runner_handler.run_install_python_module(pull_request=pull_request))
+        if BUILD_CONTAINER_STR not in skipped_checks:
+            ci_tasks.append(self.runner_handler.run_build_container(pull_request=pull_request))
 
         if self.github_webhook.conventional_title:
             ci_tasks.append(self.runner_handler.run_conventional_title_check(pull_request=pull_request))
@@ -1210,6 +1201,8 @@ For more information, please refer to the project documentation or contact the m
 
         # Launch custom check runs (same as built-in checks)
         for custom_check in self.github_webhook.custom_check_runs:
+            if custom_check["name"] in skipped_checks:
+                continue
             ci_tasks.append(
                 self.runner_handler.run_custom_check(
                     pull_request=pull_request,
@@ -1227,6 +1220,47 @@ For more information, please refer to the project documentation or contact the m
         if self.ctx:
             self.ctx.complete_step("pr_cicd_execution")
 
+    def _checks_skipped_by_path_filters(self) -> dict[str, PathFilter]:
+        """Return the checks whose ``paths``/``paths-ignore`` filter matches none of the PR's changed files."""
+        if not self.github_webhook.check_path_filters:
+            return {}
+
+        changed_files = self.owners_file_handler.changed_files
+        skipped_checks = {
+            check_name: path_filter
+            for check_name, path_filter in self.github_webhook.check_path_filters.items()
+            if not path_filter.matches(changed_files)
+        }
+        if skipped_checks:
+            self.logger.info(
+                f"{self.log_prefix} Skipping checks with no matching changed files: {', '.join(skipped_checks)}"
+            )
+        return skipped_checks
+
+    def _applicable_checks(self) -> list[str]:
+        """Names of the check runs a new head of the pull request gets, in queuing order."""
+        checks = [CAN_BE_MERGED_STR]
+
+        # Only queue built-in checks when their corresponding feature is enabled
+        if self.github_webhook.tox:
+            checks.append(TOX_STR)
+        if self.github_webhook.pre_commit:
+            checks.append(PRE_COMMIT_STR)
+        if self.github_webhook.pypi:
+            checks.append(PYTHON_MODULE_INSTALL_STR)
+        if self.github_webhook.build_and_push_container:
+            checks.append(BUILD_CONTAINER_STR)
+        if self.github_webhook.conventional_title:
+            checks.append(CONVENTIONAL_TITLE_STR)
+        if self.github_webhook.security_suspicious_paths:
+            checks.append(SECURITY_SUSPICIOUS_PATHS_STR)
+        if self.github_webhook.security_committer_identity_check:
+            checks.append(SECURITY_COMMITTER_IDENTITY_STR)
+
+        # Custom checks are validated in GithubWebhook._validate_custom_check_runs(), so name is guaranteed to exist
+        checks.extend(custom_check["name"] for custom_check in self.github_webhook.custom_check_runs)
+        return checks
+
     async def create_issue_for_new_pull_request(self, pull_request: PullRequest) -> None:
         if not self.github_webhook.create_issue_for_new_pr:
             self.logger.info(f"{self.log_prefix} Issue creation for new PRs is disabled for this repository")
@@ -1405,7 +1439,9 @@ For more information, please refer to the project documentation or contact the m
                     )
                 )
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # All reviewed-by labels go in one write
+        async with self.labels_handler.label_batch(pull_request=pull_request):
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
         for result in results:
             if isinstance(result, Exception):
@@ -1474,102 +1510,114 @@ For more information, please refer to the project documentation or contact the m
             self.ctx.start_step("label_merge_state")
 
         try:
-            # Get current labels (single API call for optimization)
-            current_labels = await self.labels_handler.pull_request_labels_names(pull_request=pull_request)
-            has_conflicts_label_exists = HAS_CONFLICTS_LABEL_STR in current_labels
-            needs_rebase_label_exists = NEEDS_REBASE_LABEL_STR in current_labels
-
-            # Step 1: Check for conflicts first
-            # GitHub may return mergeable=None while computing - poll until definitive
-            mergeable = await github_api_call(
-                lambda: pull_request.mergeable, logger=self.logger, log_prefix=self.log_prefix
-            )
-
-            if mergeable is None:
-                self.logger.debug(
-                    f"{self.log_prefix} PR mergeable status is None, polling until GitHub computes status"
+            # Conflict and rebase labels are written together
+            async with self.labels_handler.label_batch(pull_request=pull_request):
+                # Get current labels (single API call for optimization)
+                current_labels = await self.labels_handler.pull_request_labels_names(pull_request=pull_request)
+                has_conflicts_label_exists = HAS_CONFLICTS_LABEL_STR in current_labels
+                needs_rebase_label_exists = NEEDS_REBASE_LABEL_STR in current_labels
+
+                # Step 1: Check for conflicts first
+                # GitHub may return mergeable=None while computing - poll until definitive
+                mergeable = await github_api_call(
+                    lambda: pull_request.mergeable, logger=self.logger, log_prefix=self.log_prefix
                 )
-                pr_number = pull_request.number
-                repository = self.github_webhook.repository
-
-                def _poll_mergeable() -> bool | None:
-                    for sample in TimeoutSampler(
-                        wait_timeout=30,
-                        sleep=5,
-                        func=lambda: repository.get_pull(pr_number).mergeable,
-                    ):
-                        if sample is not None:
-                            return sample
-                    return None  # pragma: no cover
 
-                try:
-                    mergeable = await github_api_call(_poll_mergeable, logger=self.logger, log_prefix=self.log_prefix)
-                except asyncio.CancelledError:
-                    raise
-                except TimeoutExpiredError:
-                    self.logger.warning(
-                        f"{self.log_prefix} PR mergeable status still None after retries, skipping label update"
+                if mergeable is None:
+                    self.logger.debug(
+                        f"{self.log_prefix} PR mergeable status is None, polling until GitHub computes status"
                     )
-                    if self.ctx:
-                        self.ctx.complete_step("label_merge_state", mergeable_unknown=True)
+                    pr_number = pull_request.number
+                    repository = self.github_webhook.repository
+
+                    def _poll_mergeable() -> bool | None:
+                        for sample in TimeoutSampler(
+                            wait_timeout=30,
+                            sleep=5,
+                            func=lambda: repository.get_pull(pr_number).mergeable,
+                        ):
+                            if sample is not None:
+                                return sample
+                        return None  # pragma: no cover
 
-            if mergeable is not None:
-                has_conflicts = mergeable is False
+                    try:
+                        mergeable = await github_api_call(
+                            _poll_mergeable, logger=self.logger, log_prefix=self.log_prefix
+                        )
+                    except asyncio.CancelledError:
+                        raise
+                    except TimeoutExpiredError:
+                        self.logger.warning(
+                            f"{self.log_prefix} PR mergeable status still None after retries, skipping label update"
+                        )
+                        if self.ctx:
+                            self.ctx.complete_step("label_merge_state", mergeable_unknown=True)
 
-                if has_conflicts:
-                    # Has conflicts - add has-conflicts label and exit
-                    self.logger.debug(f"{self.log_prefix} PR has conflicts. {mergeable=}")
+                if mergeable is not None:
+                    has_conflicts = mergeable is False
 
-                    if not has_conflicts_label_exists:
-                        self.logger.debug(f"{self.log_prefix} Adding {HAS_CONFLICTS_LABEL_STR} label")
-                        await self.labels_handler._add_label(pull_request=pull_request, label=HAS_CONFLICTS_LABEL_STR)
+                    if has_conflicts:
+                        # Has conflicts - add has-conflicts label and exit
+                        self.logger.debug(f"{self.log_prefix} PR has conflicts. {mergeable=}")
 
-                    if self.ctx:
-                        self.ctx.complete_step("label_merge_state", has_conflicts=True)
-                    return  # Exit early - conflicts take precedence
+                        if not has_conflicts_label_exists:
+                            self.logger.debug(f"{self.log_prefix} Adding {HAS_CONFLICTS_LABEL_STR} label")
+                            await self.labels_handler._add_label(
+                                pull_request=pull_request, label=HAS_CONFLICTS_LABEL_STR
+                            )
 
-                # No conflicts - remove has-conflicts label if present (skip in add_only mode)
-                if has_conflicts_label_exists and not add_only:
-                    self.logger.debug(f"{self.log_prefix} Removing {HAS_CONFLICTS_LABEL_STR} label")
-                    await self.labels_handler._remove_label(pull_request=pull_request, label=HAS_CONFLICTS_LABEL_STR)
-            else:
-                self.logger.debug(f"{self.log_prefix} Mergeable status unknown, skipping has-conflicts label update")
+                        if self.ctx:
+                            self.ctx.complete_step("label_merge_state", has_conflicts=True)
+                        return  # Exit early - conflicts take precedence
 
-            # Step 3: Check if needs rebase via Compare API
-            base_ref, head_user_login, head_ref = await asyncio.gather(
-                github_api_call(lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix),
-                github_api_call(lambda: pull_request.head.user.login, logger=self.logger, log_prefix=self.log_prefix),
-                github_api_call(lambda: pull_request.head.ref, logger=self.logger, log_prefix=self.log_prefix),
-            )
-            head_ref_full = f"{head_user_login}:{head_ref}"
+                    # No conflicts - remove has-conflicts label if present (skip in add_only mode)
+                    if has_conflicts_label_exists and not add_only:
+                        self.logger.debug(f"{self.log_prefix} Removing {HAS_CONFLICTS_LABEL_STR} label")
+                        await self.labels_handler._remove_label(
+                            pull_request=pull_request, label=HAS_CONFLICTS_LABEL_STR
+                        )
+                else:
+                    self.logger.debug(
+                        f"{self.log_prefix} Mergeable status unknown, skipping has-conflicts label update"
+                    )
 
-            compare_data = await self._compare_branches(base_ref=base_ref, head_ref_full=head_ref_full)
-            if compare_data is None:
-                self.logger.warning(f"{self.log_prefix} Compare API failed, skipping rebase label update")
-                if self.ctx:
-                    self.ctx.complete_step("label_merge_state", compare_api_failed=True)
-                return
+                # Step 3: Check if needs rebase via Compare API
+                base_ref, head_user_login, head_ref = await asyncio.gather(
+                    github_api_call(lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix),
+                    github_api_call(
+                        lambda: pull_request.head.user.login, logger=self.logger, log_prefix=self.log_prefix
+                    ),
+                    github_api_call(lambda: pull_request.head.ref, logger=self.logger, log_prefix=self.log_prefix),
+                )
+                head_ref_full = f"{head_user_login}:{head_ref}"
 
-            behind_by = compare_data.get("behind_by", 0)
-            status = compare_data.get("status", "")
+                compare_data = await self._compare_branches(base_ref=base_ref, head_ref_full=head_ref_full)
+                if compare_data is None:
+                    self.logger.warning(f"{self.log_prefix} Compare API failed, skipping rebase label update")
+                    if self.ctx:
+                        self.ctx.complete_step("label_merge_state", compare_api_failed=True)
+                    return
 
-            needs_rebase = behind_by > 0 or status == "diverged"
+                behind_by = compare_data.get("behind_by", 0)
+                status = compare_data.get("status", "")
 
-            self.logger.debug(
-                f"{self.log_prefix} Compare API - behind_by: {behind_by}, "
-                f"status: {status}, needs_rebase: {needs_rebase}"
-            )
+                needs_rebase = behind_by > 0 or status == "diverged"
 
-            # Step 4: Update needs-rebase label
-            if needs_rebase and not needs_rebase_label_exists:
-                self.logger.debug(f"{self.log_prefix} Adding {NEEDS_REBASE_LABEL_STR} label")
-                await self.labels_handler._add_label(pull_request=pull_request, label=NEEDS_REBASE_LABEL_STR)
-            elif not needs_rebase and needs_rebase_label_exists and not add_only:
-                self.logger.debug(f"{self.log_prefix} Removing {NEEDS_REBASE_LABEL_STR} label")
-                await self.labels_handler._remove_label(pull_request=pull_request, label=NEEDS_REBASE_LABEL_STR)
+                self.logger.debug(
+                    f"{self.log_prefix} Compare API - behind_by: {behind_by}, "
+                    f"status: {status}, needs_rebase: {needs_rebase}"
+                )
 
-            if self.ctx:
-                self.ctx.complete_step("label_merge_state", has_conflicts=False, needs_rebase=needs_rebase)
+                # Step 4: Update needs-rebase label
+                if needs_rebase and not needs_rebase_label_exists:
+                    self.logger.debug(f"{self.log_prefix} Adding {NEEDS_REBASE_LABEL_STR} label")
+                    await self.labels_handler._add_label(pull_request=pull_request, label=NEEDS_REBASE_LABEL_STR)
+                elif not needs_rebase and needs_rebase_label_exists and not add_only:
+                    self.logger.debug(f"{self.log_prefix} Removing {NEEDS_REBASE_LABEL_STR} label")
+                    await self.labels_handler._remove_label(pull_request=pull_request, label=NEEDS_REBASE_LABEL_STR)
+
+                if self.ctx:
+                    self.ctx.complete_step("label_merge_state", has_conflicts=False, needs_rebase=needs_rebase)
 
         except asyncio.CancelledError:
             self.logger.debug(f"{self.log_prefix} Label merge state check cancelled")
@@ -1689,7 +1737,184 @@ For more information, please refer to the project documentation or contact the m
 
         try:
             self.logger.info(f"{self.log_prefix} Check if {CAN_BE_MERGED_STR}.")
+            eligibility, reconciled = await self._merge_eligibility_state(pull_request=pull_request)
+            # Our own check run writes are recorded in the state, so it holds the conclusion shown on GitHub
+            _current = eligibility.check_runs.get(CAN_BE_MERGED_STR)
+            current_conclusion = (
+                _current.conclusion if _current is not None and _current.status == "completed" else None
+            )
             await self.check_run_handler.set_check_in_progress(name=CAN_BE_MERGED_STR)
+
+            for attempt in range(1, _MERGE_EVALUATION_ATTEMPTS + 1):
+                # Labels and reviews are not part of the state; label events may have been handled by another worker
+                _labels = await self.labels_handler.pull_request_labels_names(pull_request=pull_request, fresh=True)
+                self.logger.debug(f"{self.log_prefix} check if can be merged. PR labels are: {_labels}")
+                failure_output = await self._can_be_merged_failure_output(
+                    pull_request=pull_request, eligibility=eligibility, labels=_labels
+                )
+                conclusion = FAILURE_STR if failure_output else SUCCESS_STR
+                if not reconciled and conclusion != current_conclusion:
+                    # Only a full reconcile may change the conclusion, in case the state missed an event
+                    self.logger.debug(
+                        f"{self.log_prefix} Reconciling merge-eligibility state before changing "
+                        f"{CAN_BE_MERGED_STR} from {current_conclusion} to {conclusion}"
+                    )
+                    eligibility, reconciled = await self._merge_eligibility_state(
+                        pull_request=pull_request, reconcile=True
+                    )
+                    failure_output = await self._can_be_merged_failure_output(
+                        pull_request=pull_request, eligibility=eligibility, labels=_labels
+                    )
+                    conclusion = FAILURE_STR if failure_output else SUCCESS_STR
+
+                await self._set_can_be_merged_conclusion(
+                    pull_request=pull_request, failure_output=failure_output, output=output
+                )
+                current_conclusion = conclusion
+
+                # An event applied by another worker while we evaluated may change the outcome
+                latest = await merge_eligibility_states.get(
+                    repo_full_name=self.github_webhook.repository_full_name,
+                    number=pull_request.number,
+                    head_sha=self.github_webhook.last_commit.sha,
+                )
+                if latest is None or latest.version == eligibility.version or attempt == _MERGE_EVALUATION_ATTEMPTS:
+                    break
+                self.logger.debug(f"{self.log_prefix} Merge-eligibility state changed during evaluation, re-evaluating")
+                eligibility, reconciled = await self._merge_eligibility_state(pull_request=pull_request)
+
+            if not failure_output:
+                self.logger.info(f"{self.log_prefix} Pull request can be merged")
+                if self.ctx:
+                    self.ctx.complete_step("check_merge_eligibility", can_merge=True)
+                return
+
+            self.logger.debug(f"{self.log_prefix} cannot be merged: {failure_output}")
+            if self.ctx:
+                self.ctx.complete_step("check_merge_eligibility", can_merge=False, reason=failure_output)
+
+        except asyncio.CancelledError:
+            self.logger.debug(f"{self.log_prefix} Merge check cancelled")
+            raise
+        except Exception as ex:
+            self.logger.exception(f"{self.log_prefix} Failed to check if can be merged, set check run to {FAILURE_STR}")
+            await merge_eligibility_states.invalidate(
+                repo_full_name=self.github_webhook.repository_full_name, number=pull_request.number
+            )
+            _err = "Failed to check if can be merged, check logs"
+            output["text"] = _err
+            await self.labels_handler._remove_label(pull_request=pull_request, label=CAN_BE_MERGED_STR)
+            await self.check_run_handler.set_check_failure(name=CAN_BE_MERGED_STR, output=output)
+            if self.ctx:
+                self.ctx.fail_step("check_merge_eligibility", ex, traceback.format_exc())
+
+    async def _set_can_be_merged_conclusion(
+        self, pull_request: PullRequest, failure_output: str, output: CheckRunOutput
+    ) -> None:
+        if not failure_output:
+            await self.labels_handler._add_label(pull_request=pull_request, label=CAN_BE_MERGED_STR)
+            await self.check_run_handler.set_check_success(name=CAN_BE_MERGED_STR)
+            return
+
+        output["text"] = failure_output
+        await self.labels_handler._remove_label(pull_request=pull_request, label=CAN_BE_MERGED_STR)
+        await self.check_run_handler.set_check_failure(name=CAN_BE_MERGED_STR, output=output)
+
+    async def _can_be_merged_failure_output(
+        self, pull_request: PullRequest, eligibility: MergeEligibilityState, labels: list[str]
+    ) -> str:
+        """Return why the pull request cannot be merged, or an empty string when it can."""
+        failure_output = ""
+        last_commit_check_runs = list(eligibility.check_runs.values())
+        last_commit_statuses = list(eligibility.statuses.values())
+        _unresolved_threads = eligibility.unresolved_threads or []
+        if last_commit_statuses:
+            status_names = [s.context for s in last_commit_statuses]
+            self.logger.debug(f"{self.log_prefix} Commit statuses: {status_names}")
+
+        is_pr_mergable = eligibility.mergeable
+        if is_pr_mergable is None:
+            is_pr_mergable = await github_api_call(
+                lambda: pull_request.mergeable, logger=self.logger, log_prefix=self.log_prefix
+            )
+            await merge_eligibility_states.record_mergeable(
+                repo_full_name=self.github_webhook.repository_full_name,
+                number=pull_request.number,
+                mergeable=is_pr_mergable,
+            )
+        self.logger.debug(f"{self.log_prefix} PR mergeable is {is_pr_mergable}")
+        if not is_pr_mergable:
+            failure_output += f"PR is not mergeable: {is_pr_mergable}\n"
+
+        (
+            required_check_in_progress_failure_output,
+            check_runs_in_progress,
+        ) = await self.check_run_handler.required_check_in_progress(
+            pull_request=pull_request,
+            last_commit_check_runs=last_commit_check_runs,
+        )
+        if required_check_in_progress_failure_output:
+            failure_output += required_check_in_progress_failure_output
+        self.logger.debug(f"{self.log_prefix} required_check_in_progress_failure_output: {failure_output}")
+
+        labels_failure_output = self.labels_handler.wip_or_hold_labels_exists(labels=labels)
+        if labels_failure_output:
+            failure_output += labels_failure_output
+        self.logger.debug(f"{self.log_prefix} wip_or_hold_labels_exists: {failure_output}")
+
+        required_check_failed_failure_output = await self.check_run_handler.required_check_failed_or_no_status(
+            pull_request=pull_request,
+            last_commit_check_runs=last_commit_check_runs,
+            last_commit_statuses=last_commit_statuses,
+            check_runs_in_progress=check_runs_in_progress,
+        )
+        if required_check_failed_failure_output:
+            failure_output += required_check_failed_failure_output
+        self.logger.debug(f"{self.log_prefix} required_check_failed_or_no_status: {failure_output}")
+
+        labels_failure_output = self._check_labels_for_can_be_merged(labels=labels)
+        if labels_failure_output:
+            failure_output += labels_failure_output
+        self.logger.debug(f"{self.log_prefix} _check_labels_for_can_be_merged: {failure_output}")
+
+        if self.github_webhook.required_conversation_resolution and _unresolved_threads:
+            conversation_failure = f"PR has {len(_unresolved_threads)} unresolved review conversation(s):\n"
+            for thread in _unresolved_threads:
+                path = thread.get("path", "unknown")
+                line = thread.get("line", "N/A")
+                url = thread.get("url")
+                outdated = " (outdated)" if thread.get("isOutdated") else ""
+                if url:
+                    conversation_failure += f"  - {path}:{line}{outdated} ({url})\n"
+                else:
+                    conversation_failure += f"  - {path}:{line}{outdated}\n"
+            failure_output += conversation_failure
+        self.logger.debug(f"{self.log_prefix} unresolved_conversations: {failure_output}")
+
+        pr_approvered_failure_output = await self._check_if_pr_approved(labels=labels)
+        if pr_approvered_failure_output:
+            failure_output += pr_approvered_failure_output
+        self.logger.debug(f"{self.log_prefix} _check_if_pr_approved: {failure_output}")
+        return failure_output
+
+    async def _merge_eligibility_state(
+        self, pull_request: PullRequest, reconcile: bool = False
+    ) -> tuple[MergeEligibilityState, bool]:
+        """Return the merge-eligibility inputs of the PR head and whether they were just reconciled from the API.
+
+        The state is kept current from webhook payloads; check runs, statuses and
+        review threads are listed only when it is missing, expired, for another
+        head, or *reconcile* is set.
+        """
+        repo_full_name = self.github_webhook.repository_full_name
+        head_sha = self.github_webhook.last_commit.sha
+        state = None
+        if not reconcile:
+            state = await merge_eligibility_states.get(
+                repo_full_name=repo_full_name, number=pull_request.number, head_sha=head_sha
+            )
+
+        if state is None:
             # Fetch check runs, statuses, and optionally unresolved threads in parallel
             _check_runs_task = github_api_call(
                 lambda: list(self.github_webhook.last_commit.get_check_runs()),
@@ -1701,7 +1926,7 @@ For more information, please refer to the project documentation or contact the m
                 logger=self.logger,
                 log_prefix=self.log_prefix,
             )
-            _unresolved_threads: list[dict[str, Any]] = []
+            _unresolved_threads: list[dict[str, Any]] | None = None
 
             if self.github_webhook.required_conversation_resolution:
                 _threads_task = self.github_webhook.get_unresolved_review_threads(pr_number=pull_request.number)
@@ -1714,95 +1939,45 @@ For more information, please refer to the project documentation or contact the m
                 f"{self.log_prefix} Fetched {len(last_commit_check_runs)} check runs "
                 f"and {len(last_commit_statuses)} statuses"
             )
-            if last_commit_statuses:
-                status_names = [s.context for s in last_commit_statuses]
-                self.logger.debug(f"{self.log_prefix} Commit statuses: {status_names}")
-            _labels = await self.labels_handler.pull_request_labels_names(pull_request=pull_request)
-            self.logger.debug(f"{self.log_prefix} check if can be merged. PR labels are: {_labels}")
-
-            is_pr_mergable = await github_api_call(
-                lambda: pull_request.mergeable, logger=self.logger, log_prefix=self.log_prefix
+            base_ref = await github_api_call(
+                lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix
             )
-            self.logger.debug(f"{self.log_prefix} PR mergeable is {is_pr_mergable}")
-            if not is_pr_mergable:
-                failure_output += f"PR is not mergeable: {is_pr_mergable}\n"
-
-            (
-                required_check_in_progress_failure_output,
-                check_runs_in_progress,
-            ) = await self.check_run_handler.required_check_in_progress(
-                pull_request=pull_request,
-                last_commit_check_runs=last_commit_check_runs,
+            state = await merge_eligibility_states.reconcile(
+                repo_full_name=repo_full_name,
+                number=pull_request.number,
+                head_sha=head_sha,
+                base_ref=base_ref if isinstance(base_ref, str) else None,
+                check_runs=[
+                    CheckRunSnapshot(
+                        name=check_run.name,
+                        status=check_run.status,
+                        conclusion=check_run.conclusion,
+                        id=check_run.id if isinstance(check_run.id, int) else 0,
+                    )
+                    for check_run in last_commit_check_runs
+                ],
+                statuses=[
+                    StatusSnapshot(
+                        context=status.context, state=status.state, id=status.id if isinstance(status.id, int) else 0
+                    )
+                    for status in last_commit_statuses
+                ],
+                unresolved_threads=_unresolved_threads,
+                mergeable=None,
             )
-            if required_check_in_progress_failure_output:
-                failure_output += required_check_in_progress_failure_output
-            self.logger.debug(f"{self.log_prefix} required_check_in_progress_failure_output: {failure_output}")
+            return state, True
 
-            labels_failure_output = self.labels_handler.wip_or_hold_labels_exists(labels=_labels)
-            if labels_failure_output:
-                failure_output += labels_failure_output
-            self.logger.debug(f"{self.log_prefix} wip_or_hold_labels_exists: {failure_output}")
-
-            required_check_failed_failure_output = await self.check_run_handler.required_check_failed_or_no_status(
-                pull_request=pull_request,
-                last_commit_check_runs=last_commit_check_runs,
-                last_commit_statuses=last_commit_statuses,
-                check_runs_in_progress=check_runs_in_progress,
+        self.logger.debug(
+            f"{self.log_prefix} Using merge-eligibility state of {head_sha[:7]}: "
+            f"{len(state.check_runs)} check runs and {len(state.statuses)} statuses"
+        )
+        if self.github_webhook.required_conversation_resolution and state.unresolved_threads is None:
+            threads = await self.github_webhook.get_unresolved_review_threads(pr_number=pull_request.number)
+            state.unresolved_threads = threads
+            await merge_eligibility_states.record_unresolved_threads(
+                repo_full_name=repo_full_name, number=pull_request.number, threads=threads
             )
-            if required_check_failed_failure_output:
-                failure_output += required_check_failed_failure_output
-            self.logger.debug(f"{self.log_prefix} required_check_failed_or_no_status: {failure_output}")
-
-            labels_failure_output = self._check_labels_for_can_be_merged(labels=_labels)
-            if labels_failure_output:
-                failure_output += labels_failure_output
-            self.logger.debug(f"{self.log_prefix} _check_labels_for_can_be_merged: {failure_output}")
-
-            if self.github_webhook.required_conversation_resolution and _unresolved_threads:
-                conversation_failure = f"PR has {len(_unresolved_threads)} unresolved review conversation(s):\n"
-                for thread in _unresolved_threads:
-                    path = thread.get("path", "unknown")
-                    line = thread.get("line", "N/A")
-                    url = thread.get("url")
-                    outdated = " (outdated)" if thread.get("isOutdated") else ""
-                    if url:
-                        conversation_failure += f"  - {path}:{line}{outdated} ({url})\n"
-                    else:
-                        conversation_failure += f"  - {path}:{line}{outdated}\n"
-                failure_output += conversation_failure
-            self.logger.debug(f"{self.log_prefix} unresolved_conversations: {failure_output}")
-
-            pr_approvered_failure_output = await self._check_if_pr_approved(labels=_labels)
-            if pr_approvered_failure_output:
-                failure_output += pr_approvered_failure_output
-            self.logger.debug(f"{self.log_prefix} _check_if_pr_approved: {failure_output}")
-
-            if not failure_output:
-                await self.labels_handler._add_label(pull_request=pull_request, label=CAN_BE_MERGED_STR)
-                await self.check_run_handler.set_check_success(name=CAN_BE_MERGED_STR)
-                self.logger.info(f"{self.log_prefix} Pull request can be merged")
-                if self.ctx:
-                    self.ctx.complete_step("check_merge_eligibility", can_merge=True)
-                return
-
-            self.logger.debug(f"{self.log_prefix} cannot be merged: {failure_output}")
-            output["text"] = failure_output
-            await self.labels_handler._remove_label(pull_request=pull_request, label=CAN_BE_MERGED_STR)
-            await self.check_run_handler.set_check_failure(name=CAN_BE_MERGED_STR, output=output)
-            if self.ctx:
-                self.ctx.complete_step("check_merge_eligibility", can_merge=False, reason=failure_output)
-
-        except asyncio.CancelledError:
-            self.logger.debug(f"{self.log_prefix} Merge check cancelled")
-            raise
-        except Exception as ex:
-            self.logger.exception(f"{self.log_prefix} Failed to check if can be merged, set check run to {FAILURE_STR}")
-            _err = "Failed to check if can be merged, check logs"
-            output["text"] = _err
-            await self.labels_handler._remove_label(pull_request=pull_request, label=CAN_BE_MERGED_STR)
-            await self.check_run_handler.set_check_failure(name=CAN_BE_MERGED_STR, output=output)
-            if self.ctx:
-                self.ctx.fail_step("check_merge_eligibility", ex, traceback.format_exc())
+        return state, False
 
     async def _check_if_pr_approved(self, labels: list[str]) -> str:
         self.logger.info(f"{self.log_prefix} Check if pull request is approved by pull request labels.")
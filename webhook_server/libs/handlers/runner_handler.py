@@ -1,11 +1,14 @@
 import asyncio
 import contextlib
+import json
 import os
 import re
 import shlex
 import shutil
+import tempfile
+import time
 from asyncio import Task
-from collections.abc import AsyncGenerator, Callable, Coroutine
+from collections.abc import AsyncGenerator, Awaitable, Callable, Coroutine
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from functools import partial
@@ -20,9 +23,16 @@ from webhook_server.libs.ai_cli import call_ai, get_ai_config
 from webhook_server.libs.handlers.check_run_handler import CheckRunHandler, CheckRunOutput
 from webhook_server.libs.handlers.owners_files_handler import OwnersFileHandler
 from webhook_server.utils import helpers as helpers_module
+from webhook_server.utils.cache_manager import cache_manager
+from webhook_server.utils.check_cgroups import CheckCgroup, ResourceUsage, check_cgroups
+from webhook_server.utils.check_policy import CheckPolicy
+from webhook_server.utils.check_result_cache import CachedCheckResult, check_result_cache, check_result_key
+from webhook_server.utils.check_runners import CheckJob, CheckJobResult, OutputCallback, check_runners
 from webhook_server.utils.constants import (
     AI_RESOLVED_CONFLICTS_LABEL,
     BUILD_CONTAINER_STR,
+    CHECK_OUTPUT_KEEP_BYTES,
+    CHECK_OUTPUT_MAX_BYTES,
     CHERRY_PICKED_LABEL,
     CONVENTIONAL_TITLE_STR,
     GITHUB_WEB_FLOW_LOGIN,
@@ -32,12 +42,24 @@ from webhook_server.utils.constants import (
     PYTHON_MODULE_INSTALL_STR,
     SECURITY_COMMITTER_IDENTITY_STR,
     SECURITY_SUSPICIOUS_PATHS_STR,
+    SUCCESS_STR,
     TOX_STR,
 )
+from webhook_server.utils.container_build_cache import (
+    CONTAINER_BUILD_LABEL,
+    CONTAINER_IGNORE_FILES,
+    DEFAULT_CONTAINERIGNORE,
+    container_build_cache,
+    container_build_key,
+)
+from webhook_server.utils.env_cache import env_cache
 from webhook_server.utils.github_repository_settings import get_repository_github_app_token
 from webhook_server.utils.github_retry import github_api_call
 from webhook_server.utils.helpers import _redact_secrets, run_command
+from webhook_server.utils.job_scheduler import job_scheduler
+from webhook_server.utils.live_check_output import LiveCheckOutput
 from webhook_server.utils.notification_utils import send_slack_message
+from webhook_server.utils.worktree_pool import WorktreeLease, WorktreePool, worktree_pools
 from webhook_server.web.tool_server import TOOL_REGISTRY, TOOL_SERVER_PORT
 
 if TYPE_CHECKING:
@@ -54,12 +76,19 @@ class CheckConfig:
         title: The display title for the check run output.
         use_cwd: If True, execute command with cwd set to worktree_path.
                  If False, command should include worktree_path in args.
+        cache_result: If True, a pass is reused for later runs on an identical merged tree.
+        env_cache: Persistent tool environment to run with: ``"tox"`` replaces ``{env_dir}`` in the
+                   command with a tox work dir keyed by the worktree's dependency files (the
+                   worktree itself when none is available); ``"prek"`` points prek at hook
+                   environments keyed by the pre-commit config. Both use the shared uv/pip caches.
     """
 
     name: str
     command: str
     title: str
     use_cwd: bool = False
+    cache_result: bool = True
+    env_cache: str = ""
 
 
 def _build_custom_tools(
@@ -134,6 +163,8 @@ class RunnerHandler:
         self.check_run_handler = CheckRunHandler(
             github_webhook=self.github_webhook, owners_file_handler=self.owners_file_handler
         )
+        # Set by `/retest ... --force`: run checks even if an identical merged tree already passed
+        self.force_rerun: bool = False
 
     @contextlib.asynccontextmanager
     async def _checkout_worktree(
@@ -212,6 +243,13 @@ class RunnerHandler:
                 yield (True, repo_dir, "", "")
                 return
 
+        # PR checks share pooled worktrees: the base branch is merged once per PR head
+        # and every check reuses the merge commit instead of adding its own worktree
+        if pull_request and base_ref is not None and not is_merged and not checkout and not tag_name and not skip_merge:
+            async with self._checkout_pooled_worktree(checkout_target=checkout_target, merge_ref=base_ref) as pooled:
+                yield pooled
+            return
+
         # Create worktree for this operation
         async with helpers_module.git_worktree_checkout(
             repo_dir=repo_dir,
@@ -239,6 +277,111 @@ class RunnerHandler:
 
             yield result
 
+    @contextlib.asynccontextmanager
+    async def _checkout_pooled_worktree(
+        self, checkout_target: str, merge_ref: str
+    ) -> AsyncGenerator[tuple[bool, str, str, str]]:
+        """Lease a worktree from the clone's pool with *merge_ref* merged into *checkout_target*.
+
+        The first check for a target creates (or recycles) a worktree, merges the base
+        branch and records the merge commit. Later checks for the same target only
+        check out that commit. Idle worktrees are recycled with checkout --force + clean.
+
+        Yields:
+            tuple: (success: bool, worktree_path: str, stdout: str, stderr: str)
+        """
+        repo_dir = self.github_webhook.clone_repo_dir
+        pool = worktree_pools.get(repo_dir=repo_dir, max_worktrees=self.github_webhook.worktree_pool_size)
+        key = (checkout_target, merge_ref)
+
+        async with pool.lease() as lease:
+            result: tuple[bool, str, str, str] | None = None
+            prepared = pool.prepared(key)
+            if prepared is None:
+                async with pool.prepare_lock(key):
+                    prepared = pool.prepared(key)
+                    if prepared is None:
+                        # First check for this target: checkout and merge once
+                        result = await self._merge_base_in_pooled_worktree(
+                            pool=pool, lease=lease, checkout_target=checkout_target, merge_ref=merge_ref
+                        )
+
+            if result is None and prepared is not None:
+                if prepared.success:
+                    result = await self._pool_worktree_at(pool=pool, lease=lease, commit=prepared.commit)
+                else:
+                    # Merge already failed for this target, report the same failure without retrying
+                    result = (False, "", prepared.out, prepared.err)
+
+            yield result or (False, "", "", "")
+
+    async def _merge_base_in_pooled_worktree(
+        self, pool: WorktreePool, lease: WorktreeLease, checkout_target: str, merge_ref: str
+    ) -> tuple[bool, str, str, str]:
+        """Check out *checkout_target* in the lease's worktree, merge *merge_ref* and record the merge commit."""
+        success, worktree_path, out, err = await self._pool_worktree_at(pool=pool, lease=lease, commit=checkout_target)
+        if not success:
+            # Worktree creation failures are not recorded, the next check retries them
+            return False, worktree_path, out, err
+
+        git_cmd = f"git -C {worktree_path}"
+        rc, out, err = await run_command(
+            command=f"{git_cmd} merge origin/{merge_ref} -m 'Merge {merge_ref}'",
+            log_prefix=self.log_prefix,
+            mask_sensitive=self.github_webhook.mask_sensitive,
+        )
+        commit = ""
+        if rc:
+            _, head_sha, _ = await run_command(
+                command=f"{git_cmd} rev-parse HEAD",
+                log_prefix=self.log_prefix,
+                mask_sensitive=self.github_webhook.mask_sensitive,
+            )
+            commit = head_sha.strip()
+
+        pool.set_prepared(
+            key=(checkout_target, merge_ref), success=bool(rc and commit), commit=commit, out=out, err=err
+        )
+        return bool(rc), worktree_path, out, err
+
+    async def _pool_worktree_at(
+        self, pool: WorktreePool, lease: WorktreeLease, commit: str
+    ) -> tuple[bool, str, str, str]:
+        """Point the lease's worktree at *commit*, recycling an idle one or creating a new one."""
+        worktree = lease.worktree
+        if worktree is not None:
+            git_cmd = f"git -C {worktree.path}"
+            rc, out, err = await run_command(
+                command=f"{git_cmd} checkout --force --detach {shlex.quote(commit)}",
+                log_prefix=self.log_prefix,
+                mask_sensitive=self.github_webhook.mask_sensitive,
+            )
+            if rc:
+                rc, out, err = await run_command(
+                    command=f"{git_cmd} clean -ffdxq",
+                    log_prefix=self.log_prefix,
+                    mask_sensitive=self.github_webhook.mask_sensitive,
+                )
+            if rc:
+                return True, worktree.path, out, err
+
+            # Recycling failed - drop the worktree and fall back to a fresh one
+            self.logger.warning(f"{self.log_prefix} Failed to recycle worktree {worktree.path}, creating a new one")
+            lease.worktree = None
+            await pool.discard(worktree)
+
+        worktree, result = await pool.add(
+            helpers_module.git_worktree_checkout(
+                repo_dir=pool.repo_dir,
+                checkout=commit,
+                log_prefix=self.log_prefix,
+                mask_sensitive=self.github_webhook.mask_sensitive,
+            )
+        )
+        if worktree is not None:
+            lease.worktree = worktree
+        return result
+
     def is_podman_bug(self, err: str) -> bool:
         _err = "Error: current system boot ID differs from cached boot ID; an unhandled reboot has occurred"
         return _err in err.strip()
@@ -248,12 +391,15 @@ class RunnerHandler:
         shutil.rmtree("/tmp/storage-run-1000/containers", ignore_errors=True)
         shutil.rmtree("/tmp/storage-run-1000/libpod/tmp", ignore_errors=True)
 
-    async def run_podman_command(self, command: str, redact_secrets: list[str] | None = None) -> tuple[bool, str, str]:
+    async def run_podman_command(
+        self, command: str, redact_secrets: list[str] | None = None, **kwargs: Any
+    ) -> tuple[bool, str, str]:
         rc, out, err = await run_command(
             command=command,
             log_prefix=self.log_prefix,
             redact_secrets=redact_secrets,
             mask_sensitive=self.github_webhook.mask_sensitive,
+            **kwargs,
         )
 
         if rc:
@@ -266,6 +412,7 @@ class RunnerHandler:
                 log_prefix=self.log_prefix,
                 redact_secrets=redact_secrets,
                 mask_sensitive=self.github_webhook.mask_sensitive,
+                **kwargs,
             )
 
         return rc, out, err
@@ -274,10 +421,11 @@ class RunnerHandler:
         """Unified check execution method for both built-in and custom checks.
 
         This method handles the common lifecycle for all command-based checks:
-        1. Set check to in_progress
-        2. Checkout worktree
-        3. Execute command
-        4. Report success or failure
+        1. Publish the cached result if the merged tree already passed this check
+        2. Set check to in_progress
+        3. Checkout worktree
+        4. Execute command
+        5. Report success or failure (passes are cached)
 
         Args:
             pull_request: The pull request to run the check on.
@@ -287,48 +435,110 @@ class RunnerHandler:
             if await self.check_run_handler.is_check_run_in_progress(check_run=check_config.name):
                 self.logger.debug(f"{self.log_prefix} Check run is in progress, re-running {check_config.name}.")
 
-            self.logger.info(f"{self.log_prefix} Starting check: {check_config.name}")
-            await self.check_run_handler.set_check_in_progress(name=check_config.name)
-
-            async with self._checkout_worktree(pull_request=pull_request) as (success, worktree_path, out, err):
-                output: CheckRunOutput = {
-                    "title": check_config.title,
-                    "summary": "",
-                    "text": None,
-                }
-
-                if not success:
-                    self.logger.error(f"{self.log_prefix} Repository preparation failed for {check_config.name}")
-                    output["text"] = self.check_run_handler.get_check_run_text(out=out, err=err)
-                    return await self.check_run_handler.set_check_failure(name=check_config.name, output=output)
+            cache_key = await self._check_result_cache_key(pull_request=pull_request, check_config=check_config)
+            if cache_key:
+                cached = await check_result_cache.get(
+                    repository=self.github_webhook.repository_full_name,
+                    key=cache_key[1],
+                    logger=self.logger,
+                    log_prefix=self.log_prefix,
+                )
+                if cached:
+                    self.logger.info(
+                        f"{self.log_prefix} Check {check_config.name} already passed on merged tree "
+                        f"{cached.tree_sha[:7]}, publishing cached result"
+                    )
+                    return await self.check_run_handler.set_check_cached(name=check_config.name, result=cached)
 
-                # Build command with worktree path substitution
-                # Use replace() instead of format() to avoid KeyError on other braces in user commands
-                cmd = check_config.command.replace("{worktree_path}", worktree_path)
-                # NOTE: Removed debug log of command to prevent secret leakage
+            # Check run stays queued until the host-wide scheduler admits the job
+            async with contextlib.AsyncExitStack() as slot:
+                await slot.enter_async_context(self._job_slot(check_name=check_config.name))
+                self.logger.info(f"{self.log_prefix} Starting check: {check_config.name}")
+                await self.check_run_handler.set_check_in_progress(name=check_config.name)
 
-                # Execute command - use cwd if configured, otherwise command should include paths
-                cwd = worktree_path if check_config.use_cwd else None
-                try:
-                    rc, out, err = await run_command(
-                        command=cmd,
-                        log_prefix=self.log_prefix,
-                        mask_sensitive=self.github_webhook.mask_sensitive,
-                        cwd=cwd,
+                setup_started = time.monotonic()
+                async with self._checkout_worktree(pull_request=pull_request) as (success, worktree_path, out, err):
+                    self.logger.info(
+                        f"{self.log_prefix} Worktree setup for {check_config.name} took "
+                        f"{time.monotonic() - setup_started:.2f}s"
                     )
-                except TimeoutError:
-                    self.logger.error(f"{self.log_prefix} Check {check_config.name} timed out")
-                    output["text"] = "Command execution timed out"
-                    return await self.check_run_handler.set_check_failure(name=check_config.name, output=output)
+                    output: CheckRunOutput = {
+                        "title": check_config.title,
+                        "summary": "",
+                        "text": None,
+                    }
 
-                output["text"] = self.check_run_handler.get_check_run_text(err=err, out=out)
+                    if not success:
+                        self.logger.error(f"{self.log_prefix} Repository preparation failed for {check_config.name}")
+                        output["text"] = self.check_run_handler.get_check_run_text(out=out, err=err)
+                        return await self.check_run_handler.set_check_failure(name=check_config.name, output=output)
 
-                if rc:
-                    self.logger.info(f"{self.log_prefix} Check {check_config.name} completed successfully")
-                    return await self.check_run_handler.set_check_success(name=check_config.name, output=output)
-                else:
-                    self.logger.info(f"{self.log_prefix} Check {check_config.name} failed")
-                    return await self.check_run_handler.set_check_failure(name=check_config.name, output=output)
+                    # Build command with worktree path substitution
+                    # Use replace() instead of format() to avoid KeyError on other braces in user commands
+                    cmd = check_config.command.replace("{worktree_path}", worktree_path)
+                    # NOTE: Removed debug log of command to prevent secret leakage
+
+                    # Execute command - use cwd if configured, otherwise command should include paths
+                    cwd = worktree_path if check_config.use_cwd else None
+                    policy = self._check_policy(check_name=check_config.name)
+                    try:
+                        async with (
+                            self._check_env(check_config=check_config, worktree_path=worktree_path) as (env_dir, env),
+                            self._check_output_spill(
+                                pull_request=pull_request, check_name=check_config.name
+                            ) as spill_path,
+                            self._live_output(check_config=check_config, policy=policy) as output_callback,
+                        ):
+                            result, attempts = await self._run_with_policy(
+                                check_name=check_config.name,
+                                policy=policy,
+                                slot=slot,
+                                attempt=partial(
+                                    self._run_check_command,
+                                    check_name=check_config.name,
+                                    command=cmd.replace("{env_dir}", env_dir),
+                                    cwd=cwd,
+                                    env=env,
+                                    spill_path=spill_path,
+                                    max_output_bytes=policy.max_output_bytes,
+                                    output_callback=output_callback,
+                                ),
+                            )
+                        if spill_path:
+                            self.logger.debug(f"{self.log_prefix} Full output of {check_config.name}: {spill_path}")
+                    except TimeoutError:
+                        self.logger.error(
+                            f"{self.log_prefix} Check {check_config.name} timed out after {policy.timeout}s"
+                        )
+                        output["summary"] = f"Killed after exceeding its timeout of {policy.timeout}s"
+                        output["text"] = "Command execution timed out"
+                        return await self.check_run_handler.set_check_timed_out(name=check_config.name, output=output)
+
+                    output["text"] = self.check_run_handler.get_check_run_text(err=result.err, out=result.out)
+                    output["summary"] = self._check_summary(result=result, attempts=attempts)
+
+                    if result.success:
+                        self.logger.info(f"{self.log_prefix} Check {check_config.name} completed successfully")
+                        if cache_key:
+                            await check_result_cache.put(
+                                repository=self.github_webhook.repository_full_name,
+                                key=cache_key[1],
+                                result=CachedCheckResult(
+                                    check_name=check_config.name,
+                                    conclusion=SUCCESS_STR,
+                                    title=output["title"],
+                                    summary=output["summary"],
+                                    text=output["text"],
+                                    head_sha=self.github_webhook.last_commit.sha,
+                                    tree_sha=cache_key[0],
+                                ),
+                                logger=self.logger,
+                                log_prefix=self.log_prefix,
+                            )
+                        return await self.check_run_handler.set_check_success(name=check_config.name, output=output)
+                    else:
+                        self.logger.info(f"{self.log_prefix} Check {check_config.name} failed")
+                        return await self.check_run_handler.set_check_failure(name=check_config.name, output=output)
 
         except asyncio.CancelledError:
             self.logger.debug(f"{self.log_prefix} Check {check_config.name} cancelled")
@@ -343,6 +553,267 @@ class RunnerHandler:
             await self.check_run_handler.set_check_failure(name=check_config.name, output=error_output)
             raise
 
+    async def _check_result_cache_key(
+        self, pull_request: PullRequest, check_config: CheckConfig
+    ) -> tuple[str, str] | None:
+        """Return ``(merged tree SHA, cache key)`` for a check run, or ``None`` if its result must not be reused."""
+        if (
+            self.force_rerun
+            or not check_config.cache_result
+            or not self.github_webhook.check_result_cache
+            or not check_result_cache.enabled
+        ):
+            return None
+
+        tree_sha = await self._merged_tree_sha(pull_request=pull_request)
+        if not tree_sha:
+            return None
+
+        definition = json.dumps({"command": check_config.command, "use_cwd": check_config.use_cwd})
+        tool_versions = await check_result_cache.tool_versions(logger=self.logger, log_prefix=self.log_prefix)
+        return tree_sha, check_result_key(
+            tree_sha=tree_sha, check_name=check_config.name, definition=definition, tool_versions=tool_versions
+        )
+
+    async def _merged_tree_sha(self, pull_request: PullRequest) -> str:
+        """Tree SHA of the PR head merged with its base branch, computed without a checkout.
+
+        Matches the tree checks run on (see ``_checkout_worktree``); empty if the merge conflicts.
+        """
+        pr_number = await github_api_call(lambda: pull_request.number, logger=self.logger, log_prefix=self.log_prefix)
+        base_ref = await github_api_call(lambda: pull_request.base.ref, logger=self.logger, log_prefix=self.log_prefix)
+        rc, out, _ = await run_command(
+            command=(
+                f"git -C {self.github_webhook.clone_repo_dir} merge-tree --write-tree "
+                f"origin/pr/{pr_number} {shlex.quote(f'origin/{base_ref}')}"
+            ),
+            log_prefix=self.log_prefix,
+            mask_sensitive=self.github_webhook.mask_sensitive,
+        )
+        return out.split()[0] if rc and out.strip() else ""
+
+    @contextlib.asynccontextmanager
+    async def _job_slot(self, check_name: str) -> AsyncGenerator[None]:
+        """Hold a host-wide CI scheduler slot for *check_name* while the block runs."""
+        async with job_scheduler.slot(
+            repository=self.github_webhook.repository_full_name,
+            check_name=check_name,
+            logger=self.logger,
+            log_prefix=self.log_prefix,
+        ):
+            yield
+
+    def _check_policy(self, check_name: str) -> CheckPolicy:
+        """Timeout, output limit and retry policy of *check_name* (see ``check-policies``)."""
+        return self.github_webhook.check_policies.get(check_name) or CheckPolicy()
+
+    async def _run_with_policy(
+        self,
+        check_name: str,
+        policy: CheckPolicy,
+        attempt: Callable[[], Awaitable[CheckJobResult]],
+        slot: contextlib.AsyncExitStack | None = None,
+    ) -> tuple[CheckJobResult, int]:
+        """Run *attempt* under *policy* and return its last result and the number of attempts made.
+
+        Each attempt gets ``policy.timeout`` seconds; when it runs out the attempt is
+        cancelled, which kills the command's process group, and TimeoutError is raised.
+        An attempt that fails with a retryable exit code is retried after a backoff.
+        *slot* holds the check's CI scheduler slot (see ``_job_slot``); it is released
+        during the backoff and re-acquired for the next attempt.
+        """
+        attempts = 1
+        while True:
+            async with asyncio.timeout(policy.timeout):
+                result = await attempt()
+            if result.success or not policy.should_retry(attempt=attempts, returncode=result.returncode):
+                return result, attempts
+
+            delay = policy.backoff(attempt=attempts)
+            self.logger.warning(
+                f"{self.log_prefix} {check_name} failed with exit code {result.returncode}, "
+                f"retry {attempts}/{policy.retries} in {delay:.0f}s"
+            )
+            if slot is not None:
+                # A waiting retry must not keep host CI capacity from other checks
+                await slot.aclose()
+            await asyncio.sleep(delay)
+            if slot is not None:
+                await slot.enter_async_context(self._job_slot(check_name=check_name))
+            attempts += 1
+
+    @staticmethod
+    def _check_summary(result: CheckJobResult, attempts: int) -> str:
+        lines: list[str] = []
+        if attempts > 1:
+            lines.append(f"Attempt {attempts}: earlier attempts failed with a retryable exit code")
+        if result.usage:
+            lines.append(result.usage.summary())
+        return "\n\n".join(lines)
+
+    async def _run_check_command(
+        self,
+        check_name: str,
+        command: str,
+        cwd: str | None,
+        env: dict[str, str] | None,
+        spill_path: str | None,
+        max_output_bytes: int = CHECK_OUTPUT_MAX_BYTES,
+        output_callback: OutputCallback | None = None,
+    ) -> CheckJobResult:
+        """Run a check command on a check runner process if any is configured, else in this process."""
+        if check_runners.enabled:
+            job = CheckJob(
+                check_name=check_name,
+                command=command,
+                cwd=cwd,
+                # Runners have the server environment; send only what the check adds to it
+                env={key: value for key, value in env.items() if os.environ.get(key) != value} if env else None,
+                log_prefix=self.log_prefix,
+                redact_secrets=self.check_run_handler.output_secrets(),
+                mask_sensitive=self.github_webhook.mask_sensitive,
+                keep_output_bytes=CHECK_OUTPUT_KEEP_BYTES,
+                max_output_bytes=max_output_bytes,
+                spill_path=spill_path,
+            )
+            result = await check_runners.run(
+                job=job, logger=self.logger, log_prefix=self.log_prefix, output_callback=output_callback
+            )
+            if result is not None:
+                self._report_usage(check_name=check_name, usage=result.usage)
+                return result
+            self.logger.warning(f"{self.log_prefix} No check runner available, running {check_name} locally")
+
+        returncodes: list[int] = []
+        async with self._check_cgroup(check_name=check_name) as cgroup:
+            rc, out, err = await run_command(
+                command=cgroup.wrap(command),
+                log_prefix=self.log_prefix,
+                redact_secrets=self.check_run_handler.output_secrets(),
+                mask_sensitive=self.github_webhook.mask_sensitive,
+                keep_output_bytes=CHECK_OUTPUT_KEEP_BYTES,
+                max_output_bytes=max_output_bytes,
+                spill_path=spill_path,
+                output_callback=output_callback,
+                exit_callback=returncodes.append,
+                cwd=cwd,
+                env=env,
+            )
+        return CheckJobResult(
+            success=rc, out=out, err=err, usage=cgroup.usage, returncode=returncodes[0] if returncodes else None
+        )
+
+    @contextlib.asynccontextmanager
+    async def _check_cgroup(self, check_name: str) -> AsyncGenerator[CheckCgroup]:
+        """Yield the cgroup a check command runs in; its measured usage is reported when the block exits."""
+        async with check_cgroups.cgroup(
+            check_name=check_name, logger=self.logger, log_prefix=self.log_prefix
+        ) as cgroup:
+            yield cgroup
+
+        self._report_usage(check_name=check_name, usage=cgroup.usage)
+
+    def _report_usage(self, check_name: str, usage: ResourceUsage | None) -> None:
+        """Log a check's measured resource usage and feed it to the CI scheduler."""
+        if not usage:
+            return
+        self.logger.info(f"{self.log_prefix} Check {check_name} resources: {usage.summary()}")
+        job_scheduler.observe(
+            check_name=check_name,
+            peak_memory_mb=usage.peak_memory_mb,
+            cpu_seconds=usage.cpu_seconds,
+            wall_seconds=usage.wall_seconds,
+        )
+
+    @contextlib.asynccontextmanager
+    async def _check_env(
+        self, check_config: CheckConfig, worktree_path: str
+    ) -> AsyncGenerator[tuple[str, dict[str, str] | None]]:
+        """Yield ``(env_dir, env)`` for a check: its tox work dir and process environment.
+
+        Only checks with ``env_cache`` get cached tool environments and the shared
+        uv/pip caches; everything else runs in the worktree with the server environment.
+        """
+        if not check_config.env_cache:
+            yield worktree_path, None
+            return
+
+        async with contextlib.AsyncExitStack() as stack:
+            cache_env = await stack.enter_async_context(
+                env_cache.tool_cache_env(logger=self.logger, log_prefix=self.log_prefix)
+            )
+            env_dir = worktree_path
+            if check_config.env_cache == TOX_STR:
+                workdir = await stack.enter_async_context(
+                    env_cache.tox_workdir(
+                        repository=self.github_webhook.repository_full_name,
+                        worktree_path=worktree_path,
+                        python_version=self.github_webhook.tox_python_version or "",
+                        logger=self.logger,
+                        log_prefix=self.log_prefix,
+                    )
+                )
+                env_dir = workdir or worktree_path
+            elif check_config.env_cache == PREK_STR:
+                prek_home = await stack.enter_async_context(
+                    env_cache.prek_home(worktree_path=worktree_path, logger=self.logger, log_prefix=self.log_prefix)
+                )
+                if prek_home:
+                    cache_env = {**cache_env, "PREK_HOME": prek_home}
+
+            yield env_dir, {**os.environ, **cache_env} if cache_env else None
+
+    @contextlib.asynccontextmanager
+    async def _live_output(
+        self, check_config: CheckConfig, policy: CheckPolicy
+    ) -> AsyncGenerator[OutputCallback | None]:
+        """Yield the output callback that streams a check's output tail to its in-progress check run.
+
+        Updates are throttled to ``policy.live_output_interval``; the last one has
+        finished when the block exits, before the check run is completed.
+        """
+        if not policy.live_output_interval:
+            yield None
+            return
+
+        interval = policy.live_output_interval
+        live_output = LiveCheckOutput(
+            publish=partial(
+                self._publish_live_output, check_name=check_config.name, title=check_config.title, interval=interval
+            ),
+            interval=interval,
+            logger=self.logger,
+            log_prefix=self.log_prefix,
+        )
+        try:
+            yield live_output.write
+        finally:
+            await live_output.aclose()
+
+    async def _publish_live_output(self, tail: str, check_name: str, title: str, interval: float) -> None:
+        await self.check_run_handler.set_check_live_output(name=check_name, title=title, tail=tail, interval=interval)
+
+    @contextlib.asynccontextmanager
+    async def _check_output_spill(self, pull_request: PullRequest, check_name: str) -> AsyncGenerator[str | None]:
+        """Yield the file a check's full (redacted) output is streamed to.
+
+        Files live in the ``check-output`` namespace of the data-dir cache, one
+        directory per PR, and are evicted with the rest of the cache.  Yields
+        ``None`` when the cache is not configured.
+        """
+        if not cache_manager.root_dir:
+            yield None
+            return
+
+        pr_number = await github_api_call(lambda: pull_request.number, logger=self.logger, log_prefix=self.log_prefix)
+        async with cache_manager.use(
+            namespace="check-output",
+            key=f"{self.github_webhook.repository_full_name}-{pr_number}",
+            logger=self.logger,
+            log_prefix=self.log_prefix,
+        ) as output_dir:
+            yield os.path.join(output_dir, f"{re.sub(r'[^A-Za-z0-9._-]', '_', check_name)}.log")
+
     async def run_tox(self, pull_request: PullRequest) -> None:
         if not self.github_webhook.tox:
             self.logger.debug(f"{self.log_prefix} Tox not configured for this repository")
@@ -356,7 +827,8 @@ class RunnerHandler:
         _tox_tests = self.github_webhook.tox.get(base_ref, "")
 
         # Build tox command with {worktree_path} placeholder
-        cmd = f"uvx {python_ver} {TOX_STR} --workdir {{worktree_path}} --root {{worktree_path}} -c {{worktree_path}}"
+        # Envs live in a cached work dir ({env_dir}) so dependencies survive the ephemeral worktree
+        cmd = f"uvx {python_ver} {TOX_STR} --workdir {{env_dir}} --root {{worktree_path}} -c {{worktree_path}}"
         if _tox_tests and _tox_tests != "all":
             tests = _tox_tests.replace(" ", "")
             cmd += f" -e {tests}"
@@ -364,7 +836,7 @@ class RunnerHandler:
         if self.github_webhook.tox_args:
             cmd += f" {self.github_webhook.tox_args}"
 
-        check_config = CheckConfig(name=TOX_STR, command=cmd, title="Tox")
+        check_config = CheckConfig(name=TOX_STR, command=cmd, title="Tox", env_cache=TOX_STR)
         await self.run_check(pull_request=pull_request, check_config=check_config)
 
     async def run_pre_commit(self, pull_request: PullRequest) -> None:
@@ -373,7 +845,7 @@ class RunnerHandler:
             return
 
         cmd = f"uvx --directory {{worktree_path}} {PREK_STR} run --all-files"
-        check_config = CheckConfig(name=PRE_COMMIT_STR, command=cmd, title="Pre-Commit")
+        check_config = CheckConfig(name=PRE_COMMIT_STR, command=cmd, title="Pre-Commit", env_cache=PREK_STR)
         await self.run_check(pull_request=pull_request, check_config=check_config)
 
     async def run_security_suspicious_paths(self) -> None:
@@ -602,6 +1074,134 @@ class RunnerHandler:
 
         return " ".join(f"--annotation {shlex.quote(f'{k}={v}')}" for k, v in annotations.items())
 
+    async def _podman_build(
+        self,
+        build_cmd: str,
+        image: str | None,
+        worktree_path: str,
+        build_context: str,
+        dedup_flags: str | None = None,
+        slot: contextlib.AsyncExitStack | None = None,
+    ) -> tuple[bool, str, str, str]:
+        """Run ``podman build`` with the layer cache and a minimal build context.
+
+        When *dedup_flags* is set and an earlier build had the same context tree,
+        Containerfile and flags, its image is re-tagged as *image* instead.  Without
+        an *image* name there is nothing to re-tag, so the build always runs.
+
+        Returns:
+            tuple: (success, stdout, stderr, check run summary)
+        """
+        repository = self.github_webhook.repository_full_name
+        key = ""
+        if dedup_flags is not None and image and container_build_cache.enabled:
+            key = await self._container_build_key(
+                worktree_path=worktree_path, build_context=build_context, build_flags=dedup_flags
+            )
+
+        async with contextlib.AsyncExitStack() as stack:
+            if key:
+                await stack.enter_async_context(container_build_cache.single_flight(key))
+                image_id = await container_build_cache.lookup(
+                    repository=repository, key=key, logger=self.logger, log_prefix=self.log_prefix
+                )
+                if image_id:
+                    rc, out, err = await self.run_podman_command(command=f"podman tag {image_id} {image}")
+                    if rc:
+                        container_build_cache.record_reuse()
+                        self.logger.info(f"{self.log_prefix} Reused image {image_id[:12]} for {image}")
+                        return rc, out, err, f"Reused image `{image_id[:12]}` built from identical build inputs"
+                    self.logger.debug(f"{self.log_prefix} Image {image_id[:12]} is gone, building {image}")
+
+            tmp_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="github-webhook-build-"))
+            build_flags = f"--layers --label {shlex.quote(f'{CONTAINER_BUILD_LABEL}={repository}')}"
+            if not any(os.path.exists(os.path.join(build_context, name)) for name in CONTAINER_IGNORE_FILES):
+                ignore_file = os.path.join(tmp_dir, ".containerignore")
+                with open(ignore_file, "w") as fd:
+                    fd.write("\n".join(DEFAULT_CONTAINERIGNORE) + "\n")
+                build_flags = f"{build_flags} --ignorefile {ignore_file}"
+            iid_file = os.path.join(tmp_dir, "iid")
+            if key:
+                build_flags = f"{build_flags} --iidfile {iid_file}"
+
+            podman_build_cmd: str = f"podman build {build_flags} {build_cmd}"
+            self.logger.debug(f"{self.log_prefix} Podman build command to run: {podman_build_cmd}")
+
+            started = time.monotonic()
+            policy = self._check_policy(check_name=BUILD_CONTAINER_STR)
+            result, attempts = await self._run_with_policy(
+                check_name=BUILD_CONTAINER_STR,
+                policy=policy,
+                slot=slot,
+                attempt=partial(
+                    self._run_podman_build, command=podman_build_cmd, max_output_bytes=policy.max_output_bytes
+                ),
+            )
+            rc, out, err = result.success, result.out, result.err
+            seconds = time.monotonic() - started
+            steps, cache_hits = container_build_cache.record_build(output=f"{out}\n{err}", seconds=seconds)
+            self.logger.info(
+                f"{self.log_prefix} podman build took {seconds:.1f}s, {cache_hits}/{steps} steps from the layer cache"
+            )
+
+            if rc and key:
+                with contextlib.suppress(OSError):
+                    with open(iid_file) as fd:
+                        image_id = fd.read().strip()
+                    if image_id:
+                        await container_build_cache.record(
+                            repository=repository,
+                            key=key,
+                            image_id=image_id,
+                            logger=self.logger,
+                            log_prefix=self.log_prefix,
+                        )
+
+        await self._prune_container_images()
+        summary = f"Built in {seconds:.1f}s, {cache_hits}/{steps} steps from the layer cache" if steps else ""
+        usage_summary = self._check_summary(result=result, attempts=attempts)
+        if usage_summary:
+            summary = f"{summary}\n\n{usage_summary}" if summary else usage_summary
+        return rc, out, err, summary
+
+    async def _run_podman_build(self, command: str, max_output_bytes: int) -> CheckJobResult:
+        """One ``podman build`` attempt, in the build-container cgroup."""
+        returncodes: list[int] = []
+        async with self._check_cgroup(check_name=BUILD_CONTAINER_STR) as cgroup:
+            rc, out, err = await self.run_podman_command(
+                command=cgroup.wrap(command), max_output_bytes=max_output_bytes, exit_callback=returncodes.append
+            )
+        return CheckJobResult(
+            success=rc, out=out, err=err, usage=cgroup.usage, returncode=returncodes[-1] if returncodes else None
+        )
+
+    async def _container_build_key(self, worktree_path: str, build_context: str, build_flags: str) -> str:
+        """Dedup key from the committed build context tree and Containerfile; empty if either is not tracked."""
+        context_rel = os.path.relpath(build_context, os.path.realpath(worktree_path))
+        context_spec = "HEAD:" if context_rel == "." else f"HEAD:{context_rel}"
+        rc, out, _ = await run_command(
+            command=(
+                f"git -C {worktree_path} rev-parse {shlex.quote(context_spec)} "
+                f"{shlex.quote(f'HEAD:{self.github_webhook.dockerfile}')}"
+            ),
+            log_prefix=self.log_prefix,
+            mask_sensitive=self.github_webhook.mask_sensitive,
+        )
+        shas = out.split()
+        if not rc or len(shas) != 2:
+            return ""
+        return container_build_key(context_tree=shas[0], containerfile=shas[1], build_flags=build_flags)
+
+    async def _prune_container_images(self) -> None:
+        """Drop this repository's images (and their layers) past the layer cache max age."""
+        repository = self.github_webhook.repository_full_name
+        if not container_build_cache.prune_due(repository):
+            return
+
+        rc, _, err = await self.run_podman_command(command=container_build_cache.prune_command(repository))
+        if not rc:
+            self.logger.warning(f"{self.log_prefix} Failed to prune old container images: {err}")
+
     async def run_build_container(
         self,
         pull_request: PullRequest | None = None,
@@ -629,6 +1229,29 @@ class RunnerHandler:
             if await self.check_run_handler.is_check_run_in_progress(check_run=BUILD_CONTAINER_STR) and not is_merged:
                 self.logger.info(f"{self.log_prefix} Check run is in progress, re-running {BUILD_CONTAINER_STR}.")
 
+        # Check run stays queued until the host-wide scheduler admits the build
+        async with contextlib.AsyncExitStack() as slot:
+            await slot.enter_async_context(self._job_slot(check_name=BUILD_CONTAINER_STR))
+            await self._build_container(
+                pull_request=pull_request,
+                set_check=set_check,
+                push=push,
+                is_merged=is_merged,
+                tag=tag,
+                command_args=command_args,
+                slot=slot,
+            )
+
+    async def _build_container(
+        self,
+        pull_request: PullRequest | None,
+        set_check: bool,
+        push: bool,
+        is_merged: bool,
+        tag: str,
+        command_args: str,
+        slot: contextlib.AsyncExitStack | None = None,
+    ) -> None:
         if set_check:
             await self.check_run_handler.set_check_in_progress(name=BUILD_CONTAINER_STR)
 
@@ -694,12 +1317,35 @@ class RunnerHandler:
             if command_args:
                 build_cmd = f"{command_args} {build_cmd}"
 
-            podman_build_cmd: str = f"podman build {build_cmd}"
-            self.logger.debug(f"{self.log_prefix} Podman build command to run: {podman_build_cmd}")
-
-            build_rc, build_out, build_err = await self.run_podman_command(
-                command=podman_build_cmd,
-            )
+            # Only PR check builds are deduplicated; pushed images keep their own tag and annotations
+            dedup_flags: str | None = None
+            if pull_request and set_check and not is_merged:
+                dedup_flags = json.dumps([
+                    self.github_webhook.dockerfile,
+                    self.github_webhook.container_build_args,
+                    self.github_webhook.container_command_args,
+                    command_args,
+                ])
+
+            try:
+                build_rc, build_out, build_err, output["summary"] = await self._podman_build(
+                    build_cmd=build_cmd,
+                    image=_container_repository_and_tag,
+                    worktree_path=worktree_path,
+                    build_context=build_context,
+                    dedup_flags=dedup_flags,
+                    slot=slot,
+                )
+            except TimeoutError:
+                timeout = self._check_policy(check_name=BUILD_CONTAINER_STR).timeout
+                self.logger.error(
+                    f"{self.log_prefix} Building {_container_repository_and_tag} timed out after {timeout}s"
+                )
+                if pull_request and set_check:
+                    output["summary"] = f"Killed after exceeding its timeout of {timeout}s"
+                    output["text"] = "Container build timed out"
+                    await self.check_run_handler.set_check_timed_out(name=BUILD_CONTAINER_STR, output=output)
+                return
             output["text"] = self.check_run_handler.get_check_run_text(err=build_err, out=build_out)
 
             if build_rc:
@@ -1050,6 +1696,7 @@ Your team can configure additional types in the repository settings.
             command=shell_wrapped_command,
             title=f"Custom Check: {check_name}",
             use_cwd=True,
+            cache_result=check_config.get("cache-result", True),
         )
         await self.run_check(pull_request=pull_request, check_config=unified_config)
 
@@ -2153,17 +2800,20 @@ Your team can configure additional types in the repository settings.
                 log_prefix=self.log_prefix,
             )
 
-    async def run_retests(self, supported_retests: list[str], pull_request: PullRequest) -> None:
+    async def run_retests(self, supported_retests: list[str], pull_request: PullRequest, force: bool = False) -> None:
         """Run the specified retests for a pull request.
 
         Args:
             supported_retests: List of test names to run (e.g., ['tox', 'pre-commit'])
             pull_request: The PullRequest object to run tests for
+            force: Run checks even if an identical merged tree already passed them
         """
         if not supported_retests:
             self.logger.debug(f"{self.log_prefix} No retests to run")
             return
 
+        self.force_rerun = force
+
         # Map check names to runner functions
         _retests_to_func_map: dict[str, Callable[..., Coroutine[Any, Any, None]]] = {
             TOX_STR: self.run_tox,
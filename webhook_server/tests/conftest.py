@@ -12,6 +12,22 @@ from starlette.datastructures import Headers
 
 from webhook_server.libs.handlers.owners_files_handler import OwnersFileHandler
 from webhook_server.libs.log_parser import LogEntry
+from webhook_server.utils.cache_manager import cache_manager
+from webhook_server.utils.check_cgroups import check_cgroups
+from webhook_server.utils.check_result_cache import check_result_cache
+from webhook_server.utils.check_run_registry import check_run_registry
+from webhook_server.utils.check_runners import check_runners
+from webhook_server.utils.container_build_cache import container_build_cache
+from webhook_server.utils.diff_cache import diff_stats_cache
+from webhook_server.utils.job_scheduler import job_scheduler
+from webhook_server.utils.label_catalog import repository_label_catalog
+from webhook_server.utils.label_state import pull_request_label_state
+from webhook_server.utils.merge_eligibility import merge_eligibility_states
+from webhook_server.utils.owners_cache import owners_data_cache
+from webhook_server.utils.process_groups import process_reaper
+from webhook_server.utils.required_checks_cache import required_checks_cache
+from webhook_server.utils.shared_clones import shared_clones
+from webhook_server.utils.worktree_pool import worktree_pools
 
 os.environ["WEBHOOK_SERVER_DATA_DIR"] = "webhook_server/tests/manifests"
 os.environ["ENABLE_LOG_SERVER"] = "true"
@@ -196,6 +212,28 @@ def optimize_test_environment():
     os.environ["PYTEST_TIMEOUT"] = original_timeout
 
 
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Reset process-wide caches so results never leak between tests."""
+    yield
+    diff_stats_cache.clear()
+    worktree_pools.clear()
+    shared_clones.clear()
+    cache_manager.clear()
+    check_result_cache.clear()
+    job_scheduler.clear()
+    container_build_cache.clear()
+    check_cgroups.clear()
+    process_reaper.clear()
+    check_runners.clear()
+    pull_request_label_state.clear()
+    repository_label_catalog.clear()
+    check_run_registry.clear()
+    required_checks_cache.clear()
+    merge_eligibility_states.clear()
+    owners_data_cache.clear()
+
+
 @pytest.fixture
 def owners_files_test_data():
     """Shared OWNERS test data structure used across multiple test files.
@@ -4,6 +4,7 @@ import hmac
 import ipaddress
 import json
 import os
+from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
@@ -16,6 +17,8 @@ from webhook_server import app as app_module
 from webhook_server.app import (
     FASTAPI_APP,
     HTTPException,
+    get_cache_usage,
+    get_ci_scheduler_usage,
     get_log_viewer_controller,
     healthcheck,
     require_log_server_enabled,
@@ -73,6 +76,31 @@ class TestWebhookApp:
         assert data["status"] == 200
         assert data["message"] == "Alive"
 
+    def test_get_cache_usage(self, tmp_path: Path) -> None:
+        """Test the cache usage endpoint reports the configured cache manager state."""
+        with patch.object(app_module.cache_manager, "root_dir", str(tmp_path)):
+            data = get_cache_usage()
+
+        assert data["root_dir"] == str(tmp_path)
+        assert data["total_bytes"] == 0
+        assert data["entries"] == 0
+        assert data["evictions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_ci_scheduler_usage(self, tmp_path: Path) -> None:
+        """Test the CI scheduler endpoint reports the budget and running jobs."""
+        app_module.job_scheduler.configure(state_dir=str(tmp_path), cpu_slots=4, memory_mb=1024)
+        async with app_module.job_scheduler.slot(
+            repository="org/repo", check_name="tox", logger=Mock(), log_prefix="[TEST]"
+        ):
+            data = await get_ci_scheduler_usage()
+
+        assert data["enabled"] is True
+        assert data["cpu_slots"] == 4
+        assert data["cpu_in_use"] == 2
+        assert [job["check"] for job in data["running"]] == ["tox"]
+        assert data["waiting"] == []
+
     @patch.dict(os.environ, {"WEBHOOK_SERVER_DATA_DIR": "webhook_server/tests/manifests"})
     @patch("webhook_server.app.GithubWebhook")
     def test_process_webhook_success(
@@ -0,0 +1,155 @@
+"""Tests for webhook_server.utils.cache_manager — size-bounded LRU cache directories."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from webhook_server.utils.cache_manager import CacheManager, directory_size
+
+
+def _write(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+
+
+def _age(path: Path, seconds: float) -> None:
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+class TestCacheManager:
+    """Tests for CacheManager bookkeeping, eviction and temp dir reaping."""
+
+    @pytest.mark.asyncio
+    async def test_use_creates_entry_and_scan_tracks_size(self, tmp_path: Path) -> None:
+        manager = CacheManager(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+
+        with patch("webhook_server.utils.cache_manager.directory_size") as mock_directory_size:
+            async with manager.use(namespace="uv", key="py3.14/abc", logger=Mock(), log_prefix="[TEST]") as path:
+                assert os.path.isdir(path)
+                assert path == str(tmp_path / "cache" / "uv" / "py3.14_abc")
+                assert manager.usage().in_use == 1
+                _write(Path(path) / "env" / "lib.so", 64 * 1024)
+
+        # Releasing an entry does not walk it
+        mock_directory_size.assert_not_called()
+        usage = manager.usage()
+        assert usage.entries == 1
+        assert usage.in_use == 0
+        assert usage.total_bytes == 0
+
+        await manager.scan(logger=Mock(), log_prefix="[TEST]")
+        usage = manager.usage()
+        assert usage.total_bytes >= 64 * 1024
+        assert usage.namespaces == {"uv": usage.total_bytes}
+
+    @pytest.mark.asyncio
+    async def test_scan_and_evict_least_recently_used(self, tmp_path: Path) -> None:
+        root = tmp_path / "cache"
+        for key, age in (("old", 7200), ("mid", 5400), ("new", 4000)):
+            _write(root / "prek" / key / "blob", 100 * 1024)
+            _age(root / "prek" / key, age)
+
+        per_entry = directory_size(str(root / "prek" / "old"))
+        manager = CacheManager(root_dir=str(root), max_bytes=int(per_entry * 1.5))
+        await manager.scan(logger=Mock(), log_prefix="[TEST]")
+        assert manager.usage().entries == 3
+
+        freed = await manager.evict(logger=Mock(), log_prefix="[TEST]")
+
+        # Evicts down to 90% of the high-water mark, oldest first
+        assert freed == 2 * per_entry
+        assert sorted(os.listdir(root / "prek")) == ["new"]
+        usage = manager.usage()
+        assert usage.evictions == 2
+        assert usage.evicted_bytes == 2 * per_entry
+
+    @pytest.mark.asyncio
+    async def test_evict_skips_recent_and_in_use_entries(self, tmp_path: Path) -> None:
+        root = tmp_path / "cache"
+        _write(root / "uv" / "recent" / "blob", 100 * 1024)
+        _write(root / "uv" / "old" / "blob", 100 * 1024)
+        _age(root / "uv" / "old", 7200)
+
+        manager = CacheManager(root_dir=str(root), max_bytes=1)
+        await manager.scan(logger=Mock(), log_prefix="[TEST]")
+
+        async with manager.use(namespace="uv", key="old", logger=Mock(), log_prefix="[TEST]"):
+            # In use by this process: nothing can be evicted
+            assert await manager.evict(logger=Mock(), log_prefix="[TEST]") == 0
+
+        # Released entry was just used, so it is inside the grace window too
+        assert sorted(os.listdir(root / "uv")) == ["old", "recent"]
+
+    @pytest.mark.asyncio
+    async def test_run_rescans_and_evicts_periodically(self, tmp_path: Path) -> None:
+        root = tmp_path / "cache"
+        _write(root / "uv" / "old" / "blob", 100 * 1024)
+        _age(root / "uv" / "old", 7200)
+        manager = CacheManager(root_dir=str(root), max_bytes=1)
+
+        task = asyncio.create_task(manager.run(logger=Mock(), interval_seconds=0.01))
+        for _ in range(100):
+            if not (root / "uv" / "old").exists():
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert manager.usage().evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_evict_is_noop_below_high_water_mark(self, tmp_path: Path) -> None:
+        root = tmp_path / "cache"
+        _write(root / "uv" / "a" / "blob", 1024)
+        _age(root / "uv" / "a", 7200)
+
+        manager = CacheManager(root_dir=str(root), max_bytes=10 * 1024**2)
+        await manager.scan(logger=Mock(), log_prefix="[TEST]")
+
+        assert await manager.evict(logger=Mock(), log_prefix="[TEST]") == 0
+        assert os.listdir(root / "uv") == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_scan_removes_interrupted_eviction_leftovers(self, tmp_path: Path) -> None:
+        root = tmp_path / "cache"
+        _write(root / ".trash-deadbeef" / "blob", 1024)
+
+        manager = CacheManager(root_dir=str(root))
+        await manager.scan(logger=Mock(), log_prefix="[TEST]")
+
+        assert not (root / ".trash-deadbeef").exists()
+        assert manager.usage().entries == 0
+
+    @pytest.mark.asyncio
+    async def test_reap_orphaned_temp_dirs(self, tmp_path: Path) -> None:
+        orphan = tmp_path / "github-webhook-org-repo-abc"
+        orphan_worktree = tmp_path / "github-webhook-org-repo-abc-worktree-123"
+        live = tmp_path / "github-webhook-org-repo-live"
+        unrelated = tmp_path / "something-else"
+        for path in (orphan, orphan_worktree, live, unrelated):
+            _write(path / "file", 16)
+        for path in (orphan, orphan_worktree, unrelated):
+            _age(path, 7 * 3600)
+
+        manager = CacheManager()
+        removed = await manager.reap_orphaned_temp_dirs(logger=Mock(), log_prefix="[TEST]", temp_dir=str(tmp_path))
+
+        assert sorted(removed) == sorted([str(orphan), str(orphan_worktree)])
+        assert live.exists()
+        assert unrelated.exists()
+        assert manager.usage().reaped_temp_dirs == 2
+
+    def test_unconfigured_manager_rejects_use(self) -> None:
+        with pytest.raises(RuntimeError, match="not configured"):
+            CacheManager().entry_path(namespace="uv", key="abc")
+
+    def test_invalid_name_rejected(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Invalid cache name"):
+            CacheManager(root_dir=str(tmp_path)).entry_path(namespace="..", key="abc")
@@ -0,0 +1,113 @@
+"""Tests for webhook_server.utils.check_cgroups — per-check cgroup limits and accounting."""
+
+from __future__ import annotations
+
+import shlex
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils.check_cgroups import CheckCgroup, CheckCgroups, ResourceLimits, ResourceUsage
+
+
+def _write_accounting(path: Path) -> None:
+    (path / "memory.peak").write_text(f"{300 * 1024**2}\n")
+    (path / "cpu.stat").write_text("usage_usec 4500000\nuser_usec 4000000\nsystem_usec 500000\n")
+    (path / "io.stat").write_text(
+        f"8:0 rbytes={2 * 1024**2} wbytes={1024**2} rios=10 wios=5\n8:16 rbytes={1024**2} wbytes=0 rios=1 wios=0\n"
+    )
+    (path / "memory.events").write_text("low 0\nhigh 0\nmax 3\noom 1\noom_kill 1\n")
+
+
+class TestResourceLimits:
+    """Tests for ResourceLimits config parsing."""
+
+    def test_from_config_merges_over_base(self) -> None:
+        base = ResourceLimits.from_config({"cpu": 2, "memory-mb": 4096})
+
+        assert base == ResourceLimits(cpu=2, memory_mb=4096, pids=0)
+        assert ResourceLimits.from_config({"pids": 100}, base=base) == ResourceLimits(cpu=2, memory_mb=4096, pids=100)
+        assert ResourceLimits.from_config(None, base=base) == base
+        assert base.describe() == "2 CPU, 4096 MiB"
+        assert ResourceLimits().describe() == "unlimited"
+
+
+class TestCheckCgroup:
+    """Tests for wrapping check commands."""
+
+    def test_wrapped_command_runs_in_cgroup(self, tmp_path: Path) -> None:
+        command = CheckCgroup(path=str(tmp_path)).wrap("echo 'hello world'")
+
+        result = subprocess.run(shlex.split(command), capture_output=True, text=True, check=True)
+
+        assert result.stdout == "hello world\n"
+        assert (tmp_path / "cgroup.procs").read_text() == "0\n"
+
+    def test_command_runs_when_cgroup_cannot_be_joined(self, tmp_path: Path) -> None:
+        command = CheckCgroup(path=str(tmp_path / "missing")).wrap("echo ok")
+
+        result = subprocess.run(shlex.split(command), capture_output=True, text=True, check=True)
+
+        assert result.stdout == "ok\n"
+        assert result.stderr == ""
+
+    def test_unconfigured_and_systemd_run_wrappers(self) -> None:
+        assert CheckCgroup().wrap("tox -e py") == "tox -e py"
+        prefix = CheckCgroups._systemd_run_prefix(ResourceLimits(cpu=1.5, memory_mb=2048, pids=64))
+        assert prefix == (
+            "systemd-run --user --scope --quiet --collect -p CPUQuota=150% -p MemoryMax=2048M -p TasksMax=64 --"
+        )
+
+
+class TestCheckCgroups:
+    """Tests for CheckCgroups limits, accounting and cleanup."""
+
+    def test_create_writes_limits(self, tmp_path: Path) -> None:
+        path = tmp_path / "check"
+        CheckCgroups._create(str(path), ResourceLimits(cpu=0.5, memory_mb=1024, pids=256))
+
+        assert (path / "cpu.max").read_text() == "50000 100000"
+        assert (path / "memory.max").read_text() == str(1024**3)
+        assert (path / "memory.swap.max").read_text() == "0"
+        assert (path / "pids.max").read_text() == "256"
+        assert (path / "memory.oom.group").read_text() == "1"
+
+    def test_read_usage(self, tmp_path: Path) -> None:
+        _write_accounting(tmp_path)
+
+        usage = CheckCgroups._read_usage(str(tmp_path))
+
+        assert usage == ResourceUsage(
+            peak_memory_mb=300, cpu_seconds=4.5, io_read_mb=3, io_write_mb=1, wall_seconds=0, oom_killed=True
+        )
+        assert "Peak memory 300 MiB, CPU 4.5s" in usage.summary()
+        assert usage.summary().endswith("Killed: the check ran out of memory")
+
+    @pytest.mark.asyncio
+    async def test_cgroup_per_check_run(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        # A plain directory cannot be emptied by the kernel like a real cgroup
+        monkeypatch.setattr(CheckCgroups, "_destroy", staticmethod(lambda path: shutil.rmtree(path) or True))
+        cgroups = CheckCgroups()
+        assert cgroups.configure(backend="cgroup", root=str(tmp_path), check_limits={"tox": ResourceLimits(pids=10)})
+
+        async with cgroups.cgroup(check_name="tox", logger=Mock(), log_prefix="[TEST]") as cgroup:
+            assert Path(cgroup.path).parent == tmp_path
+            assert (Path(cgroup.path) / "pids.max").read_text() == "10"
+            _write_accounting(Path(cgroup.path))
+
+        assert cgroup.usage is not None
+        assert cgroup.usage.peak_memory_mb == 300
+        assert cgroup.usage.wall_seconds > 0
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_unusable_root_runs_without_cgroups(self, tmp_path: Path) -> None:
+        cgroups = CheckCgroups()
+
+        assert cgroups.configure(backend="auto", root=str(tmp_path / "missing")) == "none"
+        async with cgroups.cgroup(check_name="tox", logger=Mock(), log_prefix="[TEST]") as cgroup:
+            assert cgroup.wrap("tox") == "tox"
+        assert cgroup.usage is None
@@ -0,0 +1,65 @@
+"""Tests for webhook_server.utils.check_policy — per-check timeout, output limit and retries."""
+
+from __future__ import annotations
+
+from webhook_server.utils.check_policy import (
+    DEFAULT_CHECK_TIMEOUT_SECONDS,
+    DEFAULT_LIVE_OUTPUT_INTERVAL_SECONDS,
+    DEFAULT_RETRY_EXIT_CODES,
+    MAX_RETRY_BACKOFF_SECONDS,
+    MIN_LIVE_OUTPUT_INTERVAL_SECONDS,
+    CheckPolicy,
+)
+from webhook_server.utils.constants import CHECK_OUTPUT_MAX_BYTES
+
+
+class TestCheckPolicy:
+    """Tests for building and applying a check policy."""
+
+    def test_defaults(self) -> None:
+        policy = CheckPolicy.from_config(None)
+
+        assert policy.timeout == DEFAULT_CHECK_TIMEOUT_SECONDS
+        assert policy.max_output_bytes == CHECK_OUTPUT_MAX_BYTES
+        assert policy.retries == 0
+        assert not policy.should_retry(attempt=1, returncode=125)
+
+    def test_from_config_overrides_base(self) -> None:
+        base = CheckPolicy.from_config({"timeout": 1800, "retries": 2})
+
+        policy = CheckPolicy.from_config({"max-output": 64, "retries": {"exit-codes": [1]}}, base=base)
+
+        assert policy.timeout == 1800
+        assert policy.max_output_bytes == 64 * 1024**2
+        assert policy.retries == 2
+        assert policy.retry_exit_codes == frozenset({1})
+
+    def test_invalid_values_are_ignored(self) -> None:
+        policy = CheckPolicy.from_config({"timeout": 0, "max-output": "lots", "retries": "twice"})
+
+        assert policy == CheckPolicy()
+
+    def test_live_output_interval(self) -> None:
+        assert CheckPolicy.from_config(None).live_output_interval == DEFAULT_LIVE_OUTPUT_INTERVAL_SECONDS
+        assert CheckPolicy.from_config({"live-output-interval": 60}).live_output_interval == 60
+        assert CheckPolicy.from_config({"live-output-interval": 0}).live_output_interval == 0
+        # Too frequent updates are slowed down to the minimum interval
+        assert CheckPolicy.from_config({"live-output-interval": 1}).live_output_interval == (
+            MIN_LIVE_OUTPUT_INTERVAL_SECONDS
+        )
+
+    def test_should_retry_only_retryable_exit_codes(self) -> None:
+        policy = CheckPolicy.from_config({"retries": {"count": 2, "backoff-seconds": 10}})
+
+        assert policy.retry_exit_codes == DEFAULT_RETRY_EXIT_CODES
+        assert policy.should_retry(attempt=1, returncode=125)
+        assert policy.should_retry(attempt=2, returncode=255)
+        assert not policy.should_retry(attempt=3, returncode=125)
+        assert not policy.should_retry(attempt=1, returncode=1)
+        assert not policy.should_retry(attempt=1, returncode=None)
+
+    def test_backoff_doubles_and_is_capped(self) -> None:
+        policy = CheckPolicy.from_config({"retries": {"count": 10, "backoff-seconds": 10}})
+
+        assert [policy.backoff(attempt=attempt) for attempt in (1, 2, 3)] == [10, 20, 40]
+        assert policy.backoff(attempt=10) == MAX_RETRY_BACKOFF_SECONDS
@@ -0,0 +1,82 @@
+"""Tests for webhook_server.utils.check_result_cache — reuse of passed check results."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils.cache_manager import cache_manager
+from webhook_server.utils.check_result_cache import (
+    CHECK_RESULTS_NAMESPACE,
+    CachedCheckResult,
+    CheckResultCache,
+    check_result_key,
+)
+
+
+def _result(check_name: str = "tox") -> CachedCheckResult:
+    return CachedCheckResult(
+        check_name=check_name,
+        conclusion="success",
+        title="Tox",
+        summary="",
+        text="42 passed",
+        head_sha="abc1234def",
+        tree_sha="5678beef",
+    )
+
+
+class TestCheckResultKey:
+    """Tests for check_result_key."""
+
+    def test_every_component_changes_the_key(self) -> None:
+        base = check_result_key(tree_sha="t1", check_name="tox", definition="cmd", tool_versions="uv 1")
+
+        assert base == check_result_key(tree_sha="t1", check_name="tox", definition="cmd", tool_versions="uv 1")
+        assert base != check_result_key(tree_sha="t2", check_name="tox", definition="cmd", tool_versions="uv 1")
+        assert base != check_result_key(tree_sha="t1", check_name="lint", definition="cmd", tool_versions="uv 1")
+        assert base != check_result_key(tree_sha="t1", check_name="tox", definition="cmd2", tool_versions="uv 1")
+        assert base != check_result_key(tree_sha="t1", check_name="tox", definition="cmd", tool_versions="uv 2")
+
+
+class TestCheckResultCache:
+    """Tests for CheckResultCache storage."""
+
+    @pytest.mark.asyncio
+    async def test_put_and_get(self, tmp_path: Path) -> None:
+        cache_manager.configure(root_dir=str(tmp_path), max_bytes=10 * 1024**2)
+        cache = CheckResultCache()
+
+        assert await cache.get(repository="org/repo", key="k1", logger=Mock(), log_prefix="[TEST]") is None
+
+        await cache.put(repository="org/repo", key="k1", result=_result(), logger=Mock(), log_prefix="[TEST]")
+        cached = await cache.get(repository="org/repo", key="k1", logger=Mock(), log_prefix="[TEST]")
+
+        assert cached is not None
+        assert cached.text == "42 passed"
+        assert cached.tree_sha == "5678beef"
+        assert cached.created_at > 0
+        # Results are per repository
+        assert await cache.get(repository="org/other", key="k1", logger=Mock(), log_prefix="[TEST]") is None
+
+    @pytest.mark.asyncio
+    async def test_unreadable_entry_is_a_miss(self, tmp_path: Path) -> None:
+        cache_manager.configure(root_dir=str(tmp_path), max_bytes=10 * 1024**2)
+        entry_dir = cache_manager.entry_path(namespace=CHECK_RESULTS_NAMESPACE, key="org/repo")
+        os.makedirs(entry_dir)
+        Path(entry_dir, "k1.json").write_text("{not json")
+        logger = Mock()
+
+        assert await CheckResultCache().get(repository="org/repo", key="k1", logger=logger, log_prefix="[TEST]") is None
+        logger.warning.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_cache_manager(self) -> None:
+        cache = CheckResultCache()
+
+        assert not cache.enabled
+        await cache.put(repository="org/repo", key="k1", result=_result(), logger=Mock(), log_prefix="[TEST]")
+        assert await cache.get(repository="org/repo", key="k1", logger=Mock(), log_prefix="[TEST]") is None
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from collections.abc import Awaitable, Callable
 from unittest.mock import AsyncMock, Mock, patch
@@ -5,10 +6,13 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 from github.CheckRun import CheckRun
 from github.CommitStatus import CommitStatus
+from github.GithubException import GithubException
 from starlette.datastructures import Headers
 
 from webhook_server.libs.github_api import GithubWebhook
-from webhook_server.libs.handlers.check_run_handler import CheckRunHandler
+from webhook_server.libs.handlers.check_run_handler import QUEUE_CHECKS_CONCURRENCY, CheckRunHandler
+from webhook_server.utils.check_result_cache import CachedCheckResult
+from webhook_server.utils.check_run_registry import check_run_registry
 from webhook_server.utils.constants import (
     BUILD_CONTAINER_STR,
     CAN_BE_MERGED_STR,
@@ -16,6 +20,7 @@ from webhook_server.utils.constants import (
     CONVENTIONAL_TITLE_STR,
     FAILURE_STR,
     IN_PROGRESS_STR,
+    NEUTRAL_STR,
     PRE_COMMIT_STR,
     PYTHON_MODULE_INSTALL_STR,
     QUEUED_STR,
@@ -23,6 +28,9 @@ from webhook_server.utils.constants import (
     TOX_STR,
     VERIFIED_LABEL_STR,
 )
+from webhook_server.utils.merge_eligibility import CheckRunSnapshot, merge_eligibility_states
+from webhook_server.utils.path_filters import PathFilter
+from webhook_server.utils.required_checks_cache import required_checks_cache
 
 
 class TestCheckRunHandler:
@@ -163,6 +171,40 @@ class TestCheckRunHandler:
             await check_run_handler.set_check_success(name=TOX_STR, output=output)
             mock_set_status.assert_called_once_with(check_run=TOX_STR, conclusion=SUCCESS_STR, output=output)
 
+    @pytest.mark.asyncio
+    async def test_set_check_cached_tox(self, check_run_handler: CheckRunHandler) -> None:
+        """Test publishing a cached tox result marks it as cached and explains how to force a re-run."""
+        result = CachedCheckResult(
+            check_name=TOX_STR,
+            conclusion=SUCCESS_STR,
+            title="Tox",
+            summary="",
+            text="42 passed",
+            head_sha="abc1234def",
+            tree_sha="5678beef",
+        )
+        with patch.object(check_run_handler, "set_check_run_status") as mock_set_status:
+            await check_run_handler.set_check_cached(name=TOX_STR, result=result)
+
+        output = mock_set_status.call_args.kwargs["output"]
+        assert mock_set_status.call_args.kwargs["conclusion"] == SUCCESS_STR
+        assert output["title"] == "Tox (cached)"
+        assert "abc1234" in output["summary"]
+        assert "`/retest tox --force`" in output["summary"]
+        assert output["text"] == "42 passed"
+
+    @pytest.mark.asyncio
+    async def test_set_check_skipped(self, check_run_handler: CheckRunHandler) -> None:
+        """Test a check skipped by its path filter is completed as neutral with the filter in the summary."""
+        with patch.object(check_run_handler, "set_check_run_status") as mock_set_status:
+            await check_run_handler.set_check_skipped(name=TOX_STR, path_filter=PathFilter(paths_ignore=("docs/",)))
+
+        output = mock_set_status.call_args.kwargs["output"]
+        assert mock_set_status.call_args.kwargs["conclusion"] == NEUTRAL_STR
+        assert output["title"] == "Skipped: no relevant changes"
+        assert "paths-ignore: `docs/`" in output["summary"]
+        assert "`/retest tox`" in output["summary"]
+
     @pytest.mark.asyncio
     async def test_set_check_queued_pre_commit(self, check_run_handler: CheckRunHandler) -> None:
         """Test setting pre-commit check to queued status."""
@@ -436,6 +478,131 @@ class TestCheckRunHandler:
                 assert call_count["count"] == 2
                 mock_debug.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_set_check_run_status_edits_registered_check_run(self, check_run_handler: CheckRunHandler) -> None:
+        """Test later transitions edit the created check run in place and completion drops its ID."""
+        check_run_handler.github_webhook.repository_full_name = "test-org/test-repo"
+        repository = check_run_handler.github_webhook.repository_by_github_app
+        repository.create_check_run.return_value = Mock(id=101)
+        await merge_eligibility_states.reconcile(
+            repo_full_name="test-org/test-repo",
+            number=1,
+            head_sha="test-sha",
+            base_ref="main",
+            check_runs=[],
+            statuses=[],
+            unresolved_threads=None,
+            mergeable=True,
+        )
+
+        await check_run_handler.set_check_queued(name=TOX_STR)
+        await check_run_handler.set_check_in_progress(name=TOX_STR)
+        await check_run_handler.set_check_success(name=TOX_STR, output={"title": "Tox", "summary": "passed"})
+
+        repository.create_check_run.assert_called_once_with(name=TOX_STR, head_sha="test-sha", status=QUEUED_STR)
+        assert repository.get_check_run.call_args_list == [((101,),), ((101,),)]
+        assert repository.get_check_run.return_value.edit.call_args_list[-1].kwargs == {
+            "conclusion": SUCCESS_STR,
+            "status": "completed",
+            "output": {"title": "Tox", "summary": "passed"},
+        }
+        assert check_run_registry.get(repo_full_name="test-org/test-repo", head_sha="test-sha", name=TOX_STR) is None
+        # Written through to the merge-eligibility state without waiting for the check_run event
+        state = await merge_eligibility_states.get(repo_full_name="test-org/test-repo", number=1, head_sha="test-sha")
+        assert state is not None
+        assert state.check_runs[TOX_STR] == CheckRunSnapshot(
+            name=TOX_STR, status="completed", conclusion=SUCCESS_STR, id=101
+        )
+
+    @pytest.mark.asyncio
+    async def test_set_check_run_status_creates_when_registered_id_is_stale(
+        self, check_run_handler: CheckRunHandler
+    ) -> None:
+        """Test a failed edit of a registered check run falls back to creating a new one."""
+        check_run_handler.github_webhook.repository_full_name = "test-org/test-repo"
+        repository = check_run_handler.github_webhook.repository_by_github_app
+        repository.get_check_run.return_value.edit.side_effect = GithubException(404, {"message": "Not Found"})
+        repository.create_check_run.return_value = Mock(id=202)
+        check_run_registry.record(
+            repo_full_name="test-org/test-repo", head_sha="test-sha", name=TOX_STR, check_run_id=101, completed=False
+        )
+
+        await check_run_handler.set_check_in_progress(name=TOX_STR)
+
+        repository.create_check_run.assert_called_once_with(name=TOX_STR, head_sha="test-sha", status=IN_PROGRESS_STR)
+        assert check_run_registry.get(repo_full_name="test-org/test-repo", head_sha="test-sha", name=TOX_STR) == 202
+
+    @pytest.mark.asyncio
+    async def test_set_check_live_output_updates_registered_check_run(self, check_run_handler: CheckRunHandler) -> None:
+        """Test live output edits only a registered check run, with ANSI codes stripped and secrets redacted."""
+        check_run_handler.github_webhook.repository_full_name = "test-org/test-repo"
+        check_run_handler.github_webhook.token = "secret-token"
+        repository = check_run_handler.github_webhook.repository_by_github_app
+
+        assert not await check_run_handler.set_check_live_output(
+            name=TOX_STR, title="Tox", tail="collecting", interval=30
+        )
+        repository.get_check_run.assert_not_called()
+
+        check_run_registry.record(
+            repo_full_name="test-org/test-repo", head_sha="test-sha", name=TOX_STR, check_run_id=101, completed=False
+        )
+        assert await check_run_handler.set_check_live_output(
+            name=TOX_STR, title="Tox", tail="\x1b[32mpassed\x1b[0m secret-token", interval=30
+        )
+
+        repository.create_check_run.assert_not_called()
+        repository.get_check_run.assert_called_once_with(101)
+        edit_kwargs = repository.get_check_run.return_value.edit.call_args.kwargs
+        assert edit_kwargs["status"] == IN_PROGRESS_STR
+        assert edit_kwargs["output"]["title"] == "Tox (running)"
+        assert edit_kwargs["output"]["text"] == "```\npassed *****\n```"
+
+    @pytest.mark.asyncio
+    async def test_queue_checks_concurrently_within_budget(self, check_run_handler: CheckRunHandler) -> None:
+        """Test all checks are queued concurrently, bounded, once each, with path-filtered ones skipped."""
+        check_run_handler.github_webhook.repository_by_github_app.requester.rate_limiting = (5000, 5000)
+        running = {"now": 0, "max": 0}
+
+        async def _set_check_queued(name: str) -> None:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0)
+            running["now"] -= 1
+
+        names = [CAN_BE_MERGED_STR, TOX_STR, PRE_COMMIT_STR, *(f"custom-{index}" for index in range(10)), TOX_STR]
+        path_filter = PathFilter(paths=("src/",))
+        with (
+            patch.object(check_run_handler, "set_check_queued", side_effect=_set_check_queued) as mock_queued,
+            patch.object(check_run_handler, "set_check_skipped", new_callable=AsyncMock) as mock_skipped,
+        ):
+            await check_run_handler.queue_checks(names=names, skipped_checks={PRE_COMMIT_STR: path_filter})
+
+        assert [call.kwargs["name"] for call in mock_queued.call_args_list] == [
+            CAN_BE_MERGED_STR,
+            TOX_STR,
+            *(f"custom-{index}" for index in range(10)),
+        ]
+        mock_skipped.assert_awaited_once_with(name=PRE_COMMIT_STR, path_filter=path_filter)
+        assert 1 < running["max"] <= QUEUE_CHECKS_CONCURRENCY
+
+    @pytest.mark.asyncio
+    async def test_queue_checks_one_at_a_time_when_rate_limit_is_low(self, check_run_handler: CheckRunHandler) -> None:
+        """Test checks are queued sequentially when the app token has few requests left."""
+        check_run_handler.github_webhook.repository_by_github_app.requester.rate_limiting = (10, 5000)
+        running = {"now": 0, "max": 0}
+
+        async def _set_check_queued(name: str) -> None:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0)
+            running["now"] -= 1
+
+        with patch.object(check_run_handler, "set_check_queued", side_effect=_set_check_queued):
+            await check_run_handler.queue_checks(names=[TOX_STR, PRE_COMMIT_STR, BUILD_CONTAINER_STR])
+
+        assert running["max"] == 1
+
     def test_get_check_run_text_normal_length(self, check_run_handler: CheckRunHandler) -> None:
         """Test getting check run text with normal length."""
         err = "Error message"
@@ -500,6 +667,14 @@ class TestCheckRunHandler:
             assert "test-user" not in call, "Username leaked in debug log"
             assert "*****" in call, "Expected redacted placeholder in debug log"
 
+    def test_output_secrets(self, check_run_handler: CheckRunHandler, mock_github_webhook: Mock) -> None:
+        """Test output_secrets lists configured credentials and skips unset ones."""
+        assert check_run_handler.output_secrets() == ["test-token", "test-user", "test-pass", "test-token"]
+
+        mock_github_webhook.pypi = {}
+        mock_github_webhook.container_repository_password = None
+        assert check_run_handler.output_secrets() == ["test-user", "test-token"]
+
     def test_get_check_run_text_no_log_when_not_truncated(self, check_run_handler: CheckRunHandler) -> None:
         """Test that no full output debug log is emitted when output fits within limit."""
         err = "Short error"
@@ -626,6 +801,28 @@ class TestCheckRunHandler:
                     result = await check_run_handler.get_branch_required_status_checks(mock_pull_request)
                     assert result == ["branch-check-1", "branch-check-2"]
 
+    @pytest.mark.asyncio
+    async def test_get_branch_required_status_checks_shared_across_handlers(
+        self, mock_github_webhook: Mock, mock_pull_request: Mock
+    ) -> None:
+        """Test branch protection is fetched once per branch for all webhooks of the process."""
+        mock_github_webhook.repository_full_name = "test-org/test-repo"
+        mock_github_webhook.repository.private = False
+        branch_protection = mock_github_webhook.repository.get_branch.return_value.get_protection.return_value
+        branch_protection.required_status_checks.contexts = ["branch-check"]
+
+        for _ in range(2):
+            handler = CheckRunHandler(mock_github_webhook)
+            assert await handler.get_branch_required_status_checks(mock_pull_request) == ["branch-check"]
+
+        mock_github_webhook.repository.get_branch.assert_called_once_with("main")
+
+        required_checks_cache.observe_event(repo_full_name="test-org/test-repo", hook_data={"rule": {"name": "main"}})
+        assert await CheckRunHandler(mock_github_webhook).get_branch_required_status_checks(mock_pull_request) == [
+            "branch-check"
+        ]
+        assert mock_github_webhook.repository.get_branch.call_count == 2
+
     @pytest.mark.asyncio
     async def test_get_branch_required_status_checks_private_repo(self, check_run_handler: CheckRunHandler) -> None:
         """Test getting branch required status checks for private repository."""
@@ -1233,6 +1430,7 @@ class TestCheckRunRepositoryCloning:
                         with patch("webhook_server.libs.github_api.OwnersFileHandler") as mock_owners_class:
                             mock_owners = AsyncMock()
                             mock_owners.initialize = AsyncMock(return_value=mock_owners)
+                            mock_owners.initialize_from_cache = AsyncMock(return_value=None)
                             mock_owners_class.return_value = mock_owners
 
                             # Mock PullRequestHandler to avoid actual check_if_can_be_merged
@@ -1348,6 +1546,7 @@ class TestCheckRunRepositoryCloning:
                         ):
                             mock_owners = AsyncMock()
                             mock_owners.initialize = AsyncMock(return_value=mock_owners)
+                            mock_owners.initialize_from_cache = AsyncMock(return_value=None)
                             mock_owners_class.return_value = mock_owners
 
                             # Mock get_pull_request to return mock PR
@@ -0,0 +1,60 @@
+"""Tests for webhook_server.utils.check_run_registry — check run IDs for in-place updates."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from webhook_server.utils.check_run_registry import CheckRunRegistry
+
+REPO = "test-org/test-repo"
+APP_ID = "12345"
+
+
+def _event(check_run_id: int, status: str, app_id: int = 12345, name: str = "tox") -> dict[str, Any]:
+    return {
+        "action": "created",
+        "check_run": {"id": check_run_id, "name": name, "head_sha": "sha", "status": status, "app": {"id": app_id}},
+    }
+
+
+class TestCheckRunRegistry:
+    def test_record_and_complete(self) -> None:
+        registry = CheckRunRegistry()
+
+        registry.record(repo_full_name=REPO, head_sha="sha", name="tox", check_run_id=1, completed=False)
+        assert registry.get(repo_full_name=REPO, head_sha="sha", name="tox") == 1
+        assert registry.get(repo_full_name=REPO, head_sha="other-sha", name="tox") is None
+
+        registry.record(repo_full_name=REPO, head_sha="sha", name="tox", check_run_id=1, completed=True)
+        assert registry.get(repo_full_name=REPO, head_sha="sha", name="tox") is None
+
+        # Responses without a real ID are ignored
+        registry.record(repo_full_name=REPO, head_sha="sha", name="tox", check_run_id=None, completed=False)
+        assert len(registry) == 0
+
+    def test_events_of_our_app_only(self) -> None:
+        registry = CheckRunRegistry()
+
+        assert not registry.observe_event(REPO, _event(check_run_id=1, status="queued", app_id=999), app_id=APP_ID)
+        assert registry.observe_event(REPO, _event(check_run_id=2, status="queued"), app_id=APP_ID)
+        assert registry.get(repo_full_name=REPO, head_sha="sha", name="tox") == 2
+
+    def test_late_event_does_not_register_completed_run(self) -> None:
+        registry = CheckRunRegistry()
+        registry.observe_event(REPO, _event(check_run_id=3, status="completed"), app_id=APP_ID)
+
+        registry.observe_event(REPO, _event(check_run_id=3, status="in_progress"), app_id=APP_ID)
+
+        assert registry.get(repo_full_name=REPO, head_sha="sha", name="tox") is None
+
+    def test_forget_and_eviction(self) -> None:
+        registry = CheckRunRegistry(max_entries=2)
+        for check_run_id, name in ((1, "tox"), (2, "pre-commit"), (3, "build")):
+            registry.record(repo_full_name=REPO, head_sha="sha", name=name, check_run_id=check_run_id, completed=False)
+
+        assert len(registry) == 2
+        assert registry.get(repo_full_name=REPO, head_sha="sha", name="tox") is None
+
+        registry.forget(repo_full_name=REPO, head_sha="sha", name="build")
+        assert registry.get(repo_full_name=REPO, head_sha="sha", name="build") is None
+        assert registry.get(repo_full_name=REPO, head_sha="sha", name="pre-commit") == 2
@@ -0,0 +1,184 @@
+"""Tests for webhook_server.utils.check_runners — the check job protocol with an in-process runner."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils.check_cgroups import ResourceUsage
+from webhook_server.utils.check_runners import (
+    CheckJob,
+    CheckJobResult,
+    CheckRunners,
+    CheckRunnerServer,
+    OutputCallback,
+    check_runner_endpoints,
+)
+
+
+class FakeExecutor:
+    """Records jobs, streams canned output and returns a canned result."""
+
+    def __init__(self, block: bool = False) -> None:
+        self.jobs: list[CheckJob] = []
+        self.block = block
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self, job: CheckJob, output_callback: OutputCallback) -> CheckJobResult:
+        self.jobs.append(job)
+        self.started.set()
+        await output_callback("stdout", "collecting...\n")
+        await output_callback("stderr", "warning: slow\n")
+        if self.block:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+        return CheckJobResult(success=True, out="1 passed\n", err="", usage=ResourceUsage(peak_memory_mb=42.0))
+
+
+@pytest.fixture
+async def runner_endpoint(tmp_path: Path) -> AsyncGenerator[tuple[str, CheckRunnerServer]]:
+    server = CheckRunnerServer(token="s3cret", max_jobs=2, executor=FakeExecutor(), logger=Mock())
+    endpoint = f"unix://{tmp_path / 'runners' / 'runner-0.sock'}"
+    await server.start(endpoint)
+    yield endpoint, server
+    await server.close()
+
+
+class TestCheckJob:
+    """Tests for the wire format of jobs and results."""
+
+    def test_round_trip(self) -> None:
+        job = CheckJob(check_name="tox", command="tox -e py", cwd="/tmp/wt", env={"UV_CACHE_DIR": "/cache/uv"})
+        result = CheckJobResult(success=False, out="o", err="e", usage=ResourceUsage(cpu_seconds=1.5))
+
+        assert CheckJob.from_dict(job.as_dict()) == job
+        assert CheckJobResult.from_dict(result.as_dict()) == result
+        assert CheckJobResult.from_dict({"success": True}).usage is None
+
+    def test_endpoints_from_config(self, tmp_path: Path) -> None:
+        config = {"enabled": True, "local-processes": 2, "remote": ["tcp://runner:5100"]}
+
+        assert check_runner_endpoints(config=config, data_dir=str(tmp_path)) == [
+            f"unix://{tmp_path}/check-runners/runner-0.sock",
+            f"unix://{tmp_path}/check-runners/runner-1.sock",
+            "tcp://runner:5100",
+        ]
+        assert check_runner_endpoints(config={**config, "enabled": False}, data_dir=str(tmp_path)) == []
+
+
+class TestCheckRunners:
+    """Tests for submitting jobs to an in-process runner."""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_on_runner_with_streamed_output(
+        self, runner_endpoint: tuple[str, CheckRunnerServer]
+    ) -> None:
+        endpoint, server = runner_endpoint
+        client = CheckRunners()
+        client.configure(endpoints=[endpoint], token="s3cret")
+        streamed: list[tuple[str, str]] = []
+
+        async def collect(stream: str, text: str) -> None:
+            streamed.append((stream, text))
+
+        job = CheckJob(check_name="tox", command="tox", env={"PREK_HOME": "/cache/prek"}, redact_secrets=["tok"])
+        result = await client.run(job=job, logger=Mock(), log_prefix="[TEST]", output_callback=collect)
+
+        assert result == CheckJobResult(success=True, out="1 passed\n", usage=ResourceUsage(peak_memory_mb=42.0))
+        assert streamed == [("stdout", "collecting...\n"), ("stderr", "warning: slow\n")]
+        assert server.executor.jobs == [job]  # type: ignore[attr-defined]
+
+    @pytest.mark.asyncio
+    async def test_wrong_token_is_rejected(self, runner_endpoint: tuple[str, CheckRunnerServer]) -> None:
+        endpoint, server = runner_endpoint
+        client = CheckRunners()
+        client.configure(endpoints=[endpoint], token="wrong")
+
+        result = await client.run(job=CheckJob(check_name="tox", command="tox"), logger=Mock(), log_prefix="[TEST]")
+
+        assert result is not None
+        assert not result.success
+        assert "Invalid check runner token" in result.err
+        assert server.executor.jobs == []  # type: ignore[attr-defined]
+
+    @pytest.mark.asyncio
+    async def test_cancelling_the_client_cancels_the_job(self, tmp_path: Path) -> None:
+        executor = FakeExecutor(block=True)
+        server = CheckRunnerServer(executor=executor, logger=Mock())
+        endpoint = f"unix://{tmp_path / 'runner.sock'}"
+        await server.start(endpoint)
+        client = CheckRunners()
+        client.configure(endpoints=[endpoint])
+
+        try:
+            task = asyncio.create_task(
+                client.run(job=CheckJob(check_name="tox", command="tox"), logger=Mock(), log_prefix="[TEST]")
+            )
+            await asyncio.wait_for(executor.started.wait(), timeout=5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            for _ in range(50):
+                if executor.cancelled:
+                    break
+                await asyncio.sleep(0.02)
+            assert executor.cancelled
+        finally:
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_runners_fall_back(
+        self, tmp_path: Path, runner_endpoint: tuple[str, CheckRunnerServer]
+    ) -> None:
+        endpoint, _ = runner_endpoint
+        client = CheckRunners()
+        client.configure(endpoints=[f"unix://{tmp_path / 'missing.sock'}", endpoint], token="s3cret")
+        job = CheckJob(check_name="tox", command="tox")
+
+        # The dead runner is skipped for the live one
+        result = await client.run(job=job, logger=Mock(), log_prefix="[TEST]")
+        assert result is not None
+        assert result.success
+
+        client.configure(endpoints=[f"unix://{tmp_path / 'missing.sock'}"])
+        assert await client.run(job=job, logger=Mock(), log_prefix="[TEST]") is None
+
+    def test_invalid_endpoint(self) -> None:
+        with pytest.raises(ValueError, match="Invalid check runner endpoint"):
+            CheckRunners().configure(endpoints=["http://runner"])
+
+    @pytest.mark.asyncio
+    async def test_tcp_requires_token(self) -> None:
+        with pytest.raises(ValueError, match="requires a token"):
+            CheckRunners().configure(endpoints=["tcp://runner:5100"])
+        with pytest.raises(ValueError, match="requires a token"):
+            await CheckRunnerServer(logger=Mock()).start("tcp://127.0.0.1:5100")
+
+        # Unix sockets are only reachable by this user and need no token
+        CheckRunners().configure(endpoints=["unix:///run/runner.sock"])
+
+    @pytest.mark.asyncio
+    async def test_job_with_missing_worktree_is_declined(
+        self, tmp_path: Path, runner_endpoint: tuple[str, CheckRunnerServer]
+    ) -> None:
+        endpoint, server = runner_endpoint
+        client = CheckRunners()
+        client.configure(endpoints=[endpoint], token="s3cret")
+
+        job = CheckJob(check_name="tox", command="tox", cwd=str(tmp_path / "not-on-this-runner"))
+        assert await client.run(job=job, logger=Mock(), log_prefix="[TEST]") is None
+        assert server.executor.jobs == []  # type: ignore[attr-defined]
+
+        job.cwd = str(tmp_path)
+        result = await client.run(job=job, logger=Mock(), log_prefix="[TEST]")
+        assert result is not None
+        assert result.success
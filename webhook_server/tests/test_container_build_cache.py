@@ -0,0 +1,105 @@
+"""Tests for webhook_server.utils.container_build_cache — PR build dedup and layer cache figures."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils.cache_manager import cache_manager
+from webhook_server.utils.container_build_cache import (
+    ContainerBuildCache,
+    container_build_key,
+    parse_layer_cache_hits,
+)
+
+PODMAN_OUTPUT = """STEP 1/4: FROM quay.io/fedora/python-313
+STEP 2/4: COPY pyproject.toml uv.lock ./
+--> Using cache 1c4e9a6b0f0d
+--> 1c4e9a6b0f0d
+STEP 3/4: RUN uv sync
+--> Using cache 8f2d3c1a9b7e
+--> 8f2d3c1a9b7e
+STEP 4/4: COPY . .
+--> 5a6b7c8d9e0f
+"""
+
+
+class TestHelpers:
+    """Tests for container_build_key and parse_layer_cache_hits."""
+
+    def test_every_component_changes_the_key(self) -> None:
+        base = container_build_key(context_tree="t1", containerfile="c1", build_flags="[]")
+
+        assert base == container_build_key(context_tree="t1", containerfile="c1", build_flags="[]")
+        assert base != container_build_key(context_tree="t2", containerfile="c1", build_flags="[]")
+        assert base != container_build_key(context_tree="t1", containerfile="c2", build_flags="[]")
+        assert base != container_build_key(context_tree="t1", containerfile="c1", build_flags='["--pull"]')
+
+    def test_parse_layer_cache_hits(self) -> None:
+        assert parse_layer_cache_hits(PODMAN_OUTPUT) == (4, 2)
+        assert parse_layer_cache_hits("") == (0, 0)
+
+
+class TestContainerBuildCache:
+    """Tests for ContainerBuildCache records, stats and pruning policy."""
+
+    @pytest.mark.asyncio
+    async def test_record_and_lookup(self, tmp_path: Path) -> None:
+        cache_manager.configure(root_dir=str(tmp_path), max_bytes=10 * 1024**2)
+        cache = ContainerBuildCache()
+        cache.configure()
+
+        assert await cache.lookup(repository="org/repo", key="k1", logger=Mock(), log_prefix="[TEST]") is None
+
+        await cache.record(repository="org/repo", key="k1", image_id="sha256:abc", logger=Mock(), log_prefix="[TEST]")
+
+        assert await cache.lookup(repository="org/repo", key="k1", logger=Mock(), log_prefix="[TEST]") == "sha256:abc"
+        assert await cache.lookup(repository="org/other", key="k1", logger=Mock(), log_prefix="[TEST]") is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_until_configured(self, tmp_path: Path) -> None:
+        cache_manager.configure(root_dir=str(tmp_path), max_bytes=10 * 1024**2)
+        cache = ContainerBuildCache()
+
+        assert not cache.enabled
+        assert not cache.prune_due("org/repo")
+        await cache.record(repository="org/repo", key="k1", image_id="sha256:abc", logger=Mock(), log_prefix="[TEST]")
+        assert await cache.lookup(repository="org/repo", key="k1", logger=Mock(), log_prefix="[TEST]") is None
+
+    @pytest.mark.asyncio
+    async def test_single_flight_serializes_same_key(self) -> None:
+        cache = ContainerBuildCache()
+        order: list[str] = []
+
+        async def build(name: str, key: str) -> None:
+            async with cache.single_flight(key):
+                order.append(f"{name}-start")
+                await asyncio.sleep(0.02)
+                order.append(f"{name}-end")
+
+        await asyncio.gather(build("a", "k1"), build("b", "k1"), build("c", "k2"))
+
+        assert order.index("a-end") < order.index("b-start")
+        assert order.index("c-start") < order.index("a-end")
+        assert cache._locks == {}
+
+    def test_stats_and_prune_policy(self) -> None:
+        cache = ContainerBuildCache()
+        cache.configure(max_age_hours=24, prune_interval_minutes=60)
+
+        assert cache.record_build(output=PODMAN_OUTPUT, seconds=10.0) == (4, 2)
+        cache.record_reuse()
+        stats = cache.stats.as_dict()
+        assert stats["builds"] == 1
+        assert stats["reused"] == 1
+        assert stats["layer_cache_hit_ratio"] == 0.5
+
+        assert cache.prune_due("org/repo")
+        assert not cache.prune_due("org/repo")
+        assert cache.prune_due("org/other")
+        command = cache.prune_command("org/repo")
+        assert "--filter label=io.github-webhook-server.repository=org/repo" in command
+        assert "--filter until=24h" in command
@@ -46,6 +46,7 @@ class TestCustomCheckRunsSchemaValidation:
         mock_webhook = Mock()
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         return mock_webhook
 
     @pytest.fixture
@@ -160,6 +161,7 @@ class TestCheckRunHandlerCustomCheckMethods:
         mock_webhook.hook_data = {}
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.repository_by_github_app = Mock()
         mock_webhook.last_commit = Mock()
@@ -281,6 +283,7 @@ class TestCustomCheckMandatoryOption:
         mock_webhook.hook_data = {}
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.repository_by_github_app = Mock()
         mock_webhook.last_commit = Mock()
@@ -291,6 +294,7 @@ class TestCustomCheckMandatoryOption:
             {"name": "mandatory-check-2", "command": "echo test3", "mandatory": True},
             {"name": "default-mandatory-check", "command": "echo test4"},  # No mandatory field = default to true
         ]
+        mock_webhook.check_path_filters = {}
         mock_webhook.security_suspicious_paths = []
         mock_webhook.security_committer_identity_check = False
         mock_webhook.security_mandatory = False
@@ -397,6 +401,7 @@ class TestRunnerHandlerCustomCheck:
         mock_webhook.hook_data = {}
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.clone_repo_dir = str(tmp_path / "test-repo")
         mock_webhook.mask_sensitive = True
@@ -553,6 +558,7 @@ class TestCustomCheckRunsIntegration:
         }
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.clone_repo_dir = str(tmp_path / "test-repo")
         mock_webhook.mask_sensitive = True
@@ -624,6 +630,7 @@ class TestCustomCheckRunsRetestCommand:
         mock_webhook = Mock()
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.custom_check_runs = [
             {"name": "lint", "command": "uv tool run --from ruff ruff check"},
             {"name": "security", "command": "uv tool run --from bandit bandit -r ."},
@@ -718,6 +725,7 @@ class TestValidateCustomCheckRuns:
         mock_webhook = Mock()
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         return mock_webhook
 
     def test_missing_name_field(self, mock_github_webhook: Mock) -> None:
@@ -1026,6 +1034,7 @@ class TestCustomCheckRunsEdgeCases:
         mock_webhook = Mock()
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.clone_repo_dir = str(tmp_path / "test-repo")
         mock_webhook.mask_sensitive = True
         mock_webhook.custom_check_runs = []
@@ -1065,6 +1074,7 @@ class TestCustomCheckRunsEdgeCases:
         runner_handler.check_run_handler.is_check_run_in_progress = AsyncMock(return_value=False)
         runner_handler.check_run_handler.set_check_in_progress = AsyncMock()
         runner_handler.check_run_handler.set_check_failure = AsyncMock()
+        runner_handler.check_run_handler.set_check_timed_out = AsyncMock()
         runner_handler.check_run_handler.get_check_run_text = Mock(return_value="Timeout")
 
         mock_pull_request = Mock()
@@ -1090,12 +1100,13 @@ class TestCustomCheckRunsEdgeCases:
                 new=AsyncMock(side_effect=asyncio.TimeoutError),
             ),
         ):
-            # Should handle timeout gracefully by reporting failure
+            # Should handle timeout gracefully by reporting a timed_out conclusion
             await runner_handler.run_custom_check(pull_request=mock_pull_request, check_config=check_config)
 
-            # Verify that a failure was reported with timeout-related message
-            runner_handler.check_run_handler.set_check_failure.assert_awaited_once()
-            call_args = runner_handler.check_run_handler.set_check_failure.call_args
+            # Verify that a timeout was reported with timeout-related message
+            runner_handler.check_run_handler.set_check_failure.assert_not_awaited()
+            runner_handler.check_run_handler.set_check_timed_out.assert_awaited_once()
+            call_args = runner_handler.check_run_handler.set_check_timed_out.call_args
             # Check that the failure message mentions timeout
             assert "timeout" in str(call_args).lower() or "timed out" in str(call_args).lower()
 
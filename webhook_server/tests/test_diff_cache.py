@@ -0,0 +1,126 @@
+"""Tests for webhook_server.utils.diff_cache — diff stats parsing and caching."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from webhook_server.utils.diff_cache import DiffStats, DiffStatsCache, FileDiffStat, parse_numstat
+
+# ---------------------------------------------------------------------------
+# parse_numstat
+# ---------------------------------------------------------------------------
+
+
+class TestParseNumstat:
+    """Tests for parsing ``git diff --numstat -z`` output."""
+
+    def test_empty_output(self) -> None:
+        stats = parse_numstat("")
+        assert stats.files == ()
+        assert stats.size == 0
+
+    def test_regular_files(self) -> None:
+        stats = parse_numstat("10\t2\tsrc/app.py\x000\t5\tREADME.md\x00")
+
+        assert stats.files == ("src/app.py", "README.md")
+        assert stats.file_stats["src/app.py"] == FileDiffStat(additions=10, deletions=2)
+        assert stats.additions == 10
+        assert stats.deletions == 7
+        assert stats.size == 17
+
+    def test_binary_file_counts_as_zero(self) -> None:
+        stats = parse_numstat("-\t-\tlogo.png\x00")
+
+        assert stats.files == ("logo.png",)
+        assert stats.file_stats["logo.png"] == FileDiffStat()
+
+    def test_rename_reports_new_path(self) -> None:
+        stats = parse_numstat("1\t1\t\x00old/name.py\x00new/name.py\x004\t0\tother.py\x00")
+
+        assert stats.files == ("new/name.py", "other.py")
+        assert stats.additions == 5
+
+    def test_path_with_spaces_and_tabs_in_name(self) -> None:
+        stats = parse_numstat("1\t0\tdocs/my file\twith tab.md\x00")
+
+        assert stats.files == ("docs/my file\twith tab.md",)
+
+
+# ---------------------------------------------------------------------------
+# DiffStatsCache
+# ---------------------------------------------------------------------------
+
+
+class TestDiffStatsCache:
+    """Tests for the bounded single-flight diff stats cache."""
+
+    @pytest.fixture
+    def logger(self) -> Mock:
+        return Mock()
+
+    @pytest.mark.asyncio
+    async def test_compute_once_per_key(self, logger: Mock) -> None:
+        cache = DiffStatsCache()
+        compute = AsyncMock(return_value=DiffStats(files=("a.py",), additions=1))
+
+        for _ in range(3):
+            result = await cache.get_or_compute("org/repo", "base", "head", compute, logger, "[TEST]")
+
+        assert result.files == ("a.py",)
+        compute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_fill(self, logger: Mock) -> None:
+        cache = DiffStatsCache()
+        calls = 0
+
+        async def compute() -> DiffStats:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return DiffStats(files=("a.py",))
+
+        results = await asyncio.gather(*[
+            cache.get_or_compute("org/repo", "base", "head", compute, logger, "[TEST]") for _ in range(5)
+        ])
+
+        assert calls == 1
+        assert all(r.files == ("a.py",) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_failed_fill_is_not_cached(self, logger: Mock) -> None:
+        cache = DiffStatsCache()
+        compute = AsyncMock(side_effect=[RuntimeError("git diff failed"), DiffStats(files=("a.py",))])
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("org/repo", "base", "head", compute, logger, "[TEST]")
+
+        result = await cache.get_or_compute("org/repo", "base", "head", compute, logger, "[TEST]")
+        assert result.files == ("a.py",)
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_sha_bypasses_cache(self, logger: Mock) -> None:
+        cache = DiffStatsCache()
+        compute = AsyncMock(return_value=DiffStats())
+
+        await cache.get_or_compute("org/repo", "", "head", compute, logger, "[TEST]")
+        await cache.get_or_compute("org/repo", "", "head", compute, logger, "[TEST]")
+
+        assert compute.await_count == 2
+        assert len(cache) == 0
+
+    def test_lru_eviction(self) -> None:
+        cache = DiffStatsCache(max_entries=2)
+        cache.put("org/repo", "b", "h1", DiffStats())
+        cache.put("org/repo", "b", "h2", DiffStats())
+        # Touch h1 so h2 becomes least recently used
+        assert cache.get("org/repo", "b", "h1") is not None
+        cache.put("org/repo", "b", "h3", DiffStats())
+
+        assert cache.get("org/repo", "b", "h2") is None
+        assert cache.get("org/repo", "b", "h1") is not None
+        assert len(cache) == 2
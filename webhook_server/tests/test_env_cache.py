@@ -0,0 +1,119 @@
+"""Tests for webhook_server.utils.env_cache — persistent tox work dirs."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils import env_cache as env_cache_module
+from webhook_server.utils.cache_manager import cache_manager
+from webhook_server.utils.env_cache import TOX_ENV_SLOTS, EnvCache, env_dependency_hash, pre_commit_config_hash
+
+
+class TestEnvDependencyHash:
+    """Tests for env_dependency_hash."""
+
+    def test_hash_tracks_dependency_files_and_python_version(self, tmp_path: Path) -> None:
+        (tmp_path / "tox.ini").write_text("[tox]\n")
+        (tmp_path / "README.md").write_text("docs")
+        base = env_dependency_hash(str(tmp_path), "3.13")
+
+        (tmp_path / "README.md").write_text("other docs")
+        assert env_dependency_hash(str(tmp_path), "3.13") == base
+
+        assert env_dependency_hash(str(tmp_path), "3.14") != base
+
+        (tmp_path / "requirements-dev.txt").write_text("pytest\n")
+        assert env_dependency_hash(str(tmp_path), "3.13") != base
+
+
+class TestEnvCache:
+    """Tests for EnvCache leases."""
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_cache_yields_nothing(self, tmp_path: Path) -> None:
+        cache = EnvCache()
+
+        async with cache.tox_workdir(
+            repository="org/repo", worktree_path=str(tmp_path), python_version="", logger=Mock(), log_prefix="[TEST]"
+        ) as workdir:
+            assert workdir is None
+        async with cache.tool_cache_env(logger=Mock(), log_prefix="[TEST]") as env:
+            assert env == {}
+
+    @pytest.mark.asyncio
+    async def test_same_dependencies_reuse_work_dir(self, tmp_path: Path) -> None:
+        cache_manager.configure(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+        worktree = tmp_path / "worktree"
+        worktree.mkdir()
+        (worktree / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+        cache = EnvCache()
+        kwargs = {"repository": "org/repo", "worktree_path": str(worktree), "python_version": "3.13"}
+
+        async with cache.tox_workdir(**kwargs, logger=Mock(), log_prefix="[TEST]") as first:
+            assert first is not None
+            Path(first, "py313").mkdir()
+        async with cache.tox_workdir(**kwargs, logger=Mock(), log_prefix="[TEST]") as second:
+            assert second == first
+            assert Path(second, "py313").is_dir()
+
+    @pytest.mark.asyncio
+    async def test_busy_work_dirs_fall_back(self, tmp_path: Path) -> None:
+        cache_manager.configure(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+        cache = EnvCache()
+        kwargs = {"repository": "org/repo", "worktree_path": str(tmp_path), "python_version": ""}
+
+        held: list[str | None] = []
+        leases = [cache.tox_workdir(**kwargs, logger=Mock(), log_prefix="[TEST]") for _ in range(TOX_ENV_SLOTS + 1)]
+        for lease in leases:
+            held.append(await lease.__aenter__())
+        try:
+            # Each concurrent run gets its own work dir until the slots run out
+            assert len(set(held[:TOX_ENV_SLOTS])) == TOX_ENV_SLOTS
+            assert held[TOX_ENV_SLOTS] is None
+        finally:
+            for lease in reversed(leases):
+                await lease.__aexit__(None, None, None)
+
+    @pytest.mark.asyncio
+    async def test_prek_home_keyed_by_pre_commit_config(self, tmp_path: Path) -> None:
+        cache_manager.configure(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+        cache = EnvCache()
+
+        async with cache.prek_home(worktree_path=str(tmp_path), logger=Mock(), log_prefix="[TEST]") as home:
+            # No pre-commit config, nothing to cache
+            assert home is None
+
+        (tmp_path / ".pre-commit-config.yaml").write_text("repos: []\n")
+        digest = pre_commit_config_hash(str(tmp_path))
+        assert digest is not None
+        async with cache.prek_home(worktree_path=str(tmp_path), logger=Mock(), log_prefix="[TEST]") as home:
+            assert home == str(tmp_path / "cache" / "prek-home" / digest[:16])
+        assert (Path(home) / ".ready").exists()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_wait_for_prek_initialization(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(env_cache_module, "_LOCK_POLL_SECONDS", 0.01)
+        cache_manager.configure(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+        (tmp_path / ".pre-commit-config.yaml").write_text("repos: []\n")
+        cache = EnvCache()
+        events: list[str] = []
+
+        async def run(name: str, duration: float) -> None:
+            async with cache.prek_home(worktree_path=str(tmp_path), logger=Mock(), log_prefix="[TEST]"):
+                events.append(f"{name}-start")
+                await asyncio.sleep(duration)
+                events.append(f"{name}-end")
+
+        first = asyncio.create_task(run("init", 0.1))
+        await asyncio.sleep(0.02)
+        await asyncio.gather(run("a", 0.05), run("b", 0.05), first)
+
+        # Nobody starts before initialization ends; later runs share the home concurrently
+        assert events[:2] == ["init-start", "init-end"]
+        assert sorted(events[2:4]) == ["a-start", "b-start"]
@@ -17,6 +17,8 @@ from webhook_server.libs.github_api import GithubWebhook
 from webhook_server.libs.handlers.owners_files_handler import OwnersFileHandler
 from webhook_server.tests.conftest import TEST_GITHUB_TOKEN
 from webhook_server.utils.constants import SECURITY_COMMITTER_IDENTITY_STR, SECURITY_SUSPICIOUS_PATHS_STR
+from webhook_server.utils.label_catalog import CatalogLabel, repository_label_catalog
+from webhook_server.utils.required_checks_cache import required_checks_cache
 
 
 class TestGithubWebhook:
@@ -562,6 +564,86 @@ class TestGithubWebhook:
         # Should not raise an exception, just skip processing
         await webhook.process()
 
+    @patch.dict(os.environ, {"WEBHOOK_SERVER_DATA_DIR": "webhook_server/tests/manifests"})
+    @patch("webhook_server.libs.github_api.get_repository_github_app_api")
+    @patch("webhook_server.libs.github_api.get_api_with_highest_rate_limit")
+    @patch("webhook_server.utils.helpers.get_apis_and_tokes_from_config")
+    @patch("webhook_server.libs.config.Config.repository_local_data")
+    @patch("webhook_server.libs.github_api.GithubWebhook.get_api_users", return_value=())
+    async def test_process_label_event_updates_label_catalog(
+        self,
+        mock_get_api_users: Mock,
+        mock_repo_local_data: Mock,
+        mock_get_apis: Mock,
+        mock_api_rate_limit: Mock,
+        mock_repo_api: Mock,
+    ) -> None:
+        """Test label events only update the cached repository label catalog."""
+        mock_api_rate_limit.return_value = (Mock(), "TOKEN", "USER")
+        mock_repo_api.return_value = Mock()
+        mock_get_apis.return_value = []
+        mock_repo_local_data.return_value = {}
+        hook_data = {
+            "action": "edited",
+            "label": {"name": "size/XL", "color": "D93F0B"},
+            "changes": {"name": {"from": "size/huge"}},
+            "repository": {"name": "test-repo", "full_name": "my-org/test-repo"},
+        }
+        await repository_label_catalog.get_or_load(
+            repo_full_name="my-org/test-repo",
+            fetch=AsyncMock(return_value=[CatalogLabel(name="size/huge", color="ededed")]),
+            logger=Mock(),
+            log_prefix="[TEST]",
+        )
+
+        webhook = GithubWebhook(hook_data=hook_data, headers=Headers({"X-GitHub-Event": "label"}), logger=Mock())
+        assert await webhook.process() is None
+
+        assert repository_label_catalog.get("my-org/test-repo") == {
+            "size/xl": CatalogLabel(name="size/XL", color="d93f0b")
+        }
+        mock_get_api_users.assert_not_called()
+
+    @patch.dict(os.environ, {"WEBHOOK_SERVER_DATA_DIR": "webhook_server/tests/manifests"})
+    @patch("webhook_server.libs.github_api.get_repository_github_app_api")
+    @patch("webhook_server.libs.github_api.get_api_with_highest_rate_limit")
+    @patch("webhook_server.utils.helpers.get_apis_and_tokes_from_config")
+    @patch("webhook_server.libs.config.Config.repository_local_data")
+    @patch("webhook_server.libs.github_api.GithubWebhook.get_api_users", return_value=())
+    async def test_process_branch_protection_rule_event_invalidates_required_checks(
+        self,
+        mock_get_api_users: Mock,
+        mock_repo_local_data: Mock,
+        mock_get_apis: Mock,
+        mock_api_rate_limit: Mock,
+        mock_repo_api: Mock,
+    ) -> None:
+        """Test branch protection rule events only drop the cached required status checks."""
+        mock_api_rate_limit.return_value = (Mock(), "TOKEN", "USER")
+        mock_repo_api.return_value = Mock()
+        mock_get_apis.return_value = []
+        mock_repo_local_data.return_value = {}
+        hook_data = {
+            "action": "edited",
+            "rule": {"name": "main"},
+            "repository": {"name": "test-repo", "full_name": "my-org/test-repo"},
+        }
+        await required_checks_cache.get_or_load(
+            repo_full_name="my-org/test-repo",
+            branch="main",
+            fetch=AsyncMock(return_value=["tox"]),
+            logger=Mock(),
+            log_prefix="[TEST]",
+        )
+
+        webhook = GithubWebhook(
+            hook_data=hook_data, headers=Headers({"X-GitHub-Event": "branch_protection_rule"}), logger=Mock()
+        )
+        assert await webhook.process() is None
+
+        assert required_checks_cache.get(repo_full_name="my-org/test-repo", branch="main") is None
+        mock_get_api_users.assert_not_called()
+
     @patch.dict(os.environ, {"WEBHOOK_SERVER_DATA_DIR": "webhook_server/tests/manifests"})
     @patch("webhook_server.libs.github_api.get_github_repo_api")
     @patch("webhook_server.libs.github_api.get_repository_github_app_api")
@@ -1501,6 +1583,47 @@ class TestGithubWebhook:
                                     mock_debouncer.schedule.assert_called_once()
                                     mock_recheck.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_merge_check_owners_file_handler_clones_only_on_cache_miss(self) -> None:
+        """Test merge-eligibility events use cached OWNERS data and clone only when it is missing."""
+        hook_data = {"repository": {"name": "test-repo", "full_name": "org/test-repo"}}
+        headers = Headers({"X-GitHub-Event": "check_run", "X-GitHub-Delivery": "abc"})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("webhook_server.libs.github_api.Config") as mock_config:
+                mock_config.return_value.repository = True
+                mock_config.return_value.repository_local_data.return_value = {}
+                mock_config.return_value.data_dir = temp_dir
+
+                with (
+                    patch("webhook_server.libs.github_api.get_api_with_highest_rate_limit") as mock_get_api,
+                    patch("webhook_server.libs.github_api.get_github_repo_api", return_value=Mock()),
+                    patch("webhook_server.libs.github_api.get_repository_github_app_api", return_value=Mock()),
+                    patch("webhook_server.libs.github_api.OwnersFileHandler") as mock_owners_handler,
+                ):
+                    mock_get_api.return_value = (Mock(), "token", "apiuser")
+                    mock_owners_instance = Mock()
+                    mock_owners_instance.initialize = AsyncMock(return_value=mock_owners_instance)
+                    mock_owners_handler.return_value = mock_owners_instance
+
+                    webhook = GithubWebhook(hook_data, headers, Mock())
+                    mock_pr = Mock()
+                    mock_pr.base.ref = "main"
+
+                    with patch.object(webhook, "_clone_repository", new=AsyncMock()) as mock_clone:
+                        mock_owners_instance.initialize_from_cache = AsyncMock(return_value=mock_owners_instance)
+                        assert await webhook._merge_check_owners_file_handler(pull_request=mock_pr) is (
+                            mock_owners_instance
+                        )
+                        mock_owners_instance.initialize_from_cache.assert_awaited_once_with(base_ref="main")
+                        mock_clone.assert_not_awaited()
+                        mock_owners_instance.initialize.assert_not_awaited()
+
+                        mock_owners_instance.initialize_from_cache = AsyncMock(return_value=None)
+                        await webhook._merge_check_owners_file_handler(pull_request=mock_pr)
+                        mock_clone.assert_awaited_once_with(pull_request=mock_pr)
+                        mock_owners_instance.initialize.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_process_check_run_no_pr_found(self) -> None:
         """Test check_run event when no PR is found (stale commit, no open PRs)."""
@@ -1622,6 +1745,7 @@ class TestGithubWebhook:
                                     ) as mock_owners_handler:
                                         mock_owners_instance = Mock()
                                         mock_owners_instance.initialize = AsyncMock(return_value=mock_owners_instance)
+                                        mock_owners_instance.initialize_from_cache = AsyncMock(return_value=None)
                                         mock_owners_handler.return_value = mock_owners_instance
 
                                         webhook = GithubWebhook(review_data, headers, logger)
@@ -1711,6 +1835,7 @@ class TestGithubWebhook:
                                     ) as mock_owners_handler:
                                         mock_owners_instance = Mock()
                                         mock_owners_instance.initialize = AsyncMock(return_value=mock_owners_instance)
+                                        mock_owners_instance.initialize_from_cache = AsyncMock(return_value=None)
                                         mock_owners_handler.return_value = mock_owners_instance
 
                                         with patch.object(
@@ -2942,6 +3067,85 @@ class TestGithubWebhook:
                                     f"Commands: {executed_commands}"
                                 )
 
+    @pytest.mark.asyncio
+    async def test_clone_repository_shares_clone_for_same_pr_head(
+        self,
+        minimal_hook_data: dict,
+        minimal_headers: Headers,
+        logger: Mock,
+        get_value_side_effect: Callable[..., object],
+    ) -> None:
+        """Concurrent webhooks for the same PR head run one git clone and share its directory."""
+        with patch("webhook_server.libs.github_api.Config") as mock_config:
+            mock_config.return_value.repository = True
+            mock_config.return_value.repository_local_data.return_value = {}
+            mock_config.return_value.get_value.side_effect = get_value_side_effect
+
+            with patch("webhook_server.libs.github_api.get_api_with_highest_rate_limit") as mock_get_api:
+                mock_get_api.return_value = (Mock(), "test-token", "apiuser")
+
+                with patch("webhook_server.libs.github_api.get_github_repo_api") as mock_get_repo_api:
+                    mock_repo = Mock()
+                    mock_repo.clone_url = "https://github.com/org/test-repo.git"
+                    mock_repo.owner.login = "test-owner"
+                    mock_get_repo_api.return_value = mock_repo
+
+                    with (
+                        patch("webhook_server.libs.github_api.get_repository_github_app_api"),
+                        patch("webhook_server.utils.helpers.get_repository_color_for_log_prefix"),
+                    ):
+                        webhooks = [GithubWebhook(minimal_hook_data, minimal_headers, logger) for _ in range(3)]
+                        own_dirs = [gh.clone_repo_dir for gh in webhooks]
+                        for gh in webhooks:
+                            gh.pr_base_sha = "b" * 40
+                            gh.pr_head_sha = "a" * 40
+
+                        mock_pr = Mock()
+                        mock_pr.base.ref = "main"
+                        mock_pr.number = 123
+
+                        clone_commands: list[str] = []
+
+                        async def mock_run_command(command: str, **_kwargs: object) -> tuple[bool, str, str]:
+                            if "git clone" in command:
+                                clone_commands.append(command)
+                                await asyncio.sleep(0.01)
+                            return (True, "", "")
+
+                        with patch("webhook_server.libs.github_api.run_command", side_effect=mock_run_command):
+                            await asyncio.gather(*(gh._clone_repository(pull_request=mock_pr) for gh in webhooks))
+
+                            assert len(clone_commands) == 1
+                            assert {gh.clone_repo_dir for gh in webhooks} == {own_dirs[0]}
+                            # Joiners dropped their own unused temp dirs
+                            assert not any(os.path.exists(path) for path in own_dirs[1:])
+
+                            for gh in webhooks[:2]:
+                                await gh.cleanup()
+                            assert os.path.exists(own_dirs[0])
+
+                            await webhooks[2].cleanup()
+                            assert not os.path.exists(own_dirs[0])
+
+                            # Another PR at the same head and base needs its own origin/pr/<number> ref
+                            other_pr = Mock()
+                            other_pr.base.ref = "main"
+                            other_pr.number = 124
+                            first = GithubWebhook(minimal_hook_data, minimal_headers, logger)
+                            other = GithubWebhook(minimal_hook_data, minimal_headers, logger)
+                            for gh in (first, other):
+                                gh.pr_base_sha = "b" * 40
+                                gh.pr_head_sha = "a" * 40
+                            await asyncio.gather(
+                                first._clone_repository(pull_request=mock_pr),
+                                other._clone_repository(pull_request=other_pr),
+                            )
+
+                            assert len(clone_commands) == 3
+                            assert first.clone_repo_dir != other.clone_repo_dir
+                            for gh in (first, other):
+                                await gh.cleanup()
+
     @patch.dict(os.environ, {"WEBHOOK_SERVER_DATA_DIR": "webhook_server/tests/manifests"})
     @patch("webhook_server.libs.github_api.get_github_repo_api")
     @patch("webhook_server.libs.github_api.get_repository_github_app_api")
@@ -3393,6 +3597,7 @@ class TestGithubWebhook:
                                     ) as mock_owners_handler:
                                         mock_owners_instance = Mock()
                                         mock_owners_instance.initialize = AsyncMock(return_value=mock_owners_instance)
+                                        mock_owners_instance.initialize_from_cache = AsyncMock(return_value=None)
                                         mock_owners_handler.return_value = mock_owners_instance
 
                                         with patch.object(
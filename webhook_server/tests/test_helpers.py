@@ -4,6 +4,7 @@ import logging
 import os
 import subprocess as sp
 import sys
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -11,6 +12,7 @@ import pytest
 from webhook_server.libs.config import Config
 from webhook_server.libs.exceptions import NoApiTokenError
 from webhook_server.utils.helpers import (
+    _StreamRedactor,
     get_api_with_highest_rate_limit,
     get_apis_and_tokes_from_config,
     get_future_results,
@@ -306,6 +308,61 @@ class TestHelpers:
         result = await run_command("nonexistent_command_xyz", log_prefix="[TEST]")
         assert result[0] is False
 
+    @pytest.mark.asyncio
+    async def test_run_command_keeps_head_and_tail_only(self) -> None:
+        """Test run_command with keep_output_bytes keeps bounded head/tail of large output."""
+        script = "for i in range(100000): print('line', i)"
+        result = await run_command(f'{sys.executable} -c "{script}"', log_prefix="[TEST]", keep_output_bytes=1024)
+
+        assert result[0] is True
+        assert result[1].startswith("line 0\n")
+        assert result[1].endswith("line 99999\n")
+        assert "bytes omitted]..." in result[1]
+        assert len(result[1]) < 2048
+
+    @pytest.mark.asyncio
+    async def test_run_command_spill_file_is_redacted(self, tmp_path: Path) -> None:
+        """Test run_command streams full, redacted output to spill_path while returning unredacted output."""
+        spill_path = tmp_path / "out" / "check.log"
+        script = "for i in range(20000): print(i, 'TOKEN123')"
+        result = await run_command(
+            f'{sys.executable} -c "{script}"',
+            log_prefix="[TEST]",
+            redact_secrets=["TOKEN123"],
+            keep_output_bytes=256,
+            spill_path=str(spill_path),
+        )
+
+        assert result[0] is True
+        assert "TOKEN123" in result[1]
+        spilled = spill_path.read_text()
+        assert "TOKEN123" not in spilled
+        assert spilled.count("***REDACTED***") == 20000
+        assert spilled.splitlines()[-1] == "19999 ***REDACTED***"
+
+    @pytest.mark.asyncio
+    async def test_run_command_output_cap_kills_command(self) -> None:
+        """Test run_command kills a command whose output exceeds max_output_bytes."""
+        result = await run_command(
+            f"{sys.executable} -c \"import sys\nwhile True: sys.stdout.write('x' * 4096)\"",
+            log_prefix="[TEST]",
+            keep_output_bytes=1024,
+            max_output_bytes=1024 * 1024,
+            timeout=30,
+        )
+
+        assert result[0] is False
+        assert "Command output exceeded 1048576 bytes" in result[2]
+
+    def test_stream_redactor_handles_secrets_split_across_chunks(self) -> None:
+        """Test _StreamRedactor redacts secrets that span chunk boundaries."""
+        redactor = _StreamRedactor(["abcdef"])
+        chunks = ["xxab", "cd", "efyyabc", "def", "zz"]
+
+        redacted = "".join(redactor.feed(chunk) for chunk in chunks) + redactor.flush()
+
+        assert redacted == "xx***REDACTED***yy***REDACTED***zz"
+
     def test_log_rate_limit_all_branches(self):
         """Test log_rate_limit for all color/warning branches."""
 
@@ -415,6 +472,32 @@ class TestHelpers:
         except Exception:
             pass  # ps not available, but timeout test still validates behavior
 
+    @pytest.mark.asyncio
+    async def test_run_command_timeout_kills_grandchildren(self, tmp_path: Path) -> None:
+        """Test that a timeout terminates the command's whole process group, not just the direct child."""
+        pid_file = tmp_path / "grandchild.pid"
+
+        result = await run_command(f"sh -c 'sleep 100 & echo $! > {pid_file}; wait'", log_prefix="[TEST]", timeout=1)
+
+        assert result[0] is False
+        grandchild = int(pid_file.read_text())
+        await asyncio.sleep(0.2)
+        stat_path = Path(f"/proc/{grandchild}/stat")
+        # Gone, or a zombie waiting for init to reap it
+        assert not stat_path.exists() or stat_path.read_text().rpartition(")")[2].split()[0] == "Z"
+
+    @pytest.mark.asyncio
+    async def test_run_command_exit_callback(self) -> None:
+        """Test that exit_callback gets the exit status of a command that exited on its own, but not on timeout."""
+        exit_codes: list[int] = []
+
+        result = await run_command("sh -c 'exit 3'", log_prefix="[TEST]", exit_callback=exit_codes.append)
+        assert result[0] is False
+        assert exit_codes == [3]
+
+        await run_command("sleep 100", log_prefix="[TEST]", timeout=1, exit_callback=exit_codes.append)
+        assert exit_codes == [3]
+
     @pytest.mark.asyncio
     async def test_run_command_cancelled_cleanup(self) -> None:
         """Test that subprocess is properly cleaned up when cancelled."""
@@ -1290,6 +1290,24 @@ class TestIssueCommentHandler:
                 mock_run_tox.assert_called_once_with(pull_request=mock_pull_request)
                 mock_comment.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_process_retest_command_force(self, issue_comment_handler: IssueCommentHandler) -> None:
+        """Test `--force` is not treated as a test name and bypasses cached results."""
+        mock_pull_request = Mock()
+
+        with (
+            patch.object(issue_comment_handler.runner_handler, "run_tox", new_callable=AsyncMock) as mock_run_tox,
+            patch.object(mock_pull_request, "create_issue_comment") as mock_comment,
+        ):
+            await issue_comment_handler.process_retest_command(
+                pull_request=mock_pull_request,
+                command_args="tox --force",
+                reviewed_user="test-user",
+            )
+            mock_run_tox.assert_awaited_once_with(pull_request=mock_pull_request)
+            mock_comment.assert_not_called()
+            assert issue_comment_handler.runner_handler.force_rerun is True
+
     @pytest.mark.asyncio
     async def test_process_retest_command_unsupported_tests(self, issue_comment_handler: IssueCommentHandler) -> None:
         """Test processing retest command with unsupported tests."""
@@ -0,0 +1,150 @@
+"""Tests for webhook_server.utils.job_scheduler — host-wide CI admission control."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils.job_scheduler import JobCost, JobScheduler
+
+
+def _scheduler(tmp_path: Path, cpu_slots: int = 2, memory_mb: int = 4096) -> JobScheduler:
+    scheduler = JobScheduler()
+    scheduler.configure(
+        state_dir=str(tmp_path / "ci-scheduler"),
+        cpu_slots=cpu_slots,
+        memory_mb=memory_mb,
+        check_resources={"small": {"cpu": 1, "memory-mb": 256}, "huge": {"cpu": 64, "memory-mb": 10**6}},
+    )
+    return scheduler
+
+
+class TestJobScheduler:
+    """Tests for JobScheduler admission, fairness and bookkeeping."""
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_scheduler_admits_immediately(self) -> None:
+        scheduler = JobScheduler()
+        async with scheduler.slot(repository="org/repo", check_name="tox", logger=Mock(), log_prefix="[TEST]"):
+            assert not (await scheduler.usage()).enabled
+
+    def test_costs_are_configurable_and_clamped(self, tmp_path: Path) -> None:
+        scheduler = _scheduler(tmp_path)
+
+        assert scheduler.cost_for("small") == JobCost(cpu=1, memory_mb=256)
+        assert scheduler.cost_for("huge") == JobCost(cpu=2, memory_mb=4096)
+        assert scheduler.cost_for("tox") == JobCost(cpu=2, memory_mb=2048)
+        assert scheduler.cost_for("my-custom-check") == JobCost(cpu=1, memory_mb=512)
+
+    def test_observed_usage_tunes_unconfigured_checks(self, tmp_path: Path) -> None:
+        scheduler = _scheduler(tmp_path, cpu_slots=8, memory_mb=16384)
+
+        for peak_memory_mb in (900, 1000):
+            scheduler.observe(check_name="tox", peak_memory_mb=peak_memory_mb, cpu_seconds=30, wall_seconds=10)
+            scheduler.observe(check_name="small", peak_memory_mb=peak_memory_mb, cpu_seconds=30, wall_seconds=10)
+        assert scheduler.cost_for("tox") == JobCost(cpu=2, memory_mb=2048)
+
+        scheduler.observe(check_name="tox", peak_memory_mb=500, cpu_seconds=5, wall_seconds=10)
+        scheduler.observe(check_name="small", peak_memory_mb=500, cpu_seconds=5, wall_seconds=10)
+
+        # Worst recent run plus headroom: 1000 MiB * 1.25, rounded up to 64 MiB; 3 cores
+        assert scheduler.cost_for("tox") == JobCost(cpu=3, memory_mb=1280)
+        # Configured reservations are left alone
+        assert scheduler.cost_for("small") == JobCost(cpu=1, memory_mb=256)
+
+    @pytest.mark.asyncio
+    async def test_jobs_wait_for_cpu_slots(self, tmp_path: Path) -> None:
+        scheduler = _scheduler(tmp_path, cpu_slots=2)
+        running = 0
+        peak = 0
+
+        async def job() -> None:
+            nonlocal running, peak
+            async with scheduler.slot(repository="org/repo", check_name="small", logger=Mock(), log_prefix="[TEST]"):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.05)
+                running -= 1
+
+        await asyncio.gather(*(job() for _ in range(5)))
+
+        assert peak == 2
+        usage = await scheduler.usage()
+        assert usage.running == []
+        assert usage.waiting == []
+
+    @pytest.mark.asyncio
+    async def test_memory_reservation_limits_admission(self, tmp_path: Path) -> None:
+        scheduler = _scheduler(tmp_path, cpu_slots=8, memory_mb=600)
+
+        async with scheduler.slot(repository="org/repo", check_name="small", logger=Mock(), log_prefix="[TEST]"):
+            waiter = asyncio.create_task(self._hold(scheduler, "org/repo", "small"))
+            await asyncio.sleep(0.1)
+            # 256 + 256 MiB fits in 600 MiB
+            assert waiter.done()
+
+            blocked = asyncio.create_task(self._hold(scheduler, "org/repo", "tox"))
+            await asyncio.sleep(0.1)
+            usage = await scheduler.usage()
+            assert [job["check"] for job in usage.waiting] == ["tox"]
+            assert usage.memory_mb_in_use == 256
+
+        await asyncio.wait_for(blocked, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_fair_share_between_repositories(self, tmp_path: Path) -> None:
+        scheduler = _scheduler(tmp_path, cpu_slots=1)
+        order: list[str] = []
+        release = asyncio.Event()
+
+        async def job(repository: str) -> None:
+            async with scheduler.slot(repository=repository, check_name="small", logger=Mock(), log_prefix="[TEST]"):
+                order.append(repository)
+                await release.wait()
+
+        first = asyncio.create_task(job("org/busy"))
+        await asyncio.sleep(0.05)
+        busy = [asyncio.create_task(job("org/busy")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        quiet = asyncio.create_task(job("org/quiet"))
+        await asyncio.sleep(0.05)
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(first, *busy, quiet), timeout=10)
+
+        # org/quiet queued last but has no running jobs, so it goes next
+        assert order[:2] == ["org/busy", "org/quiet"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self, tmp_path: Path) -> None:
+        scheduler = _scheduler(tmp_path, cpu_slots=1)
+
+        async with scheduler.slot(repository="org/repo", check_name="small", logger=Mock(), log_prefix="[TEST]"):
+            waiter = asyncio.create_task(self._hold(scheduler, "org/repo", "small"))
+            await asyncio.sleep(0.1)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert (await scheduler.usage()).waiting == []
+
+    @pytest.mark.asyncio
+    async def test_jobs_of_dead_processes_are_dropped(self, tmp_path: Path) -> None:
+        state_dir = tmp_path / "ci-scheduler"
+        state_dir.mkdir()
+        stale = {"id": "x", "pid": 2**22 + 1, "repository": "org/repo", "check": "tox", "cpu": 2, "memory_mb": 1}
+        (state_dir / "state.json").write_text(json.dumps({"running": [{**stale, "since": 0}], "waiting": []}))
+
+        scheduler = _scheduler(tmp_path, cpu_slots=2)
+        async with scheduler.slot(repository="org/repo", check_name="tox", logger=Mock(), log_prefix="[TEST]"):
+            usage = await scheduler.usage()
+            assert [job["check"] for job in usage.running] == ["tox"]
+            assert usage.cpu_in_use == 2
+
+    @staticmethod
+    async def _hold(scheduler: JobScheduler, repository: str, check_name: str) -> None:
+        async with scheduler.slot(repository=repository, check_name=check_name, logger=Mock(), log_prefix="[TEST]"):
+            await asyncio.sleep(0)
@@ -0,0 +1,114 @@
+"""Tests for webhook_server.utils.label_catalog — repository label catalog and reconciliation."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from github.GithubException import GithubException
+
+from webhook_server.utils.label_catalog import CatalogLabel, RepositoryLabelCatalog
+
+REPO = "test-org/test-repo"
+
+
+async def _loaded_catalog(*labels: CatalogLabel) -> RepositoryLabelCatalog:
+    catalog = RepositoryLabelCatalog()
+    await catalog.get_or_load(
+        repo_full_name=REPO, fetch=AsyncMock(return_value=list(labels)), logger=Mock(), log_prefix="[TEST]"
+    )
+    return catalog
+
+
+class TestRepositoryLabelCatalog:
+    """Tests for loading, label events and background reconciliation."""
+
+    @pytest.mark.asyncio
+    async def test_loaded_once_and_case_insensitive(self) -> None:
+        catalog = RepositoryLabelCatalog()
+        fetch = AsyncMock(return_value=[CatalogLabel(name="Size/XS", color="EDEDED")])
+
+        for _ in range(2):
+            await catalog.get_or_load(repo_full_name=REPO, fetch=fetch, logger=Mock(), log_prefix="[TEST]")
+
+        fetch.assert_awaited_once()
+        assert not catalog.needs_reconcile(repo_full_name=REPO, name="size/xs", color="ededed")
+        assert catalog.needs_reconcile(repo_full_name=REPO, name="size/xs", color="0e8a16")
+        assert catalog.needs_reconcile(repo_full_name=REPO, name="size/S", color="0e8a16")
+
+    @pytest.mark.asyncio
+    async def test_expired_catalog_is_reloaded(self) -> None:
+        catalog = RepositoryLabelCatalog(ttl_seconds=0)
+        fetch = AsyncMock(side_effect=[[CatalogLabel(name="wip", color="ededed")], []])
+
+        await catalog.get_or_load(repo_full_name=REPO, fetch=fetch, logger=Mock(), log_prefix="[TEST]")
+        # Expired: label events no longer apply and the next lookup reloads
+        assert catalog.get(REPO) is None
+        assert not catalog.observe_event(REPO, {"action": "created", "label": {"name": "hold", "color": "b60205"}})
+        assert await catalog.get_or_load(repo_full_name=REPO, fetch=fetch, logger=Mock(), log_prefix="[TEST]") == {}
+
+        assert fetch.await_count == 2
+        assert catalog.needs_reconcile(repo_full_name=REPO, name="wip", color="ededed")
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self) -> None:
+        catalog = RepositoryLabelCatalog()
+
+        with pytest.raises(RuntimeError):
+            await catalog.get_or_load(
+                repo_full_name=REPO, fetch=AsyncMock(side_effect=RuntimeError), logger=Mock(), log_prefix="[TEST]"
+            )
+
+        assert catalog.get(REPO) is None
+        assert catalog.needs_reconcile(repo_full_name=REPO, name="wip", color="ededed")
+
+    @pytest.mark.asyncio
+    async def test_label_events(self) -> None:
+        catalog = await _loaded_catalog(CatalogLabel(name="old", color="ededed"))
+
+        assert catalog.observe_event(REPO, {"action": "created", "label": {"name": "wip", "color": "D4C5F9"}})
+        assert catalog.observe_event(
+            REPO,
+            {"action": "edited", "label": {"name": "new", "color": "000000"}, "changes": {"name": {"from": "old"}}},
+        )
+        assert catalog.observe_event(REPO, {"action": "deleted", "label": {"name": "WIP", "color": "d4c5f9"}})
+
+        assert catalog.get(REPO) == {"new": CatalogLabel(name="new", color="000000")}
+        # Events for repositories whose catalog was never loaded are ignored
+        assert not catalog.observe_event("other/repo", {"action": "created", "label": {"name": "wip"}})
+
+    @pytest.mark.asyncio
+    async def test_reconcile_creates_missing_and_recolors_drifted_labels(self) -> None:
+        catalog = await _loaded_catalog(CatalogLabel(name="hold", color="000000"))
+        repository = Mock()
+        hold = Mock()
+        hold.name = "hold"
+        repository.get_label.return_value = hold
+
+        for name, color in (("hold", "b60205"), ("size/XS", "ededed")):
+            catalog.schedule_reconcile(
+                repo_full_name=REPO, name=name, color=color, repository=repository, logger=Mock(), log_prefix="[TEST]"
+            )
+        await catalog.wait_reconciled(REPO)
+
+        hold.edit.assert_called_once_with(name="hold", color="b60205")
+        repository.create_label.assert_called_once_with(name="size/XS", color="ededed")
+        assert not catalog.needs_reconcile(repo_full_name=REPO, name="hold", color="b60205")
+        assert not catalog.needs_reconcile(repo_full_name=REPO, name="size/XS", color="ededed")
+
+    @pytest.mark.asyncio
+    async def test_reconcile_edits_label_created_meanwhile(self) -> None:
+        catalog = await _loaded_catalog()
+        repository = Mock()
+        repository.create_label.side_effect = GithubException(422, {"message": "already_exists"})
+        wip = Mock()
+        wip.name = "wip"
+        repository.get_label.return_value = wip
+
+        catalog.schedule_reconcile(
+            repo_full_name=REPO, name="wip", color="d4c5f9", repository=repository, logger=Mock(), log_prefix="[TEST]"
+        )
+        await catalog.wait_reconciled(REPO)
+
+        wip.edit.assert_called_once_with(name="wip", color="d4c5f9")
+        assert not catalog.needs_reconcile(repo_full_name=REPO, name="wip", color="d4c5f9")
@@ -0,0 +1,98 @@
+"""Tests for webhook_server.utils.label_state — per-pull-request label state."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from webhook_server.utils.label_state import PullRequestLabelState
+
+REPO = "test-org/test-repo"
+
+
+def _payload(labels: list[str], updated_at: str, key: str = "pull_request") -> dict[str, Any]:
+    data: dict[str, Any] = {"number": 7, "updated_at": updated_at, "labels": [{"name": name} for name in labels]}
+    if key == "issue":
+        data["pull_request"] = {"url": "https://api.github.com/repos/test-org/test-repo/pulls/7"}
+    return {"action": "labeled", key: data}
+
+
+class TestPullRequestLabelState:
+    """Tests for seeding, ordering and write-through of cached labels."""
+
+    def test_seed_from_pull_request_and_issue_payloads(self) -> None:
+        state = PullRequestLabelState()
+
+        assert state.observe_payload(repo_full_name=REPO, hook_data=_payload(["bug"], "2026-01-01T10:00:00Z"))
+        assert state.get(repo_full_name=REPO, number=7) == ["bug"]
+
+        issue_payload = _payload(["bug", "lgtm"], "2026-01-01T10:01:00Z", key="issue")
+        assert state.observe_payload(repo_full_name=REPO, hook_data=issue_payload)
+        assert state.get(repo_full_name=REPO, number=7) == ["bug", "lgtm"]
+
+        # Plain issues and payloads without a pull request are ignored
+        plain_issue = {"issue": {"number": 8, "labels": []}}
+        assert not state.observe_payload(repo_full_name=REPO, hook_data=plain_issue)
+        assert not state.observe_payload(repo_full_name=REPO, hook_data={"check_run": {}})
+        assert state.get(repo_full_name=REPO, number=8) is None
+
+    def test_older_payload_does_not_override_newer_state(self) -> None:
+        state = PullRequestLabelState()
+        state.observe_payload(repo_full_name=REPO, hook_data=_payload(["bug", "wip"], "2026-01-01T10:05:00Z"))
+
+        assert not state.observe_payload(repo_full_name=REPO, hook_data=_payload(["bug"], "2026-01-01T10:00:00Z"))
+        assert state.get(repo_full_name=REPO, number=7) == ["bug", "wip"]
+
+    def test_write_through_supersedes_payloads_it_was_built_on(self) -> None:
+        state = PullRequestLabelState()
+        # Far in the future: ordering must not depend on the server clock
+        basis = "2099-01-01T10:00:00Z"
+        state.observe_payload(repo_full_name=REPO, hook_data=_payload(["bug"], basis))
+
+        state.record_added(repo_full_name=REPO, number=7, label="hold")
+        state.record_removed(repo_full_name=REPO, number=7, label="bug")
+        assert state.get(repo_full_name=REPO, number=7) == ["hold"]
+
+        # The payload our writes were based on (e.g. re-observed by another handler) cannot undo them
+        assert not state.observe_payload(repo_full_name=REPO, hook_data=_payload(["bug"], basis))
+        assert state.get(repo_full_name=REPO, number=7) == ["hold"]
+
+        # The event of our own write is newer on GitHub's clock and replaces the entry
+        assert state.observe_payload(repo_full_name=REPO, hook_data=_payload(["hold"], "2099-01-01T10:00:01Z"))
+        assert state.get(repo_full_name=REPO, number=7) == ["hold"]
+
+    def test_untimed_read_keeps_the_github_timestamp(self) -> None:
+        state = PullRequestLabelState()
+        state.observe_payload(repo_full_name=REPO, hook_data=_payload(["bug"], "2026-01-01T10:05:00Z"))
+
+        assert state.observe(repo_full_name=REPO, number=7, labels=["bug", "lgtm"])
+
+        assert not state.observe_payload(repo_full_name=REPO, hook_data=_payload(["bug"], "2026-01-01T10:00:00Z"))
+        assert state.get(repo_full_name=REPO, number=7) == ["bug", "lgtm"]
+
+    def test_write_lock_is_shared_per_pull_request(self) -> None:
+        state = PullRequestLabelState()
+        lock = state.write_lock(repo_full_name=REPO, number=7)
+        assert state.write_lock(repo_full_name=REPO, number=7) is lock
+        assert state.write_lock(repo_full_name=REPO, number=8) is not lock
+
+    def test_write_through_ignores_unknown_pull_requests(self) -> None:
+        state = PullRequestLabelState()
+
+        state.record_added(repo_full_name=REPO, number=7, label="hold")
+
+        assert state.get(repo_full_name=REPO, number=7) is None
+
+    def test_expiry_invalidate_and_eviction(self) -> None:
+        state = PullRequestLabelState(max_entries=2, ttl_seconds=0)
+        state.observe(repo_full_name=REPO, number=1, labels=["bug"])
+        assert state.get(repo_full_name=REPO, number=1) is None
+
+        state = PullRequestLabelState(max_entries=2)
+        for number in (1, 2, 3):
+            state.observe(repo_full_name=REPO, number=number, labels=["bug"])
+        assert len(state) == 2
+        assert state.get(repo_full_name=REPO, number=1) is None
+
+        state.invalidate(repo_full_name=REPO, number=2)
+        assert state.get(repo_full_name=REPO, number=2) is None
+        assert state.get(repo_full_name=REPO, number=3) == ["bug"]
@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock, call, patch
 
 import pytest
 from github.GithubException import UnknownObjectException
@@ -20,6 +20,8 @@ from webhook_server.utils.constants import (
     VERIFIED_LABEL_STR,
     WIP_STR,
 )
+from webhook_server.utils.diff_cache import DiffStats, diff_stats_cache
+from webhook_server.utils.label_catalog import CatalogLabel, repository_label_catalog
 
 
 class MockPullRequest:
@@ -104,6 +106,74 @@ class TestLabelsHandler:
 
         assert result == f"{SIZE_LABEL_PREFIX}{expected_size}"
 
+    @pytest.mark.asyncio
+    async def test_get_size_uses_cached_diff_stats(self, labels_handler: LabelsHandler) -> None:
+        """Test get_size reads cached diff stats instead of the PR additions/deletions API."""
+        labels_handler.github_webhook.repository_full_name = "test-org/test-repo"
+        labels_handler.github_webhook.pr_base_sha = "base-sha"
+        labels_handler.github_webhook.pr_head_sha = "head-sha"
+        diff_stats_cache.put(
+            "test-org/test-repo", "base-sha", "head-sha", DiffStats(files=("a.py",), additions=60, deletions=30)
+        )
+        pull_request = Mock(spec=PullRequest)
+
+        with patch("webhook_server.libs.handlers.labels_handler.github_api_call", new=AsyncMock()) as mock_api:
+            result = await labels_handler.get_size(pull_request=pull_request)
+
+        assert result == f"{SIZE_LABEL_PREFIX}M"
+        mock_api.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_add_size_label_from_payload_without_api_calls(
+        self, mock_github_webhook: Mock, mock_owners_handler: Mock
+    ) -> None:
+        """Test the size label is computed from the payload line counts and labels, with no GET calls."""
+        mock_github_webhook.repository_full_name = "test-org/test-repo"
+        mock_github_webhook.hook_data = {
+            "action": "synchronize",
+            "pull_request": {
+                "number": 123,
+                "updated_at": "2026-01-01T10:00:00Z",
+                "additions": 150,
+                "deletions": 100,
+                "changed_files": 4,
+                "labels": [{"name": f"{SIZE_LABEL_PREFIX}M"}],
+            },
+        }
+        handler = LabelsHandler(github_webhook=mock_github_webhook, owners_file_handler=mock_owners_handler)
+        pull_request = Mock(spec=PullRequest)
+        pull_request.number = 123
+
+        with (
+            patch.object(handler, "update_labels", new_callable=AsyncMock) as mock_update,
+            patch("webhook_server.libs.handlers.labels_handler.github_api_call", new=AsyncMock()) as mock_api,
+        ):
+            await handler.add_size_label(pull_request=pull_request)
+
+        mock_update.assert_called_once_with(
+            pull_request=pull_request, add=[f"{SIZE_LABEL_PREFIX}L"], remove=[f"{SIZE_LABEL_PREFIX}M"]
+        )
+        mock_api.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_table_compiled_once_per_config(self, mock_github_webhook: Mock) -> None:
+        """Test thresholds are compiled once per repository and recompiled when the config changes."""
+        mock_github_webhook.repository_full_name = "test-org/size-thresholds-repo"
+        mock_github_webhook.config.get_value.return_value = {"Small": {"threshold": 10}, "Big": {"threshold": "inf"}}
+        handler = LabelsHandler(github_webhook=mock_github_webhook, owners_file_handler=Mock())
+        pull_request = Mock(spec=PullRequest)
+        pull_request.additions = 5
+        pull_request.deletions = 10
+
+        with patch.object(handler, "_parse_pr_size_thresholds", wraps=handler._parse_pr_size_thresholds) as mock_parse:
+            assert await handler.get_size(pull_request=pull_request) == f"{SIZE_LABEL_PREFIX}Big"
+            assert await handler.get_size(pull_request=pull_request) == f"{SIZE_LABEL_PREFIX}Big"
+            assert mock_parse.call_count == 1
+
+            mock_github_webhook.config.get_value.return_value = {"Small": {"threshold": 100}}
+            assert await handler.get_size(pull_request=pull_request) == f"{SIZE_LABEL_PREFIX}Small"
+            assert mock_parse.call_count == 2
+
     @pytest.mark.asyncio
     async def test_add_label_success(self, labels_handler: LabelsHandler, mock_pull_request: Mock) -> None:
         """Test successful label addition."""
@@ -149,26 +219,28 @@ class TestLabelsHandler:
 
     @pytest.mark.asyncio
     async def test_add_label_static_label(self, labels_handler: LabelsHandler, mock_pull_request: Mock) -> None:
-        """Test _add_label with static label."""
+        """Test _add_label attaches a missing static label and creates it in the background."""
         static_label = next(iter(STATIC_LABELS_DICT.keys()))
+        labels_handler.repository_full_name = "test-org/test-repo"
+        labels_handler.repository.get_labels.return_value = []
         with patch.object(
             labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, return_value=False
         ) as mock_exists:
-            with patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=True):
-                # Mock repository.get_label to return a mock label
-                mock_label = Mock()
-                labels_handler.repository.get_label = Mock(return_value=mock_label)
-
-                await labels_handler._add_label(mock_pull_request, static_label)
-
-                # Verify label_exists_in_pull_request was called
-                mock_exists.assert_called_once()
-                # Verify repository.get_label was called to fetch the label
-                labels_handler.repository.get_label.assert_called_once_with(static_label)
-                # Verify the label was edited with the correct color
-                mock_label.edit.assert_called_once()
-                # Verify add_to_labels was called on the pull request
-                mock_pull_request.add_to_labels.assert_called_once_with(static_label)
+            await labels_handler._add_label(mock_pull_request, static_label)
+            await repository_label_catalog.wait_reconciled("test-org/test-repo")
+
+            # Verify label_exists_in_pull_request was called
+            mock_exists.assert_called_once()
+            # Verify add_to_labels was called on the pull request
+            mock_pull_request.add_to_labels.assert_called_once_with(static_label)
+            # Verify the missing repository label was created with its color by the reconciliation pass
+            labels_handler.repository.create_label.assert_called_once_with(
+                name=static_label, color=STATIC_LABELS_DICT[static_label]
+            )
+            labels_handler.repository.get_label.assert_not_called()
+            assert not repository_label_catalog.needs_reconcile(
+                repo_full_name="test-org/test-repo", name=static_label, color=STATIC_LABELS_DICT[static_label]
+            )
 
     @pytest.mark.asyncio
     async def test_add_label_exception_handling(self, labels_handler: LabelsHandler, mock_pull_request: Mock) -> None:
@@ -215,40 +287,6 @@ class TestLabelsHandler:
                         result = await labels_handler._remove_label(mock_pull_request, "test-label")
                         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_remove_label_exception_during_wait(
-        self, labels_handler: LabelsHandler, mock_pull_request: Mock
-    ) -> None:
-        """Test _remove_label with exception during wait operation."""
-        with patch("timeout_sampler.TimeoutWatch") as mock_timeout:
-            mock_timeout.return_value.remaining_time.side_effect = [10, 10, 0]
-            with patch("asyncio.sleep", new_callable=AsyncMock):
-                with patch.object(
-                    labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, side_effect=[True, False]
-                ):
-                    with patch.object(
-                        labels_handler, "wait_for_label", new_callable=AsyncMock, side_effect=Exception("Wait failed")
-                    ):
-                        result = await labels_handler._remove_label(mock_pull_request, "test-label")
-                        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_remove_label_wait_for_label_exception(
-        self, labels_handler: LabelsHandler, mock_pull_request: Mock
-    ) -> None:
-        """Test _remove_label with exception during wait_for_label."""
-        with patch("timeout_sampler.TimeoutWatch") as mock_timeout:
-            mock_timeout.return_value.remaining_time.side_effect = [10, 10, 0]
-            with patch("asyncio.sleep", new_callable=AsyncMock):
-                with patch.object(
-                    labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, side_effect=[True, False]
-                ):
-                    with patch.object(
-                        labels_handler, "wait_for_label", new_callable=AsyncMock, side_effect=Exception("Wait failed")
-                    ):
-                        result = await labels_handler._remove_label(mock_pull_request, "test-label")
-                        assert result is False
-
     @pytest.mark.asyncio
     async def test_remove_label_not_exists(self, labels_handler: LabelsHandler, mock_pull_request: Mock) -> None:
         """Test _remove_label when label doesn't exist (acceptable outcome)."""
@@ -259,99 +297,156 @@ class TestLabelsHandler:
             mock_pull_request.remove_from_labels.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_remove_label_wait_timeout(self, labels_handler: LabelsHandler, mock_pull_request: Mock) -> None:
-        """Test _remove_label when removal succeeds but wait_for_label times out."""
-        with patch("timeout_sampler.TimeoutWatch") as mock_timeout:
-            mock_timeout.return_value.remaining_time.side_effect = [10, 10, 0]
-            with patch("asyncio.sleep", new_callable=AsyncMock):
-                with patch.object(
-                    labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, side_effect=[True, True]
-                ):
-                    # wait_for_label returns False (timeout)
-                    with patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=False):
-                        result = await labels_handler._remove_label(mock_pull_request, "test-label")
-                        assert result is False
-                        mock_pull_request.remove_from_labels.assert_called_once_with("test-label")
+    async def test_labels_seeded_from_payload(self, mock_github_webhook: Mock, mock_owners_handler: Mock) -> None:
+        """Test the payload labels are used without listing the pull request labels."""
+        mock_github_webhook.repository_full_name = "test-org/test-repo"
+        mock_github_webhook.hook_data = {
+            "action": "labeled",
+            "pull_request": {
+                "number": 123,
+                "updated_at": "2026-01-01T10:00:00Z",
+                "labels": [{"name": "bug"}, {"name": WIP_STR}],
+            },
+        }
+        handler = LabelsHandler(github_webhook=mock_github_webhook, owners_file_handler=mock_owners_handler)
+        pull_request = Mock(spec=PullRequest)
+        pull_request.number = 123
+
+        assert await handler.pull_request_labels_names(pull_request=pull_request) == ["bug", WIP_STR]
+        assert await handler.label_exists_in_pull_request(pull_request=pull_request, label=WIP_STR)
+        pull_request.get_labels.assert_not_called()
+
+        # Another worker removed the label; a fresh read (merge eligibility) sees it and updates the state
+        bug = Mock()
+        bug.name = "bug"
+        pull_request.get_labels.return_value = [bug]
+        assert await handler.pull_request_labels_names(pull_request=pull_request, fresh=True) == ["bug"]
+        assert await handler.pull_request_labels_names(pull_request=pull_request) == ["bug"]
+        pull_request.get_labels.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_add_label_dynamic_label_wait_exception(
-        self, labels_handler: LabelsHandler, mock_pull_request: Mock
-    ) -> None:
-        """Test _add_label with exception during wait for dynamic label."""
-        dynamic_label = "dynamic-label"
-        with patch("timeout_sampler.TimeoutWatch") as mock_timeout:
-            mock_timeout.return_value.remaining_time.side_effect = [10, 10, 0]
-            with patch("asyncio.sleep", new_callable=AsyncMock):
-                with patch.object(
-                    labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, side_effect=[False, True]
-                ):
-                    with patch.object(
-                        labels_handler.repository, "get_label", side_effect=Exception("Get label failed")
-                    ):
-                        with patch.object(labels_handler.repository, "create_label"):
-                            with patch.object(
-                                labels_handler,
-                                "wait_for_label",
-                                new_callable=AsyncMock,
-                                side_effect=Exception("Wait failed"),
-                            ):
-                                # Should not raise exception
-                                try:
-                                    await labels_handler._add_label(mock_pull_request, dynamic_label)
-                                except Exception:
-                                    # This is expected behavior
-                                    pass
+    async def test_label_writes_update_label_state(self, labels_handler: LabelsHandler) -> None:
+        """Test added and removed labels are visible immediately, with a single labels GET."""
+        labels_handler.repository_full_name = "test-org/test-repo"
+        pull_request = Mock(spec=PullRequest)
+        pull_request.number = 123
+        existing = Mock()
+        existing.name = "bug"
+        pull_request.get_labels.return_value = [existing]
+
+        assert await labels_handler._add_label(pull_request=pull_request, label=HOLD_LABEL_STR) is True
+        assert await labels_handler.pull_request_labels_names(pull_request=pull_request) == ["bug", HOLD_LABEL_STR]
+
+        assert await labels_handler._remove_label(pull_request=pull_request, label="bug") is True
+        assert await labels_handler.pull_request_labels_names(pull_request=pull_request) == [HOLD_LABEL_STR]
+
+        pull_request.get_labels.assert_called_once()
+        pull_request.add_to_labels.assert_called_once_with(HOLD_LABEL_STR)
+        pull_request.remove_from_labels.assert_called_once_with("bug")
 
     @pytest.mark.asyncio
-    async def test_add_label_static_label_wait_exception(
-        self, labels_handler: LabelsHandler, mock_pull_request: Mock
-    ) -> None:
-        """Test _add_label with exception during wait for static label.
+    async def test_failed_label_write_invalidates_label_state(self, labels_handler: LabelsHandler) -> None:
+        """Test a failed write drops the cached labels so the next read refetches them."""
+        labels_handler.repository_full_name = "test-org/test-repo"
+        pull_request = Mock(spec=PullRequest)
+        pull_request.number = 123
+        pull_request.get_labels.return_value = []
+        pull_request.add_to_labels.side_effect = Exception("Test error")
 
-        When wait_for_label raises an exception, it should propagate (fail-fast).
-        """
-        static_label = next(iter(STATIC_LABELS_DICT.keys()))
-        with patch("timeout_sampler.TimeoutWatch") as mock_timeout:
-            mock_timeout.return_value.remaining_time.side_effect = [10, 10, 0]
-            with patch("asyncio.sleep", new_callable=AsyncMock):
-                with patch.object(
-                    labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, side_effect=[False, True]
-                ):
-                    with patch.object(
-                        labels_handler, "wait_for_label", new_callable=AsyncMock, side_effect=Exception("Wait failed")
-                    ):
-                        # Exception should propagate (fail-fast architecture)
-                        with pytest.raises(Exception, match="Wait failed"):
-                            await labels_handler._add_label(mock_pull_request, static_label)
+        with pytest.raises(Exception, match="Test error"):
+            await labels_handler._add_label(pull_request=pull_request, label="bug")
+
+        await labels_handler.pull_request_labels_names(pull_request=pull_request)
+        assert pull_request.get_labels.call_count == 2
 
     @pytest.mark.asyncio
-    async def test_wait_for_label_success(self, labels_handler: LabelsHandler, mock_pull_request: Mock) -> None:
-        """Test wait_for_label with success."""
-        with patch("timeout_sampler.TimeoutWatch") as mock_timeout:
-            mock_timeout.return_value.remaining_time.side_effect = [10, 10, 0]
-            with patch("asyncio.sleep", new_callable=AsyncMock):
-                with patch.object(
-                    labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, side_effect=[True]
-                ):
-                    result = await labels_handler.wait_for_label(mock_pull_request, "test-label", exists=True)
-                    assert result is True
+    async def test_label_batch_applies_changes_in_one_write(self, labels_handler: LabelsHandler) -> None:
+        """Test changes declared inside a batch are diffed and written once, label by label."""
+        labels_handler.repository_full_name = "test-org/test-repo"
+        pull_request = Mock(spec=PullRequest)
+        pull_request.number = 123
+        existing = []
+        for name in ("bug", f"{SIZE_LABEL_PREFIX}M", VERIFIED_LABEL_STR):
+            label = Mock()
+            label.name = name
+            existing.append(label)
+        pull_request.get_labels.return_value = existing
+
+        with patch.object(labels_handler, "_ensure_repository_label", new_callable=AsyncMock):
+            async with labels_handler.label_batch(pull_request=pull_request):
+                assert await labels_handler._remove_label(pull_request=pull_request, label="bug") is True
+                assert await labels_handler._add_label(pull_request=pull_request, label=HOLD_LABEL_STR) is True
+                await labels_handler.update_labels(
+                    pull_request=pull_request, add=[f"{SIZE_LABEL_PREFIX}L"], remove=[f"{SIZE_LABEL_PREFIX}M"]
+                )
+                # Added and removed again within the batch: the last declaration wins
+                await labels_handler.update_labels(pull_request=pull_request, add=[WIP_STR])
+                await labels_handler.update_labels(pull_request=pull_request, remove=[WIP_STR])
+
+                assert await labels_handler.pull_request_labels_names(pull_request=pull_request) == [
+                    VERIFIED_LABEL_STR,
+                    HOLD_LABEL_STR,
+                    f"{SIZE_LABEL_PREFIX}L",
+                ]
+                pull_request.remove_from_labels.assert_not_called()
+                pull_request.add_to_labels.assert_not_called()
+
+        # Never replaced as a whole from cached labels, so labels added meanwhile by others survive
+        pull_request.set_labels.assert_not_called()
+        assert pull_request.remove_from_labels.call_args_list == [call("bug"), call(f"{SIZE_LABEL_PREFIX}M")]
+        pull_request.add_to_labels.assert_called_once_with(HOLD_LABEL_STR, f"{SIZE_LABEL_PREFIX}L")
+        assert await labels_handler.pull_request_labels_names(pull_request=pull_request) == [
+            VERIFIED_LABEL_STR,
+            HOLD_LABEL_STR,
+            f"{SIZE_LABEL_PREFIX}L",
+        ]
+        pull_request.get_labels.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_wait_for_label_exception_during_check(
-        self, labels_handler: LabelsHandler, mock_pull_request: Mock
-    ) -> None:
-        """Test wait_for_label with exception during label check."""
-        with patch("timeout_sampler.TimeoutWatch") as mock_timeout:
-            mock_timeout.return_value.remaining_time.side_effect = [10, 10, 0]
-            with patch("asyncio.sleep", new_callable=AsyncMock):
-                with patch.object(
-                    labels_handler,
-                    "label_exists_in_pull_request",
-                    new_callable=AsyncMock,
-                    side_effect=Exception("Check failed"),
-                ):
-                    with pytest.raises(Exception, match="Check failed"):
-                        await labels_handler.wait_for_label(mock_pull_request, "test-label", exists=True)
+    async def test_update_labels_single_removal_uses_remove_and_add(self, labels_handler: LabelsHandler) -> None:
+        """Test one removal is written as a remove/add pair and unchanged labels are skipped."""
+        labels_handler.repository_full_name = "test-org/test-repo"
+        pull_request = Mock(spec=PullRequest)
+        pull_request.number = 123
+        existing = Mock()
+        existing.name = "bug"
+        pull_request.get_labels.return_value = [existing]
+        await labels_handler.pull_request_labels_names(pull_request=pull_request)
+
+        with patch.object(labels_handler, "_ensure_repository_label", new_callable=AsyncMock):
+            await labels_handler.update_labels(
+                pull_request=pull_request, add=[HOLD_LABEL_STR], remove=["bug", "absent"]
+            )
+            await labels_handler.update_labels(pull_request=pull_request, add=[HOLD_LABEL_STR])
+
+        pull_request.remove_from_labels.assert_called_once_with("bug")
+        pull_request.add_to_labels.assert_called_once_with(HOLD_LABEL_STR)
+        pull_request.set_labels.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_labels_tolerates_label_removed_meanwhile(self, labels_handler: LabelsHandler) -> None:
+        """Test a label already removed elsewhere (404) counts as removed and the other changes are written."""
+        labels_handler.repository_full_name = "test-org/test-repo"
+        pull_request = Mock(spec=PullRequest)
+        pull_request.number = 123
+        existing = []
+        for name in ("bug", WIP_STR):
+            label = Mock()
+            label.name = name
+            existing.append(label)
+        pull_request.get_labels.return_value = existing
+        pull_request.remove_from_labels.side_effect = [
+            UnknownObjectException(404, {"message": "Label does not exist"}),
+            None,
+        ]
+        await labels_handler.pull_request_labels_names(pull_request=pull_request)
+
+        with patch.object(labels_handler, "_ensure_repository_label", new_callable=AsyncMock):
+            await labels_handler.update_labels(pull_request=pull_request, add=[HOLD_LABEL_STR], remove=["bug", WIP_STR])
+
+        pull_request.add_to_labels.assert_called_once_with(HOLD_LABEL_STR)
+        assert await labels_handler.pull_request_labels_names(pull_request=pull_request) == [HOLD_LABEL_STR]
+        pull_request.get_labels.assert_called_once()
 
     async def test_label_by_user_comment_authorized_user(self, labels_handler: LabelsHandler) -> None:
         """Test user-requested labeling by authorized user."""
@@ -361,7 +456,6 @@ class TestLabelsHandler:
 
         with (
             patch.object(labels_handler, "_add_label", new_callable=AsyncMock) as mock_add,
-            patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=True),
         ):
             await labels_handler.label_by_user_comment(
                 pull_request=pull_request, user_requested_label=label_name, remove=False, reviewed_user=user
@@ -377,7 +471,6 @@ class TestLabelsHandler:
 
         with (
             patch.object(labels_handler, "_add_label", new_callable=AsyncMock) as mock_add,
-            patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=True),
         ):
             await labels_handler.label_by_user_comment(
                 pull_request=pull_request, user_requested_label=label_name, remove=False, reviewed_user=user
@@ -394,7 +487,6 @@ class TestLabelsHandler:
 
         with (
             patch.object(labels_handler, "_remove_label", new_callable=AsyncMock) as mock_remove,
-            patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=True),
         ):
             await labels_handler.label_by_user_comment(
                 pull_request=pull_request, user_requested_label=label_name, remove=True, reviewed_user=user
@@ -417,15 +509,14 @@ class TestLabelsHandler:
 
         with (
             patch.object(pull_request, "get_labels", return_value=existing_labels),
-            patch.object(labels_handler, "_remove_label", new_callable=AsyncMock) as mock_remove,
-            patch.object(labels_handler, "_add_label", new_callable=AsyncMock) as mock_add,
-            patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=True),
+            patch.object(labels_handler, "update_labels", new_callable=AsyncMock) as mock_update,
         ):
             await labels_handler.add_size_label(pull_request=pull_request)
 
-            # Should remove old size label and add new one
-            mock_remove.assert_called_once_with(pull_request=pull_request, label=f"{SIZE_LABEL_PREFIX}M")
-            mock_add.assert_called_once_with(pull_request=pull_request, label=f"{SIZE_LABEL_PREFIX}L")
+            # Old size label is replaced by the new one in a single update
+            mock_update.assert_called_once_with(
+                pull_request=pull_request, add=[f"{SIZE_LABEL_PREFIX}L"], remove=[f"{SIZE_LABEL_PREFIX}M"]
+            )
 
     async def test_size_label_no_existing_size_label(self, labels_handler: LabelsHandler) -> None:
         """Test adding size label when no existing size label."""
@@ -442,15 +533,12 @@ class TestLabelsHandler:
 
         with (
             patch.object(pull_request, "get_labels", return_value=existing_labels),
-            patch.object(labels_handler, "_remove_label", new_callable=AsyncMock) as mock_remove,
-            patch.object(labels_handler, "_add_label", new_callable=AsyncMock) as mock_add,
-            patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=True),
+            patch.object(labels_handler, "update_labels", new_callable=AsyncMock) as mock_update,
         ):
             await labels_handler.add_size_label(pull_request=pull_request)
 
             # Should not remove any label, just add new size label
-            mock_remove.assert_not_called()
-            mock_add.assert_called_once_with(pull_request=pull_request, label=f"{SIZE_LABEL_PREFIX}M")
+            mock_update.assert_called_once_with(pull_request=pull_request, add=[f"{SIZE_LABEL_PREFIX}M"], remove=[])
 
     @pytest.mark.asyncio
     async def test_size_threshold_boundaries(self, labels_handler: LabelsHandler) -> None:
@@ -485,7 +573,6 @@ class TestLabelsHandler:
         with (
             patch.object(labels_handler, "_add_label", new_callable=AsyncMock) as mock_add,
             patch.object(labels_handler, "_remove_label", new_callable=AsyncMock) as mock_remove,
-            patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=True),
         ):
             # Run concurrent operations
             await asyncio.gather(
@@ -500,37 +587,47 @@ class TestLabelsHandler:
             assert mock_remove.call_count == 1
 
     @pytest.mark.asyncio
-    async def test_add_label_dynamic_label_edit_exception(
+    async def test_add_label_recolors_drifted_repository_label(
         self, labels_handler: LabelsHandler, mock_pull_request: Mock
     ) -> None:
-        """Test _add_label with dynamic label where edit raises exception and label is created."""
+        """Test a repository label with another color is edited in the background, not on the hot path."""
+        labels_handler.repository_full_name = "test-org/test-repo"
+        drifted = Mock()
+        drifted.name = "dynamic-label"
+        drifted.color = "000000"
+        labels_handler.repository.get_labels.return_value = [drifted]
+        mock_label = Mock()
+        mock_label.name = "dynamic-label"
+        labels_handler.repository.get_label.return_value = mock_label
+
         with patch.object(labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, return_value=False):
-            with patch.object(mock_pull_request, "get_labels", return_value=[]):
-                with patch("asyncio.to_thread") as mock_to_thread:
-                    # get_label raises UnknownObjectException, create_label raises Exception
-                    mock_to_thread.side_effect = [
-                        UnknownObjectException(404, "Not found"),
-                        Exception("Create failed"),
-                        None,
-                    ]
-                    with pytest.raises(Exception, match="Create failed"):
-                        await labels_handler._add_label(mock_pull_request, "dynamic-label")
+            assert await labels_handler._add_label(mock_pull_request, "dynamic-label") is True
+            await repository_label_catalog.wait_reconciled("test-org/test-repo")
+
+        mock_pull_request.add_to_labels.assert_called_once_with("dynamic-label")
+        labels_handler.repository.create_label.assert_not_called()
+        labels_handler.repository.get_label.assert_called_once_with("dynamic-label")
+        mock_label.edit.assert_called_once_with(name="dynamic-label", color="D4C5F9")
 
     @pytest.mark.asyncio
-    async def test_add_label_dynamic_label_edit_success(
+    async def test_add_label_known_repository_label_only_attaches(
         self, labels_handler: LabelsHandler, mock_pull_request: Mock
     ) -> None:
-        """Test _add_label with dynamic label where edit succeeds."""
+        """Test labels present in the catalog with the right color cost only the attach call."""
+        labels_handler.repository_full_name = "test-org/test-repo"
+        await repository_label_catalog.get_or_load(
+            repo_full_name="test-org/test-repo",
+            fetch=AsyncMock(return_value=[CatalogLabel(name="dynamic-label", color="d4c5f9")]),
+            logger=Mock(),
+            log_prefix="[TEST]",
+        )
+
         with patch.object(labels_handler, "label_exists_in_pull_request", new_callable=AsyncMock, return_value=False):
-            with patch.object(mock_pull_request, "get_labels", return_value=[]):
-                with patch.object(labels_handler, "wait_for_label", new_callable=AsyncMock, return_value=True):
-                    with patch("asyncio.to_thread") as mock_to_thread:
-                        # get_label returns label, edit succeeds, add_to_labels succeeds
-                        mock_label = Mock()
-                        mock_to_thread.side_effect = [mock_label, None, None]
-                        await labels_handler._add_label(mock_pull_request, "dynamic-label")
-                        # The method calls to_thread for: get_label, edit, add_to_labels, wait_for_label
-                        assert mock_to_thread.call_count >= 3
+            with patch("asyncio.to_thread") as mock_to_thread:
+                await labels_handler._add_label(mock_pull_request, "dynamic-label")
+
+        # Only add_to_labels goes to the API
+        mock_to_thread.assert_called_once_with(mock_pull_request.add_to_labels, "dynamic-label")
 
     @pytest.mark.asyncio
     async def test_manage_reviewed_by_label_approve_not_in_approvers(
@@ -616,11 +713,10 @@ class TestLabelsHandler:
             labels_handler, "pull_request_labels_names", new_callable=AsyncMock, return_value=[existing_size_label]
         ):
             with patch.object(
-                labels_handler, "_remove_label", new_callable=AsyncMock, side_effect=Exception("Remove failed")
+                labels_handler, "update_labels", new_callable=AsyncMock, side_effect=Exception("Remove failed")
             ):
-                with patch.object(labels_handler, "_add_label", new_callable=AsyncMock):
-                    with pytest.raises(Exception, match="Remove failed"):
-                        await labels_handler.add_size_label(mock_pull_request)
+                with pytest.raises(Exception, match="Remove failed"):
+                    await labels_handler.add_size_label(mock_pull_request)
 
     @pytest.mark.asyncio
     async def test_label_by_user_comment_lgtm_remove(
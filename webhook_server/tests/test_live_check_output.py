@@ -0,0 +1,68 @@
+"""Tests for webhook_server.utils.live_check_output — throttled live output of running checks."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from webhook_server.utils.live_check_output import LiveCheckOutput
+
+
+class TestLiveCheckOutput:
+    """Tests for the output tail, throttling and shutdown ordering."""
+
+    @pytest.mark.asyncio
+    async def test_output_is_coalesced_into_one_update_per_interval(self) -> None:
+        publish = AsyncMock()
+        live_output = LiveCheckOutput(publish=publish, interval=0.05, logger=Mock(), log_prefix="[TEST]", tail_chars=8)
+
+        for chunk in ("line-1\n", "line-2\n", "line-3\n"):
+            await live_output.write("stdout", chunk)
+        await asyncio.sleep(0.1)
+
+        # One update with the last 8 characters of everything written so far
+        publish.assert_awaited_once_with("\nline-3\n")
+        await live_output.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_drops_pending_update(self) -> None:
+        publish = AsyncMock()
+        live_output = LiveCheckOutput(publish=publish, interval=60, logger=Mock(), log_prefix="[TEST]")
+
+        await live_output.write("stderr", "output")
+        await live_output.aclose()
+        await live_output.write("stderr", "more output")
+
+        publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_aclose_waits_for_update_in_flight(self) -> None:
+        finished: list[str] = []
+
+        async def _publish(tail: str) -> None:
+            await asyncio.sleep(0.05)
+            finished.append(tail)
+
+        live_output = LiveCheckOutput(publish=_publish, interval=0, logger=Mock(), log_prefix="[TEST]")
+        await live_output.write("stdout", "output")
+        await asyncio.sleep(0)
+
+        await live_output.aclose()
+
+        assert finished == ["output"]
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_is_logged(self) -> None:
+        logger = Mock()
+        live_output = LiveCheckOutput(
+            publish=AsyncMock(side_effect=RuntimeError("rate limited")), interval=0, logger=logger, log_prefix="[TEST]"
+        )
+
+        await live_output.write("stdout", "output")
+        await asyncio.sleep(0.01)
+        await live_output.aclose()
+
+        logger.debug.assert_called_once()
+        assert "rate limited" in logger.debug.call_args.args[0]
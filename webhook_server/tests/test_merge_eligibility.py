@@ -0,0 +1,200 @@
+"""Tests for webhook_server.utils.merge_eligibility — incremental merge-eligibility state."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from webhook_server.utils.constants import CAN_BE_MERGED_STR
+from webhook_server.utils.merge_eligibility import (
+    CheckRunSnapshot,
+    MergeEligibilityState,
+    MergeEligibilityStates,
+    StatusSnapshot,
+)
+
+REPO = "test-org/test-repo"
+HEAD = "a" * 40
+
+
+async def _reconciled(states: MergeEligibilityStates, **kwargs: Any) -> MergeEligibilityState:
+    params: dict[str, Any] = {
+        "repo_full_name": REPO,
+        "number": 1,
+        "head_sha": HEAD,
+        "base_ref": "main",
+        "check_runs": [CheckRunSnapshot(name="tox", status="in_progress", id=10)],
+        "statuses": [StatusSnapshot(context="ci/jenkins", state="pending", id=5)],
+        "unresolved_threads": [{"id": "T1", "path": "a.py"}],
+        "mergeable": True,
+    }
+    params.update(kwargs)
+    return await states.reconcile(**params)
+
+
+async def _state(states: MergeEligibilityStates) -> MergeEligibilityState:
+    state = await states.get(repo_full_name=REPO, number=1, head_sha=HEAD)
+    assert state is not None
+    return state
+
+
+def _pull_request(**overrides: Any) -> dict[str, Any]:
+    pull_request: dict[str, Any] = {"number": 1, "state": "open", "head": {"sha": HEAD}, "base": {"ref": "main"}}
+    pull_request.update(overrides)
+    return pull_request
+
+
+class TestMergeEligibilityStates:
+    """Tests for reconciliation and incremental updates from webhook payloads."""
+
+    @pytest.mark.asyncio
+    async def test_get_requires_same_head_and_unexpired_state(self) -> None:
+        states = MergeEligibilityStates()
+        await _reconciled(states)
+
+        assert await states.get(repo_full_name=REPO, number=1, head_sha=HEAD) is not None
+        assert await states.get(repo_full_name=REPO, number=1, head_sha="b" * 40) is None
+
+        expired = MergeEligibilityStates(ttl_seconds=0)
+        await _reconciled(expired)
+        assert await expired.get(repo_full_name=REPO, number=1, head_sha=HEAD) is None
+
+    @pytest.mark.asyncio
+    async def test_reconcile_keeps_latest_status_per_context(self) -> None:
+        state = await _reconciled(
+            MergeEligibilityStates(),
+            statuses=[
+                StatusSnapshot(context="ci/jenkins", state="success", id=7),
+                StatusSnapshot(context="ci/jenkins", state="failure", id=3),
+            ],
+        )
+
+        assert state.statuses == {"ci/jenkins": StatusSnapshot(context="ci/jenkins", state="success", id=7)}
+
+    @pytest.mark.asyncio
+    async def test_check_run_and_status_events_update_state_at_head(self) -> None:
+        states = MergeEligibilityStates()
+        await _reconciled(states)
+
+        assert await states.observe_event(
+            REPO,
+            "check_run",
+            {"check_run": {"id": 10, "name": "tox", "head_sha": HEAD, "status": "completed", "conclusion": "success"}},
+        )
+        # A late in_progress event of the same run must not undo its completion
+        assert not await states.observe_event(
+            REPO, "check_run", {"check_run": {"id": 10, "name": "tox", "head_sha": HEAD, "status": "in_progress"}}
+        )
+        await states.observe_event(REPO, "status", {"id": 6, "sha": HEAD, "context": "ci/jenkins", "state": "success"})
+        # Events of other heads are ignored
+        assert not await states.observe_event(
+            REPO, "check_run", {"check_run": {"id": 11, "name": "build", "head_sha": "c" * 40, "status": "queued"}}
+        )
+
+        state = await _state(states)
+        assert state.check_runs == {
+            "tox": CheckRunSnapshot(name="tox", status="completed", conclusion="success", id=10),
+        }
+        assert state.statuses["ci/jenkins"].state == "success"
+
+    @pytest.mark.asyncio
+    async def test_version_is_bumped_by_events_only(self) -> None:
+        states = MergeEligibilityStates()
+        version = (await _reconciled(states)).version
+
+        # Values read by the evaluation itself and our own conclusion do not change its inputs
+        await states.record_mergeable(repo_full_name=REPO, number=1, mergeable=False)
+        await states.record_unresolved_threads(repo_full_name=REPO, number=1, threads=[])
+        await states.record_check_run(
+            repo_full_name=REPO,
+            head_sha=HEAD,
+            check_run=CheckRunSnapshot(name=CAN_BE_MERGED_STR, status="completed", conclusion="failure", id=20),
+        )
+        state = await _state(states)
+        assert (state.version, state.mergeable, state.unresolved_threads) == (version, False, [])
+
+        await states.observe_event(REPO, "pull_request", {"action": "labeled", "pull_request": _pull_request()})
+        assert (await _state(states)).version == version + 1
+
+        # A new reconciliation never repeats a version an evaluation may hold
+        assert (await _reconciled(states)).version > version + 1
+
+    @pytest.mark.asyncio
+    async def test_pull_request_events_drop_state_of_new_head_or_closed_pr(self) -> None:
+        states = MergeEligibilityStates()
+        await _reconciled(states)
+
+        assert await states.observe_event(REPO, "pull_request", {"pull_request": _pull_request(mergeable=False)})
+        assert (await _state(states)).mergeable is False
+
+        await states.observe_event(REPO, "pull_request", {"pull_request": _pull_request(head={"sha": "b" * 40})})
+        assert await states.get(repo_full_name=REPO, number=1, head_sha=HEAD) is None
+
+        await _reconciled(states)
+        await states.observe_event(REPO, "pull_request", {"pull_request": _pull_request(state="closed")})
+        assert await states.get(repo_full_name=REPO, number=1, head_sha=HEAD) is None
+
+    @pytest.mark.asyncio
+    async def test_push_to_base_branch_resets_mergeable(self) -> None:
+        states = MergeEligibilityStates()
+        await _reconciled(states)
+
+        assert not await states.observe_event(REPO, "push", {"ref": "refs/heads/develop"})
+        assert (await _state(states)).mergeable is True
+
+        assert await states.observe_event(REPO, "push", {"ref": "refs/heads/main"})
+        assert (await _state(states)).mergeable is None
+
+    @pytest.mark.asyncio
+    async def test_review_thread_events(self) -> None:
+        states = MergeEligibilityStates()
+        await _reconciled(states, unresolved_threads=[{"id": "T1"}, {"id": "T2"}])
+
+        payload = {"action": "resolved", "thread": {"node_id": "T1"}, "pull_request": _pull_request()}
+        await states.observe_event(REPO, "pull_request_review_thread", payload)
+        assert (await _state(states)).unresolved_threads == [{"id": "T2"}]
+
+        payload = {"action": "unresolved", "thread": {"node_id": "T1"}, "pull_request": _pull_request()}
+        await states.observe_event(REPO, "pull_request_review_thread", payload)
+        # The thread details are fetched again before the next evaluation
+        assert (await _state(states)).unresolved_threads is None
+
+    @pytest.mark.asyncio
+    async def test_non_string_keys_are_not_stored(self) -> None:
+        states = MergeEligibilityStates()
+
+        state = await _reconciled(states, head_sha=object())
+
+        assert state.check_runs["tox"].status == "in_progress"
+        assert not states._repos
+
+    @pytest.mark.asyncio
+    async def test_state_is_shared_through_state_dir(self, tmp_path: Path) -> None:
+        # Two worker processes configured with the same data dir
+        first, second = MergeEligibilityStates(), MergeEligibilityStates()
+        first.configure(state_dir=str(tmp_path / "merge-eligibility"))
+        second.configure(state_dir=str(tmp_path / "merge-eligibility"))
+        await _reconciled(first)
+
+        await second.observe_event(
+            REPO,
+            "check_run",
+            {"check_run": {"id": 10, "name": "tox", "head_sha": HEAD, "status": "completed", "conclusion": "success"}},
+        )
+
+        assert (await _state(first)).check_runs["tox"].conclusion == "success"
+        await first.invalidate(repo_full_name=REPO, number=1)
+        assert await second.get(repo_full_name=REPO, number=1, head_sha=HEAD) is None
+
+    @pytest.mark.asyncio
+    async def test_unusable_state_dir_requires_reconcile(self, tmp_path: Path) -> None:
+        (tmp_path / "file").write_text("")
+        states = MergeEligibilityStates()
+        states.configure(state_dir=str(tmp_path / "file" / "merge-eligibility"))
+
+        state = await _reconciled(states)
+
+        assert state.check_runs["tox"].status == "in_progress"
+        assert await states.get(repo_full_name=REPO, number=1, head_sha=HEAD) is None
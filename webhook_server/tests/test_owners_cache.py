@@ -0,0 +1,36 @@
+"""Tests for webhook_server.utils.owners_cache — OWNERS data cached by base tree."""
+
+from __future__ import annotations
+
+from webhook_server.utils.owners_cache import OwnersDataCache
+
+REPO = "test-org/test-repo"
+TREE = "a" * 40
+
+
+class TestOwnersDataCache:
+    """Tests for tree-keyed OWNERS data."""
+
+    def test_put_and_get_return_copies(self) -> None:
+        cache = OwnersDataCache()
+        owners = {".": {"approvers": ["user1"], "reviewers": ["user2"]}}
+
+        cache.put(repo_full_name=REPO, tree_sha=TREE, owners=owners)
+        owners["."]["approvers"].append("mutated")
+
+        cached = cache.get(repo_full_name=REPO, tree_sha=TREE)
+        assert cached == {".": {"approvers": ["user1"], "reviewers": ["user2"]}}
+        assert cached is not None
+        cached["."]["approvers"].append("mutated")
+        assert cache.get(repo_full_name=REPO, tree_sha=TREE) == {".": {"approvers": ["user1"], "reviewers": ["user2"]}}
+
+        assert cache.get(repo_full_name="other/repo", tree_sha=TREE) is None
+
+    def test_lru_eviction(self) -> None:
+        cache = OwnersDataCache(max_trees=2)
+        for tree_sha in ("1" * 40, "2" * 40, "3" * 40):
+            cache.put(repo_full_name=REPO, tree_sha=tree_sha, owners={})
+
+        assert len(cache) == 2
+        assert cache.get(repo_full_name=REPO, tree_sha="1" * 40) is None
+        assert cache.get(repo_full_name=REPO, tree_sha="3" * 40) == {}
@@ -6,6 +6,8 @@ import yaml
 from github.GithubException import GithubException
 
 from webhook_server.libs.handlers.owners_files_handler import OwnersFileHandler
+from webhook_server.utils.diff_cache import DiffStats, diff_stats_cache
+from webhook_server.utils.owners_cache import owners_data_cache
 
 
 class TestOwnersFileHandler:
@@ -101,7 +103,7 @@ class TestOwnersFileHandler:
         with patch(
             "webhook_server.libs.handlers.owners_files_handler.run_command", new=AsyncMock()
         ) as mock_run_command:
-            mock_run_command.return_value = (True, "file1.py\nfile2.py\n", "")
+            mock_run_command.return_value = (True, "3\t1\tfile1.py\x002\t0\tfile2.py\x00", "")
 
             result = await owners_file_handler.list_changed_files()
 
@@ -110,12 +112,73 @@ class TestOwnersFileHandler:
 
             # Verify run_command was called with correct git command
             mock_run_command.assert_called_once_with(
-                command=f"git -C {tmp_path} diff --name-only base123abc...head456def",
+                command=f"git -C {tmp_path} diff --numstat -z base123abc...head456def",
                 log_prefix="[TEST]",
                 verify_stderr=False,
                 mask_sensitive=True,
             )
 
+    @pytest.mark.asyncio
+    async def test_list_changed_files_uses_diff_cache(
+        self, owners_file_handler: OwnersFileHandler, tmp_path: Path
+    ) -> None:
+        """Test list_changed_files runs git diff once per base/head pair and keeps diff stats."""
+        owners_file_handler.github_webhook.repository_full_name = "test-org/test-repo"
+        owners_file_handler.github_webhook.pr_base_sha = "base123abc"
+        owners_file_handler.github_webhook.pr_head_sha = "head456def"
+        owners_file_handler.github_webhook.clone_repo_dir = str(tmp_path)
+        owners_file_handler.github_webhook.mask_sensitive = True
+
+        with patch(
+            "webhook_server.libs.handlers.owners_files_handler.run_command", new=AsyncMock()
+        ) as mock_run_command:
+            mock_run_command.return_value = (True, "3\t1\tfile1.py\x00-\t-\timage.png\x00", "")
+
+            first = await owners_file_handler.list_changed_files()
+            second = await OwnersFileHandler(owners_file_handler.github_webhook).list_changed_files()
+
+        assert first == second == ["file1.py", "image.png"]
+        mock_run_command.assert_called_once()
+        assert owners_file_handler.diff_stats.size == 4
+
+    @pytest.mark.asyncio
+    async def test_initialize_from_cache(self, owners_file_handler: OwnersFileHandler) -> None:
+        """Test initialize_from_cache resolves approvers from cached data without running git."""
+        owners_file_handler.github_webhook.repository_full_name = "test-org/test-repo"
+        owners_file_handler.github_webhook.pr_base_sha = "base123abc"
+        owners_file_handler.github_webhook.pr_head_sha = "head456def"
+        owners_file_handler.repository.get_branch.return_value.commit.commit.tree.sha = "f" * 40
+
+        # Changed files are not cached yet
+        assert await owners_file_handler.initialize_from_cache(base_ref="main") is None
+
+        diff_stats_cache.put(
+            repo_full_name="test-org/test-repo",
+            base_sha="base123abc",
+            head_sha="head456def",
+            stats=DiffStats(files=("folder1/file.py",)),
+        )
+        # The base tree is resolved, but its OWNERS data is not cached yet
+        assert await owners_file_handler.initialize_from_cache(base_ref="main") is None
+
+        owners_data_cache.put(
+            repo_full_name="test-org/test-repo",
+            tree_sha="f" * 40,
+            owners={
+                ".": {"approvers": ["root_approver"], "reviewers": ["root_reviewer"]},
+                "folder1": {"approvers": ["folder1_approver"], "reviewers": []},
+            },
+        )
+        with patch("webhook_server.libs.handlers.owners_files_handler.run_command", new=AsyncMock()) as mock_run:
+            result = await owners_file_handler.initialize_from_cache(base_ref="main")
+
+        assert result is owners_file_handler
+        mock_run.assert_not_called()
+        # The base tree is looked up on every call, never taken from a cache another worker may not update
+        assert owners_file_handler.repository.get_branch.call_args_list == [call("main"), call("main")]
+        assert owners_file_handler.changed_files == ["folder1/file.py"]
+        assert sorted(owners_file_handler.all_pull_request_approvers) == ["folder1_approver", "root_approver"]
+
     def test_validate_owners_content_valid(self, owners_file_handler: OwnersFileHandler) -> None:
         """Test _validate_owners_content with valid content."""
         valid_content = {"approvers": ["user1", "user2"], "reviewers": ["user3", "user4"]}
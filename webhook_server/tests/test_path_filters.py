@@ -0,0 +1,70 @@
+"""Tests for webhook_server.utils.path_filters — per-check paths/paths-ignore rules."""
+
+from __future__ import annotations
+
+import pytest
+
+from webhook_server.utils.path_filters import PathFilter, path_matches
+
+
+class TestPathMatches:
+    """Tests for path_matches glob semantics."""
+
+    @pytest.mark.parametrize(
+        "path, pattern, expected",
+        [
+            ("README.md", "*.md", True),
+            ("docs/index.md", "*.md", False),
+            ("docs/index.md", "**.md", True),
+            ("docs/index.md", "**/*.md", True),
+            ("README.md", "**/*.md", True),
+            ("docs/api/index.md", "docs/", True),
+            ("docs", "docs/", False),
+            ("docs/api/index.md", "docs/*", False),
+            ("docs/api/index.md", "docs/**", True),
+            ("src/app/main.py", "src/**/main.py", True),
+            ("src/main.py", "src/**/main.py", True),
+            ("OWNERS", "OWNERS", True),
+            ("src/OWNERS", "OWNERS", False),
+            ("src/OWNERS", "**/OWNERS", True),
+            ("a.txt", "?.txt", True),
+            ("ab.txt", "?.txt", False),
+            ("setup.py", "/setup.py", True),
+            ("file[1].txt", "file[1].txt", True),
+        ],
+    )
+    def test_glob_semantics(self, path: str, pattern: str, expected: bool) -> None:
+        assert path_matches(path, pattern) is expected
+
+
+class TestPathFilter:
+    """Tests for PathFilter."""
+
+    def test_from_config(self) -> None:
+        assert PathFilter.from_config(None) is None
+        assert PathFilter.from_config({"name": "lint", "command": "ruff"}) is None
+        assert PathFilter.from_config({"paths": ["src/", " "], "paths-ignore": "docs/"}) == PathFilter(
+            paths=("src/",), paths_ignore=("docs/",)
+        )
+
+    def test_paths(self) -> None:
+        path_filter = PathFilter(paths=("src/", "pyproject.toml"))
+
+        assert path_filter.matches(["docs/index.md", "src/app.py"])
+        assert path_filter.matches(["pyproject.toml"])
+        assert not path_filter.matches(["docs/index.md", "README.md"])
+
+    def test_paths_ignore(self) -> None:
+        path_filter = PathFilter(paths_ignore=("docs/", "**.md", "OWNERS"))
+
+        assert not path_filter.matches(["docs/conf.py", "README.md", "OWNERS"])
+        assert path_filter.matches(["docs/conf.py", "src/app.py"])
+
+    def test_paths_and_paths_ignore(self) -> None:
+        path_filter = PathFilter(paths=("src/",), paths_ignore=("src/**/test_*.py",))
+
+        assert not path_filter.matches(["src/tests/test_app.py"])
+        assert path_filter.matches(["src/tests/test_app.py", "src/app.py"])
+
+    def test_no_changed_files_always_match(self) -> None:
+        assert PathFilter(paths=("src/",)).matches([])
@@ -0,0 +1,101 @@
+"""Tests for webhook_server.utils.process_groups — process-group termination and orphan reaping."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils.process_groups import ProcessReaper, terminate_process_group
+
+# Starts a child that moves to its own process group (but stays in the session), prints its pid and exits
+SPAWN_REGROUPED_CHILD = (
+    "import subprocess, sys; "
+    "child = subprocess.Popen([sys.executable, '-c', 'import os, time; os.setpgid(0, 0); time.sleep(100)'], "
+    "stdout=subprocess.DEVNULL); "
+    "print(child.pid, flush=True)"
+)
+
+
+def _alive(pid: int) -> bool:
+    stat_path = Path(f"/proc/{pid}/stat")
+    try:
+        state = stat_path.read_text().rpartition(")")[2].split()[0]
+    except OSError:
+        return False
+    return state != "Z"
+
+
+async def _wait_dead(pid: int) -> bool:
+    for _ in range(50):
+        if not _alive(pid):
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+class TestTerminateProcessGroup:
+    """Tests for terminate_process_group."""
+
+    @pytest.mark.asyncio
+    async def test_terminates_whole_group(self) -> None:
+        process = await asyncio.create_subprocess_exec(
+            "sh", "-c", "sleep 100 & echo $!; wait", stdout=asyncio.subprocess.PIPE, start_new_session=True
+        )
+        assert process.stdout is not None
+        grandchild = int(await process.stdout.readline())
+
+        await terminate_process_group(process, grace_seconds=2)
+
+        assert process.returncode == -signal.SIGTERM
+        assert await _wait_dead(grandchild)
+
+    @pytest.mark.asyncio
+    async def test_escalates_to_sigkill(self) -> None:
+        process = await asyncio.create_subprocess_exec(
+            "sh", "-c", "trap '' TERM; echo ready; sleep 100", stdout=asyncio.subprocess.PIPE, start_new_session=True
+        )
+        assert process.stdout is not None
+        await process.stdout.readline()
+
+        await terminate_process_group(process, grace_seconds=0.3)
+
+        assert process.returncode == -signal.SIGKILL
+
+
+class TestProcessReaper:
+    """Tests for ProcessReaper bookkeeping and reaping."""
+
+    @pytest.mark.asyncio
+    async def test_reaps_stragglers_of_finished_sessions(self) -> None:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", SPAWN_REGROUPED_CHILD, stdout=asyncio.subprocess.PIPE, start_new_session=True
+        )
+        stdout, _ = await process.communicate()
+        straggler = int(stdout)
+        reaper = ProcessReaper()
+
+        try:
+            reaper.started(process.pid)
+            assert await reaper.reap(logger=Mock(), log_prefix="[TEST]") == 0
+
+            reaper.finished(process.pid)
+            assert await reaper.reap(logger=Mock(), log_prefix="[TEST]") == 1
+            assert await _wait_dead(straggler)
+            assert reaper.reaped == 1
+        finally:
+            if _alive(straggler):
+                os.kill(straggler, signal.SIGKILL)
+
+    @pytest.mark.asyncio
+    async def test_new_session_with_recycled_pid_is_not_reaped(self) -> None:
+        reaper = ProcessReaper()
+        reaper.finished(os.getpid())
+        reaper.started(os.getpid())
+
+        assert await reaper.reap(logger=Mock(), log_prefix="[TEST]") == 0
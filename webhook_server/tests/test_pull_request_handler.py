@@ -17,6 +17,7 @@ from webhook_server.tests.conftest import TEST_GITHUB_TOKEN
 from webhook_server.utils.constants import (
     AI_RESOLVED_CONFLICTS_LABEL,
     APPROVED_BY_LABEL_PREFIX,
+    BUILD_CONTAINER_STR,
     CAN_BE_MERGED_STR,
     CHANGED_REQUESTED_BY_LABEL_PREFIX,
     CHERRY_PICK_LABEL_PREFIX,
@@ -26,10 +27,13 @@ from webhook_server.utils.constants import (
     HOLD_LABEL_STR,
     LGTM_BY_LABEL_PREFIX,
     NEEDS_REBASE_LABEL_STR,
+    PRE_COMMIT_STR,
     TOX_STR,
     VERIFIED_LABEL_STR,
     WIP_STR,
 )
+from webhook_server.utils.merge_eligibility import CheckRunSnapshot, merge_eligibility_states
+from webhook_server.utils.path_filters import PathFilter
 
 
 class _AwaitableValue:
@@ -87,6 +91,8 @@ def _create_mock_github_webhook() -> Mock:
     mock_webhook.ctx = None
     mock_webhook.enabled_labels = None
     mock_webhook.custom_check_runs = []
+    mock_webhook.check_path_filters = {}
+    mock_webhook.check_policies = {}
     mock_webhook.ai_features = None
     mock_webhook.required_conversation_resolution = False
     mock_webhook.security_suspicious_paths = []
@@ -131,6 +137,7 @@ class TestPullRequestHandler:
 
         # Replace handler instances with mocks that have async methods
         handler.labels_handler = Mock()
+        handler.labels_handler.label_batch = MagicMock()
         handler.labels_handler._add_label = AsyncMock()
         handler.labels_handler._remove_label = AsyncMock()
         handler.labels_handler.add_size_label = AsyncMock()
@@ -139,6 +146,7 @@ class TestPullRequestHandler:
 
         handler.check_run_handler = Mock()
         handler.check_run_handler.set_check_queued = AsyncMock()
+        handler.check_run_handler.queue_checks = AsyncMock()
         handler.check_run_handler.set_check_in_progress = AsyncMock()
         handler.check_run_handler.set_check_success = AsyncMock()
         handler.check_run_handler.set_check_failure = AsyncMock()
@@ -1077,7 +1085,7 @@ class TestPullRequestHandler:
             patch.object(pull_request_handler.labels_handler, "wip_or_hold_labels_exists", return_value=""),
             patch.object(
                 pull_request_handler.labels_handler, "pull_request_labels_names", new=AsyncMock(return_value=[])
-            ),
+            ) as mock_labels_names,
             patch.object(
                 pull_request_handler.github_webhook,
                 "last_commit",
@@ -1086,6 +1094,8 @@ class TestPullRequestHandler:
         ):
             await pull_request_handler.check_if_can_be_merged(pull_request=mock_pull_request)
             mock_add_label.assert_awaited_once_with(pull_request=mock_pull_request, label=CAN_BE_MERGED_STR)
+            # Labels are re-fetched, not read from this worker's label state
+            mock_labels_names.assert_awaited_once_with(pull_request=mock_pull_request, fresh=True)
 
     @staticmethod
     @contextmanager
@@ -1161,6 +1171,131 @@ class TestPullRequestHandler:
                 "set_check_failure": mock_set_check_failure,
             }
 
+    @staticmethod
+    async def _seed_merge_eligibility_state(
+        pull_request_handler: PullRequestHandler, mock_pull_request: Mock, conclusion: str
+    ) -> list[CheckRunSnapshot]:
+        github_webhook = pull_request_handler.github_webhook
+        github_webhook.repository_full_name = "test-org/test-repo"
+        github_webhook.required_conversation_resolution = True
+        github_webhook.last_commit = Mock(sha="a" * 40)
+        github_webhook.get_unresolved_review_threads = AsyncMock(return_value=[])
+        check_runs = [
+            CheckRunSnapshot(name="tox", status="completed", conclusion=conclusion, id=1),
+            # The conclusion shown on GitHub before the evaluation
+            CheckRunSnapshot(name=CAN_BE_MERGED_STR, status="completed", conclusion="failure", id=2),
+        ]
+        await merge_eligibility_states.reconcile(
+            repo_full_name="test-org/test-repo",
+            number=mock_pull_request.number,
+            head_sha="a" * 40,
+            base_ref="main",
+            check_runs=check_runs,
+            statuses=[],
+            unresolved_threads=[],
+            mergeable=True,
+        )
+        return check_runs
+
+    @staticmethod
+    def _failed_checks_output(last_commit_check_runs: list[Any], **_kwargs: Any) -> str:
+        failed = [
+            check_run.name
+            for check_run in last_commit_check_runs
+            if check_run.name != CAN_BE_MERGED_STR and check_run.conclusion != "success"
+        ]
+        return f"Failed checks: {failed}\n" if failed else ""
+
+    @pytest.mark.asyncio
+    async def test_can_be_merged_uses_merge_eligibility_state(
+        self, pull_request_handler: PullRequestHandler, mock_pull_request: Mock
+    ) -> None:
+        """Test an unchanged failure is decided from the merge-eligibility state without list calls."""
+        check_runs = await self._seed_merge_eligibility_state(
+            pull_request_handler, mock_pull_request, conclusion="failure"
+        )
+        github_webhook = pull_request_handler.github_webhook
+        check_run_handler = pull_request_handler.check_run_handler
+        check_run_handler.required_check_in_progress = AsyncMock(return_value=("", []))
+        check_run_handler.required_check_failed_or_no_status = AsyncMock(side_effect=self._failed_checks_output)
+
+        with (
+            patch.object(pull_request_handler, "_check_if_pr_approved", new=AsyncMock(return_value="")),
+            patch.object(pull_request_handler, "_check_labels_for_can_be_merged", return_value=""),
+        ):
+            await pull_request_handler.check_if_can_be_merged(pull_request=mock_pull_request)
+
+        github_webhook.last_commit.get_check_runs.assert_not_called()
+        github_webhook.last_commit.get_statuses.assert_not_called()
+        github_webhook.get_unresolved_review_threads.assert_not_awaited()
+        check_run_handler.required_check_in_progress.assert_awaited_once_with(
+            pull_request=mock_pull_request, last_commit_check_runs=check_runs
+        )
+        pull_request_handler.labels_handler._add_label.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_can_be_merged_conclusion_change_is_confirmed_by_full_reconcile(
+        self, pull_request_handler: PullRequestHandler, mock_pull_request: Mock
+    ) -> None:
+        """Test a cached state that would change the conclusion is reconciled first, in case it missed an event."""
+        await self._seed_merge_eligibility_state(pull_request_handler, mock_pull_request, conclusion="success")
+        github_webhook = pull_request_handler.github_webhook
+        # The state missed that the re-run of tox failed
+        failed_run = Mock(status="completed", conclusion="failure", id=3)
+        failed_run.name = "tox"
+        github_webhook.last_commit.get_check_runs.return_value = [failed_run]
+        github_webhook.last_commit.get_statuses.return_value = []
+        mock_pull_request.mergeable = True
+        check_run_handler = pull_request_handler.check_run_handler
+        check_run_handler.required_check_in_progress = AsyncMock(return_value=("", []))
+        check_run_handler.required_check_failed_or_no_status = AsyncMock(side_effect=self._failed_checks_output)
+
+        with (
+            patch.object(pull_request_handler, "_check_if_pr_approved", new=AsyncMock(return_value="")),
+            patch.object(pull_request_handler, "_check_labels_for_can_be_merged", return_value=""),
+        ):
+            await pull_request_handler.check_if_can_be_merged(pull_request=mock_pull_request)
+
+        github_webhook.last_commit.get_check_runs.assert_called_once()
+        github_webhook.get_unresolved_review_threads.assert_awaited_once_with(pr_number=mock_pull_request.number)
+        assert check_run_handler.required_check_failed_or_no_status.await_count == 2
+        pull_request_handler.labels_handler._add_label.assert_not_awaited()
+        pull_request_handler.labels_handler._remove_label.assert_awaited_once_with(
+            pull_request=mock_pull_request, label=CAN_BE_MERGED_STR
+        )
+
+    @pytest.mark.asyncio
+    async def test_can_be_merged_re_evaluates_when_state_changes_during_evaluation(
+        self, pull_request_handler: PullRequestHandler, mock_pull_request: Mock
+    ) -> None:
+        """Test an event applied by another worker during the evaluation triggers another evaluation."""
+        await self._seed_merge_eligibility_state(pull_request_handler, mock_pull_request, conclusion="failure")
+        github_webhook = pull_request_handler.github_webhook
+        check_run_handler = pull_request_handler.check_run_handler
+        check_run_handler.required_check_in_progress = AsyncMock(return_value=("", []))
+        check_run_handler.required_check_failed_or_no_status = AsyncMock(side_effect=self._failed_checks_output)
+        labeled = {
+            "action": "labeled",
+            "pull_request": {"number": mock_pull_request.number, "state": "open", "head": {"sha": "a" * 40}},
+        }
+
+        async def _label_added_elsewhere(**_kwargs: Any) -> str:
+            if check_run_handler.required_check_failed_or_no_status.await_count == 1:
+                await merge_eligibility_states.observe_event("test-org/test-repo", "pull_request", labeled)
+            return ""
+
+        with (
+            patch.object(
+                pull_request_handler, "_check_if_pr_approved", new=AsyncMock(side_effect=_label_added_elsewhere)
+            ),
+            patch.object(pull_request_handler, "_check_labels_for_can_be_merged", return_value=""),
+        ):
+            await pull_request_handler.check_if_can_be_merged(pull_request=mock_pull_request)
+
+        github_webhook.last_commit.get_check_runs.assert_not_called()
+        assert check_run_handler.required_check_failed_or_no_status.await_count == 2
+        assert pull_request_handler.labels_handler._remove_label.await_count == 2
+
     @pytest.mark.asyncio
     async def test_can_be_merged_conversation_resolution_disabled(
         self, pull_request_handler: PullRequestHandler, mock_pull_request: Mock
@@ -2689,6 +2824,40 @@ class TestPullRequestHandler:
 
             pull_request_handler.logger.error.assert_any_call("[TEST] CI/CD task failed: CI failed")
 
+    @pytest.mark.asyncio
+    async def test_process_opened_skips_checks_by_path_filter(
+        self, pull_request_handler: PullRequestHandler, mock_github_webhook: Mock, mock_pull_request: Mock
+    ) -> None:
+        """Test checks whose path filter matches no changed file are completed as skipped and not run."""
+        mock_github_webhook.custom_check_runs = [{"name": "docs-build", "command": "make docs"}]
+        mock_github_webhook.check_path_filters = {
+            TOX_STR: PathFilter(paths_ignore=("docs/", "**.md")),
+            BUILD_CONTAINER_STR: PathFilter(paths=("src/",)),
+            "docs-build": PathFilter(paths=("docs/",)),
+        }
+        pull_request_handler.owners_file_handler.changed_files = ["docs/index.md", "README.md"]
+
+        with (
+            patch.object(pull_request_handler.labels_handler, "_add_label", new=AsyncMock()),
+            patch.object(pull_request_handler, "label_pull_request_by_merge_state", new=AsyncMock()),
+            patch.object(pull_request_handler, "_process_verified_for_update_or_new_pull_request", new=AsyncMock()),
+            patch.object(pull_request_handler, "add_pull_request_owner_as_assingee", new=AsyncMock()),
+            patch.object(pull_request_handler.runner_handler, "run_custom_check", new=AsyncMock()) as mock_custom,
+        ):
+            await pull_request_handler.process_opened_or_synchronize_pull_request(mock_pull_request)
+
+        # All checks are queued in one call; the skipped ones are completed as neutral by queue_checks
+        pull_request_handler.check_run_handler.queue_checks.assert_awaited_once()
+        queue_kwargs = pull_request_handler.check_run_handler.queue_checks.await_args.kwargs
+        assert set(queue_kwargs["skipped_checks"]) == {TOX_STR, BUILD_CONTAINER_STR}
+        assert {CAN_BE_MERGED_STR, TOX_STR, PRE_COMMIT_STR, BUILD_CONTAINER_STR, "docs-build"} <= set(
+            queue_kwargs["names"]
+        )
+        pull_request_handler.runner_handler.run_tox.assert_not_called()
+        pull_request_handler.runner_handler.run_build_container.assert_not_called()
+        pull_request_handler.runner_handler.run_pre_commit.assert_awaited_once()
+        mock_custom.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_create_issue_for_new_pr_disabled(
         self, pull_request_handler: PullRequestHandler, mock_github_webhook: Mock, mock_pull_request: Mock
@@ -0,0 +1,86 @@
+"""Tests for webhook_server.utils.required_checks_cache — cached branch protection required checks."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from webhook_server.utils.required_checks_cache import RequiredChecksCache
+
+REPO = "test-org/test-repo"
+
+
+class TestRequiredChecksCache:
+    """Tests for loading, expiry and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_loaded_once_per_branch(self) -> None:
+        cache = RequiredChecksCache()
+        fetch = AsyncMock(return_value=["tox", "pre-commit"])
+
+        results = await asyncio.gather(
+            *(
+                cache.get_or_load(repo_full_name=REPO, branch="main", fetch=fetch, logger=Mock(), log_prefix="[TEST]")
+                for _ in range(3)
+            )
+        )
+
+        assert results == [["tox", "pre-commit"]] * 3
+        fetch.assert_awaited_once()
+        assert cache.get(repo_full_name=REPO, branch="main") == ["tox", "pre-commit"]
+        assert cache.get(repo_full_name=REPO, branch="develop") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_load_and_expired_entries_are_refetched(self) -> None:
+        cache = RequiredChecksCache(ttl_seconds=0)
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load(
+                repo_full_name=REPO,
+                branch="main",
+                fetch=AsyncMock(side_effect=RuntimeError),
+                logger=Mock(),
+                log_prefix="[TEST]",
+            )
+
+        fetch = AsyncMock(return_value=["tox"])
+        for _ in range(2):
+            await cache.get_or_load(repo_full_name=REPO, branch="main", fetch=fetch, logger=Mock(), log_prefix="[TEST]")
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_branch_protection_rule_event_invalidates_repository(self) -> None:
+        cache = RequiredChecksCache()
+        for repo, branch in ((REPO, "main"), (REPO, "release-1.0"), ("other/repo", "main")):
+            await cache.get_or_load(
+                repo_full_name=repo, branch=branch, fetch=AsyncMock(return_value=["tox"]), logger=Mock(), log_prefix=""
+            )
+
+        assert not cache.observe_event(REPO, {"action": "edited"})
+        assert cache.observe_event(REPO, {"action": "edited", "rule": {"name": "release-*"}})
+
+        assert cache.get(repo_full_name=REPO, branch="main") is None
+        assert cache.get(repo_full_name=REPO, branch="release-1.0") is None
+        assert cache.get(repo_full_name="other/repo", branch="main") == ["tox"]
+
+    @pytest.mark.asyncio
+    async def test_load_racing_with_invalidation_is_not_stored(self) -> None:
+        cache = RequiredChecksCache()
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def _fetch() -> list[str]:
+            started.set()
+            await release.wait()
+            return ["tox"]
+
+        load = asyncio.create_task(
+            cache.get_or_load(repo_full_name=REPO, branch="main", fetch=_fetch, logger=Mock(), log_prefix="[TEST]")
+        )
+        await started.wait()
+        cache.invalidate(REPO)
+        release.set()
+
+        assert await load == ["tox"]
+        assert cache.get(repo_full_name=REPO, branch="main") is None
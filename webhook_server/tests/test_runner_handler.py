@@ -1,4 +1,5 @@
 import asyncio
+import json
 import shlex
 from collections.abc import AsyncGenerator, Generator
 from contextlib import asynccontextmanager
@@ -12,6 +13,11 @@ from github import GithubException
 
 from webhook_server.libs.ai_cli import AIResult
 from webhook_server.libs.handlers.runner_handler import CheckConfig, RunnerHandler
+from webhook_server.utils.cache_manager import cache_manager
+from webhook_server.utils.check_cgroups import CheckCgroup, ResourceUsage
+from webhook_server.utils.check_policy import CheckPolicy
+from webhook_server.utils.check_result_cache import check_result_cache
+from webhook_server.utils.check_runners import CheckJobResult, check_runners
 from webhook_server.utils.constants import (
     BUILD_CONTAINER_STR,
     CONVENTIONAL_TITLE_STR,
@@ -19,6 +25,7 @@ from webhook_server.utils.constants import (
     PYTHON_MODULE_INSTALL_STR,
     TOX_STR,
 )
+from webhook_server.utils.container_build_cache import container_build_cache, container_build_key
 
 
 @dataclass
@@ -40,6 +47,7 @@ class TestRunnerHandler:
         mock_webhook.hook_data = {"action": "opened"}
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.repository.clone_url = "https://github.com/test/repo.git"
         mock_webhook.repository.owner.login = "test-owner"
@@ -74,6 +82,7 @@ class TestRunnerHandler:
         mock_webhook.ctx = None
         mock_webhook.custom_check_runs = []
         mock_webhook.ai_features = None
+        mock_webhook.worktree_pool_size = 8
         mock_webhook.config = Mock()
         mock_webhook.config.get_value = Mock(return_value=None)
         return mock_webhook
@@ -243,6 +252,71 @@ class TestRunnerHandler:
                                 name=TOX_STR, output={"title": "Tox", "summary": "", "text": "dummy output"}
                             )
 
+    @pytest.mark.asyncio
+    async def test_run_tox_uses_cached_env_dir(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock, tmp_path: Path
+    ) -> None:
+        """Test run_tox keeps envs in a cached work dir and points uv/pip at the shared caches."""
+        cache_manager.configure(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+        runner_handler.github_webhook.check_result_cache = False
+        worktree = tmp_path / "worktree"
+        worktree.mkdir()
+        (worktree / "tox.ini").write_text("[tox]\nenvlist = py3\n")
+        runner_handler.check_run_handler.is_check_run_in_progress = AsyncMock(return_value=False)
+        runner_handler.check_run_handler.set_check_in_progress = AsyncMock()
+        runner_handler.check_run_handler.set_check_success = AsyncMock()
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, str(worktree), "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch(
+                "webhook_server.libs.handlers.runner_handler.run_command",
+                new=AsyncMock(return_value=(True, "success", "")),
+            ) as mock_run,
+        ):
+            await runner_handler.run_tox(mock_pull_request)
+
+        command = mock_run.call_args.kwargs["command"]
+        env = mock_run.call_args.kwargs["env"]
+        assert f"--workdir {tmp_path / 'cache' / 'tox-env'}" in command
+        assert f"--root {worktree}" in command
+        assert env["UV_CACHE_DIR"] == str(tmp_path / "cache" / "uv" / "shared")
+        assert env["PIP_CACHE_DIR"] == str(tmp_path / "cache" / "pip" / "shared")
+
+    @pytest.mark.asyncio
+    async def test_run_pre_commit_uses_cached_prek_home(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock, tmp_path: Path
+    ) -> None:
+        """Test run_pre_commit points prek at hook environments keyed by the pre-commit config."""
+        cache_manager.configure(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+        runner_handler.github_webhook.check_result_cache = False
+        worktree = tmp_path / "worktree"
+        worktree.mkdir()
+        (worktree / ".pre-commit-config.yaml").write_text("repos: []\n")
+        runner_handler.check_run_handler.is_check_run_in_progress = AsyncMock(return_value=False)
+        runner_handler.check_run_handler.set_check_in_progress = AsyncMock()
+        runner_handler.check_run_handler.set_check_success = AsyncMock()
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, str(worktree), "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch(
+                "webhook_server.libs.handlers.runner_handler.run_command",
+                new=AsyncMock(return_value=(True, "success", "")),
+            ) as mock_run,
+        ):
+            await runner_handler.run_pre_commit(mock_pull_request)
+
+        env = mock_run.call_args.kwargs["env"]
+        assert env["PREK_HOME"].startswith(str(tmp_path / "cache" / "prek-home"))
+        assert env["UV_CACHE_DIR"] == str(tmp_path / "cache" / "uv" / "shared")
+
     @pytest.mark.asyncio
     async def test_run_tox_failure(self, runner_handler: RunnerHandler, mock_pull_request: Mock) -> None:
         """Test run_tox with failed execution."""
@@ -513,6 +587,75 @@ class TestRunnerHandler:
                                 # The command should contain worktree-path as context (not worktree-path/)
                                 assert "/tmp/worktree-path -t" in podman_cmd
 
+    @pytest.mark.asyncio
+    async def test_run_build_container_layer_cache_and_ignore_file(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock, tmp_path: Path
+    ) -> None:
+        """Test podman build uses the layer cache, labels the image and gets a default ignore file."""
+        worktree = tmp_path / "worktree"
+        worktree.mkdir()
+        runner_handler.check_run_handler.is_check_run_in_progress = AsyncMock(return_value=False)
+        runner_handler.check_run_handler.set_check_in_progress = AsyncMock()
+        runner_handler.check_run_handler.set_check_success = AsyncMock()
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, str(worktree), "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+        build_output = "STEP 1/2: FROM fedora\nSTEP 2/2: RUN make\n--> Using cache 1c4e9a6b0f0d\n"
+
+        with (
+            patch.object(runner_handler.github_webhook, "container_repository_and_tag", return_value="repo:pr-1"),
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch.object(
+                runner_handler, "run_podman_command", new=AsyncMock(return_value=(True, build_output, ""))
+            ) as mock_podman,
+        ):
+            await runner_handler.run_build_container(pull_request=mock_pull_request)
+
+        podman_cmd = mock_podman.call_args.kwargs["command"]
+        assert "--layers --label io.github-webhook-server.repository=test/repo" in podman_cmd
+        assert "--ignorefile " in podman_cmd
+        output = runner_handler.check_run_handler.set_check_success.call_args.kwargs["output"]
+        assert "1/2 steps from the layer cache" in output["summary"]
+
+    @pytest.mark.asyncio
+    async def test_run_build_container_reuses_identical_pr_build(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock, tmp_path: Path
+    ) -> None:
+        """Test a PR build with the same context tree, Containerfile and flags re-tags the earlier image."""
+        cache_manager.configure(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+        container_build_cache.configure()
+        key = container_build_key(
+            context_tree="tree-sha", containerfile="blob-sha", build_flags=json.dumps(["Dockerfile", [], [], ""])
+        )
+        await container_build_cache.record(
+            repository="test/repo", key=key, image_id="0123456789abcdef", logger=Mock(), log_prefix="[TEST]"
+        )
+        container_build_cache.prune_due("test/repo")
+        runner_handler.check_run_handler.is_check_run_in_progress = AsyncMock(return_value=False)
+        runner_handler.check_run_handler.set_check_in_progress = AsyncMock()
+        runner_handler.check_run_handler.set_check_success = AsyncMock()
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, str(tmp_path), "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler.github_webhook, "container_repository_and_tag", return_value="repo:pr-1"),
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch(
+                "webhook_server.libs.handlers.runner_handler.run_command",
+                new=AsyncMock(return_value=(True, "tree-sha\nblob-sha\n", "")),
+            ),
+            patch.object(
+                runner_handler, "run_podman_command", new=AsyncMock(return_value=(True, "", ""))
+            ) as mock_podman,
+        ):
+            await runner_handler.run_build_container(pull_request=mock_pull_request)
+
+        mock_podman.assert_awaited_once_with(command="podman tag 0123456789abcdef repo:pr-1")
+        output = runner_handler.check_run_handler.set_check_success.call_args.kwargs["output"]
+        assert "Reused image `0123456789ab`" in output["summary"]
+        assert container_build_cache.stats.reused == 1
+
     @pytest.mark.asyncio
     async def test_run_install_python_module_disabled(
         self, runner_handler: RunnerHandler, mock_pull_request: Mock
@@ -1308,6 +1451,40 @@ class TestRunnerHandler:
                     assert not success
                     assert out == "fail"
 
+    @pytest.mark.asyncio
+    async def test_checkout_worktree_pool_merges_once_and_recycles(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock
+    ) -> None:
+        """Test PR checks reuse a pooled worktree and merge the base branch only once."""
+        commands: list[str] = []
+
+        async def mock_run_command(*args: Any, **kwargs: Any) -> tuple[bool, str, str]:
+            cmd = kwargs.get("command", args[0] if args else "")
+            commands.append(cmd)
+            if cmd.endswith("rev-parse --abbrev-ref HEAD"):
+                return (True, "main\n", "")
+            if cmd.endswith("rev-parse HEAD"):
+                return (True, "mergesha123\n", "")
+            return (True, "", "")
+
+        with patch("webhook_server.utils.helpers.git_worktree_checkout") as mock_git_worktree:
+            mock_git_worktree.return_value.__aenter__ = AsyncMock(return_value=(True, "/tmp/worktree-path", "", ""))
+            mock_git_worktree.return_value.__aexit__ = AsyncMock(return_value=None)
+            with patch(
+                "webhook_server.libs.handlers.runner_handler.run_command",
+                new=AsyncMock(side_effect=mock_run_command),
+            ):
+                for _ in range(2):
+                    async with runner_handler._checkout_worktree(pull_request=mock_pull_request) as result:
+                        success, worktree_path, _, _ = result
+                        assert success is True
+                        assert worktree_path == "/tmp/worktree-path"
+
+        mock_git_worktree.assert_called_once()
+        assert len([c for c in commands if " merge origin/main" in c]) == 1
+        assert "git -C /tmp/worktree-path checkout --force --detach mergesha123" in commands
+        assert "git -C /tmp/worktree-path clean -ffdxq" in commands
+
     @pytest.mark.asyncio
     async def test_checkout_worktree_skip_merge(self, runner_handler: RunnerHandler, mock_pull_request: Mock) -> None:
         """Test _checkout_worktree with skip_merge=True skips the merge step."""
@@ -2302,6 +2479,7 @@ class TestRestoreOriginalAuthorForCherryPick:
         mock_webhook.hook_data = {"action": "opened"}
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.repository.clone_url = "https://github.com/test/repo.git"
         mock_webhook.repository.owner.login = "test-owner"
@@ -2763,6 +2941,7 @@ class TestRunCheck:
         mock_webhook.hook_data = {"action": "opened"}
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.clone_repo_dir = "/tmp/test-repo"
         mock_webhook.mask_sensitive = True
@@ -2821,6 +3000,215 @@ class TestRunCheck:
             call_args = mock_run.call_args
             assert call_args.kwargs["command"] == "echo /tmp/worktree"
 
+    @pytest.mark.asyncio
+    async def test_run_check_in_cgroup_reports_usage(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock
+    ) -> None:
+        """Test run_check runs the command in the check's cgroup and reports its resource usage."""
+        check_config = CheckConfig(name="my-check", command="echo {worktree_path}", title="My Check")
+        cgroup = CheckCgroup(path="/sys/fs/cgroup/checks/1-my-check")
+        usage = ResourceUsage(peak_memory_mb=300, cpu_seconds=4.5, wall_seconds=3.0)
+
+        @asynccontextmanager
+        async def fake_cgroup(**_kwargs: Any) -> AsyncGenerator[CheckCgroup]:
+            yield cgroup
+            cgroup.usage = usage
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, "/tmp/worktree", "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch("webhook_server.libs.handlers.runner_handler.check_cgroups.cgroup", side_effect=fake_cgroup),
+            patch("webhook_server.libs.handlers.runner_handler.job_scheduler.observe") as mock_observe,
+            patch(
+                "webhook_server.libs.handlers.runner_handler.run_command",
+                new=AsyncMock(return_value=(True, "success output", "")),
+            ) as mock_run,
+        ):
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+
+        assert mock_run.call_args.kwargs["command"] == cgroup.wrap("echo /tmp/worktree")
+        output = runner_handler.check_run_handler.set_check_success.call_args.kwargs["output"]
+        assert output["summary"] == usage.summary()
+        mock_observe.assert_called_once_with(
+            check_name="my-check", peak_memory_mb=300, cpu_seconds=4.5, wall_seconds=3.0
+        )
+
+    @pytest.mark.asyncio
+    async def test_run_check_on_check_runner(self, runner_handler: RunnerHandler, mock_pull_request: Mock) -> None:
+        """Test run_check submits the command to a check runner and falls back to running it locally."""
+        check_config = CheckConfig(name="my-check", command="echo {worktree_path}", title="My Check")
+        check_runners.configure(endpoints=["unix:///tmp/check-runners/runner-0.sock"])
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, "/tmp/worktree", "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch(
+                "webhook_server.libs.handlers.runner_handler.check_runners.run",
+                new=AsyncMock(side_effect=[CheckJobResult(success=True, out="remote output"), None]),
+            ) as mock_submit,
+            patch(
+                "webhook_server.libs.handlers.runner_handler.run_command",
+                new=AsyncMock(return_value=(True, "local output", "")),
+            ) as mock_run,
+        ):
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+
+            job = mock_submit.call_args.kwargs["job"]
+            assert job.check_name == "my-check"
+            assert job.command == "echo /tmp/worktree"
+            mock_run.assert_not_called()
+
+            # No runner reachable: the check runs in this process
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+            mock_run.assert_called_once()
+
+        assert runner_handler.check_run_handler.set_check_success.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_check_streams_live_output(self, runner_handler: RunnerHandler, mock_pull_request: Mock) -> None:
+        """Test the output tail is published while the command runs, before the check completes."""
+        check_config = CheckConfig(name="my-check", command="echo {worktree_path}", title="My Check")
+        runner_handler.github_webhook.check_policies = {"my-check": CheckPolicy(live_output_interval=0.01)}
+        events: list[str] = []
+        runner_handler.check_run_handler.set_check_live_output = AsyncMock(
+            side_effect=lambda **kwargs: events.append(f"live:{kwargs['tail']}")
+        )
+        runner_handler.check_run_handler.set_check_success = AsyncMock(side_effect=lambda **_: events.append("done"))
+
+        async def _run_command(**kwargs: Any) -> tuple[bool, str, str]:
+            await kwargs["output_callback"]("stdout", "collected 3 items\n")
+            await asyncio.sleep(0.05)
+            return True, "collected 3 items\n", ""
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, "/tmp/worktree", "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch("webhook_server.libs.handlers.runner_handler.run_command", new=AsyncMock(side_effect=_run_command)),
+        ):
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+
+        assert events == ["live:collected 3 items\n", "done"]
+        runner_handler.check_run_handler.set_check_live_output.assert_awaited_once_with(
+            name="my-check", title="My Check", tail="collected 3 items\n", interval=0.01
+        )
+
+    @pytest.mark.asyncio
+    async def test_run_check_retries_retryable_exit_codes(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock
+    ) -> None:
+        """Test run_check retries an attempt that failed with a retryable exit code."""
+        check_config = CheckConfig(name="my-check", command="echo test", title="My Check")
+        runner_handler.github_webhook.check_policies = {
+            "my-check": CheckPolicy.from_config({"retries": {"count": 2, "backoff-seconds": 0}})
+        }
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, "/tmp/worktree", "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch.object(
+                runner_handler,
+                "_run_check_command",
+                new=AsyncMock(
+                    side_effect=[
+                        CheckJobResult(success=False, err="registry unreachable", returncode=125),
+                        CheckJobResult(success=True, out="ok", returncode=0),
+                    ]
+                ),
+            ) as mock_run,
+        ):
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+
+        assert mock_run.await_count == 2
+        output = runner_handler.check_run_handler.set_check_success.call_args.kwargs["output"]
+        assert "Attempt 2" in output["summary"]
+
+    @pytest.mark.asyncio
+    async def test_run_check_releases_scheduler_slot_between_attempts(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock
+    ) -> None:
+        """Test a retrying check does not hold its CI scheduler slot during the backoff."""
+        check_config = CheckConfig(name="my-check", command="echo test", title="My Check")
+        runner_handler.github_webhook.check_policies = {
+            "my-check": CheckPolicy.from_config({"retries": {"count": 1, "backoff-seconds": 0}})
+        }
+        events: list[str] = []
+
+        @asynccontextmanager
+        async def _job_slot(check_name: str) -> AsyncGenerator[None]:
+            events.append(f"acquire {check_name}")
+            try:
+                yield
+            finally:
+                events.append(f"release {check_name}")
+
+        async def _run(**_kwargs: Any) -> CheckJobResult:
+            events.append("attempt")
+            if events.count("attempt") == 1:
+                return CheckJobResult(success=False, returncode=125)
+            return CheckJobResult(success=True, returncode=0)
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, "/tmp/worktree", "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler, "_job_slot", new=_job_slot),
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch.object(runner_handler, "_run_check_command", new=AsyncMock(side_effect=_run)),
+        ):
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+
+        assert events == [
+            "acquire my-check",
+            "attempt",
+            "release my-check",
+            "acquire my-check",
+            "attempt",
+            "release my-check",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_run_check_timeout_is_reported_as_timed_out(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock
+    ) -> None:
+        """Test a check that exceeds its timeout is killed and completed as timed_out, not retried."""
+        check_config = CheckConfig(name="my-check", command="sleep 100", title="My Check")
+        runner_handler.github_webhook.check_policies = {
+            "my-check": CheckPolicy.from_config({"timeout": 1, "retries": 3})
+        }
+        runner_handler.check_run_handler.set_check_timed_out = AsyncMock()
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, "/tmp/worktree", "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        async def hang(**_kwargs: Any) -> CheckJobResult:
+            await asyncio.sleep(100)
+            return CheckJobResult(success=True)
+
+        with (
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch.object(runner_handler, "_run_check_command", new=AsyncMock(side_effect=hang)) as mock_run,
+        ):
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+
+        mock_run.assert_awaited_once()
+        runner_handler.check_run_handler.set_check_failure.assert_not_called()
+        output = runner_handler.check_run_handler.set_check_timed_out.call_args.kwargs["output"]
+        assert "timeout of 1s" in output["summary"]
+
     @pytest.mark.asyncio
     async def test_run_check_failure(self, runner_handler: RunnerHandler, mock_pull_request: Mock) -> None:
         """Test run_check with failed command execution."""
@@ -2920,6 +3308,52 @@ class TestRunCheck:
             runner_handler.check_run_handler.set_check_in_progress.assert_called_once()
             runner_handler.check_run_handler.set_check_success.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_run_check_reuses_result_for_identical_tree(
+        self, runner_handler: RunnerHandler, mock_pull_request: Mock, tmp_path: Path
+    ) -> None:
+        """Test a passed check is published from cache for the same merged tree until forced."""
+        cache_manager.configure(root_dir=str(tmp_path / "cache"), max_bytes=10 * 1024**2)
+        runner_handler.github_webhook.repository_full_name = "org/repo"
+        runner_handler.github_webhook.last_commit.sha = "abc1234def"
+        runner_handler.check_run_handler.set_check_cached = AsyncMock()
+        check_config = CheckConfig(name="tox", command="tox -c {worktree_path}", title="Tox")
+
+        mock_checkout_cm = AsyncMock()
+        mock_checkout_cm.__aenter__ = AsyncMock(return_value=(True, "/tmp/worktree", "", ""))
+        mock_checkout_cm.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(runner_handler, "_checkout_worktree", return_value=mock_checkout_cm),
+            patch.object(runner_handler, "_merged_tree_sha", new=AsyncMock(return_value="tree5678")),
+            patch.object(check_result_cache, "tool_versions", new=AsyncMock(return_value="uv 0.9.0")),
+            patch(
+                "webhook_server.libs.handlers.runner_handler.run_command",
+                new=AsyncMock(return_value=(True, "success", "")),
+            ) as mock_run,
+        ):
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+
+            assert mock_run.call_count == 1
+            runner_handler.check_run_handler.set_check_success.assert_called_once()
+            cached = runner_handler.check_run_handler.set_check_cached.call_args.kwargs["result"]
+            assert cached.conclusion == "success"
+            assert cached.head_sha == "abc1234def"
+            assert cached.tree_sha == "tree5678"
+
+            # A changed command is a different check definition
+            await runner_handler.run_check(
+                pull_request=mock_pull_request,
+                check_config=CheckConfig(name="tox", command="tox -e py314 -c {worktree_path}", title="Tox"),
+            )
+            assert mock_run.call_count == 2
+
+            runner_handler.force_rerun = True
+            await runner_handler.run_check(pull_request=mock_pull_request, check_config=check_config)
+            assert mock_run.call_count == 3
+            runner_handler.check_run_handler.set_check_cached.assert_called_once()
+
 
 class TestBuildOciAnnotations:
     """Test suite for _build_oci_annotations method."""
@@ -2929,6 +3363,7 @@ class TestBuildOciAnnotations:
         """Create a mock GithubWebhook for OCI annotation tests."""
         mock_webhook = Mock()
         mock_webhook.repository_full_name = "test-org/test-repo"
+        mock_webhook.check_policies = {}
         mock_webhook.repository_name = "test-repo"
         mock_webhook.hook_data = {"head_commit": {"id": "push-sha-123"}}
         mock_webhook.container_oci_annotations_enabled = True
@@ -3125,6 +3560,7 @@ class TestRebasePr:
         mock_webhook.hook_data = {"action": "opened"}
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.repository.clone_url = "https://github.com/test/repo.git"
         mock_webhook.token = "test-token"  # pragma: allowlist secret
@@ -3392,6 +3828,7 @@ class TestCherryPickPreCommitAutoFix:
         mock_webhook.hook_data = {"action": "opened"}
         mock_webhook.logger = Mock()
         mock_webhook.log_prefix = "[TEST]"
+        mock_webhook.check_policies = {}
         mock_webhook.repository = Mock()
         mock_webhook.repository.clone_url = "https://github.com/test/repo.git"
         mock_webhook.repository.owner.login = "test-owner"
@@ -0,0 +1,127 @@
+"""Tests for webhook_server.utils.shared_clones — single-flight shared clones."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils.shared_clones import SharedCloneRegistry
+
+KEY = ("org/repo", "a" * 40, "main", 1)
+
+
+class FakeCloner:
+    """Records clone calls; blocks until released so callers overlap."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.calls: list[str] = []
+        self.gate = asyncio.Event()
+
+    async def clone(self, path: str) -> str:
+        self.calls.append(path)
+        await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("Failed to clone repository")
+        (Path(path) / ".git").mkdir(parents=True, exist_ok=True)
+        return "main"
+
+
+class TestSharedCloneRegistry:
+    """Tests for SharedCloneRegistry refcounting and single-flight cloning."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquires_share_one_clone(self, tmp_path: Path) -> None:
+        registry = SharedCloneRegistry()
+        cloner = FakeCloner()
+        dirs = [str(tmp_path / f"clone-{i}") for i in range(3)]
+
+        tasks = [
+            asyncio.create_task(
+                registry.acquire(key=KEY, path=path, clone=cloner.clone, logger=Mock(), log_prefix="[TEST]")
+            )
+            for path in dirs
+        ]
+        await asyncio.sleep(0)
+        cloner.gate.set()
+        handles = await asyncio.gather(*tasks)
+
+        assert cloner.calls == [dirs[0]]
+        assert {handle.path for handle in handles} == {dirs[0]}
+        assert handles[0].refs == 3
+
+        # Directory survives until the last holder releases it
+        for handle in handles[:2]:
+            await registry.release(shared=handle, logger=Mock(), log_prefix="[TEST]")
+        assert Path(dirs[0]).exists()
+        assert len(registry) == 1
+
+        await registry.release(shared=handles[2], logger=Mock(), log_prefix="[TEST]")
+        assert not Path(dirs[0]).exists()
+        assert len(registry) == 0
+
+    @pytest.mark.asyncio
+    async def test_different_head_sha_clones_separately(self, tmp_path: Path) -> None:
+        registry = SharedCloneRegistry()
+        cloner = FakeCloner()
+        cloner.gate.set()
+
+        first = await registry.acquire(
+            key=KEY, path=str(tmp_path / "a"), clone=cloner.clone, logger=Mock(), log_prefix="[TEST]"
+        )
+        second = await registry.acquire(
+            key=("org/repo", "b" * 40, "main", 1),
+            path=str(tmp_path / "b"),
+            clone=cloner.clone,
+            logger=Mock(),
+            log_prefix="[TEST]",
+        )
+
+        assert first.path != second.path
+        assert len(cloner.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_clone_is_not_shared_with_later_callers(self, tmp_path: Path) -> None:
+        registry = SharedCloneRegistry()
+        failing = FakeCloner(fail=True)
+        failing.gate.set()
+
+        with pytest.raises(RuntimeError, match="Failed to clone"):
+            await registry.acquire(
+                key=KEY, path=str(tmp_path / "a"), clone=failing.clone, logger=Mock(), log_prefix="[TEST]"
+            )
+        assert len(registry) == 0
+
+        working = FakeCloner()
+        working.gate.set()
+        shared = await registry.acquire(
+            key=KEY, path=str(tmp_path / "b"), clone=working.clone, logger=Mock(), log_prefix="[TEST]"
+        )
+        assert shared.path == str(tmp_path / "b")
+        assert shared.refs == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_abort_clone_for_others(self, tmp_path: Path) -> None:
+        registry = SharedCloneRegistry()
+        cloner = FakeCloner()
+        path = str(tmp_path / "a")
+
+        first = asyncio.create_task(
+            registry.acquire(key=KEY, path=path, clone=cloner.clone, logger=Mock(), log_prefix="[TEST]")
+        )
+        second = asyncio.create_task(
+            registry.acquire(key=KEY, path=str(tmp_path / "b"), clone=cloner.clone, logger=Mock(), log_prefix="[TEST]")
+        )
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+
+        cloner.gate.set()
+        shared = await second
+
+        assert shared.path == path
+        assert shared.refs == 1
+        assert Path(path, ".git").exists()
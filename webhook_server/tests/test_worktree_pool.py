@@ -0,0 +1,126 @@
+"""Tests for webhook_server.utils.worktree_pool — pooled git worktrees."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
+from unittest.mock import Mock
+
+import pytest
+
+from webhook_server.utils.worktree_pool import WorktreePool, WorktreePoolRegistry
+
+
+class FakeWorktrees:
+    """Stand-in for helpers.git_worktree_checkout that records created/removed paths."""
+
+    def __init__(self, succeed: bool = True) -> None:
+        self.succeed = succeed
+        self.created: list[str] = []
+        self.removed: list[str] = []
+
+    @contextlib.asynccontextmanager
+    async def checkout(self) -> AsyncGenerator[tuple[bool, str, str, str]]:
+        path = f"/tmp/repo-worktree-{len(self.created)}"
+        self.created.append(path)
+        try:
+            yield (self.succeed, path, "", "" if self.succeed else "fatal: invalid reference")
+        finally:
+            self.removed.append(path)
+
+
+class TestWorktreePool:
+    """Tests for WorktreePool leasing and recycling."""
+
+    @pytest.mark.asyncio
+    async def test_released_worktree_is_reused(self) -> None:
+        pool = WorktreePool(repo_dir="/tmp/repo")
+        fake = FakeWorktrees()
+
+        async with pool.lease() as lease:
+            assert lease.worktree is None
+            lease.worktree, _ = await pool.add(fake.checkout())
+
+        async with pool.lease() as lease:
+            assert lease.worktree is not None
+            assert lease.worktree.path == fake.created[0]
+
+        assert len(fake.created) == 1
+        assert fake.removed == []
+        assert pool.size == 1
+        assert pool.idle == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_creation_is_closed_immediately(self) -> None:
+        pool = WorktreePool(repo_dir="/tmp/repo")
+        fake = FakeWorktrees(succeed=False)
+
+        worktree, result = await pool.add(fake.checkout())
+
+        assert worktree is None
+        assert result[0] is False
+        assert fake.removed == fake.created
+        assert pool.size == 0
+
+    @pytest.mark.asyncio
+    async def test_lease_caps_concurrent_worktrees(self) -> None:
+        pool = WorktreePool(repo_dir="/tmp/repo", max_worktrees=2)
+        active = 0
+        peak = 0
+
+        async def check() -> None:
+            nonlocal active, peak
+            async with pool.lease():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*[check() for _ in range(5)])
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_close_removes_idle_and_released_worktrees(self) -> None:
+        pool = WorktreePool(repo_dir="/tmp/repo")
+        fake = FakeWorktrees()
+
+        async with pool.lease() as first:
+            first.worktree, _ = await pool.add(fake.checkout())
+            async with pool.lease() as second:
+                second.worktree, _ = await pool.add(fake.checkout())
+
+            await pool.close()
+            # Idle worktree is removed right away, the leased one survives until released
+            assert fake.removed == [fake.created[1]]
+
+        assert sorted(fake.removed) == sorted(fake.created)
+        assert pool.size == 0
+
+    def test_prepared_checkout_is_recorded_per_key(self) -> None:
+        pool = WorktreePool(repo_dir="/tmp/repo")
+        key = ("origin/pr/1", "main")
+
+        assert pool.prepared(key) is None
+        pool.set_prepared(key, success=True, commit="abc123", out="", err="")
+
+        prepared = pool.prepared(key)
+        assert prepared is not None
+        assert prepared.commit == "abc123"
+        assert pool.prepared(("origin/pr/2", "main")) is None
+
+
+class TestWorktreePoolRegistry:
+    """Tests for the process-wide pool registry."""
+
+    @pytest.mark.asyncio
+    async def test_get_returns_same_pool_until_closed(self) -> None:
+        registry = WorktreePoolRegistry()
+
+        pool = registry.get(repo_dir="/tmp/repo", max_worktrees=3)
+        assert registry.get(repo_dir="/tmp/repo") is pool
+        assert pool.max_worktrees == 3
+
+        await registry.close(repo_dir="/tmp/repo", logger=Mock(), log_prefix="[TEST]")
+        assert registry.get(repo_dir="/tmp/repo") is not pool
@@ -0,0 +1,356 @@
+"""Disk-usage-aware cache directory management under the server data dir.
+
+Provides:
+- ``CacheManager``: Tracks size and last use of every cache entry under
+  ``<data_dir>/cache/<namespace>/<key>``, evicts least recently used entries once
+  total usage crosses the configured high-water mark, and reaps orphaned
+  ``github-webhook-*`` temp clones/worktrees left behind by crashes.
+- ``CacheUsage``: Snapshot of cache usage for monitoring endpoints.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+
+DEFAULT_CACHE_MAX_SIZE_GB: float = 20.0
+_DEFAULT_MAX_BYTES: int = int(DEFAULT_CACHE_MAX_SIZE_GB * 1024**3)
+
+# Eviction stops once usage drops below this fraction of the high-water mark,
+# so a cache hovering at the limit does not evict on every use.
+_LOW_WATER_RATIO: float = 0.9
+
+# Entries used within this window are never evicted: another uvicorn worker
+# (with its own in-use bookkeeping) may still be working in them.
+_EVICTION_GRACE_SECONDS: float = 3600.0
+
+# Temp clones younger than this may belong to a live webhook in another worker.
+ORPHAN_MIN_AGE_SECONDS: float = 6 * 3600.0
+
+# Entry sizes are only measured by the periodic scan, so new entries count once it has run
+CACHE_SCAN_INTERVAL_SECONDS: float = 900.0
+
+ORPHAN_TEMP_DIR_PREFIX: str = "github-webhook-"
+
+_TRASH_PREFIX: str = ".trash-"
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+# (namespace, key)
+EntryKey = tuple[str, str]
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """Bookkeeping for one cache directory."""
+
+    path: str
+    size: int = 0
+    last_used: float = 0.0
+    in_use: int = 0
+
+
+@dataclass(slots=True)
+class CacheUsage:
+    """Point-in-time usage figures returned by :meth:`CacheManager.usage`."""
+
+    root_dir: str
+    max_bytes: int
+    total_bytes: int
+    entries: int
+    in_use: int
+    namespaces: dict[str, int] = field(default_factory=dict)
+    evictions: int = 0
+    evicted_bytes: int = 0
+    reaped_temp_dirs: int = 0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "root_dir": self.root_dir,
+            "max_bytes": self.max_bytes,
+            "total_bytes": self.total_bytes,
+            "entries": self.entries,
+            "in_use": self.in_use,
+            "namespaces": dict(self.namespaces),
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
+            "reaped_temp_dirs": self.reaped_temp_dirs,
+        }
+
+
+def _safe_name(value: str) -> str:
+    """Map an arbitrary namespace/key (repo names, hashes) to one path component."""
+    name = _SAFE_NAME_RE.sub("_", value).strip(".")
+    if not name:
+        raise ValueError(f"Invalid cache name: {value!r}")
+    return name
+
+
+def directory_size(path: str) -> int:
+    """Return the disk usage of *path* in bytes without following symlinks."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path, followlinks=False):
+        for name in filenames:
+            with contextlib.suppress(OSError):
+                total += os.lstat(os.path.join(dirpath, name)).st_blocks * 512
+    return total
+
+
+class CacheManager:
+    """LRU, size-bounded manager for persistent cache directories.
+
+    Every cached artifact (clone mirror, uv/tox env, prek hooks, podman context...)
+    lives in its own directory ``<root_dir>/<namespace>/<key>``.  Last use is
+    recorded as the directory mtime so it survives restarts and is shared by all
+    worker processes.  Sizes are measured by :meth:`scan`, at startup and
+    periodically from :meth:`run`.
+
+    Usage (module-level singleton)::
+
+        cache_manager.configure(root_dir=os.path.join(config.data_dir, "cache"), max_bytes=20 * 1024**3)
+        async with cache_manager.use(namespace="uv", key=lock_hash, logger=logger, log_prefix="[TEST]") as path:
+            ...
+    """
+
+    def __init__(self, root_dir: str = "", max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self._entries: dict[EntryKey, CacheEntry] = {}
+        self._lock = asyncio.Lock()
+        self._evictions = 0
+        self._evicted_bytes = 0
+        self._reaped_temp_dirs = 0
+
+    def configure(self, root_dir: str, max_bytes: int) -> None:
+        """Set the cache root and high-water mark (called once at startup)."""
+        if root_dir != self.root_dir:
+            self._entries.clear()
+        self.root_dir = root_dir
+        self.max_bytes = max(0, max_bytes)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry.size for entry in self._entries.values())
+
+    def entry_path(self, namespace: str, key: str) -> str:
+        if not self.root_dir:
+            raise RuntimeError("Cache manager is not configured")
+        return os.path.join(self.root_dir, _safe_name(namespace), _safe_name(key))
+
+    @contextlib.asynccontextmanager
+    async def use(self, namespace: str, key: str, logger: logging.Logger, log_prefix: str) -> AsyncGenerator[str]:
+        """Yield the (created) directory for an entry, protecting it from eviction while held.
+
+        On release, least recently used idle entries are evicted if the cache is
+        above its high-water mark.  Sizes are not re-measured here: shared caches
+        (uv, pip) hold hundreds of thousands of files, so only :meth:`scan` walks them.
+        """
+        path = self.entry_path(namespace=namespace, key=key)
+        entry_key = (_safe_name(namespace), _safe_name(key))
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            entry = CacheEntry(path=path)
+            self._entries[entry_key] = entry
+
+        entry.in_use += 1
+        try:
+            await asyncio.to_thread(os.makedirs, path, exist_ok=True)
+            self._touch(entry)
+            yield path
+        finally:
+            entry.in_use -= 1
+            self._touch(entry)
+            if self.total_bytes > self.max_bytes:
+                await self.evict(logger=logger, log_prefix=log_prefix)
+
+    def _touch(self, entry: CacheEntry) -> None:
+        entry.last_used = time.time()
+        with contextlib.suppress(OSError):
+            os.utime(entry.path, (entry.last_used, entry.last_used))
+
+    async def scan(self, logger: logging.Logger, log_prefix: str) -> None:
+        """Rebuild size/last-use bookkeeping from disk (startup and external changes)."""
+        if not self.root_dir:
+            return
+
+        found = await asyncio.to_thread(self._scan_disk)
+        for entry_key, (path, size, mtime) in found.items():
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                self._entries[entry_key] = CacheEntry(path=path, size=size, last_used=mtime)
+            elif not entry.in_use:
+                entry.size = size
+                entry.last_used = max(entry.last_used, mtime)
+
+        for entry_key in [k for k, e in self._entries.items() if k not in found and not e.in_use]:
+            del self._entries[entry_key]
+
+        logger.debug(
+            f"{log_prefix} Cache scan: {len(self._entries)} entries, {self.total_bytes} bytes under {self.root_dir}"
+        )
+
+    async def run(self, logger: logging.Logger, interval_seconds: float = CACHE_SCAN_INTERVAL_SECONDS) -> None:
+        """Re-measure entries and evict every *interval_seconds* until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.scan(logger=logger, log_prefix="[cache]")
+                await self.evict(logger=logger, log_prefix="[cache]")
+            except Exception:
+                logger.exception("Cache scan failed")
+
+    def _scan_disk(self) -> dict[EntryKey, tuple[str, int, float]]:
+        found: dict[EntryKey, tuple[str, int, float]] = {}
+        if not os.path.isdir(self.root_dir):
+            return found
+
+        for namespace in os.listdir(self.root_dir):
+            namespace_dir = os.path.join(self.root_dir, namespace)
+            if namespace.startswith(_TRASH_PREFIX):
+                # Leftover from an interrupted eviction
+                shutil.rmtree(namespace_dir, ignore_errors=True)
+                continue
+            if not os.path.isdir(namespace_dir) or os.path.islink(namespace_dir):
+                continue
+            for key in os.listdir(namespace_dir):
+                path = os.path.join(namespace_dir, key)
+                if not os.path.isdir(path) or os.path.islink(path):
+                    continue
+                with contextlib.suppress(OSError):
+                    found[(namespace, key)] = (path, directory_size(path), os.stat(path).st_mtime)
+        return found
+
+    async def evict(self, logger: logging.Logger, log_prefix: str) -> int:
+        """Evict least recently used idle entries until usage is below the low-water mark.
+
+        Returns:
+            Number of bytes freed.
+        """
+        async with self._lock:
+            target = int(self.max_bytes * _LOW_WATER_RATIO)
+            total = self.total_bytes
+            if total <= self.max_bytes:
+                return 0
+
+            now = time.time()
+            candidates = sorted(
+                (
+                    (entry_key, entry)
+                    for entry_key, entry in self._entries.items()
+                    if not entry.in_use and now - entry.last_used >= _EVICTION_GRACE_SECONDS
+                ),
+                key=lambda item: item[1].last_used,
+            )
+
+            freed = 0
+            for entry_key, entry in candidates:
+                if total - freed <= target:
+                    break
+                logger.info(
+                    f"{log_prefix} Evicting cache entry {entry_key[0]}/{entry_key[1]} "
+                    f"({entry.size} bytes, idle {now - entry.last_used:.0f}s)"
+                )
+                try:
+                    await asyncio.to_thread(self._remove_dir, entry.path)
+                except OSError as ex:
+                    logger.warning(f"{log_prefix} Failed to evict cache entry {entry.path}: {ex}")
+                    continue
+                del self._entries[entry_key]
+                freed += entry.size
+                self._evictions += 1
+
+            self._evicted_bytes += freed
+            if total - freed > self.max_bytes:
+                logger.warning(
+                    f"{log_prefix} Cache still above high-water mark after eviction: "
+                    f"{total - freed}/{self.max_bytes} bytes (remaining entries in use)"
+                )
+            return freed
+
+    def _remove_dir(self, path: str) -> None:
+        # Rename first so a half-deleted entry is never picked up as a valid cache
+        trash = os.path.join(self.root_dir, f"{_TRASH_PREFIX}{uuid.uuid4().hex}")
+        os.rename(path, trash)
+        shutil.rmtree(trash, ignore_errors=True)
+
+    async def reap_orphaned_temp_dirs(
+        self,
+        logger: logging.Logger,
+        log_prefix: str,
+        temp_dir: str | None = None,
+        min_age_seconds: float = ORPHAN_MIN_AGE_SECONDS,
+    ) -> list[str]:
+        """Remove ``github-webhook-*`` clones and worktrees leaked by crashed or cancelled webhooks.
+
+        Only directories older than *min_age_seconds* are removed, since other
+        worker processes may still be using recent ones.
+
+        Returns:
+            Removed directory paths.
+        """
+        base_dir = temp_dir or tempfile.gettempdir()
+        removed = await asyncio.to_thread(self._reap_temp_dirs, base_dir, min_age_seconds)
+        self._reaped_temp_dirs += len(removed)
+        for path in removed:
+            logger.info(f"{log_prefix} Removed orphaned temp directory {path}")
+        return removed
+
+    @staticmethod
+    def _reap_temp_dirs(base_dir: str, min_age_seconds: float) -> list[str]:
+        removed: list[str] = []
+        try:
+            names = os.listdir(base_dir)
+        except OSError:
+            return removed
+
+        cutoff = time.time() - min_age_seconds
+        for name in names:
+            if not name.startswith(ORPHAN_TEMP_DIR_PREFIX):
+                continue
+            path = os.path.join(base_dir, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if not os.path.isdir(path) or os.path.islink(path) or st.st_mtime > cutoff:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            if not os.path.exists(path):
+                removed.append(path)
+        return removed
+
+    def usage(self) -> CacheUsage:
+        namespaces: dict[str, int] = {}
+        for (namespace, _), entry in self._entries.items():
+            namespaces[namespace] = namespaces.get(namespace, 0) + entry.size
+        return CacheUsage(
+            root_dir=self.root_dir,
+            max_bytes=self.max_bytes,
+            total_bytes=self.total_bytes,
+            entries=len(self._entries),
+            in_use=sum(1 for entry in self._entries.values() if entry.in_use),
+            namespaces=namespaces,
+            evictions=self._evictions,
+            evicted_bytes=self._evicted_bytes,
+            reaped_temp_dirs=self._reaped_temp_dirs,
+        )
+
+    def clear(self) -> None:
+        """Forget configuration and bookkeeping (does not touch the disk)."""
+        self.root_dir = ""
+        self.max_bytes = _DEFAULT_MAX_BYTES
+        self._entries.clear()
+        self._evictions = 0
+        self._evicted_bytes = 0
+        self._reaped_temp_dirs = 0
+
+
+cache_manager = CacheManager()
@@ -0,0 +1,381 @@
+"""Per-check resource limits and accounting with cgroup v2.
+
+Provides:
+- ``ResourceLimits``: CPU, memory and pids limits of one check.
+- ``ResourceUsage``: Peak memory, CPU time and I/O of one finished check.
+- ``prepare_cgroup_root``: Moves the server into a ``server`` leaf cgroup and
+  creates a ``checks`` cgroup with the cpu/memory/pids/io controllers enabled
+  (run once by the entrypoint, before the worker processes start).
+- ``CheckCgroups``: Creates a cgroup per check run under ``checks``, wraps the
+  check command so its whole process tree joins it, reads the accounting back
+  and removes the cgroup when the check is done.  Without a usable cgroup root
+  it can fall back to ``systemd-run --scope`` (limits only, no accounting).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import math
+import os
+import shlex
+import shutil
+import time
+import uuid
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+
+CGROUP_MOUNT: str = "/sys/fs/cgroup"
+CHECKS_CGROUP: str = "checks"
+SERVER_CGROUP: str = "server"
+CGROUP_CONTROLLERS: tuple[str, ...] = ("cpu", "memory", "pids", "io")
+
+BACKEND_AUTO: str = "auto"
+BACKEND_CGROUP: str = "cgroup"
+BACKEND_SYSTEMD_RUN: str = "systemd-run"
+BACKEND_NONE: str = "none"
+
+# cpu.max period; the quota is ``cpu * period``
+_CPU_PERIOD_USEC: int = 100_000
+_RMDIR_ATTEMPTS: int = 50
+_RMDIR_INTERVAL_SECONDS: float = 0.1
+
+# Joins the cgroup given as $1, then becomes the check command.  If the cgroup
+# cannot be joined the check still runs, just without limits.
+_JOIN_SCRIPT: str = '{ echo 0 > "$1/cgroup.procs"; } 2>/dev/null; shift; exec "$@"'
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceLimits:
+    """Limits of one check's process tree; ``0`` means unlimited."""
+
+    cpu: float = 0
+    memory_mb: int = 0
+    pids: int = 0
+
+    @classmethod
+    def from_config(cls, config: object, base: ResourceLimits | None = None) -> ResourceLimits:
+        """Build limits from a ``{"cpu": 2, "memory-mb": 4096, "pids": 1024}`` mapping, defaulting to *base*."""
+        base = base or cls()
+        if not isinstance(config, dict):
+            return base
+        return cls(
+            cpu=float(config.get("cpu", base.cpu)),
+            memory_mb=int(config.get("memory-mb", base.memory_mb)),
+            pids=int(config.get("pids", base.pids)),
+        )
+
+    def describe(self) -> str:
+        limits = [
+            f"{self.cpu:g} CPU" if self.cpu else "",
+            f"{self.memory_mb} MiB" if self.memory_mb else "",
+            f"{self.pids} pids" if self.pids else "",
+        ]
+        return ", ".join(limit for limit in limits if limit) or "unlimited"
+
+
+@dataclass(slots=True)
+class ResourceUsage:
+    """Accounting of one check's process tree, read from its cgroup."""
+
+    peak_memory_mb: float = 0.0
+    cpu_seconds: float = 0.0
+    io_read_mb: float = 0.0
+    io_write_mb: float = 0.0
+    wall_seconds: float = 0.0
+    oom_killed: bool = False
+
+    def summary(self) -> str:
+        text = (
+            f"Peak memory {self.peak_memory_mb:.0f} MiB, CPU {self.cpu_seconds:.1f}s "
+            f"in {self.wall_seconds:.1f}s, I/O read {self.io_read_mb:.0f} MiB / write {self.io_write_mb:.0f} MiB"
+        )
+        if self.oom_killed:
+            text = f"{text}. Killed: the check ran out of memory"
+        return text
+
+
+def _own_cgroup() -> str:
+    """Return this process's cgroup v2 directory, or ``""`` if it is not on a unified hierarchy."""
+    with contextlib.suppress(OSError):
+        with open("/proc/self/cgroup") as fd:
+            for line in fd:
+                if line.startswith("0::"):
+                    path = os.path.join(CGROUP_MOUNT, line[3:].strip().lstrip("/"))
+                    if os.path.exists(os.path.join(path, "cgroup.controllers")):
+                        return os.path.normpath(path)
+    return ""
+
+
+def _enable_controllers(path: str) -> None:
+    with open(os.path.join(path, "cgroup.controllers")) as fd:
+        available = fd.read().split()
+    for controller in CGROUP_CONTROLLERS:
+        if controller in available:
+            # One at a time: a controller the kernel refuses must not block the others
+            with contextlib.suppress(OSError):
+                with open(os.path.join(path, "cgroup.subtree_control"), "w") as fd:
+                    fd.write(f"+{controller}")
+
+
+def prepare_cgroup_root() -> str:
+    """Set up ``<own cgroup>/checks`` for check cgroups; returns its path, or ``""`` if cgroups are not delegated.
+
+    cgroup v2 only lets a cgroup hand controllers to children when it has no
+    processes of its own, so the server's processes move to a ``server`` leaf
+    first.  Safe to call again after a restart.
+    """
+    own = _own_cgroup()
+    if not own:
+        return ""
+
+    parent = os.path.dirname(own) if os.path.basename(own) == SERVER_CGROUP else own
+    checks = os.path.join(parent, CHECKS_CGROUP)
+    try:
+        if parent == own:
+            server = os.path.join(parent, SERVER_CGROUP)
+            os.makedirs(server, exist_ok=True)
+            with open(os.path.join(parent, "cgroup.procs")) as fd:
+                pids = fd.read().split()
+            for pid in pids:
+                with contextlib.suppress(ProcessLookupError, OSError):
+                    with open(os.path.join(server, "cgroup.procs"), "w") as fd:
+                        fd.write(pid)
+        _enable_controllers(parent)
+        os.makedirs(checks, exist_ok=True)
+        _enable_controllers(checks)
+    except OSError:
+        return ""
+    return checks
+
+
+def default_cgroup_root() -> str:
+    """Return the ``checks`` cgroup prepared by :func:`prepare_cgroup_root` for this process, or ``""``."""
+    own = _own_cgroup()
+    if os.path.basename(own) != SERVER_CGROUP:
+        return ""
+    checks = os.path.join(os.path.dirname(own), CHECKS_CGROUP)
+    return checks if os.access(checks, os.W_OK) else ""
+
+
+def _read_int(path: str) -> int:
+    with contextlib.suppress(OSError, ValueError):
+        with open(path) as fd:
+            return int(fd.read().strip())
+    return 0
+
+
+def _read_keyed(path: str) -> dict[str, int]:
+    """Sum ``key value`` / ``key=value`` pairs of a cgroup stat file over all of its lines."""
+    totals: dict[str, int] = {}
+    with contextlib.suppress(OSError):
+        with open(path) as fd:
+            for line in fd:
+                fields = line.split()
+                pairs = [field.split("=", 1) for field in fields if "=" in field]
+                if not pairs and len(fields) == 2:
+                    pairs = [fields]
+                for key, value in pairs:
+                    with contextlib.suppress(ValueError):
+                        totals[key] = totals.get(key, 0) + int(value)
+    return totals
+
+
+class CheckCgroup:
+    """The cgroup (or scope) one check command runs in."""
+
+    def __init__(self, path: str = "", wrapper: str = "") -> None:
+        self.path = path
+        self._wrapper = wrapper
+        self.usage: ResourceUsage | None = None
+
+    def wrap(self, command: str) -> str:
+        """Return *command* prefixed so that it runs inside this cgroup."""
+        if self.path:
+            return f"sh -c {shlex.quote(_JOIN_SCRIPT)} sh {shlex.quote(self.path)} {command}"
+        if self._wrapper:
+            return f"{self._wrapper} {command}"
+        return command
+
+
+class CheckCgroups:
+    """Per-check cgroups under a delegated cgroup v2 root.
+
+    Every check run gets its own cgroup, named after the worker pid, with the
+    configured limits; ``memory.oom.group`` makes the kernel kill the whole
+    check instead of a random process in it.  When the command exits, the
+    accounting is read, leftover processes are killed and the cgroup removed.
+
+    Until :meth:`configure` is called, check commands run unchanged.
+
+    Usage (module-level singleton)::
+
+        async with check_cgroups.cgroup(check_name="tox", logger=logger, log_prefix="[TEST]") as cgroup:
+            await run_command(command=cgroup.wrap(command), ...)
+        usage = cgroup.usage  # None without cgroup accounting
+    """
+
+    def __init__(self) -> None:
+        self.backend = BACKEND_NONE
+        self.root = ""
+        self.default_limits = ResourceLimits()
+        self.check_limits: dict[str, ResourceLimits] = {}
+
+    def configure(
+        self,
+        backend: str = BACKEND_AUTO,
+        root: str = "",
+        default_limits: ResourceLimits | None = None,
+        check_limits: dict[str, ResourceLimits] | None = None,
+    ) -> str:
+        """Pick the backend and set limits (called once per worker at startup); returns the backend in use.
+
+        Args:
+            backend: ``auto`` (cgroup if a root is usable, else none), ``cgroup``, ``systemd-run`` or ``none``.
+            root: Delegated cgroup for check cgroups; empty means the one prepared by the entrypoint.
+            default_limits: Limits of checks without an entry in *check_limits*.
+            check_limits: Per-check limits keyed by check name.
+        """
+        self.default_limits = default_limits or ResourceLimits()
+        self.check_limits = dict(check_limits or {})
+        self.root = ""
+        self.backend = BACKEND_NONE
+
+        if backend in (BACKEND_AUTO, BACKEND_CGROUP):
+            cgroup_root = root or default_cgroup_root()
+            if cgroup_root and os.access(cgroup_root, os.W_OK):
+                self.root = cgroup_root
+                self.backend = BACKEND_CGROUP
+                self._remove_stale()
+        elif backend == BACKEND_SYSTEMD_RUN and shutil.which("systemd-run"):
+            self.backend = BACKEND_SYSTEMD_RUN
+        return self.backend
+
+    def configure_from_config(self, config: object) -> str:
+        """Configure from the global ``check-limits`` block; returns the backend in use."""
+        config = config if isinstance(config, dict) else {}
+        if not config.get("enabled", True):
+            self.clear()
+            return self.backend
+
+        default_limits = ResourceLimits.from_config(config.get("default"))
+        return self.configure(
+            backend=config.get("backend", BACKEND_AUTO),
+            root=config.get("cgroup-root", ""),
+            default_limits=default_limits,
+            check_limits={
+                check_name: ResourceLimits.from_config(limits, base=default_limits)
+                for check_name, limits in (config.get("checks") or {}).items()
+            },
+        )
+
+    def limits_for(self, check_name: str) -> ResourceLimits:
+        return self.check_limits.get(check_name, self.default_limits)
+
+    @contextlib.asynccontextmanager
+    async def cgroup(self, check_name: str, logger: logging.Logger, log_prefix: str) -> AsyncGenerator[CheckCgroup]:
+        """Yield the cgroup for one run of *check_name*; its usage is set when the block exits."""
+        limits = self.limits_for(check_name)
+        if self.backend == BACKEND_SYSTEMD_RUN:
+            yield CheckCgroup(wrapper=self._systemd_run_prefix(limits))
+            return
+        if self.backend != BACKEND_CGROUP:
+            yield CheckCgroup()
+            return
+
+        path = os.path.join(self.root, f"{os.getpid()}-{check_name}-{uuid.uuid4().hex[:8]}")
+        try:
+            await asyncio.to_thread(self._create, path, limits)
+        except OSError as ex:
+            logger.warning(f"{log_prefix} Cannot create cgroup for {check_name}, running without limits: {ex}")
+            yield CheckCgroup()
+            return
+
+        logger.debug(f"{log_prefix} Running {check_name} in cgroup {path} ({limits.describe()})")
+        cgroup = CheckCgroup(path=path)
+        started = time.monotonic()
+        try:
+            yield cgroup
+        finally:
+            cgroup.usage = await asyncio.to_thread(self._read_usage, path)
+            cgroup.usage.wall_seconds = time.monotonic() - started
+            if not await asyncio.to_thread(self._destroy, path):
+                logger.warning(f"{log_prefix} Could not remove cgroup {path}")
+
+    @staticmethod
+    def _systemd_run_prefix(limits: ResourceLimits) -> str:
+        properties: list[str] = []
+        if limits.cpu:
+            properties.append(f"-p CPUQuota={math.ceil(limits.cpu * 100)}%")
+        if limits.memory_mb:
+            properties.append(f"-p MemoryMax={limits.memory_mb}M")
+        if limits.pids:
+            properties.append(f"-p TasksMax={limits.pids}")
+        return " ".join(["systemd-run --user --scope --quiet --collect", *properties, "--"])
+
+    @staticmethod
+    def _create(path: str, limits: ResourceLimits) -> None:
+        os.mkdir(path)
+        settings = {"memory.oom.group": "1"}
+        if limits.cpu:
+            settings["cpu.max"] = f"{math.ceil(limits.cpu * _CPU_PERIOD_USEC)} {_CPU_PERIOD_USEC}"
+        if limits.memory_mb:
+            settings["memory.max"] = str(limits.memory_mb * 1024**2)
+            settings["memory.swap.max"] = "0"
+        if limits.pids:
+            settings["pids.max"] = str(limits.pids)
+        for name, value in settings.items():
+            # Controllers the root does not delegate have no files; skip them
+            with contextlib.suppress(FileNotFoundError, PermissionError):
+                with open(os.path.join(path, name), "w") as fd:
+                    fd.write(value)
+
+    @staticmethod
+    def _read_usage(path: str) -> ResourceUsage:
+        io = _read_keyed(os.path.join(path, "io.stat"))
+        return ResourceUsage(
+            peak_memory_mb=_read_int(os.path.join(path, "memory.peak")) / 1024**2,
+            cpu_seconds=_read_keyed(os.path.join(path, "cpu.stat")).get("usage_usec", 0) / 1_000_000,
+            io_read_mb=io.get("rbytes", 0) / 1024**2,
+            io_write_mb=io.get("wbytes", 0) / 1024**2,
+            oom_killed=_read_keyed(os.path.join(path, "memory.events")).get("oom_kill", 0) > 0,
+        )
+
+    @staticmethod
+    def _destroy(path: str) -> bool:
+        """Kill whatever is left in the cgroup and remove it; False if it is still busy."""
+        with contextlib.suppress(OSError):
+            with open(os.path.join(path, "cgroup.kill"), "w") as fd:
+                fd.write("1")
+        for _ in range(_RMDIR_ATTEMPTS):
+            try:
+                os.rmdir(path)
+                return True
+            except FileNotFoundError:
+                return True
+            except OSError:
+                time.sleep(_RMDIR_INTERVAL_SECONDS)
+        return False
+
+    def _remove_stale(self) -> None:
+        """Remove cgroups left behind by worker processes that no longer exist."""
+        with contextlib.suppress(OSError):
+            for name in os.listdir(self.root):
+                pid, _, _ = name.partition("-")
+                path = os.path.join(self.root, name)
+                if not pid.isdigit() or not os.path.isdir(path):
+                    continue
+                with contextlib.suppress(ProcessLookupError, PermissionError):
+                    os.kill(int(pid), 0)
+                    continue
+                self._destroy(path)
+
+    def clear(self) -> None:
+        self.backend = BACKEND_NONE
+        self.root = ""
+        self.default_limits = ResourceLimits()
+        self.check_limits = {}
+
+
+check_cgroups = CheckCgroups()
@@ -0,0 +1,86 @@
+"""Per-check timeout, output limit and retry policy.
+
+Provides:
+- ``CheckPolicy``: ``timeout``, ``max-output``, ``retries`` and
+  ``live-output-interval`` of one check, from the ``check-policies`` block
+  (built-in checks, and a ``default`` for every check) or a
+  ``custom-check-runs`` entry.  ``RunnerHandler`` gives each attempt of a check
+  command ``timeout`` seconds, kills it once its output exceeds ``max-output``
+  MiB, retries it with exponential backoff when it fails with one of the
+  retryable (infrastructure) exit codes, and publishes the tail of its output
+  to the in-progress check run at most every ``live-output-interval`` seconds.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+
+from webhook_server.utils.constants import CHECK_OUTPUT_MAX_BYTES
+
+# No check holds a CI slot (and its worktree) longer than this unless configured otherwise
+DEFAULT_CHECK_TIMEOUT_SECONDS: int = 3600
+DEFAULT_RETRY_BACKOFF_SECONDS: float = 30.0
+MAX_RETRY_BACKOFF_SECONDS: float = 600.0
+# 125: container engine failed before running anything; 255: ssh/network failures
+DEFAULT_RETRY_EXIT_CODES: frozenset[int] = frozenset({125, 255})
+DEFAULT_LIVE_OUTPUT_INTERVAL_SECONDS: float = 30.0
+# Keeps check run updates of chatty commands well inside the API rate limits
+MIN_LIVE_OUTPUT_INTERVAL_SECONDS: float = 10.0
+
+
+@dataclass(frozen=True, slots=True)
+class CheckPolicy:
+    """Limits and retry policy applied to every attempt of one check."""
+
+    timeout: int = DEFAULT_CHECK_TIMEOUT_SECONDS
+    max_output_bytes: int = CHECK_OUTPUT_MAX_BYTES
+    retries: int = 0
+    retry_backoff_seconds: float = DEFAULT_RETRY_BACKOFF_SECONDS
+    retry_exit_codes: frozenset[int] = DEFAULT_RETRY_EXIT_CODES
+    # 0 disables live output
+    live_output_interval: float = DEFAULT_LIVE_OUTPUT_INTERVAL_SECONDS
+
+    @classmethod
+    def from_config(cls, config: object, base: CheckPolicy | None = None) -> CheckPolicy:
+        """Build a policy from a mapping with ``timeout``, ``max-output``, ``retries`` and ``live-output-interval``.
+
+        Keys that are not set keep their value from *base* (the defaults when ``None``).
+        ``retries`` is either a count or ``{"count", "backoff-seconds", "exit-codes"}``.
+        """
+        policy = base or cls()
+        if not isinstance(config, dict):
+            return policy
+
+        changes: dict[str, object] = {}
+        if isinstance(config.get("timeout"), int) and config["timeout"] > 0:
+            changes["timeout"] = config["timeout"]
+        if isinstance(config.get("max-output"), int) and config["max-output"] > 0:
+            changes["max_output_bytes"] = config["max-output"] * 1024**2
+
+        live_output_interval = config.get("live-output-interval")
+        if isinstance(live_output_interval, int | float) and not isinstance(live_output_interval, bool):
+            changes["live_output_interval"] = (
+                max(MIN_LIVE_OUTPUT_INTERVAL_SECONDS, float(live_output_interval)) if live_output_interval > 0 else 0.0
+            )
+
+        retries = config.get("retries")
+        if isinstance(retries, int):
+            retries = {"count": retries}
+        if isinstance(retries, dict):
+            if isinstance(retries.get("count"), int):
+                changes["retries"] = max(0, retries["count"])
+            if isinstance(retries.get("backoff-seconds"), int | float):
+                changes["retry_backoff_seconds"] = max(0.0, float(retries["backoff-seconds"]))
+            if isinstance(retries.get("exit-codes"), list):
+                changes["retry_exit_codes"] = frozenset(code for code in retries["exit-codes"] if isinstance(code, int))
+
+        return dataclasses.replace(policy, **changes) if changes else policy  # type: ignore[arg-type]
+
+    def should_retry(self, attempt: int, returncode: int | None) -> bool:
+        """Return True if a failed *attempt* (1-based) that exited with *returncode* gets another try."""
+        return returncode is not None and returncode in self.retry_exit_codes and attempt <= self.retries
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after failed *attempt* (1-based): doubles per attempt, capped."""
+        return min(self.retry_backoff_seconds * 2 ** (attempt - 1), MAX_RETRY_BACKOFF_SECONDS)
@@ -0,0 +1,143 @@
+"""Results of passed checks keyed by the merged tree and the check definition.
+
+Provides:
+- ``CachedCheckResult``: Conclusion and output of one check run.
+- ``check_result_key``: Cache key for ``(merged tree SHA, check name, check
+  definition, tool versions)``.
+- ``CheckResultCache``: Stores results as JSON files in the ``check-results``
+  namespace of the data-dir cache, so rebases that do not change content,
+  ``/retest`` on unchanged code and re-opened PRs reuse an earlier pass instead of
+  re-running the check.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass
+
+from webhook_server.utils.cache_manager import cache_manager
+from webhook_server.utils.helpers import run_command
+
+CHECK_RESULTS_NAMESPACE: str = "check-results"
+
+# Tools whose version changes what a check run can report
+_TOOL_VERSION_COMMANDS: tuple[str, ...] = ("uv --version", "git --version")
+
+
+@dataclass(slots=True)
+class CachedCheckResult:
+    """A completed check run that can be republished for an identical merged tree."""
+
+    check_name: str
+    conclusion: str
+    title: str
+    summary: str
+    text: str | None
+    head_sha: str
+    tree_sha: str
+    created_at: float = 0.0
+
+
+def check_result_key(tree_sha: str, check_name: str, definition: str, tool_versions: str) -> str:
+    """Return the cache key of a check run on *tree_sha*.
+
+    *definition* must capture everything that changes what the check does
+    (command, working directory mode...).
+    """
+    payload = json.dumps([tree_sha, check_name, definition, tool_versions])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CheckResultCache:
+    """Check results stored per repository under the data-dir cache.
+
+    Only results handed to :meth:`put` are stored; the caller decides which
+    conclusions are safe to reuse.  Nothing is cached while the cache manager
+    is not configured.
+
+    Usage (module-level singleton)::
+
+        key = check_result_key(tree_sha, "tox", definition, await check_result_cache.tool_versions(...))
+        cached = await check_result_cache.get(repository="org/repo", key=key, logger=logger, log_prefix="[TEST]")
+    """
+
+    def __init__(self) -> None:
+        self._tool_versions: str | None = None
+        self._tool_versions_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(cache_manager.root_dir)
+
+    async def tool_versions(self, logger: logging.Logger, log_prefix: str) -> str:
+        """Versions of the tools checks run with, probed once per process."""
+        async with self._tool_versions_lock:
+            if self._tool_versions is None:
+                versions: list[str] = []
+                for command in _TOOL_VERSION_COMMANDS:
+                    rc, out, _ = await run_command(command=command, log_prefix=log_prefix)
+                    versions.append(out.strip() if rc else f"{command}: unavailable")
+                self._tool_versions = "\n".join(versions)
+                logger.debug(f"{log_prefix} Check result cache tool versions: {self._tool_versions}")
+            return self._tool_versions
+
+    async def get(self, repository: str, key: str, logger: logging.Logger, log_prefix: str) -> CachedCheckResult | None:
+        if not self.enabled:
+            return None
+
+        async with cache_manager.use(
+            namespace=CHECK_RESULTS_NAMESPACE, key=repository, logger=logger, log_prefix=log_prefix
+        ) as path:
+            try:
+                return await asyncio.to_thread(self._read, os.path.join(path, f"{key}.json"))
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError, TypeError) as ex:
+                logger.warning(f"{log_prefix} Ignoring unreadable cached check result {key}: {ex}")
+                return None
+
+    async def put(
+        self, repository: str, key: str, result: CachedCheckResult, logger: logging.Logger, log_prefix: str
+    ) -> None:
+        if not self.enabled:
+            return
+
+        result.created_at = result.created_at or time.time()
+        async with cache_manager.use(
+            namespace=CHECK_RESULTS_NAMESPACE, key=repository, logger=logger, log_prefix=log_prefix
+        ) as path:
+            try:
+                await asyncio.to_thread(self._write, os.path.join(path, f"{key}.json"), result)
+            except OSError as ex:
+                logger.warning(f"{log_prefix} Failed to cache {result.check_name} result: {ex}")
+
+    @staticmethod
+    def _read(path: str) -> CachedCheckResult:
+        with open(path) as fd:
+            return CachedCheckResult(**json.load(fd))
+
+    @staticmethod
+    def _write(path: str, result: CachedCheckResult) -> None:
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w") as fd:
+                json.dump(asdict(result), fd)
+            os.replace(tmp_path, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+
+    def clear(self) -> None:
+        self._tool_versions = None
+        self._tool_versions_lock = asyncio.Lock()
+
+
+check_result_cache = CheckResultCache()
@@ -0,0 +1,109 @@
+"""Process-wide registry of the check runs this app created.
+
+Provides:
+- ``CheckRunRegistry``: Bounded LRU of ``(repository, head SHA, check name)`` ->
+  check run ID, filled from ``create_check_run`` responses and from ``check_run``
+  events of our app, so the next transition of a check (queued -> in_progress ->
+  completed) edits the existing check run in place instead of creating another
+  one.  Completed runs are dropped, so a re-run starts a new check run.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+_DEFAULT_MAX_ENTRIES: int = 4096
+
+# (repo_full_name, head_sha, check_name)
+CheckRunKey = tuple[str, str, str]
+
+
+class CheckRunRegistry:
+    """Check run IDs of the checks that are not completed yet.
+
+    IDs of completed runs are remembered separately, so a late ``created``
+    event of a run that already finished cannot register it again.
+
+    Usage (module-level singleton)::
+
+        check_run_id = check_run_registry.get(repo_full_name="org/repo", head_sha=sha, name="tox")
+        check_run_registry.record(repo_full_name="org/repo", head_sha=sha, name="tox", check_run_id=1, completed=False)
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[CheckRunKey, int] = OrderedDict()
+        self._completed: OrderedDict[int, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, repo_full_name: str, head_sha: str, name: str) -> int | None:
+        """Return the ID of the open check run, or ``None`` when unknown."""
+        key = (repo_full_name, head_sha, name)
+        check_run_id = self._entries.get(key)
+        if check_run_id is not None:
+            self._entries.move_to_end(key)
+        return check_run_id
+
+    def record(self, repo_full_name: str, head_sha: str, name: str, check_run_id: object, completed: bool) -> None:
+        """Remember a check run we created or updated; completed runs are forgotten."""
+        # Only real IDs can be edited later
+        if not isinstance(check_run_id, int) or isinstance(check_run_id, bool):
+            return
+
+        key = (repo_full_name, head_sha, name)
+        if completed:
+            if self._entries.get(key) == check_run_id:
+                del self._entries[key]
+            self._completed[check_run_id] = None
+            while len(self._completed) > self._max_entries:
+                self._completed.popitem(last=False)
+            return
+
+        if check_run_id in self._completed:
+            return
+
+        self._entries[key] = check_run_id
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def observe_event(self, repo_full_name: str, hook_data: dict[str, Any], app_id: object) -> bool:
+        """Record the check run of a ``check_run`` event when it belongs to our app.
+
+        Returns True when the event updated the registry.
+        """
+        check_run = hook_data.get("check_run")
+        if not isinstance(check_run, dict):
+            return False
+
+        # Check runs of other apps cannot be edited with our installation token
+        app = check_run.get("app")
+        if not isinstance(app, dict) or str(app.get("id")) != str(app_id):
+            return False
+
+        name, head_sha = check_run.get("name"), check_run.get("head_sha")
+        if not isinstance(name, str) or not isinstance(head_sha, str):
+            return False
+
+        self.record(
+            repo_full_name=repo_full_name,
+            head_sha=head_sha,
+            name=name,
+            check_run_id=check_run.get("id"),
+            completed=check_run.get("status") == "completed",
+        )
+        return True
+
+    def forget(self, repo_full_name: str, head_sha: str, name: str) -> None:
+        """Drop an ID that turned out to be stale (e.g. the check run was deleted)."""
+        self._entries.pop((repo_full_name, head_sha, name), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._completed.clear()
+
+
+check_run_registry = CheckRunRegistry()
@@ -0,0 +1,409 @@
+"""Check execution in dedicated runner processes over a job protocol.
+
+Provides:
+- ``CheckJob`` / ``CheckJobResult``: One check command and its outcome, as sent over the wire.
+- ``execute_check_job``: Runs a job in this process (in its cgroup, see ``check_cgroups``).
+- ``CheckRunnerServer``: Accepts jobs on a Unix socket (``unix:///path``) or TCP
+  (``tcp://host:port``), runs them and streams their output back.  The
+  entrypoint starts local runner processes; remote runners run the same server.
+- ``CheckRunners``: Client used by ``RunnerHandler.run_check``; submits jobs to
+  the configured runners round-robin.
+- ``local_runner_endpoints`` / ``check_runner_endpoints``: Runner endpoints from
+  the ``check-runners`` config.
+
+Protocol: newline-delimited JSON, one connection per job.  The client sends
+``{"token": ..., "job": {...}}``; the runner answers with any number of
+``{"output": {"stream": "stdout", "text": ...}}`` messages, then either
+``{"result": {...}}`` or ``{"error": ...}``.  Closing the connection cancels
+the job, which terminates the command's process group.
+
+Jobs reference their worktree by path, so a runner must see the webhook
+server's temp dir (clones and worktrees) and data dir (caches) at the same
+paths.  A runner declines jobs whose working directory it cannot see with
+``{"declined": ...}``; the client then tries the next runner.  TCP runners
+require a token: they run arbitrary commands with the secrets of the job.
+
+Run a runner with ``python -m webhook_server.utils.check_runners --listen unix:///path/runner.sock``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import hmac
+import json
+import logging
+import os
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any
+from urllib.parse import urlsplit
+
+from webhook_server.libs.config import Config
+from webhook_server.utils.check_cgroups import ResourceUsage, check_cgroups
+from webhook_server.utils.helpers import get_logger_with_params, run_command
+from webhook_server.utils.process_groups import process_reaper
+
+DEFAULT_LOCAL_PROCESSES: int = 2
+DEFAULT_MAX_JOBS: int = 4
+RUNNER_SOCKET_DIR: str = "check-runners"
+
+# Largest protocol message; results carry the (bounded) output of a check
+_STREAM_LIMIT: int = 64 * 1024**2
+
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
+
+class _JobDeclinedError(Exception):
+    """The runner cannot run the job (e.g. it does not see its worktree); another runner may."""
+
+
+@dataclass(slots=True)
+class CheckJob:
+    """One check command to run on a check runner."""
+
+    check_name: str
+    command: str
+    cwd: str | None = None
+    # Added to the runner's own environment; ``None`` runs with it unchanged
+    env: dict[str, str] | None = None
+    log_prefix: str = ""
+    redact_secrets: list[str] = field(default_factory=list)
+    mask_sensitive: bool = True
+    timeout: int | None = None
+    keep_output_bytes: int | None = None
+    max_output_bytes: int | None = None
+    spill_path: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CheckJob:
+        return cls(**{job_field.name: data[job_field.name] for job_field in fields(cls) if job_field.name in data})
+
+
+@dataclass(slots=True)
+class CheckJobResult:
+    """Outcome of a check job: the ``run_command`` result plus the measured resource usage."""
+
+    success: bool
+    out: str = ""
+    err: str = ""
+    usage: ResourceUsage | None = None
+    # Exit status of the command; ``None`` if it did not start or was killed by a limit
+    returncode: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "success": self.success,
+            "out": self.out,
+            "err": self.err,
+            "usage": asdict(self.usage) if self.usage else None,
+            "returncode": self.returncode,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CheckJobResult:
+        usage = data.get("usage")
+        returncode = data.get("returncode")
+        return cls(
+            success=bool(data.get("success")),
+            out=str(data.get("out", "")),
+            err=str(data.get("err", "")),
+            usage=ResourceUsage(**usage) if isinstance(usage, dict) else None,
+            returncode=returncode if isinstance(returncode, int) else None,
+        )
+
+
+JobExecutor = Callable[[CheckJob, OutputCallback], Coroutine[Any, Any, CheckJobResult]]
+
+
+async def execute_check_job(job: CheckJob, output_callback: OutputCallback) -> CheckJobResult:
+    """Run *job* in this process, in its check cgroup."""
+    logger = get_logger_with_params()
+    returncodes: list[int] = []
+    async with check_cgroups.cgroup(check_name=job.check_name, logger=logger, log_prefix=job.log_prefix) as cgroup:
+        success, out, err = await run_command(
+            command=cgroup.wrap(job.command),
+            log_prefix=job.log_prefix,
+            redact_secrets=job.redact_secrets or None,
+            mask_sensitive=job.mask_sensitive,
+            timeout=job.timeout,
+            keep_output_bytes=job.keep_output_bytes,
+            max_output_bytes=job.max_output_bytes,
+            spill_path=job.spill_path,
+            output_callback=output_callback,
+            exit_callback=returncodes.append,
+            cwd=job.cwd,
+            env={**os.environ, **job.env} if job.env is not None else None,
+        )
+    return CheckJobResult(
+        success=success, out=out, err=err, usage=cgroup.usage, returncode=returncodes[0] if returncodes else None
+    )
+
+
+def _parse_endpoint(endpoint: str) -> tuple[str, str, int]:
+    """Split ``unix:///path`` or ``tcp://host:port`` into ``(scheme, path or host, port)``."""
+    parsed = urlsplit(endpoint)
+    if parsed.scheme == "unix" and parsed.path:
+        return "unix", parsed.path, 0
+    if parsed.scheme == "tcp" and parsed.hostname and parsed.port:
+        return "tcp", parsed.hostname, parsed.port
+    raise ValueError(f"Invalid check runner endpoint {endpoint!r}, expected unix:///path or tcp://host:port")
+
+
+def _require_token_for_tcp(endpoint: str, token: str) -> None:
+    if _parse_endpoint(endpoint)[0] == "tcp" and not token:
+        raise ValueError(f"Check runner endpoint {endpoint} uses tcp and requires a token")
+
+
+async def _open_connection(endpoint: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    scheme, address, port = _parse_endpoint(endpoint)
+    if scheme == "unix":
+        return await asyncio.open_unix_connection(address, limit=_STREAM_LIMIT)
+    return await asyncio.open_connection(address, port, limit=_STREAM_LIMIT)
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+def local_runner_endpoints(config: object, data_dir: str) -> list[str]:
+    """Sockets of the local runner processes in a ``check-runners`` block (started by the entrypoint)."""
+    if not isinstance(config, dict) or not config.get("enabled", False):
+        return []
+    socket_dir = config.get("socket-dir") or os.path.join(data_dir, RUNNER_SOCKET_DIR)
+    return [
+        f"unix://{os.path.join(socket_dir, f'runner-{index}.sock')}"
+        for index in range(int(config.get("local-processes", DEFAULT_LOCAL_PROCESSES)))
+    ]
+
+
+def check_runner_endpoints(config: object, data_dir: str) -> list[str]:
+    """Endpoints of the local runner processes and remote runners in a ``check-runners`` block."""
+    if not isinstance(config, dict) or not config.get("enabled", False):
+        return []
+    remote = [str(endpoint) for endpoint in config.get("remote") or []]
+    return [*local_runner_endpoints(config=config, data_dir=data_dir), *remote]
+
+
+class CheckRunnerServer:
+    """Runs check jobs for webhook server clients.
+
+    At most ``max_jobs`` jobs run at once; further connections wait.  When a
+    client disconnects, its job is cancelled.
+    """
+
+    def __init__(
+        self,
+        token: str = "",
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        executor: JobExecutor = execute_check_job,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.token = token
+        self.executor = executor
+        self.logger = logger or get_logger_with_params()
+        self._slots = asyncio.Semaphore(max(1, max_jobs))
+        self._server: asyncio.Server | None = None
+
+    async def start(self, listen: str) -> None:
+        """Listen on *listen*.
+
+        Raises:
+            ValueError: If the endpoint is invalid, or uses tcp and no token is set
+        """
+        _require_token_for_tcp(endpoint=listen, token=self.token)
+        scheme, address, port = _parse_endpoint(listen)
+        if scheme == "unix":
+            os.makedirs(os.path.dirname(address) or ".", exist_ok=True)
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(address)
+            self._server = await asyncio.start_unix_server(self._handle, path=address, limit=_STREAM_LIMIT)
+            os.chmod(address, 0o600)
+        else:
+            self._server = await asyncio.start_server(self._handle, host=address, port=port, limit=_STREAM_LIMIT)
+        self.logger.info(f"Check runner listening on {listen}")
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                if self.token and not hmac.compare_digest(str(request.get("token", "")), self.token):
+                    await _send(writer, {"error": "Invalid check runner token"})
+                    return
+                job = CheckJob.from_dict(request["job"])
+            except (ValueError, KeyError, TypeError, AttributeError) as ex:
+                await _send(writer, {"error": f"Invalid check job: {ex}"})
+                return
+
+            if job.cwd and not os.path.isdir(job.cwd):
+                await _send(writer, {"declined": f"Working directory {job.cwd} does not exist on this runner"})
+                return
+
+            async with self._slots:
+                await self._run(job=job, reader=reader, writer=writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _run(self, job: CheckJob, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def _stream_output(stream: str, text: str) -> None:
+            # A client that went away is noticed by the disconnect watch below
+            with contextlib.suppress(ConnectionError):
+                await _send(writer, {"output": {"stream": stream, "text": text}})
+
+        self.logger.info(f"{job.log_prefix} Running check job {job.check_name}")
+        job_task: asyncio.Task[CheckJobResult] = asyncio.create_task(self.executor(job, _stream_output))
+        # The client sends nothing after the job, so this completes only when it disconnects
+        disconnected = asyncio.create_task(reader.read())
+        try:
+            await asyncio.wait({job_task, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not job_task.done():
+                self.logger.info(f"{job.log_prefix} Client disconnected, cancelling check job {job.check_name}")
+                return
+            try:
+                result = job_task.result()
+            except Exception as ex:
+                self.logger.exception(f"{job.log_prefix} Check job {job.check_name} failed")
+                await _send(writer, {"error": f"Check job failed: {ex}"})
+                return
+            await _send(writer, {"result": result.as_dict()})
+        finally:
+            job_task.cancel()
+            disconnected.cancel()
+            await asyncio.gather(job_task, disconnected, return_exceptions=True)
+
+
+class CheckRunners:
+    """Submits check jobs to runner processes.
+
+    Until :meth:`configure` is called with at least one endpoint, checks run in
+    the webhook server process.
+
+    Usage (module-level singleton)::
+
+        result = await check_runners.run(job=CheckJob(check_name="tox", command=...), logger=logger, log_prefix="[X]")
+        if result is None:
+            ...  # no runner reachable, run the check locally
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: list[str] = []
+        self.token = ""
+        self._next = 0
+
+    def configure(self, endpoints: list[str], token: str = "") -> None:
+        """Set the runner endpoints (called once at startup).
+
+        Raises:
+            ValueError: If an endpoint is invalid, or uses tcp and no token is set
+        """
+        for endpoint in endpoints:
+            _require_token_for_tcp(endpoint=endpoint, token=token)
+        self.endpoints = list(endpoints)
+        self.token = token
+        self._next = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.endpoints)
+
+    async def run(
+        self,
+        job: CheckJob,
+        logger: logging.Logger,
+        log_prefix: str,
+        output_callback: OutputCallback | None = None,
+    ) -> CheckJobResult | None:
+        """Run *job* on the next reachable runner; ``None`` if no runner accepted it."""
+        for _ in range(len(self.endpoints)):
+            endpoint = self.endpoints[self._next % len(self.endpoints)]
+            self._next += 1
+            try:
+                reader, writer = await _open_connection(endpoint)
+            except OSError as ex:
+                logger.warning(f"{log_prefix} Check runner {endpoint} unavailable: {ex}")
+                continue
+
+            logger.debug(f"{log_prefix} Submitting {job.check_name} to check runner {endpoint}")
+            try:
+                return await self._submit(job=job, reader=reader, writer=writer, output_callback=output_callback)
+            except _JobDeclinedError as ex:
+                logger.warning(f"{log_prefix} Check runner {endpoint} declined {job.check_name}: {ex}")
+            finally:
+                # Closing the connection also cancels the job if this task was cancelled
+                writer.close()
+                with contextlib.suppress(ConnectionError):
+                    await writer.wait_closed()
+        return None
+
+    async def _submit(
+        self,
+        job: CheckJob,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        output_callback: OutputCallback | None,
+    ) -> CheckJobResult:
+        try:
+            await _send(writer, {"token": self.token, "job": job.as_dict()})
+            while line := await reader.readline():
+                message = json.loads(line)
+                if "output" in message:
+                    if output_callback is not None:
+                        await output_callback(message["output"]["stream"], message["output"]["text"])
+                elif "result" in message:
+                    return CheckJobResult.from_dict(message["result"])
+                elif "error" in message:
+                    return CheckJobResult(success=False, err=f"Check runner error: {message['error']}")
+                elif "declined" in message:
+                    raise _JobDeclinedError(message["declined"])
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            return CheckJobResult(success=False, err=f"Check runner connection failed: {ex}")
+        return CheckJobResult(success=False, err="Check runner closed the connection before the job finished")
+
+    def clear(self) -> None:
+        self.endpoints = []
+        self.token = ""
+        self._next = 0
+
+
+check_runners = CheckRunners()
+
+
+async def _serve(listen: str, token: str, max_jobs: int) -> None:
+    logger = get_logger_with_params()
+    server = CheckRunnerServer(token=token, max_jobs=max_jobs, logger=logger)
+    await server.start(listen)
+    try:
+        await process_reaper.run(logger=logger)
+    finally:
+        await server.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run CI check jobs for the webhook server")
+    parser.add_argument("--listen", required=True, help="unix:///path/to/runner.sock or tcp://host:port")
+    parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS, help="Jobs to run at once")
+    args = parser.parse_args(argv)
+
+    root_config = Config().root_data
+    runner_config = root_config.get("check-runners") or {}
+    check_cgroups.configure_from_config(root_config.get("check-limits"))
+    asyncio.run(_serve(listen=args.listen, token=runner_config.get("token", ""), max_jobs=args.max_jobs))
+
+
+if __name__ == "__main__":
+    main()
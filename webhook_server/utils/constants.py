@@ -10,6 +10,8 @@ SUCCESS_STR: str = "success"
 FAILURE_STR: str = "failure"
 IN_PROGRESS_STR: str = "in_progress"
 QUEUED_STR: str = "queued"
+NEUTRAL_STR: str = "neutral"
+TIMED_OUT_STR: str = "timed_out"
 ADD_STR: str = "add"
 DELETE_STR: str = "delete"
 CAN_BE_MERGED_STR: str = "can-be-merged"
@@ -39,6 +41,7 @@ HAS_CONFLICTS_LABEL_STR: str = "has-conflicts"
 HOLD_LABEL_STR: str = "hold"
 SIZE_LABEL_PREFIX: str = "size/"
 COMMAND_RETEST_STR: str = "retest"
+RETEST_FORCE_FLAG: str = "--force"
 COMMAND_REPROCESS_STR: str = "reprocess"
 COMMAND_CHERRY_PICK_STR: str = "cherry-pick"
 COMMAND_ASSIGN_REVIEWERS_STR: str = "assign-reviewers"
@@ -52,6 +55,10 @@ COMMAND_CHERRY_PICK_RETRY_STR: str = "cherry-pick-retry"
 COMMAND_REBASE_STR: str = "rebase"
 AUTOMERGE_LABEL_STR: str = "automerge"
 ROOT_APPROVERS_KEY: str = "root-approvers"
+# CI check command output: bytes of stdout/stderr kept in memory (head + tail, each stream)
+# and the combined output after which the command is killed
+CHECK_OUTPUT_KEEP_BYTES: int = 256 * 1024
+CHECK_OUTPUT_MAX_BYTES: int = 512 * 1024 * 1024
 
 # Gitlab colors require a '#' prefix; e.g: #
 USER_LABELS_DICT: dict[str, str] = {
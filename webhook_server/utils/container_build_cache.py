@@ -0,0 +1,246 @@
+"""Container build deduplication, layer cache pruning and build statistics.
+
+Provides:
+- ``DEFAULT_CONTAINERIGNORE``: Patterns left out of build contexts that ship no
+  ``.containerignore``/``.dockerignore``.
+- ``container_build_key``: Dedup key for ``(build context tree, Containerfile,
+  build flags)``.
+- ``parse_layer_cache_hits``: Layer steps and layer cache hits of one ``podman build``.
+- ``ContainerBuildStats``: Build counters, layer cache hit ratio and durations.
+- ``ContainerBuildCache``: Image ids of PR builds in the ``container-builds``
+  namespace of the data-dir cache, so a PR whose build inputs match an earlier
+  build re-tags that image instead of building it again, plus the layer cache
+  pruning policy for images built by the webhook server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+
+from webhook_server.utils.cache_manager import cache_manager
+
+CONTAINER_BUILDS_NAMESPACE: str = "container-builds"
+
+# Images built by the webhook server carry this label with the repository name,
+# so layer cache pruning never touches images built by anything else.
+CONTAINER_BUILD_LABEL: str = "io.github-webhook-server.repository"
+
+DEFAULT_MAX_AGE_HOURS: int = 168
+DEFAULT_PRUNE_INTERVAL_MINUTES: int = 60
+
+CONTAINER_IGNORE_FILES: tuple[str, ...] = (".containerignore", ".dockerignore")
+DEFAULT_CONTAINERIGNORE: tuple[str, ...] = (
+    ".git",
+    ".tox",
+    ".nox",
+    ".venv",
+    "**/__pycache__",
+    "**/*.pyc",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "node_modules",
+)
+
+_STEP_RE = re.compile(r"^STEP \d+/\d+:", re.MULTILINE)
+_CACHE_HIT_RE = re.compile(r"^--> Using cache ", re.MULTILINE)
+
+
+def container_build_key(context_tree: str, containerfile: str, build_flags: str) -> str:
+    """Return the dedup key of a build.
+
+    *build_flags* must capture everything besides the context and Containerfile
+    that changes the image (build args, extra podman args, Containerfile path...).
+    """
+    payload = json.dumps([context_tree, containerfile, build_flags])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def parse_layer_cache_hits(output: str) -> tuple[int, int]:
+    """Return ``(steps, cache_hits)`` from ``podman build`` output."""
+    return len(_STEP_RE.findall(output)), len(_CACHE_HIT_RE.findall(output))
+
+
+@dataclass(slots=True)
+class ContainerBuildStats:
+    """Per-process container build figures for monitoring endpoints."""
+
+    builds: int = 0
+    reused: int = 0
+    steps: int = 0
+    cache_hits: int = 0
+    build_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.cache_hits / self.steps if self.steps else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "builds": self.builds,
+            "reused": self.reused,
+            "layer_steps": self.steps,
+            "layer_cache_hits": self.cache_hits,
+            "layer_cache_hit_ratio": round(self.hit_ratio, 3),
+            "build_seconds": round(self.build_seconds, 1),
+            "average_build_seconds": round(self.build_seconds / self.builds, 1) if self.builds else 0.0,
+        }
+
+
+class ContainerBuildCache:
+    """Dedup records and layer cache policy for ``podman build``.
+
+    Dedup needs the data-dir cache; builds with the same key in this process
+    run one at a time so the second one finds the first one's image.  Layer
+    pruning runs at most once per ``prune_interval_minutes`` per repository
+    and only after :meth:`configure` is called.
+
+    Usage (module-level singleton)::
+
+        async with container_build_cache.single_flight(key):
+            image_id = await container_build_cache.lookup(repository="org/repo", key=key, ...)
+    """
+
+    def __init__(self) -> None:
+        self.configured = False
+        self.max_age_hours = DEFAULT_MAX_AGE_HOURS
+        self.prune_interval_minutes = DEFAULT_PRUNE_INTERVAL_MINUTES
+        self.stats = ContainerBuildStats()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+        self._last_prune: dict[str, float] = {}
+
+    def configure(
+        self,
+        max_age_hours: int = DEFAULT_MAX_AGE_HOURS,
+        prune_interval_minutes: int = DEFAULT_PRUNE_INTERVAL_MINUTES,
+    ) -> None:
+        """Enable dedup and layer pruning (called once at startup).
+
+        Args:
+            max_age_hours: Images built by the server are pruned once they are older than this.
+            prune_interval_minutes: Minimum time between prunes of one repository's images.
+        """
+        self.configured = True
+        self.max_age_hours = max_age_hours
+        self.prune_interval_minutes = prune_interval_minutes
+
+    @property
+    def enabled(self) -> bool:
+        return self.configured and bool(cache_manager.root_dir)
+
+    @contextlib.asynccontextmanager
+    async def single_flight(self, key: str) -> AsyncGenerator[None]:
+        """Run the block exclusively for *key* within this process."""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                self._locks.pop(key, None)
+
+    async def lookup(self, repository: str, key: str, logger: logging.Logger, log_prefix: str) -> str | None:
+        """Return the image id recorded for *key*, or ``None``."""
+        if not self.enabled:
+            return None
+
+        async with cache_manager.use(
+            namespace=CONTAINER_BUILDS_NAMESPACE, key=repository, logger=logger, log_prefix=log_prefix
+        ) as path:
+            try:
+                record = await asyncio.to_thread(self._read, os.path.join(path, f"{key}.json"))
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError, TypeError) as ex:
+                logger.warning(f"{log_prefix} Ignoring unreadable container build record {key}: {ex}")
+                return None
+            image_id = record.get("image_id") if isinstance(record, dict) else None
+            return image_id if isinstance(image_id, str) and image_id else None
+
+    async def record(self, repository: str, key: str, image_id: str, logger: logging.Logger, log_prefix: str) -> None:
+        """Remember that *image_id* was built for *key*."""
+        if not self.enabled:
+            return
+
+        async with cache_manager.use(
+            namespace=CONTAINER_BUILDS_NAMESPACE, key=repository, logger=logger, log_prefix=log_prefix
+        ) as path:
+            try:
+                await asyncio.to_thread(
+                    self._write, os.path.join(path, f"{key}.json"), {"image_id": image_id, "created_at": time.time()}
+                )
+            except OSError as ex:
+                logger.warning(f"{log_prefix} Failed to record container build {key}: {ex}")
+
+    def record_build(self, output: str, seconds: float) -> tuple[int, int]:
+        """Count a finished ``podman build``; returns its ``(steps, cache_hits)``."""
+        steps, cache_hits = parse_layer_cache_hits(output)
+        self.stats.builds += 1
+        self.stats.steps += steps
+        self.stats.cache_hits += cache_hits
+        self.stats.build_seconds += seconds
+        return steps, cache_hits
+
+    def record_reuse(self) -> None:
+        self.stats.reused += 1
+
+    def prune_due(self, repository: str) -> bool:
+        """Return True (and start a new interval) if *repository*'s images should be pruned now."""
+        if not self.configured:
+            return False
+
+        now = time.monotonic()
+        last = self._last_prune.get(repository)
+        if last is not None and now - last < self.prune_interval_minutes * 60:
+            return False
+        self._last_prune[repository] = now
+        return True
+
+    def prune_command(self, repository: str) -> str:
+        return (
+            f"podman image prune --all --force --filter label={CONTAINER_BUILD_LABEL}={repository} "
+            f"--filter until={self.max_age_hours}h"
+        )
+
+    @staticmethod
+    def _read(path: str) -> object:
+        with open(path) as fd:
+            return json.load(fd)
+
+    @staticmethod
+    def _write(path: str, record: dict[str, object]) -> None:
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w") as fd:
+                json.dump(record, fd)
+            os.replace(tmp_path, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+
+    def clear(self) -> None:
+        self.configured = False
+        self.max_age_hours = DEFAULT_MAX_AGE_HOURS
+        self.prune_interval_minutes = DEFAULT_PRUNE_INTERVAL_MINUTES
+        self.stats = ContainerBuildStats()
+        self._locks.clear()
+        self._lock_users.clear()
+        self._last_prune.clear()
+
+
+container_build_cache = ContainerBuildCache()
@@ -0,0 +1,194 @@
+"""Process-wide cache of pull request diff data keyed by repository and commit SHAs.
+
+Provides:
+- ``DiffStats``: Changed files with per-file and total additions/deletions.
+- ``parse_numstat``: Parse ``git diff --numstat -z`` output into ``DiffStats``.
+- ``DiffStatsCache``: Bounded LRU cache with single-flight fill, shared by OWNERS
+  resolution, PR size labeling and path-filtered checks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+
+_DEFAULT_MAX_ENTRIES: int = 512
+
+# (repo_full_name, base_sha, head_sha)
+DiffKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class FileDiffStat:
+    """Line counts for a single changed file (binary files count as 0/0)."""
+
+    additions: int = 0
+    deletions: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class DiffStats:
+    """Changed files of a ``base...head`` diff and their line counts."""
+
+    files: tuple[str, ...] = ()
+    file_stats: Mapping[str, FileDiffStat] = field(default_factory=dict)
+    additions: int = 0
+    deletions: int = 0
+
+    @property
+    def size(self) -> int:
+        """Total changed lines (additions + deletions), as used for PR size labels."""
+        return self.additions + self.deletions
+
+
+def _parse_count(value: str) -> int:
+    # git reports "-" for binary files
+    return int(value) if value.isdigit() else 0
+
+
+def parse_numstat(output: str) -> DiffStats:
+    """Parse ``git diff --numstat -z`` output.
+
+    With ``-z`` every record is NUL-terminated and paths are never quoted:
+
+    - regular change: ``<added>\\t<deleted>\\t<path>\\0``
+    - rename/copy:    ``<added>\\t<deleted>\\t\\0<old path>\\0<new path>\\0``
+
+    Renamed files are reported under their new path, matching ``git diff --name-only``.
+    """
+    tokens = output.split("\0")
+    files: list[str] = []
+    file_stats: dict[str, FileDiffStat] = {}
+    additions = 0
+    deletions = 0
+
+    idx = 0
+    while idx < len(tokens):
+        record = tokens[idx].strip("\n")
+        idx += 1
+        if not record:
+            continue
+
+        parts = record.split("\t", 2)
+        if len(parts) != 3:
+            continue
+
+        added, deleted, path = parts
+        if not path:
+            # Rename/copy: the next two tokens are the old and new paths
+            if idx + 1 >= len(tokens):
+                break
+            path = tokens[idx + 1]
+            idx += 2
+
+        stat = FileDiffStat(additions=_parse_count(added), deletions=_parse_count(deleted))
+        if path not in file_stats:
+            files.append(path)
+        file_stats[path] = stat
+        additions += stat.additions
+        deletions += stat.deletions
+
+    return DiffStats(files=tuple(files), file_stats=file_stats, additions=additions, deletions=deletions)
+
+
+class DiffStatsCache:
+    """Bounded LRU cache of :class:`DiffStats` per ``(repo, base SHA, head SHA)``.
+
+    A diff between two commits never changes, so every webhook for the same PR
+    head (labels, reviews, comments, check runs) can reuse the first result
+    instead of running ``git diff`` or calling the PR files API again.
+
+    Concurrent callers for the same key share a single fill (single-flight):
+    the first caller runs *compute*, the rest await its result.  Failed fills
+    are not cached.
+
+    Usage (module-level singleton)::
+
+        stats = await diff_stats_cache.get_or_compute(
+            repo_full_name="org/repo",
+            base_sha=base_sha,
+            head_sha=head_sha,
+            compute=my_async_git_diff,
+            logger=logger,
+            log_prefix="[TEST]",
+        )
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[DiffKey, DiffStats] = OrderedDict()
+        # key → running fill task shared by concurrent callers
+        self._inflight: dict[DiffKey, asyncio.Task[DiffStats]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, repo_full_name: str, base_sha: str, head_sha: str) -> DiffStats | None:
+        """Return cached stats for the key, or ``None`` without triggering a fill."""
+        key = (repo_full_name, base_sha, head_sha)
+        stats = self._entries.get(key)
+        if stats is not None:
+            self._entries.move_to_end(key)
+        return stats
+
+    def put(self, repo_full_name: str, base_sha: str, head_sha: str, stats: DiffStats) -> None:
+        """Store *stats* for the key, evicting the least recently used entries."""
+        key = (repo_full_name, base_sha, head_sha)
+        self._entries[key] = stats
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_compute(
+        self,
+        repo_full_name: str,
+        base_sha: str,
+        head_sha: str,
+        compute: Callable[[], Awaitable[DiffStats]],
+        logger: logging.Logger,
+        log_prefix: str,
+    ) -> DiffStats:
+        """Return cached stats for the key, filling the cache once via *compute*.
+
+        When either SHA is unknown the result cannot be keyed reliably, so
+        *compute* is awaited directly and nothing is cached.
+        """
+        if not base_sha or not head_sha:
+            return await compute()
+
+        cached = self.get(repo_full_name, base_sha, head_sha)
+        if cached is not None:
+            logger.debug(f"{log_prefix} Diff cache hit for {repo_full_name} {base_sha[:7]}...{head_sha[:7]}")
+            return cached
+
+        key = (repo_full_name, base_sha, head_sha)
+        task = self._inflight.get(key)
+        if task is None:
+            logger.debug(f"{log_prefix} Diff cache miss for {repo_full_name} {base_sha[:7]}...{head_sha[:7]}")
+            task = asyncio.ensure_future(self._fill(key, compute))
+            self._inflight[key] = task
+        else:
+            logger.debug(
+                f"{log_prefix} Diff cache fill already running for {repo_full_name} "
+                f"{base_sha[:7]}...{head_sha[:7]}, waiting"
+            )
+
+        # Shield so one cancelled webhook does not cancel the fill for the others
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: DiffKey, compute: Callable[[], Awaitable[DiffStats]]) -> DiffStats:
+        try:
+            stats = await compute()
+            self.put(*key, stats=stats)
+            return stats
+        finally:
+            self._inflight.pop(key, None)
+
+
+diff_stats_cache = DiffStatsCache()
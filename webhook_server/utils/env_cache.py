@@ -0,0 +1,204 @@
+"""Persistent Python tool environments for CI checks.
+
+Provides:
+- ``ENV_DEPENDENCY_FILES``: Files whose content decides what gets installed in a
+  check's virtualenvs (``tox.ini``, ``pyproject.toml``, ``uv.lock``...).
+- ``env_dependency_hash``: Hash of those files plus the Python version.
+- ``pre_commit_config_hash``: Hash of a worktree's pre-commit config.
+- ``EnvCache``: Leases per-repository tox work dirs keyed by the dependency hash,
+  prek hook homes keyed by the pre-commit config hash, and the shared uv/pip
+  download caches from the data-dir cache, so envs survive the ephemeral
+  worktree and dependencies are not re-installed on every push.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import glob
+import hashlib
+import logging
+import os
+import time
+from collections.abc import AsyncGenerator
+from typing import IO
+
+from webhook_server.utils.cache_manager import cache_manager
+
+ENV_DEPENDENCY_FILES: tuple[str, ...] = (
+    "tox.ini",
+    "pyproject.toml",
+    "setup.cfg",
+    "setup.py",
+    "uv.lock",
+    "poetry.lock",
+    "Pipfile.lock",
+    "requirements*.txt",
+    "requirements/*.txt",
+    "constraints*.txt",
+)
+
+TOX_ENV_NAMESPACE: str = "tox-env"
+
+# Work dirs per (repository, dependency hash).  Concurrent runs of the same
+# key each take their own copy; when all are busy the run falls back to an
+# uncached work dir inside the worktree.
+TOX_ENV_SLOTS: int = 2
+
+PRE_COMMIT_CONFIG_FILES: tuple[str, ...] = (".pre-commit-config.yaml", ".pre-commit-config.yml")
+PREK_HOME_NAMESPACE: str = "prek-home"
+
+_LOCK_FILE: str = ".lock"
+# Written once the first run has installed a prek home's hook environments
+_READY_FILE: str = ".ready"
+_LOCK_POLL_SECONDS: float = 1.0
+
+
+def env_dependency_hash(root: str, python_version: str = "") -> str:
+    """Return a digest of the dependency files under *root* and *python_version*."""
+    digest = hashlib.sha256(f"python={python_version}\n".encode())
+    for pattern in ENV_DEPENDENCY_FILES:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            if not os.path.isfile(path) or os.path.islink(path):
+                continue
+            digest.update(f"{os.path.relpath(path, root)}\n".encode())
+            with open(path, "rb") as fd:
+                digest.update(hashlib.sha256(fd.read()).digest())
+    return digest.hexdigest()
+
+
+def pre_commit_config_hash(root: str) -> str | None:
+    """Return a digest of the pre-commit config under *root*, or ``None`` if there is none."""
+    for name in PRE_COMMIT_CONFIG_FILES:
+        path = os.path.join(root, name)
+        if os.path.isfile(path) and not os.path.islink(path):
+            with open(path, "rb") as fd:
+                return hashlib.sha256(fd.read()).hexdigest()
+    return None
+
+
+def _try_lock(path: str, shared: bool = False) -> IO[str] | None:
+    """Take a non-blocking lock on *path*'s lock file; ``None`` if another run holds a conflicting one."""
+    fd = open(os.path.join(path, _LOCK_FILE), "a")
+    try:
+        fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+    except BlockingIOError:
+        fd.close()
+        return None
+    return fd
+
+
+class EnvCache:
+    """Leases cached tool environments for check runs.
+
+    A tox work dir is used by one run at a time (``flock``, so this holds
+    across worker processes).  A prek home is initialized by one run while
+    the others wait, then shared by every run with the same config.  uv and
+    pip caches are safe for concurrent use and are shared by every run.
+
+    Usage (module-level singleton)::
+
+        async with env_cache.tox_workdir(
+            repository="org/repo", worktree_path=path, python_version="3.13", logger=logger, log_prefix="[TEST]"
+        ) as workdir:
+            ...  # None when no cached work dir is available
+    """
+
+    @property
+    def enabled(self) -> bool:
+        return bool(cache_manager.root_dir)
+
+    @contextlib.asynccontextmanager
+    async def tox_workdir(
+        self, repository: str, worktree_path: str, python_version: str, logger: logging.Logger, log_prefix: str
+    ) -> AsyncGenerator[str | None]:
+        """Yield a locked tox work dir for the worktree's dependency files, or ``None``."""
+        if not self.enabled:
+            yield None
+            return
+
+        digest = await asyncio.to_thread(env_dependency_hash, worktree_path, python_version)
+        for slot in range(TOX_ENV_SLOTS):
+            key = f"{repository}-{digest[:16]}-{slot}"
+            async with cache_manager.use(
+                namespace=TOX_ENV_NAMESPACE, key=key, logger=logger, log_prefix=log_prefix
+            ) as path:
+                lock_fd = await asyncio.to_thread(_try_lock, path)
+                if lock_fd is None:
+                    continue
+                try:
+                    logger.debug(f"{log_prefix} Using cached tox work dir {path}")
+                    yield path
+                    return
+                finally:
+                    lock_fd.close()
+
+        logger.info(f"{log_prefix} All cached tox work dirs for {digest[:16]} are busy, using an uncached one")
+        yield None
+
+    @contextlib.asynccontextmanager
+    async def prek_home(
+        self, worktree_path: str, logger: logging.Logger, log_prefix: str
+    ) -> AsyncGenerator[str | None]:
+        """Yield the prek home (hook environments) for the worktree's pre-commit config, or ``None``.
+
+        The first run for a config holds an exclusive lock while prek installs the
+        hook environments; concurrent runs wait for it instead of installing the same
+        environments in parallel, then share the home.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        digest = await asyncio.to_thread(pre_commit_config_hash, worktree_path)
+        if digest is None:
+            yield None
+            return
+
+        async with cache_manager.use(
+            namespace=PREK_HOME_NAMESPACE, key=digest[:16], logger=logger, log_prefix=log_prefix
+        ) as path:
+            ready_path = os.path.join(path, _READY_FILE)
+            # Poll instead of blocking a worker thread for the length of another run's install;
+            # once the home is ready, ask for a shared lock like every other user
+            while True:
+                ready = os.path.exists(ready_path)
+                lock_fd = await asyncio.to_thread(_try_lock, path, ready)
+                if lock_fd is not None:
+                    break
+                await asyncio.sleep(_LOCK_POLL_SECONDS)
+            try:
+                if not ready and os.path.exists(ready_path):
+                    # Another run finished initializing while this one waited
+                    fcntl.flock(lock_fd, fcntl.LOCK_SH)
+                    ready = True
+
+                if ready:
+                    yield path
+                    return
+
+                logger.info(f"{log_prefix} Initializing prek hook environments in {path}")
+                started = time.monotonic()
+                yield path
+                with open(ready_path, "w"):
+                    pass
+                logger.info(f"{log_prefix} prek hook environments ready in {time.monotonic() - started:.1f}s")
+            finally:
+                lock_fd.close()
+
+    @contextlib.asynccontextmanager
+    async def tool_cache_env(self, logger: logging.Logger, log_prefix: str) -> AsyncGenerator[dict[str, str]]:
+        """Yield environment variables pointing uv and pip at the shared download caches."""
+        if not self.enabled:
+            yield {}
+            return
+
+        async with (
+            cache_manager.use(namespace="uv", key="shared", logger=logger, log_prefix=log_prefix) as uv_cache,
+            cache_manager.use(namespace="pip", key="shared", logger=logger, log_prefix=log_prefix) as pip_cache,
+        ):
+            yield {"UV_CACHE_DIR": uv_cache, "PIP_CACHE_DIR": pip_cache}
+
+
+env_cache = EnvCache()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
 import contextlib
 import datetime
 import json
@@ -10,13 +11,14 @@ import random
 import re
 import shlex
 import shutil
+import signal
 import subprocess
 import threading
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from concurrent.futures import Future, as_completed
 from logging import Logger
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 from uuid import uuid4
 
 import github
@@ -31,6 +33,7 @@ from stringcolor import cs
 from webhook_server.libs.config import Config
 from webhook_server.libs.exceptions import NoApiTokenError
 from webhook_server.utils.json_log_handler import JsonLogHandler
+from webhook_server.utils.process_groups import process_reaper, signal_process_group, terminate_process_group
 from webhook_server.utils.safe_rotating_handler import SafeRotatingFileHandler
 
 # Patch simple_logger to use SafeRotatingFileHandler to prevent crashes
@@ -170,6 +173,10 @@ def _sanitize_log_value(value: str) -> str:
 # Global cache for compiled regex patterns
 # Cache key: (tuple of secrets, case_insensitive flag)
 _REDACT_REGEX_CACHE: dict[tuple[tuple[str, ...], bool], re.Pattern[str]] = {}
+_REDACTED: str = "***REDACTED***"
+
+# Read size for streamed subprocess output
+_RUN_COMMAND_CHUNK_SIZE: int = 64 * 1024
 
 
 def _redact_secrets(
@@ -205,9 +212,19 @@ def _redact_secrets(
     if not mask_sensitive:
         return text
 
-    if not secrets:
+    regex = _compile_redact_regex(secrets, case_insensitive=case_insensitive)
+    if regex is None:
         return text
 
+    # Replace all matches with single sub() call - much faster than loop
+    return regex.sub(_REDACTED, text)
+
+
+def _compile_redact_regex(secrets: list[str] | None, case_insensitive: bool = False) -> re.Pattern[str] | None:
+    """Return the cached alternation regex matching any of *secrets*, or ``None`` if there are none."""
+    if not secrets:
+        return None
+
     # Filter out empty secrets, deduplicate, and escape special regex characters
     # Sort by length descending to prevent substring leaks
     # (e.g., if "abc" and "abcdef" are both secrets, match "abcdef" first)
@@ -217,7 +234,7 @@ def _redact_secrets(
         reverse=True,
     )
     if not escaped_secrets:
-        return text
+        return None
 
     # Create cache key from tuple of sorted secrets and case_insensitive flag
     cache_key = (tuple(escaped_secrets), case_insensitive)
@@ -239,8 +256,86 @@ def _redact_secrets(
         # Store in cache
         _REDACT_REGEX_CACHE[cache_key] = regex
 
-    # Replace all matches with single sub() call - much faster than loop
-    return regex.sub("***REDACTED***", text)
+    return regex
+
+
+class _StreamRedactor:
+    """Apply ``_redact_secrets`` to text that arrives in chunks.
+
+    A secret may be split across two chunks, so the last ``len(longest secret) - 1``
+    characters are held back until more text (or :meth:`flush`) arrives.
+    """
+
+    def __init__(self, secrets: list[str] | None, mask_sensitive: bool = True) -> None:
+        self._regex = _compile_redact_regex(secrets) if mask_sensitive else None
+        self._hold = max((len(secret) for secret in secrets or [] if secret), default=1) - 1
+        self._pending = ""
+
+    def feed(self, text: str) -> str:
+        """Return the redacted text that is safe to emit so far."""
+        if self._regex is None:
+            return text
+
+        pending = self._pending + text
+        boundary = len(pending) - self._hold
+        if boundary <= 0:
+            self._pending = pending
+            return ""
+
+        # Never cut through a secret that straddles the boundary
+        for match in self._regex.finditer(pending):
+            if match.start() >= boundary:
+                break
+            if match.end() > boundary:
+                boundary = match.start()
+                break
+
+        self._pending = pending[boundary:]
+        return self._regex.sub(_REDACTED, pending[:boundary])
+
+    def flush(self) -> str:
+        pending, self._pending = self._pending, ""
+        return self._regex.sub(_REDACTED, pending) if self._regex is not None else pending
+
+
+class _BoundedOutput:
+    """Keep the first and last bytes of a stream, counting (but dropping) the middle.
+
+    With ``keep_bytes=None`` everything is kept.
+    """
+
+    def __init__(self, keep_bytes: int | None = None) -> None:
+        self._head_limit = keep_bytes // 2 if keep_bytes is not None else None
+        self._tail_limit = keep_bytes - keep_bytes // 2 if keep_bytes is not None else 0
+        self._head = bytearray()
+        self._tail = bytearray()
+        self.total = 0
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        if self._head_limit is None:
+            self._head.extend(data)
+            return
+
+        if len(self._head) < self._head_limit:
+            take = self._head_limit - len(self._head)
+            self._head.extend(data[:take])
+            data = data[take:]
+
+        if data:
+            self._tail.extend(data)
+            if len(self._tail) > self._tail_limit:
+                del self._tail[: len(self._tail) - self._tail_limit]
+
+    def text(self) -> str:
+        omitted = self.total - len(self._head) - len(self._tail)
+        if omitted <= 0:
+            return (self._head + self._tail).decode(errors="ignore")
+        return (
+            f"{self._head.decode(errors='ignore')}\n"
+            f"...[{omitted} bytes omitted]...\n"
+            f"{self._tail.decode(errors='ignore')}"
+        )
 
 
 def _truncate_output(text: str, max_length: int = 500) -> str:
@@ -298,6 +393,19 @@ def get_github_repo_api(github_app_api: github.Github, repository: int | str) ->
     return github_app_api.get_repo(repository)
 
 
+def _open_spill_file(path: str) -> BinaryIO:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return open(path, "wb")
+
+
+def _kill_command(process: asyncio.subprocess.Process, process_group: bool) -> None:
+    """SIGKILL *process*, and its whole process group if it leads one."""
+    if process_group:
+        signal_process_group(process.pid, signal.SIGKILL)
+    with contextlib.suppress(ProcessLookupError):
+        process.kill()
+
+
 async def run_command(
     command: str,
     log_prefix: str,
@@ -306,11 +414,24 @@ async def run_command(
     stdin_input: str | bytes | None = None,
     timeout: int | None = None,
     mask_sensitive: bool = True,
+    keep_output_bytes: int | None = None,
+    max_output_bytes: int | None = None,
+    spill_path: str | None = None,
+    output_callback: Callable[[str, str], Awaitable[None]] | None = None,
+    exit_callback: Callable[[int], None] | None = None,
     **kwargs: Any,
 ) -> tuple[bool, str, str]:
     """
     Run command locally using create_subprocess_exec (safe from shell injection).
 
+    stdout and stderr are read incrementally, so memory use is bounded by
+    ``keep_output_bytes`` rather than by how much the command prints.
+
+    The command runs in its own session and process group.  On timeout or
+    cancellation the whole group gets SIGTERM, then SIGKILL after a grace
+    period, so grandchildren (tox envs, pytest-xdist workers, podman) do not
+    outlive it; stragglers that left the group are killed by ``process_reaper``.
+
     Args:
         command (str): Command to run (will be split with shlex.split for safety)
         log_prefix (str): Prefix for log messages
@@ -319,10 +440,19 @@ async def run_command(
         stdin_input (str | bytes | None, optional): Input to pass to command via stdin (for passwords, etc.)
         timeout (int | None, optional): Timeout in seconds for command execution. None means no timeout.
         mask_sensitive (bool, default True): Whether to mask sensitive data in logs. If False, logs unredacted output.
+        keep_output_bytes (int | None, optional): Keep only the first and last bytes of stdout and of stderr in
+            memory; the middle is replaced by an omission marker. None keeps the full output.
+        max_output_bytes (int | None, optional): Kill the command once stdout + stderr exceed this many bytes.
+        spill_path (str | None, optional): Stream the full stdout/stderr to this file as it is produced,
+            with ``redact_secrets`` redacted.
+        output_callback (Callable | None, optional): Awaited with ``("stdout" | "stderr", text)`` for
+            every chunk of output as it is produced, with ``redact_secrets`` redacted.
+        exit_callback (Callable | None, optional): Called with the command's exit status once it has exited
+            on its own; not called when it is killed for a timeout or the output limit.
 
     Returns:
         tuple[bool, str, str]: (success, stdout, stderr) where stdout and stderr are UNREDACTED strings.
-                               Redaction is ONLY applied to log output, not return values.
+                               Redaction is ONLY applied to log output and the spill file, not return values.
                                Callers may need to parse unredacted output for command results.
 
     Security:
@@ -334,9 +464,12 @@ async def run_command(
     out_decoded: str = ""
     err_decoded: str = ""
     sub_process = None  # Initialize to None for finally block cleanup
+    spill_file: BinaryIO | None = None
     # Don't override caller-provided pipes - use setdefault to respect provided kwargs
     kwargs.setdefault("stdout", subprocess.PIPE)
     kwargs.setdefault("stderr", subprocess.PIPE)
+    # Own session: the command and everything it spawns can be signalled as one group
+    kwargs.setdefault("start_new_session", True)
 
     # Set up stdin pipe if input is provided
     if stdin_input is not None:
@@ -353,29 +486,88 @@ async def run_command(
             *command_list,
             **kwargs,
         )
+        process = sub_process
+        if kwargs["start_new_session"]:
+            process_reaper.started(sub_process.pid)
 
         # Prepare stdin (convert str to bytes if needed)
         stdin_bytes = None
         if stdin_input is not None:
             stdin_bytes = stdin_input.encode("utf-8") if isinstance(stdin_input, str) else stdin_input
 
+        out_buffer = _BoundedOutput(keep_bytes=keep_output_bytes)
+        err_buffer = _BoundedOutput(keep_bytes=keep_output_bytes)
+        if spill_path:
+            spill_file = await asyncio.to_thread(_open_spill_file, spill_path)
+        output_exceeded = False
+
+        async def _feed_stdin() -> None:
+            if process.stdin is None:
+                return
+            if stdin_bytes is not None:
+                process.stdin.write(stdin_bytes)
+                with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+                    await process.stdin.drain()
+            process.stdin.close()
+
+        async def _emit(stream_name: str, text: str) -> None:
+            if not text:
+                return
+            if spill_file is not None:
+                await asyncio.to_thread(spill_file.write, text.encode())
+            if output_callback is not None:
+                await output_callback(stream_name, text)
+
+        async def _pump(stream: asyncio.StreamReader | None, buffer: _BoundedOutput, stream_name: str) -> None:
+            nonlocal output_exceeded
+            if stream is None:
+                return
+
+            redactor = _StreamRedactor(redact_secrets, mask_sensitive=mask_sensitive)
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+            streaming = spill_file is not None or output_callback is not None
+            while chunk := await stream.read(_RUN_COMMAND_CHUNK_SIZE):
+                buffer.write(chunk)
+                if streaming:
+                    await _emit(stream_name, redactor.feed(decoder.decode(chunk)))
+                if max_output_bytes is not None and out_buffer.total + err_buffer.total > max_output_bytes:
+                    output_exceeded = True
+                    _kill_command(process, process_group=kwargs["start_new_session"])
+                    break
+
+            if streaming:
+                await _emit(stream_name, redactor.feed(decoder.decode(b"", final=True)) + redactor.flush())
+
+        async def _communicate() -> None:
+            await asyncio.gather(
+                _feed_stdin(),
+                _pump(process.stdout, out_buffer, "stdout"),
+                _pump(process.stderr, err_buffer, "stderr"),
+            )
+            await process.wait()
+
         # Execute with optional timeout
         try:
             if timeout:
-                stdout, stderr = await asyncio.wait_for(sub_process.communicate(input=stdin_bytes), timeout=timeout)
+                await asyncio.wait_for(_communicate(), timeout=timeout)
             else:
-                stdout, stderr = await sub_process.communicate(input=stdin_bytes)
+                await _communicate()
         except TimeoutError:
             logger.error(f"{log_prefix} Command '{logged_command}' timed out after {timeout}s")
-            try:
-                sub_process.kill()
-                # Cleanup handled by finally block
-            except Exception:
-                pass  # Process may already be dead
+            # Process group is terminated (SIGTERM, then SIGKILL) by the finally block
             return False, "", f"Command timed out after {timeout}s"
         # Ensure we always have strings, never None or bytes
-        out_decoded = stdout.decode(errors="ignore") if isinstance(stdout, bytes) else (stdout or "")
-        err_decoded = stderr.decode(errors="ignore") if isinstance(stderr, bytes) else (stderr or "")
+        out_decoded = out_buffer.text()
+        err_decoded = err_buffer.text()
+
+        if output_exceeded:
+            logger.error(
+                f"{log_prefix} Command '{logged_command}' exceeded output limit of {max_output_bytes} bytes, killed"
+            )
+            return False, out_decoded, f"{err_decoded}\nCommand output exceeded {max_output_bytes} bytes, killed"
+
+        if exit_callback is not None and sub_process.returncode is not None:
+            exit_callback(sub_process.returncode)
 
         # Redact secrets ONLY for logging, keep original for return value
         # Callers may need to parse unredacted output
@@ -410,6 +602,9 @@ async def run_command(
         logger.exception(f"{log_prefix} Failed to run '{logged_command}' command")
         return False, out_decoded, err_decoded
     finally:
+        if spill_file is not None:
+            spill_file.close()
+
         # CRITICAL RACE CONDITION FIX:
         #
         # Original Bug: Zombies created when checking `if returncode is None` before wait()
@@ -430,13 +625,23 @@ async def run_command(
         #   - Log critical failures (unexpected exceptions = potential zombie)
 
         if sub_process:
-            # Always try to kill - don't check returncode (racy!)
+            process_group = kwargs["start_new_session"]
+            shutdown_cancelled: asyncio.CancelledError | None = None
+            # Still running means timeout, cancellation or an error: let the group shut down cleanly first
+            if process_group and sub_process.returncode is None:
+                try:
+                    await terminate_process_group(sub_process)
+                except asyncio.CancelledError as ex:
+                    # Cancelled again while shutting down - skip the rest of the grace period
+                    shutdown_cancelled = ex
+
+            # Always kill whatever is left - don't trust returncode to skip it (racy!)
             try:
-                sub_process.kill()
-            except ProcessLookupError:
-                pass  # Already dead - this is OK
+                _kill_command(sub_process, process_group=process_group)
             except Exception:
                 logger.debug(f"{log_prefix} Exception while killing process")
+            if process_group:
+                process_reaper.finished(sub_process.pid)
 
             # ALWAYS wait - this is the ONLY way to guarantee zombie reaping
             try:
@@ -451,6 +656,9 @@ async def run_command(
                 # Genuinely critical - wait() failed for unknown reason
                 logger.exception(f"{log_prefix} CRITICAL: Failed to wait for subprocess - potential zombie")
 
+            if shutdown_cancelled is not None:
+                raise shutdown_cancelled
+
 
 def get_apis_and_tokes_from_config(config: Config) -> list[tuple[github.Github, str]]:
     apis_and_tokens: list[tuple[github.Github, str]] = []
@@ -0,0 +1,374 @@
+"""Host-wide admission control for CI check jobs.
+
+Provides:
+- ``JobCost``: CPU slots and memory reservation of one check job.
+- ``JobScheduler``: Admits check jobs (tox, pre-commit, container builds, custom
+  checks...) against a host CPU/memory budget, giving every repository a fair
+  share.  Scheduler state lives in a ``flock``-protected JSON file under the data
+  dir, so all uvicorn worker processes draw from one budget.
+- ``SchedulerUsage``: Snapshot of running/waiting jobs for monitoring endpoints.
+
+Reservations of checks without configured resources follow the peak memory and
+CPU time measured in their cgroups (see ``check_cgroups``) once enough runs
+have been observed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import json
+import logging
+import math
+import os
+import time
+import uuid
+from collections import Counter, deque
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from webhook_server.utils.constants import (
+    BUILD_CONTAINER_STR,
+    PRE_COMMIT_STR,
+    PYTHON_MODULE_INSTALL_STR,
+    TOX_STR,
+)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class JobCost:
+    """Resources reserved for one running check job."""
+
+    cpu: int = 1
+    memory_mb: int = 512
+
+
+DEFAULT_JOB_COST = JobCost()
+DEFAULT_CHECK_COSTS: dict[str, JobCost] = {
+    TOX_STR: JobCost(cpu=2, memory_mb=2048),
+    PRE_COMMIT_STR: JobCost(cpu=1, memory_mb=1024),
+    PYTHON_MODULE_INSTALL_STR: JobCost(cpu=1, memory_mb=1024),
+    BUILD_CONTAINER_STR: JobCost(cpu=2, memory_mb=4096),
+}
+
+# Measured usage kept per check, and how many runs it takes to replace the default reservation
+OBSERVATION_WINDOW: int = 20
+MIN_OBSERVATIONS: int = 3
+# Memory reservations from measurements get headroom and are rounded up to this many MiB
+_MEMORY_HEADROOM: float = 1.25
+_MEMORY_ROUND_MB: int = 64
+
+# Waiters re-check the shared state this often; jobs released by the same
+# process wake them immediately.
+_POLL_INTERVAL_SECONDS: float = 1.0
+
+_STATE_FILE: str = "state.json"
+_LOCK_FILE: str = "state.lock"
+
+_QUEUES: tuple[str, ...] = ("running", "waiting")
+
+# Job records as stored in the state file
+Job = dict[str, Any]
+# {"running": [Job...], "waiting": [Job...], "last_admitted": {repository: timestamp}}
+State = dict[str, Any]
+
+
+@dataclass(slots=True)
+class SchedulerUsage:
+    """Point-in-time scheduler figures returned by :meth:`JobScheduler.usage`."""
+
+    enabled: bool
+    cpu_slots: int
+    memory_mb: int
+    cpu_in_use: int = 0
+    memory_mb_in_use: int = 0
+    running: list[Job] = field(default_factory=list)
+    waiting: list[Job] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "cpu_slots": self.cpu_slots,
+            "memory_mb": self.memory_mb,
+            "cpu_in_use": self.cpu_in_use,
+            "memory_mb_in_use": self.memory_mb_in_use,
+            "running": list(self.running),
+            "waiting": list(self.waiting),
+        }
+
+
+def detect_memory_mb() -> int:
+    """Return the memory available to this host/container in MiB (cgroup v2 limit if set)."""
+    with contextlib.suppress(OSError, ValueError):
+        with open("/sys/fs/cgroup/memory.max") as fd:
+            limit = fd.read().strip()
+        if limit != "max":
+            return int(limit) // 1024**2
+    with contextlib.suppress(OSError, ValueError):
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 1024**2
+    return 0
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobScheduler:
+    """Fair-share, resource-aware admission of check jobs across worker processes.
+
+    A job is admitted when it is at the head of the queue and its reservation
+    fits the free CPU slots and memory.  The head is the waiting job whose
+    repository has the fewest running jobs, then the repository served least
+    recently, then the oldest job; repositories take turns, so one busy
+    repository cannot starve the others.  Jobs are never backfilled past the
+    head, so a large job (container build) is not starved by small ones either.
+
+    Until :meth:`configure` is called every job is admitted immediately.
+
+    Usage (module-level singleton)::
+
+        job_scheduler.configure(state_dir=os.path.join(config.data_dir, "ci-scheduler"), cpu_slots=8)
+        async with job_scheduler.slot(repository="org/repo", check_name="tox", logger=logger, log_prefix="[TEST]"):
+            ...
+    """
+
+    def __init__(self) -> None:
+        self.state_dir = ""
+        self.cpu_slots = 0
+        self.memory_mb = 0
+        self.check_costs: dict[str, JobCost] = dict(DEFAULT_CHECK_COSTS)
+        # Checks with resources set in the config; their reservations are never tuned
+        self._configured_checks: set[str] = set()
+        # (peak memory MiB, CPU cores used) of recent runs of this process, per check
+        self._observations: dict[str, deque[tuple[float, float]]] = {}
+        # Job ids held by this process; anything else recorded under our pid is a leak
+        self._jobs: set[str] = set()
+        self._wakeup: asyncio.Event | None = None
+
+    def configure(
+        self,
+        state_dir: str,
+        cpu_slots: int = 0,
+        memory_mb: int = 0,
+        check_resources: dict[str, dict[str, int]] | None = None,
+    ) -> None:
+        """Set the shared state dir and host budget (called once at startup).
+
+        Args:
+            state_dir: Directory holding the shared state file.
+            cpu_slots: CPU slots to hand out; ``0`` means ``os.cpu_count()``.
+            memory_mb: Memory to hand out in MiB; ``0`` means the cgroup limit or physical memory.
+            check_resources: Per-check overrides, ``{check_name: {"cpu": 2, "memory-mb": 2048}}``.
+        """
+        self.state_dir = state_dir
+        self.cpu_slots = cpu_slots if cpu_slots > 0 else os.cpu_count() or 1
+        self.memory_mb = memory_mb if memory_mb > 0 else detect_memory_mb()
+        self.check_costs = dict(DEFAULT_CHECK_COSTS)
+        self._configured_checks = set(check_resources or {})
+        for check_name, resources in (check_resources or {}).items():
+            base = self.check_costs.get(check_name, DEFAULT_JOB_COST)
+            self.check_costs[check_name] = JobCost(
+                cpu=int(resources.get("cpu", base.cpu)),
+                memory_mb=int(resources.get("memory-mb", base.memory_mb)),
+            )
+
+    def cost_for(self, check_name: str) -> JobCost:
+        """Return the reservation for *check_name*, clamped to the host budget."""
+        cost = self._observed_cost(check_name) or self.check_costs.get(check_name, DEFAULT_JOB_COST)
+        memory_mb = min(cost.memory_mb, self.memory_mb) if self.memory_mb else cost.memory_mb
+        return JobCost(cpu=max(1, min(cost.cpu, self.cpu_slots or cost.cpu)), memory_mb=max(0, memory_mb))
+
+    def observe(self, check_name: str, peak_memory_mb: float, cpu_seconds: float, wall_seconds: float) -> None:
+        """Record the measured usage of a finished *check_name* run."""
+        if wall_seconds <= 0:
+            return
+        observations = self._observations.setdefault(check_name, deque(maxlen=OBSERVATION_WINDOW))
+        observations.append((peak_memory_mb, cpu_seconds / wall_seconds))
+
+    def _observed_cost(self, check_name: str) -> JobCost | None:
+        """Reservation from the recent worst case of *check_name*, or ``None`` until it is known."""
+        observations = self._observations.get(check_name)
+        if check_name in self._configured_checks or not observations or len(observations) < MIN_OBSERVATIONS:
+            return None
+        memory_mb = max(memory for memory, _ in observations) * _MEMORY_HEADROOM
+        return JobCost(
+            cpu=max(1, math.ceil(max(cores for _, cores in observations))),
+            memory_mb=math.ceil(memory_mb / _MEMORY_ROUND_MB) * _MEMORY_ROUND_MB,
+        )
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, repository: str, check_name: str, logger: logging.Logger, log_prefix: str
+    ) -> AsyncGenerator[None]:
+        """Wait until the job is admitted and hold its reservation for the duration of the block.
+
+        If the shared state cannot be read or written the job runs without
+        admission control rather than blocking the check forever.
+        """
+        if not self.state_dir:
+            yield
+            return
+
+        cost = self.cost_for(check_name)
+        job: Job = {
+            "id": uuid.uuid4().hex,
+            "pid": os.getpid(),
+            "repository": repository,
+            "check": check_name,
+            "cpu": cost.cpu,
+            "memory_mb": cost.memory_mb,
+            "since": time.time(),
+        }
+        self._jobs.add(job["id"])
+        queued_at = time.monotonic()
+        waited = False
+        try:
+            while True:
+                wakeup = self._wakeup_event()
+                try:
+                    admitted = await asyncio.to_thread(self._transact, lambda state: self._try_admit(state, job))
+                except OSError as ex:
+                    logger.warning(
+                        f"{log_prefix} CI scheduler state unavailable ({ex}), "
+                        f"running {check_name} without admission control"
+                    )
+                    break
+                if admitted:
+                    break
+                if not waited:
+                    logger.info(
+                        f"{log_prefix} Check {check_name} queued by CI scheduler "
+                        f"(needs {cost.cpu} CPU, {cost.memory_mb} MiB)"
+                    )
+                    waited = True
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), timeout=_POLL_INTERVAL_SECONDS)
+
+            if waited:
+                logger.info(
+                    f"{log_prefix} Check {check_name} admitted by CI scheduler "
+                    f"after {time.monotonic() - queued_at:.1f}s"
+                )
+            yield
+        finally:
+            self._jobs.discard(job["id"])
+            with contextlib.suppress(OSError):
+                await asyncio.to_thread(self._transact, lambda state: self._remove(state, job["id"]))
+            self._notify()
+
+    def _wakeup_event(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    def _notify(self) -> None:
+        # Wake every local waiter; the next waiter gets a fresh event
+        if self._wakeup is not None:
+            self._wakeup.set()
+            self._wakeup = None
+
+    def _try_admit(self, state: State, job: Job) -> bool:
+        running, waiting = state["running"], state["waiting"]
+        if not any(entry["id"] == job["id"] for entry in waiting):
+            waiting.append(dict(job))
+
+        per_repository = Counter(entry["repository"] for entry in running)
+        last_admitted: dict[str, float] = state["last_admitted"]
+        head = min(
+            waiting,
+            key=lambda entry: (
+                per_repository[entry["repository"]],
+                last_admitted.get(entry["repository"], 0.0),
+                entry["since"],
+            ),
+        )
+        if head["id"] != job["id"]:
+            return False
+
+        if running:
+            cpu_in_use = sum(entry["cpu"] for entry in running)
+            memory_in_use = sum(entry["memory_mb"] for entry in running)
+            if cpu_in_use + job["cpu"] > self.cpu_slots:
+                return False
+            if self.memory_mb and memory_in_use + job["memory_mb"] > self.memory_mb:
+                return False
+
+        now = time.time()
+        waiting.remove(head)
+        running.append({**head, "since": now})
+        last_admitted[head["repository"]] = now
+        return True
+
+    @staticmethod
+    def _remove(state: State, job_id: str) -> None:
+        for queue in _QUEUES:
+            state[queue] = [entry for entry in state[queue] if entry["id"] != job_id]
+
+    def _transact(self, update: Callable[[State], T]) -> T:
+        """Apply *update* to the shared state under an exclusive host-wide lock."""
+        os.makedirs(self.state_dir, exist_ok=True)
+        state_path = os.path.join(self.state_dir, _STATE_FILE)
+        with open(os.path.join(self.state_dir, _LOCK_FILE), "a") as lock_fd:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            state = self._read_state(state_path)
+            result = update(state)
+            tmp_path = f"{state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as fd:
+                json.dump(state, fd)
+            os.replace(tmp_path, state_path)
+            return result
+
+    def _read_state(self, state_path: str) -> State:
+        state: State = {"running": [], "waiting": [], "last_admitted": {}}
+        with contextlib.suppress(OSError, ValueError, AttributeError):
+            with open(state_path) as fd:
+                loaded = json.load(fd)
+            for queue in _QUEUES:
+                state[queue] = [entry for entry in loaded.get(queue, []) if isinstance(entry, dict)]
+            state["last_admitted"] = dict(loaded.get("last_admitted", {}))
+
+        # Drop jobs of dead worker processes and jobs this process no longer holds
+        pid = os.getpid()
+        for queue in _QUEUES:
+            state[queue] = [
+                entry
+                for entry in state[queue]
+                if (entry.get("id") in self._jobs if entry.get("pid") == pid else _pid_alive(entry.get("pid", 0)))
+            ]
+        return state
+
+    async def usage(self) -> SchedulerUsage:
+        usage = SchedulerUsage(enabled=bool(self.state_dir), cpu_slots=self.cpu_slots, memory_mb=self.memory_mb)
+        if not self.state_dir:
+            return usage
+
+        state = await asyncio.to_thread(self._transact, lambda state: state)
+        usage.running = state["running"]
+        usage.waiting = state["waiting"]
+        usage.cpu_in_use = sum(entry["cpu"] for entry in usage.running)
+        usage.memory_mb_in_use = sum(entry["memory_mb"] for entry in usage.running)
+        return usage
+
+    def clear(self) -> None:
+        """Forget configuration and local bookkeeping (does not touch the state file)."""
+        self.state_dir = ""
+        self.cpu_slots = 0
+        self.memory_mb = 0
+        self.check_costs = dict(DEFAULT_CHECK_COSTS)
+        self._configured_checks.clear()
+        self._observations.clear()
+        self._jobs.clear()
+        self._wakeup = None
+
+
+job_scheduler = JobScheduler()
@@ -0,0 +1,229 @@
+"""Process-wide catalog of repository labels and their colors.
+
+Provides:
+- ``CatalogLabel``: Name and color of one repository label.
+- ``RepositoryLabelCatalog``: TTL-bound labels of each repository, loaded once per
+  process (single-flight), kept current by ``label`` webhook events and our own
+  writes, and reloaded on expiry in case events went to another worker or were missed.
+  Missing labels and color drift are queued and fixed by one background
+  reconciliation pass per repository, so attaching a label to a pull request
+  never waits for ``get_label``/``edit``/``create_label`` calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from github.GithubException import GithubException
+from github.Repository import Repository
+
+from webhook_server.utils.github_retry import github_api_call
+
+# Label events reach only one worker; the TTL bounds how long the others miss them
+_DEFAULT_TTL_SECONDS: float = 600.0
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogLabel:
+    """A repository label as GitHub reports it (color is lowercase hex without ``#``)."""
+
+    name: str
+    color: str
+
+
+class RepositoryLabelCatalog:
+    """Labels of each repository keyed by lowercase name (GitHub label names are case-insensitive).
+
+    Usage (module-level singleton)::
+
+        labels = await repository_label_catalog.get_or_load(
+            repo_full_name="org/repo", fetch=fetch_labels, logger=logger, log_prefix="[TEST]"
+        )
+        if repository_label_catalog.needs_reconcile(repo_full_name="org/repo", name="size/XS", color="ededed"):
+            repository_label_catalog.schedule_reconcile(
+                repo_full_name="org/repo", name="size/XS", color="ededed",
+                repository=repository, logger=logger, log_prefix="[TEST]",
+            )
+    """
+
+    def __init__(self, ttl_seconds: float = _DEFAULT_TTL_SECONDS) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._labels: dict[str, dict[str, CatalogLabel]] = {}
+        # repo -> monotonic time the loaded catalog expires at
+        self._expires_at: dict[str, float] = {}
+        # repo -> running load shared by concurrent callers
+        self._inflight: dict[str, asyncio.Task[dict[str, CatalogLabel]]] = {}
+        # repo -> {label name: wanted color} waiting for the reconciliation pass
+        self._pending: dict[str, dict[str, str]] = {}
+        self._reconcilers: dict[str, asyncio.Task[None]] = {}
+
+    def get(self, repo_full_name: str) -> Mapping[str, CatalogLabel] | None:
+        """Return the loaded catalog of a repository, or ``None`` if it was never loaded or expired."""
+        return self._loaded(repo_full_name)
+
+    async def get_or_load(
+        self,
+        repo_full_name: str,
+        fetch: Callable[[], Awaitable[Iterable[CatalogLabel]]],
+        logger: logging.Logger,
+        log_prefix: str,
+    ) -> Mapping[str, CatalogLabel]:
+        """Return the catalog of a repository, loading it via *fetch* when missing or expired.
+
+        Failed loads are not cached.
+        """
+        labels = self._loaded(repo_full_name)
+        if labels is not None:
+            return labels
+
+        task = self._inflight.get(repo_full_name)
+        if task is None:
+            logger.debug(f"{log_prefix} Loading label catalog of {repo_full_name}")
+            task = asyncio.ensure_future(self._load(repo_full_name, fetch))
+            self._inflight[repo_full_name] = task
+
+        # Shield so one cancelled webhook does not cancel the load for the others
+        return await asyncio.shield(task)
+
+    def needs_reconcile(self, repo_full_name: str, name: str, color: str) -> bool:
+        """Return True if the label is missing, has another color, or the catalog is not loaded."""
+        labels = self._loaded(repo_full_name)
+        existing = labels.get(name.lower()) if labels is not None else None
+        return existing is None or existing.color != color.lower()
+
+    def record(self, repo_full_name: str, name: str, color: str) -> None:
+        """Record a label that now exists with *color*; ignored while the catalog is not loaded."""
+        labels = self._loaded(repo_full_name)
+        if labels is not None:
+            labels[name.lower()] = CatalogLabel(name=name, color=color.lower())
+
+    def observe_event(self, repo_full_name: str, hook_data: dict[str, Any]) -> bool:
+        """Apply a ``label`` webhook event (``created``, ``edited`` or ``deleted``)."""
+        labels = self._loaded(repo_full_name)
+        label = hook_data.get("label")
+        if labels is None or not isinstance(label, dict) or not isinstance(label.get("name"), str):
+            return False
+
+        action = hook_data.get("action")
+        if action == "deleted":
+            labels.pop(label["name"].lower(), None)
+            return True
+
+        if action == "edited":
+            # Renames report the previous name under changes.name.from
+            old_name = hook_data.get("changes", {}).get("name", {}).get("from")
+            if isinstance(old_name, str):
+                labels.pop(old_name.lower(), None)
+
+        if action in ("created", "edited"):
+            self.record(repo_full_name=repo_full_name, name=label["name"], color=str(label.get("color", "")))
+            return True
+
+        return False
+
+    def schedule_reconcile(
+        self,
+        repo_full_name: str,
+        name: str,
+        color: str,
+        repository: Repository,
+        logger: logging.Logger,
+        log_prefix: str,
+    ) -> None:
+        """Queue a label to be created or recolored by the repository's background reconciliation pass."""
+        self._pending.setdefault(repo_full_name, {})[name] = color
+        task = self._reconcilers.get(repo_full_name)
+        if task is None or task.done():
+            task = asyncio.create_task(
+                self._reconcile(
+                    repo_full_name=repo_full_name, repository=repository, logger=logger, log_prefix=log_prefix
+                )
+            )
+            self._reconcilers[repo_full_name] = task
+
+    async def wait_reconciled(self, repo_full_name: str) -> None:
+        """Wait for the running reconciliation pass of a repository, if any."""
+        task = self._reconcilers.get(repo_full_name)
+        if task is not None:
+            await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self._labels.clear()
+        self._expires_at.clear()
+        self._inflight.clear()
+        self._pending.clear()
+        self._reconcilers.clear()
+
+    def _loaded(self, repo_full_name: str) -> dict[str, CatalogLabel] | None:
+        if self._expires_at.get(repo_full_name, 0.0) <= time.monotonic():
+            self._labels.pop(repo_full_name, None)
+            return None
+        return self._labels.get(repo_full_name)
+
+    async def _load(
+        self, repo_full_name: str, fetch: Callable[[], Awaitable[Iterable[CatalogLabel]]]
+    ) -> dict[str, CatalogLabel]:
+        try:
+            labels = {
+                label.name.lower(): CatalogLabel(name=label.name, color=label.color.lower()) for label in await fetch()
+            }
+            self._labels[repo_full_name] = labels
+            self._expires_at[repo_full_name] = time.monotonic() + self._ttl_seconds
+            return labels
+        finally:
+            self._inflight.pop(repo_full_name, None)
+
+    async def _reconcile(
+        self, repo_full_name: str, repository: Repository, logger: logging.Logger, log_prefix: str
+    ) -> None:
+        # Labels queued while a call is in flight are picked up by the same pass
+        pending = self._pending.get(repo_full_name, {})
+        while pending:
+            name, color = next(iter(pending.items()))
+            del pending[name]
+            if not self.needs_reconcile(repo_full_name=repo_full_name, name=name, color=color):
+                continue
+
+            labels = self._loaded(repo_full_name)
+            exists = labels is not None and name.lower() in labels
+            try:
+                await self._reconcile_label(
+                    repository=repository, name=name, color=color, exists=exists, logger=logger, log_prefix=log_prefix
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"{log_prefix} Failed to reconcile repository label {name} with color {color}")
+                continue
+
+            self.record(repo_full_name=repo_full_name, name=name, color=color)
+
+        self._pending.pop(repo_full_name, None)
+
+    @staticmethod
+    async def _reconcile_label(
+        repository: Repository, name: str, color: str, exists: bool, logger: logging.Logger, log_prefix: str
+    ) -> None:
+        if not exists:
+            try:
+                logger.debug(f"{log_prefix} Add repository label {name} with color {color}")
+                await github_api_call(
+                    repository.create_label, name=name, color=color, logger=logger, log_prefix=log_prefix
+                )
+                return
+            except GithubException as ex:
+                # 422: the label exists already (e.g. GitHub created it when it was attached to a pull request)
+                if ex.status != 422:
+                    raise
+
+        logger.debug(f"{log_prefix} Edit repository label {name} with color {color}")
+        repo_label = await github_api_call(repository.get_label, name, logger=logger, log_prefix=log_prefix)
+        await github_api_call(repo_label.edit, name=repo_label.name, color=color, logger=logger, log_prefix=log_prefix)
+
+
+repository_label_catalog = RepositoryLabelCatalog()
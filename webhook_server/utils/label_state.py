@@ -0,0 +1,188 @@
+"""Process-wide label state of open pull requests.
+
+Provides:
+- ``PullRequestLabelState``: Bounded LRU of the label names of each pull request
+  keyed by ``(repository, PR number)``.  Entries are seeded from the ``labels``
+  array of every webhook payload (including ``labeled``/``unlabeled`` events),
+  from a single labels GET on a miss, and updated write-through by our own
+  ``add_to_labels``/``remove_from_labels`` calls, so a label we
+  just wrote is visible immediately without polling the API.  A per-PR write
+  lock orders label writes of concurrent webhooks in this process.  The state
+  is per worker process; decisions that must not act on stale labels (merge
+  eligibility) re-fetch them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+_DEFAULT_MAX_ENTRIES: int = 2048
+# Refetch once in a while in case label events were missed (e.g. while the server was down)
+_DEFAULT_TTL_SECONDS: float = 900.0
+
+# (repo_full_name, pull_request_number)
+LabelStateKey = tuple[str, int]
+
+
+@dataclass(slots=True)
+class _LabelStateEntry:
+    labels: list[str]
+    # Newest GitHub ``updated_at`` the labels account for (second granularity); None when unknown
+    observed_at: datetime | None
+    # Our own writes were applied after ``observed_at``
+    written: bool
+    expires_at: float
+
+
+def _parse_updated_at(value: object) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+class PullRequestLabelState:
+    """Label names of each pull request, ordered by GitHub timestamps.
+
+    Observations are ordered only by the pull request's ``updated_at`` as
+    reported by GitHub, never by the server clock.  A payload replaces the
+    entry when it is at least as new as the one the entry was built from, and
+    strictly newer once we have written labels on top of it: the
+    ``labeled``/``unlabeled`` events of our own writes carry a later
+    ``updated_at`` and bring the entry back in line with GitHub.
+
+    Usage (module-level singleton)::
+
+        pull_request_label_state.observe_payload(repo_full_name="org/repo", hook_data=hook_data)
+        labels = pull_request_label_state.get(repo_full_name="org/repo", number=42)  # None on a miss
+        pull_request_label_state.record_added(repo_full_name="org/repo", number=42, label="lgtm")
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES, ttl_seconds: float = _DEFAULT_TTL_SECONDS) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[LabelStateKey, _LabelStateEntry] = OrderedDict()
+        # Locks live only as long as a writer holds or waits for them
+        self._write_locks: weakref.WeakValueDictionary[LabelStateKey, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, repo_full_name: str, number: int) -> list[str] | None:
+        """Return a copy of the cached label names, or ``None`` when unknown or expired."""
+        key = (repo_full_name, number)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return list(entry.labels)
+
+    def observe(
+        self, repo_full_name: str, number: int, labels: Iterable[str], observed_at: datetime | None = None
+    ) -> bool:
+        """Replace the labels of a pull request with a full observation.
+
+        *observed_at* is the GitHub ``updated_at`` the labels were read at; a read
+        without one (a labels GET) is current and keeps the entry's timestamp.
+        Returns False (and keeps the entry) when the observation is older than the cached one.
+        """
+        key = (repo_full_name, number)
+        entry = self._entries.get(key)
+        if entry is not None and observed_at is not None and entry.observed_at is not None:
+            if observed_at < entry.observed_at or (observed_at == entry.observed_at and entry.written):
+                return False
+
+        if observed_at is None and entry is not None:
+            observed_at = entry.observed_at
+        self._store(key=key, labels=labels, observed_at=observed_at, written=False)
+        return True
+
+    def observe_payload(self, repo_full_name: str, hook_data: dict[str, Any]) -> bool:
+        """Seed the labels from a webhook payload's ``pull_request`` (or pull request ``issue``)."""
+        pull_request = hook_data.get("pull_request")
+        if not isinstance(pull_request, dict):
+            issue = hook_data.get("issue")
+            # Issue comments carry the labels of the issue, which is the pull request itself
+            pull_request = issue if isinstance(issue, dict) and issue.get("pull_request") else None
+        if not pull_request:
+            return False
+
+        number = pull_request.get("number")
+        labels = pull_request.get("labels")
+        if not isinstance(number, int) or not isinstance(labels, list):
+            return False
+
+        names = [label["name"] for label in labels if isinstance(label, dict) and isinstance(label.get("name"), str)]
+        return self.observe(
+            repo_full_name=repo_full_name,
+            number=number,
+            labels=names,
+            observed_at=_parse_updated_at(pull_request.get("updated_at")),
+        )
+
+    def record_added(self, repo_full_name: str, number: int, label: str) -> None:
+        """Write-through after we added *label*; unknown pull requests stay unknown."""
+        self._record(repo_full_name=repo_full_name, number=number, label=label, present=True)
+
+    def record_removed(self, repo_full_name: str, number: int, label: str) -> None:
+        """Write-through after we removed *label*; unknown pull requests stay unknown."""
+        self._record(repo_full_name=repo_full_name, number=number, label=label, present=False)
+
+    def write_lock(self, repo_full_name: str, number: int) -> asyncio.Lock:
+        """Return the lock that serializes label writes to one pull request."""
+        key = (repo_full_name, number)
+        lock = self._write_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._write_locks[key] = lock
+        return lock
+
+    def invalidate(self, repo_full_name: str, number: int) -> None:
+        """Forget a pull request, e.g. after a failed write left its state uncertain."""
+        self._entries.pop((repo_full_name, number), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._write_locks.clear()
+
+    def _record(self, repo_full_name: str, number: int, label: str, present: bool) -> None:
+        labels = self.get(repo_full_name=repo_full_name, number=number)
+        if labels is None:
+            return
+
+        if present and label not in labels:
+            labels.append(label)
+        elif not present and label in labels:
+            labels.remove(label)
+
+        key = (repo_full_name, number)
+        self._store(key=key, labels=labels, observed_at=self._entries[key].observed_at, written=True)
+
+    def _store(self, key: LabelStateKey, labels: Iterable[str], observed_at: datetime | None, written: bool) -> None:
+        self._entries[key] = _LabelStateEntry(
+            labels=list(dict.fromkeys(labels)),
+            observed_at=observed_at,
+            written=written,
+            expires_at=time.monotonic() + self._ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+pull_request_label_state = PullRequestLabelState()
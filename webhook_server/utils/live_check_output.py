@@ -0,0 +1,95 @@
+"""Throttled live output of running checks.
+
+Provides:
+- ``LiveCheckOutput``: Output callback for ``run_command`` / check runners that
+  keeps a bounded tail of a check's (already redacted) output and hands it to a
+  publish coroutine at most once per interval.  Output arriving while an update
+  waits or is in flight is coalesced into the next one, so a chatty command
+  costs at most one check run update per interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+# Characters of the output tail shown while a check runs; far below GitHub's 65535 text limit
+LIVE_OUTPUT_TAIL_CHARS: int = 16_000
+
+
+class LiveCheckOutput:
+    """Bounded output tail of one running check, published at a minimum interval.
+
+    Usage::
+
+        live_output = LiveCheckOutput(publish=publish_tail, interval=30, logger=logger, log_prefix=log_prefix)
+        await run_command(..., output_callback=live_output.write)
+        await live_output.aclose()  # before the check run is completed
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[str], Awaitable[object]],
+        interval: float,
+        logger: logging.Logger,
+        log_prefix: str,
+        tail_chars: int = LIVE_OUTPUT_TAIL_CHARS,
+    ) -> None:
+        self._publish = publish
+        self._interval = interval
+        self._logger = logger
+        self._log_prefix = log_prefix
+        self._tail_chars = tail_chars
+        self._tail = ""
+        self._dirty = False
+        self._closed = False
+        self._waiting = False
+        # The first update goes out one interval after the check started
+        self._last_publish = time.monotonic()
+        self._task: asyncio.Task[None] | None = None
+
+    async def write(self, _stream: str, text: str) -> None:
+        """Append a chunk of output; matches the ``(stream, text)`` output callback signature."""
+        if self._closed or not text:
+            return
+
+        self._tail = (self._tail + text)[-self._tail_chars :]
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._publish_loop())
+
+    async def aclose(self) -> None:
+        """Stop publishing; waits for an update in flight so it cannot land after the final result."""
+        self._closed = True
+        task, self._task = self._task, None
+        if task is None:
+            return
+
+        if self._waiting:
+            task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def _publish_loop(self) -> None:
+        while self._dirty and not self._closed:
+            delay = self._last_publish + self._interval - time.monotonic()
+            if delay > 0:
+                self._waiting = True
+                try:
+                    await asyncio.sleep(delay)
+                finally:
+                    self._waiting = False
+                if self._closed:
+                    return
+
+            self._dirty = False
+            self._last_publish = time.monotonic()
+            try:
+                await self._publish(self._tail)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                self._logger.debug(f"{self._log_prefix} Failed to publish live check output: {ex}")
@@ -0,0 +1,466 @@
+"""Host-wide merge-eligibility state of open pull requests.
+
+Provides:
+- ``CheckRunSnapshot`` / ``StatusSnapshot``: The fields of a check run / commit
+  status that the ``can-be-merged`` evaluation reads.
+- ``MergeEligibilityState``: Inputs of the ``can-be-merged`` decision for one
+  pull request head: latest check run per name, latest commit status per
+  context, unresolved review threads and the mergeable flag.
+- ``MergeEligibilityStates``: Bounded store of the state of each pull request
+  keyed by ``(repository, PR number)``.  A state is seeded by one full
+  reconciliation (check runs, statuses, review threads) and then kept current
+  from the payload of every ``check_run``, ``status``, ``pull_request*`` and
+  ``push`` event and from our own check run writes, so re-evaluating
+  ``can-be-merged`` after an event needs no list calls.  A new head, a closed
+  pull request or an expired state triggers the next full reconciliation.
+
+Webhook deliveries are spread over all uvicorn worker processes, so once
+configured the states live in one ``flock``-protected JSON file per repository
+under the data dir and every worker sees every event.  Each state carries a
+``version`` that is bumped by every event that changes it; an evaluation that
+sees the version move while it ran evaluates again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import fcntl
+import json
+import os
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+from urllib.parse import quote
+
+from webhook_server.utils.constants import CAN_BE_MERGED_STR
+
+T = TypeVar("T")
+
+# States kept per repository
+_DEFAULT_MAX_ENTRIES: int = 1024
+# Reconcile from the API once in a while in case events were missed (e.g. not subscribed or server down)
+_DEFAULT_TTL_SECONDS: float = 300.0
+
+
+@dataclass(frozen=True, slots=True)
+class CheckRunSnapshot:
+    """A check run as the merge evaluation sees it; ``id`` is 0 when unknown."""
+
+    name: str
+    status: str
+    conclusion: str | None = None
+    id: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class StatusSnapshot:
+    """A commit status as the merge evaluation sees it; ``id`` is 0 when unknown."""
+
+    context: str
+    state: str
+    id: int = 0
+
+
+@dataclass(slots=True)
+class MergeEligibilityState:
+    head_sha: str
+    base_ref: str | None
+    check_runs: dict[str, CheckRunSnapshot] = field(default_factory=dict)
+    statuses: dict[str, StatusSnapshot] = field(default_factory=dict)
+    # None: unknown, fetch before evaluating conversation resolution
+    unresolved_threads: list[dict[str, Any]] | None = None
+    # None: unknown, read from the pull request before evaluating
+    mergeable: bool | None = None
+    # Wall clock, states are shared between processes
+    expires_at: float = 0.0
+    # Bumped by every event applied to the state (not by our own can-be-merged writes)
+    version: int = 0
+
+
+# States of one repository by PR number, as stored in its state file
+Entries = dict[int, MergeEligibilityState]
+
+
+def _int_id(value: object) -> int:
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def _dump_state(state: MergeEligibilityState) -> dict[str, Any]:
+    return dataclasses.asdict(state)
+
+
+def _load_state(data: dict[str, Any]) -> MergeEligibilityState:
+    return MergeEligibilityState(
+        head_sha=data["head_sha"],
+        base_ref=data["base_ref"],
+        check_runs={name: CheckRunSnapshot(**check_run) for name, check_run in data["check_runs"].items()},
+        statuses={context: StatusSnapshot(**status) for context, status in data["statuses"].items()},
+        unresolved_threads=data["unresolved_threads"],
+        mergeable=data["mergeable"],
+        expires_at=float(data["expires_at"]),
+        version=int(data["version"]),
+    )
+
+
+class MergeEligibilityStates:
+    """Merge-eligibility state of each pull request, updated incrementally from events.
+
+    Until :meth:`configure` is called the states are kept in this process only.
+    A state directory that cannot be read makes every evaluation reconcile from
+    the API.
+
+    Usage (module-level singleton)::
+
+        merge_eligibility_states.configure(state_dir=os.path.join(config.data_dir, "merge-eligibility"))
+        await merge_eligibility_states.observe_event(repo_full_name="org/repo", event="check_run", hook_data=hook_data)
+        # None: reconcile
+        state = await merge_eligibility_states.get(repo_full_name="org/repo", number=42, head_sha=sha)
+        state = await merge_eligibility_states.reconcile(
+            repo_full_name="org/repo", number=42, head_sha=sha, base_ref="main",
+            check_runs=check_runs, statuses=statuses, unresolved_threads=None, mergeable=True,
+        )
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES, ttl_seconds: float = _DEFAULT_TTL_SECONDS) -> None:
+        self.state_dir = ""
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        # Serialized states per repository while no state dir is configured
+        self._repos: dict[str, dict[str, Any]] = {}
+
+    def configure(self, state_dir: str) -> None:
+        """Share the states with the other worker processes through files in *state_dir*."""
+        self.state_dir = state_dir
+        self._repos.clear()
+
+    async def get(self, repo_full_name: str, number: int, head_sha: str) -> MergeEligibilityState | None:
+        """Return the state of a pull request at *head_sha*, or ``None`` when it must be reconciled."""
+        try:
+            entries = await self._run(self._read, repo_full_name)
+        except OSError:
+            return None
+
+        state = entries.get(number)
+        if state is None or state.head_sha != head_sha:
+            return None
+        return state
+
+    async def reconcile(
+        self,
+        repo_full_name: str,
+        number: int,
+        head_sha: str,
+        base_ref: str | None,
+        check_runs: Iterable[CheckRunSnapshot],
+        statuses: Iterable[StatusSnapshot],
+        unresolved_threads: list[dict[str, Any]] | None,
+        mergeable: object,
+    ) -> MergeEligibilityState:
+        """Replace the state of a pull request with a full observation and return it.
+
+        The state is only stored for real keys; anything else gets a detached state.
+        """
+        state = MergeEligibilityState(
+            head_sha=head_sha,
+            base_ref=base_ref,
+            unresolved_threads=list(unresolved_threads) if unresolved_threads is not None else None,
+            mergeable=mergeable if isinstance(mergeable, bool) else None,
+            expires_at=time.time() + self._ttl_seconds,
+            # Not 1: a state reconciled after an expiry or a head change must not repeat an earlier version
+            version=time.time_ns(),
+        )
+        for check_run in check_runs:
+            self._apply_check_run(state=state, check_run=check_run)
+        for status in statuses:
+            self._apply_status(state=state, status=status)
+
+        if not isinstance(repo_full_name, str) or not isinstance(number, int) or not isinstance(head_sha, str):
+            return state
+
+        def _store(entries: Entries) -> None:
+            previous = entries.get(number)
+            if previous is not None:
+                # An evaluation holding the previous state must see a change
+                state.version = max(state.version, previous.version + 1)
+            entries[number] = state
+            while len(entries) > self._max_entries:
+                del entries[min(entries, key=lambda _number: entries[_number].expires_at)]
+
+        with contextlib.suppress(OSError):
+            await self._run(self._transact, repo_full_name, _store)
+        return state
+
+    async def record_check_run(self, repo_full_name: str, head_sha: str, check_run: CheckRunSnapshot) -> bool:
+        """Apply a check run of *head_sha* to every pull request at that head."""
+        return await self._update(
+            repo_full_name, lambda entries: self._record_check_run(entries, head_sha=head_sha, check_run=check_run)
+        )
+
+    async def record_status(self, repo_full_name: str, head_sha: str, status: StatusSnapshot) -> bool:
+        """Apply a commit status of *head_sha* to every pull request at that head."""
+        return await self._update(
+            repo_full_name, lambda entries: self._record_status(entries, head_sha=head_sha, status=status)
+        )
+
+    async def record_unresolved_threads(self, repo_full_name: str, number: int, threads: list[dict[str, Any]]) -> bool:
+        """Store the review threads fetched by an evaluation (no version bump)."""
+
+        def _store(entries: Entries) -> bool:
+            state = entries.get(number)
+            if state is None:
+                return False
+            state.unresolved_threads = list(threads)
+            return True
+
+        return await self._update(repo_full_name, _store)
+
+    async def record_mergeable(self, repo_full_name: str, number: int, mergeable: object) -> bool:
+        """Store the mergeable flag read by an evaluation (no version bump)."""
+
+        def _store(entries: Entries) -> bool:
+            state = entries.get(number)
+            if state is None or not isinstance(mergeable, bool):
+                return False
+            state.mergeable = mergeable
+            return True
+
+        return await self._update(repo_full_name, _store)
+
+    async def observe_event(self, repo_full_name: str, event: str, hook_data: dict[str, Any]) -> bool:
+        """Update the states touched by a webhook payload.  Returns True when the event was applied."""
+        if event == "check_run":
+            observed = self._check_run_from_event(hook_data)
+            if observed is None:
+                return False
+            return await self.record_check_run(
+                repo_full_name=repo_full_name, head_sha=observed[0], check_run=observed[1]
+            )
+
+        if event == "status":
+            context, head_sha, state = hook_data.get("context"), hook_data.get("sha"), hook_data.get("state")
+            if not isinstance(context, str) or not isinstance(head_sha, str) or not isinstance(state, str):
+                return False
+            return await self.record_status(
+                repo_full_name=repo_full_name,
+                head_sha=head_sha,
+                status=StatusSnapshot(context=context, state=state, id=_int_id(hook_data.get("id"))),
+            )
+
+        if event == "push":
+            ref = hook_data.get("ref")
+            if not isinstance(ref, str) or not ref.startswith("refs/heads/"):
+                return False
+            branch = ref.removeprefix("refs/heads/")
+            return await self._update(repo_full_name, lambda entries: self._observe_push(entries, branch=branch))
+
+        pull_request = hook_data.get("pull_request")
+        if not isinstance(pull_request, dict) or not isinstance(pull_request.get("number"), int):
+            return False
+        return await self._update(
+            repo_full_name,
+            lambda entries: self._observe_pull_request(
+                entries, event=event, pull_request=pull_request, hook_data=hook_data
+            ),
+        )
+
+    async def invalidate(self, repo_full_name: str, number: int) -> None:
+        """Forget a pull request, e.g. after a failed evaluation left its state uncertain."""
+        await self._update(repo_full_name, lambda entries: entries.pop(number, None) is not None)
+
+    def clear(self) -> None:
+        """Forget configuration and the in-process states (does not touch the state files)."""
+        self.state_dir = ""
+        self._repos.clear()
+
+    @staticmethod
+    def _check_run_from_event(hook_data: dict[str, Any]) -> tuple[str, CheckRunSnapshot] | None:
+        check_run = hook_data.get("check_run")
+        if not isinstance(check_run, dict):
+            return None
+
+        name, head_sha, status = check_run.get("name"), check_run.get("head_sha"), check_run.get("status")
+        if not isinstance(name, str) or not isinstance(head_sha, str) or not isinstance(status, str):
+            return None
+        return head_sha, CheckRunSnapshot(
+            name=name, status=status, conclusion=check_run.get("conclusion"), id=_int_id(check_run.get("id"))
+        )
+
+    def _record_check_run(self, entries: Entries, head_sha: str, check_run: CheckRunSnapshot) -> bool:
+        applied = False
+        for state in entries.values():
+            if state.head_sha == head_sha and self._apply_check_run(state=state, check_run=check_run):
+                # Our own can-be-merged conclusion is an output of the evaluation, not an input
+                if check_run.name != CAN_BE_MERGED_STR:
+                    state.version += 1
+                applied = True
+        return applied
+
+    def _record_status(self, entries: Entries, head_sha: str, status: StatusSnapshot) -> bool:
+        applied = False
+        for state in entries.values():
+            if state.head_sha == head_sha and self._apply_status(state=state, status=status):
+                state.version += 1
+                applied = True
+        return applied
+
+    @staticmethod
+    def _observe_push(entries: Entries, branch: str) -> bool:
+        # New commits on the base branch can create or resolve conflicts
+        applied = False
+        for state in entries.values():
+            if state.base_ref == branch:
+                state.mergeable = None
+                state.version += 1
+                applied = True
+        return applied
+
+    def _observe_pull_request(
+        self, entries: Entries, event: str, pull_request: dict[str, Any], hook_data: dict[str, Any]
+    ) -> bool:
+        number = pull_request["number"]
+        state = entries.get(number)
+        if state is None:
+            return False
+
+        head_sha = (pull_request.get("head") or {}).get("sha")
+        base_ref = (pull_request.get("base") or {}).get("ref")
+        if (
+            pull_request.get("state") == "closed"
+            or (head_sha is not None and head_sha != state.head_sha)
+            or (base_ref is not None and state.base_ref is not None and base_ref != state.base_ref)
+        ):
+            # A new head or base needs a full reconciliation
+            del entries[number]
+            return True
+
+        if state.base_ref is None and isinstance(base_ref, str):
+            state.base_ref = base_ref
+        if isinstance(pull_request.get("mergeable"), bool):
+            state.mergeable = pull_request["mergeable"]
+        if event == "pull_request_review_thread":
+            self._observe_review_thread(state=state, hook_data=hook_data)
+        # Labels and reviews are read fresh by every evaluation; the bump makes one that is running read them again
+        state.version += 1
+        return True
+
+    @staticmethod
+    def _observe_review_thread(state: MergeEligibilityState, hook_data: dict[str, Any]) -> None:
+        thread = hook_data.get("thread")
+        thread_id = thread.get("node_id") if isinstance(thread, dict) else None
+        if state.unresolved_threads is None:
+            return
+
+        if hook_data.get("action") == "resolved" and thread_id:
+            remaining = [_thread for _thread in state.unresolved_threads if _thread.get("id") != thread_id]
+            if len(remaining) < len(state.unresolved_threads):
+                state.unresolved_threads = remaining
+                return
+
+        # An unresolved thread (or one we cannot match) is fetched again before the next evaluation
+        state.unresolved_threads = None
+
+    @staticmethod
+    def _apply_check_run(state: MergeEligibilityState, check_run: CheckRunSnapshot) -> bool:
+        current = state.check_runs.get(check_run.name)
+        if current is not None and current.id and check_run.id:
+            # Events can arrive out of order: ignore older runs and regressions of a completed run
+            if check_run.id < current.id:
+                return False
+            if check_run.id == current.id and current.status == "completed" and check_run.status != "completed":
+                return False
+        state.check_runs[check_run.name] = check_run
+        return current != check_run
+
+    @staticmethod
+    def _apply_status(state: MergeEligibilityState, status: StatusSnapshot) -> bool:
+        current = state.statuses.get(status.context)
+        # The status with the highest ID is the latest one of its context
+        if current is not None and current.id and status.id and status.id < current.id:
+            return False
+        state.statuses[status.context] = status
+        return current != status
+
+    async def _update(self, repo_full_name: str, update: Callable[[Entries], bool]) -> bool:
+        if not isinstance(repo_full_name, str):
+            return False
+        try:
+            return await self._run(self._transact, repo_full_name, update)
+        except OSError:
+            return False
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        # File access blocks on the lock, keep it off the event loop
+        if self.state_dir:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    def _paths(self, repo_full_name: str) -> tuple[str, str]:
+        name = quote(repo_full_name, safe="")
+        return os.path.join(self.state_dir, f"{name}.json"), os.path.join(self.state_dir, f"{name}.lock")
+
+    def _read(self, repo_full_name: str) -> Entries:
+        if not self.state_dir:
+            return self._load_entries(self._repos.get(repo_full_name, {}))
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        state_path, lock_path = self._paths(repo_full_name)
+        with open(lock_path, "a") as lock_fd:
+            fcntl.flock(lock_fd, fcntl.LOCK_SH)
+            return self._load_entries(self._read_file(state_path))
+
+    def _transact(self, repo_full_name: str, update: Callable[[Entries], T]) -> T:
+        """Apply *update* to the states of a repository, under an exclusive host-wide lock once configured."""
+        if not self.state_dir:
+            entries = self._load_entries(self._repos.get(repo_full_name, {}))
+            result = update(entries)
+            self._repos[repo_full_name] = self._dump_entries(entries)
+            if not self._repos[repo_full_name]:
+                del self._repos[repo_full_name]
+            return result
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        state_path, lock_path = self._paths(repo_full_name)
+        with open(lock_path, "a") as lock_fd:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            stored = self._read_file(state_path)
+            entries = self._load_entries(stored)
+            result = update(entries)
+            dumped = self._dump_entries(entries)
+            if dumped != stored:
+                tmp_path = f"{state_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as fd:
+                    json.dump(dumped, fd)
+                os.replace(tmp_path, state_path)
+            return result
+
+    @staticmethod
+    def _read_file(state_path: str) -> dict[str, Any]:
+        with contextlib.suppress(OSError, ValueError):
+            with open(state_path) as fd:
+                stored = json.load(fd)
+            if isinstance(stored, dict):
+                return stored
+        return {}
+
+    @staticmethod
+    def _load_entries(stored: dict[str, Any]) -> Entries:
+        """Deserialize the states of a repository, dropping expired and unreadable ones."""
+        entries: Entries = {}
+        now = time.time()
+        for number, data in stored.items():
+            with contextlib.suppress(AttributeError, KeyError, TypeError, ValueError):
+                state = _load_state(data)
+                if state.expires_at > now:
+                    entries[int(number)] = state
+        return entries
+
+    @staticmethod
+    def _dump_entries(entries: Entries) -> dict[str, Any]:
+        # JSON object keys are strings
+        return {str(number): _dump_state(state) for number, state in entries.items()}
+
+
+merge_eligibility_states = MergeEligibilityStates()
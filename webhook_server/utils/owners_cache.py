@@ -0,0 +1,61 @@
+"""Process-wide cache of parsed OWNERS data keyed by the base tree it was read from.
+
+Provides:
+- ``OwnersDataCache``: Bounded LRU of ``(repository, tree SHA)`` -> OWNERS data
+  (the result of ``OwnersFileHandler.get_all_repository_approvers_and_reviewers``).
+  A tree SHA names the exact file contents, so cached OWNERS data never goes
+  stale.  Merge-eligibility events resolve the current tree of the base branch
+  from GitHub and use it to find approvers without cloning the repository.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+from typing import Any
+
+_DEFAULT_MAX_TREES: int = 256
+
+# (repo_full_name, tree_sha)
+OwnersKey = tuple[str, str]
+
+
+class OwnersDataCache:
+    """OWNERS data of each base tree.
+
+    Usage (module-level singleton)::
+
+        owners_data_cache.put(repo_full_name="org/repo", tree_sha=tree_sha, owners=owners)
+        owners = owners_data_cache.get(repo_full_name="org/repo", tree_sha=tree_sha)  # None on a miss
+    """
+
+    def __init__(self, max_trees: int = _DEFAULT_MAX_TREES) -> None:
+        self._max_trees = max_trees
+        self._owners: OrderedDict[OwnersKey, dict[str, dict[str, Any]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def get(self, repo_full_name: str, tree_sha: str) -> dict[str, dict[str, Any]] | None:
+        """Return a copy of the OWNERS data read from *tree_sha*, or ``None`` on a miss."""
+        key = (repo_full_name, tree_sha)
+        owners = self._owners.get(key)
+        if owners is None:
+            return None
+
+        self._owners.move_to_end(key)
+        return copy.deepcopy(owners)
+
+    def put(self, repo_full_name: str, tree_sha: str, owners: dict[str, dict[str, Any]]) -> None:
+        """Store the OWNERS data read from *tree_sha*."""
+        key = (repo_full_name, tree_sha)
+        self._owners[key] = copy.deepcopy(owners)
+        self._owners.move_to_end(key)
+        while len(self._owners) > self._max_trees:
+            self._owners.popitem(last=False)
+
+    def clear(self) -> None:
+        self._owners.clear()
+
+
+owners_data_cache = OwnersDataCache()
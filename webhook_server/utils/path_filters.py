@@ -0,0 +1,95 @@
+"""Per-check path filters evaluated against a pull request's changed files.
+
+Provides:
+- ``path_matches``: Match a repository-relative path against a glob pattern
+  (``*`` and ``?`` stay within one directory, ``**`` crosses directories, a
+  trailing ``/`` matches everything below the directory).
+- ``PathFilter``: ``paths``/``paths-ignore`` rules of one check; a check whose
+  filter matches none of the changed files is skipped instead of run.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(pattern: str) -> re.Pattern[str]:
+    if pattern.endswith("/"):
+        pattern = f"{pattern}**"
+
+    parts: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            # Zero or more leading directories
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts))
+
+
+def path_matches(path: str, pattern: str) -> bool:
+    """Return True if *path* matches the glob *pattern*."""
+    return _compile(pattern.lstrip("/")).fullmatch(path) is not None
+
+
+@dataclass(frozen=True, slots=True)
+class PathFilter:
+    """Which changed files make a check relevant.
+
+    A changed file is relevant when it matches one of ``paths`` (any file if
+    ``paths`` is empty) and none of ``paths_ignore``.
+    """
+
+    paths: tuple[str, ...] = ()
+    paths_ignore: tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, config: object) -> PathFilter | None:
+        """Build a filter from a ``{"paths": [...], "paths-ignore": [...]}`` mapping; ``None`` if it has no rules."""
+        if not isinstance(config, dict):
+            return None
+
+        def _patterns(key: str) -> tuple[str, ...]:
+            value = config.get(key) or []
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list):
+                return ()
+            return tuple(str(pattern).strip() for pattern in value if str(pattern).strip())
+
+        path_filter = cls(paths=_patterns("paths"), paths_ignore=_patterns("paths-ignore"))
+        return path_filter if path_filter.paths or path_filter.paths_ignore else None
+
+    def is_relevant(self, path: str) -> bool:
+        if self.paths and not any(path_matches(path, pattern) for pattern in self.paths):
+            return False
+        return not any(path_matches(path, pattern) for pattern in self.paths_ignore)
+
+    def matches(self, changed_files: Iterable[str]) -> bool:
+        """Return True if any changed file is relevant; an empty change list always matches."""
+        files = list(changed_files)
+        return not files or any(self.is_relevant(path) for path in files)
+
+    def describe(self) -> str:
+        rules: list[str] = []
+        if self.paths:
+            rules.append(f"paths: {', '.join(f'`{pattern}`' for pattern in self.paths)}")
+        if self.paths_ignore:
+            rules.append(f"paths-ignore: {', '.join(f'`{pattern}`' for pattern in self.paths_ignore)}")
+        return "; ".join(rules)
@@ -0,0 +1,146 @@
+"""Process-group lifecycle for commands started by ``run_command``.
+
+Provides:
+- ``terminate_process_group``: SIGTERM a command's whole process group, give it
+  a grace period, then SIGKILL whatever is left.
+- ``ProcessReaper``: Remembers the sessions ``run_command`` started and kills
+  processes still running in a session after its command has finished
+  (daemonized grandchildren, helpers that moved to their own process group),
+  so they do not keep holding CPU, ports or worktree locks.
+
+Every command runs as the leader of its own session, so its session id and
+process group id are its pid; a session id stays on every descendant that
+does not call ``setsid`` itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import time
+
+TERMINATE_GRACE_SECONDS: float = 5.0
+REAPER_INTERVAL_SECONDS: float = 60.0
+
+# A finished session is forgotten after this long, so a recycled pid is never mistaken for it
+_SESSION_TTL_SECONDS: float = 3600.0
+_GROUP_POLL_SECONDS: float = 0.1
+
+
+def signal_process_group(pgid: int, sig: int) -> bool:
+    """Send *sig* to process group *pgid*; False if the group is gone."""
+    try:
+        os.killpg(pgid, sig)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Only members that switched users are left; nothing more can be done from here
+        return False
+    return True
+
+
+async def terminate_process_group(
+    process: asyncio.subprocess.Process, grace_seconds: float = TERMINATE_GRACE_SECONDS
+) -> None:
+    """Stop *process* and its process group: SIGTERM, up to *grace_seconds* to exit, then SIGKILL.
+
+    The leader is reaped here; group members are killed even if the leader exits first.
+    """
+    pgid = process.pid
+    deadline = time.monotonic() + grace_seconds
+    try:
+        if signal_process_group(pgid, signal.SIGTERM):
+            with contextlib.suppress(TimeoutError, ProcessLookupError):
+                await asyncio.wait_for(process.wait(), timeout=grace_seconds)
+            # The leader is gone; give the rest of the group what is left of the grace period
+            while time.monotonic() < deadline and signal_process_group(pgid, 0):
+                await asyncio.sleep(_GROUP_POLL_SECONDS)
+    finally:
+        signal_process_group(pgid, signal.SIGKILL)
+    with contextlib.suppress(ProcessLookupError):
+        await process.wait()
+
+
+class ProcessReaper:
+    """Kills processes left running in sessions of finished commands.
+
+    Usage (module-level singleton)::
+
+        process_reaper.started(pid)   # run_command started a session
+        process_reaper.finished(pid)  # its command exited; the session's stragglers are now orphans
+        await process_reaper.reap(logger=logger, log_prefix="[reaper]")
+    """
+
+    def __init__(self) -> None:
+        # Session id -> when its command finished
+        self._finished: dict[int, float] = {}
+        self.reaped = 0
+
+    def started(self, sid: int) -> None:
+        # A recycled pid starts a new session; its predecessor's stragglers are no longer told apart
+        self._finished.pop(sid, None)
+
+    def finished(self, sid: int) -> None:
+        self._finished[sid] = time.monotonic()
+
+    async def reap(self, logger: logging.Logger, log_prefix: str) -> int:
+        """SIGKILL every process in a finished session; returns how many were killed."""
+        now = time.monotonic()
+        for sid, finished_at in list(self._finished.items()):
+            if now - finished_at > _SESSION_TTL_SECONDS:
+                del self._finished[sid]
+        if not self._finished:
+            return 0
+
+        orphans = await asyncio.to_thread(self._find_orphans, set(self._finished))
+        killed = 0
+        for pid, sid in orphans:
+            with contextlib.suppress(ProcessLookupError, PermissionError):
+                os.kill(pid, signal.SIGKILL)
+                killed += 1
+                logger.warning(f"{log_prefix} Killed orphaned process {pid} left behind by command session {sid}")
+        self.reaped += killed
+        return killed
+
+    @staticmethod
+    def _find_orphans(sessions: set[int]) -> list[tuple[int, int]]:
+        """Return ``(pid, session id)`` of live processes in *sessions*."""
+        own_pid = os.getpid()
+        orphans: list[tuple[int, int]] = []
+        with contextlib.suppress(OSError):
+            for entry in os.scandir("/proc"):
+                if not entry.name.isdigit() or int(entry.name) == own_pid:
+                    continue
+                try:
+                    with open(os.path.join(entry.path, "stat")) as fd:
+                        stat = fd.read()
+                except OSError:
+                    continue
+                # comm may contain spaces and parentheses; the fields after its closing one are fixed
+                fields = stat.rpartition(")")[2].split()
+                if len(fields) < 4 or fields[0] == "Z":
+                    continue
+                with contextlib.suppress(ValueError):
+                    sid = int(fields[3])
+                    if sid in sessions:
+                        orphans.append((int(entry.name), sid))
+        return orphans
+
+    async def run(self, logger: logging.Logger, interval_seconds: float = REAPER_INTERVAL_SECONDS) -> None:
+        """Reap orphans every *interval_seconds* until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.reap(logger=logger, log_prefix="[reaper]")
+            except Exception:
+                logger.exception("Orphaned process reaping failed")
+
+    def clear(self) -> None:
+        self._finished.clear()
+        self.reaped = 0
+
+
+process_reaper = ProcessReaper()
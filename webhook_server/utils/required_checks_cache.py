@@ -0,0 +1,128 @@
+"""Process-wide cache of the status checks branch protection requires.
+
+Provides:
+- ``RequiredChecksCache``: TTL-bound ``(repository, branch)`` -> required status
+  check contexts of the branch protection, loaded once per entry (single-flight)
+  and shared by every webhook in this process.  ``branch_protection_rule``
+  events drop all branches of the repository, since a rule pattern can match
+  any number of branches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+_DEFAULT_MAX_ENTRIES: int = 1024
+# Branch protection rarely changes; events invalidate earlier, the TTL covers missed events
+_DEFAULT_TTL_SECONDS: float = 600.0
+
+# (repo_full_name, branch)
+RequiredChecksKey = tuple[str, str]
+
+
+class RequiredChecksCache:
+    """Required status checks of protected branches.
+
+    A load that started before an invalidation of its repository is returned
+    to its callers but not stored, so a rule change is never hidden by a fetch
+    that was already in flight.
+
+    Usage (module-level singleton)::
+
+        checks = await required_checks_cache.get_or_load(
+            repo_full_name="org/repo", branch="main", fetch=fetch_required_checks, logger=logger, log_prefix="[TEST]"
+        )
+        required_checks_cache.observe_event(repo_full_name="org/repo", hook_data=hook_data)
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES, ttl_seconds: float = _DEFAULT_TTL_SECONDS) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        # key -> (required checks, expires_at)
+        self._entries: OrderedDict[RequiredChecksKey, tuple[tuple[str, ...], float]] = OrderedDict()
+        self._inflight: dict[RequiredChecksKey, asyncio.Task[tuple[str, ...]]] = {}
+        # repo -> number of invalidations, to discard loads that raced with one
+        self._generations: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, repo_full_name: str, branch: str) -> list[str] | None:
+        """Return a copy of the cached required checks, or ``None`` when unknown or expired."""
+        key = (repo_full_name, branch)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        checks, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return list(checks)
+
+    async def get_or_load(
+        self,
+        repo_full_name: str,
+        branch: str,
+        fetch: Callable[[], Awaitable[Iterable[str]]],
+        logger: logging.Logger,
+        log_prefix: str,
+    ) -> list[str]:
+        """Return the required checks of a branch, loading them once via *fetch*.  Failed loads are not cached."""
+        checks = self.get(repo_full_name=repo_full_name, branch=branch)
+        if checks is not None:
+            return checks
+
+        key = (repo_full_name, branch)
+        task = self._inflight.get(key)
+        if task is None:
+            logger.debug(f"{log_prefix} Loading required status checks of {repo_full_name}:{branch}")
+            task = asyncio.ensure_future(self._load(key, fetch))
+            self._inflight[key] = task
+
+        # Shield so one cancelled webhook does not cancel the load for the others
+        return list(await asyncio.shield(task))
+
+    def observe_event(self, repo_full_name: str, hook_data: dict[str, Any]) -> bool:
+        """Invalidate the repository on a ``branch_protection_rule`` event.  Returns True when it did."""
+        if not isinstance(hook_data.get("rule"), dict):
+            return False
+
+        self.invalidate(repo_full_name)
+        return True
+
+    def invalidate(self, repo_full_name: str) -> None:
+        """Forget the required checks of every branch of a repository."""
+        self._generations[repo_full_name] = self._generations.get(repo_full_name, 0) + 1
+        for key in [key for key in self._entries if key[0] == repo_full_name]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+        self._generations.clear()
+
+    async def _load(self, key: RequiredChecksKey, fetch: Callable[[], Awaitable[Iterable[str]]]) -> tuple[str, ...]:
+        generation = self._generations.get(key[0], 0)
+        try:
+            checks = tuple(await fetch())
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+        if self._generations.get(key[0], 0) == generation:
+            self._entries[key] = (checks, time.monotonic() + self._ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return checks
+
+
+required_checks_cache = RequiredChecksCache()
@@ -0,0 +1,127 @@
+"""Process-wide registry of repository clones shared by concurrent webhooks.
+
+Provides:
+- ``SharedClone``: Handle for one clone directory and the task filling it.
+- ``SharedCloneRegistry``: Refcounted, single-flight clones keyed by
+  ``(repo, head SHA, base ref, PR number)``.  Near-simultaneous events for the
+  same PR head (``opened`` + ``labeled`` + ``review_requested``...) await one
+  clone instead of cloning the repository once each.  The PR number is part of
+  the key because a clone only fetches the ``origin/pr/<number>`` ref of the PR
+  that created it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import shutil
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from webhook_server.utils.worktree_pool import worktree_pools
+
+# (repo_full_name, head_sha, base_ref, pull_request_number)
+CloneKey = tuple[str, str, str, int]
+
+
+@dataclass(slots=True, eq=False)
+class SharedClone:
+    """A clone directory shared by every webhook holding a reference to it."""
+
+    key: CloneKey
+    path: str
+    task: asyncio.Future[object]
+    refs: int = 0
+
+
+class SharedCloneRegistry:
+    """Refcounted, single-flight registry of clone directories.
+
+    The first caller for a key clones into the directory it passes in; later
+    callers await the same fill and get that directory back.  The directory (and
+    its pooled worktrees) is removed when the last holder calls :meth:`release`.
+    A failed fill is dropped from the registry right away so the next webhook
+    retries with a fresh clone.
+
+    Usage (module-level singleton)::
+
+        shared = await shared_clones.acquire(
+            key=("org/repo", head_sha, "main", 42),
+            path=my_temp_dir,
+            clone=clone_into,
+            logger=logger,
+            log_prefix="[TEST]",
+        )
+        try:
+            ...  # use shared.path
+        finally:
+            await shared_clones.release(shared=shared, logger=logger, log_prefix="[TEST]")
+    """
+
+    def __init__(self) -> None:
+        self._clones: dict[CloneKey, SharedClone] = {}
+
+    def __len__(self) -> int:
+        return len(self._clones)
+
+    async def acquire(
+        self,
+        key: CloneKey,
+        path: str,
+        clone: Callable[[str], Awaitable[object]],
+        logger: logging.Logger,
+        log_prefix: str,
+    ) -> SharedClone:
+        """Return a ready clone for *key*, running *clone(path)* only if none exists yet.
+
+        Raises:
+            Whatever *clone* raised; the caller's reference is released first.
+        """
+        shared = self._clones.get(key)
+        if shared is None:
+            logger.debug(f"{log_prefix} Cloning {key[0]} at {key[1][:7]} into shared clone {path}")
+            shared = SharedClone(key=key, path=path, task=asyncio.ensure_future(clone(path)))
+            shared.task.add_done_callback(functools.partial(self._forget_failed, shared))
+            self._clones[key] = shared
+        else:
+            logger.debug(
+                f"{log_prefix} Reusing shared clone {shared.path} for {key[0]} at {key[1][:7]} ({shared.refs} holders)"
+            )
+
+        shared.refs += 1
+        try:
+            # Shield so one cancelled webhook does not abort the clone for the others
+            await asyncio.shield(shared.task)
+        except BaseException:
+            await self.release(shared=shared, logger=logger, log_prefix=log_prefix)
+            raise
+        return shared
+
+    def _forget_failed(self, shared: SharedClone, task: asyncio.Future[object]) -> None:
+        if (task.cancelled() or task.exception() is not None) and self._clones.get(shared.key) is shared:
+            del self._clones[shared.key]
+
+    async def release(self, shared: SharedClone, logger: logging.Logger, log_prefix: str) -> None:
+        """Drop one reference; the last holder removes the clone and its worktrees."""
+        shared.refs -= 1
+        if shared.refs > 0:
+            return
+
+        if self._clones.get(shared.key) is shared:
+            del self._clones[shared.key]
+
+        if not shared.task.done():
+            # Every waiter gave up (e.g. cancelled) while the clone was still running
+            shared.task.cancel()
+            await asyncio.gather(shared.task, return_exceptions=True)
+
+        logger.debug(f"{log_prefix} Removing shared clone {shared.path}")
+        await worktree_pools.close(repo_dir=shared.path, logger=logger, log_prefix=log_prefix)
+        await asyncio.to_thread(shutil.rmtree, shared.path, ignore_errors=True)
+
+    def clear(self) -> None:
+        self._clones.clear()
+
+
+shared_clones = SharedCloneRegistry()
@@ -0,0 +1,182 @@
+"""Reusable git worktree pools for CI checks.
+
+Provides:
+- ``WorktreePool``: Bounded set of worktrees attached to one clone directory.
+  Worktrees are recycled between checks (``checkout --force`` + ``clean``)
+  instead of being added and removed for every check.
+- ``WorktreePoolRegistry``: Process-wide registry of pools keyed by clone directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+
+DEFAULT_WORKTREE_POOL_SIZE: int = 8
+
+# (success, worktree_path, stdout, stderr) as yielded by helpers.git_worktree_checkout
+WorktreeResult = tuple[bool, str, str, str]
+
+# (checkout target, base ref merged into it)
+PrepareKey = tuple[str, str]
+
+
+@dataclass(slots=True)
+class PooledWorktree:
+    """A live worktree owned by a pool.
+
+    Attributes:
+        path: Worktree directory.
+        stack: Exit stack holding the ``git_worktree_checkout`` context that created
+            the worktree; closing it removes the worktree.
+    """
+
+    path: str
+    stack: contextlib.AsyncExitStack
+
+
+@dataclass(slots=True)
+class WorktreeLease:
+    """A pool slot held by one check. ``worktree`` is returned to the pool on release."""
+
+    worktree: PooledWorktree | None = None
+
+
+@dataclass(slots=True)
+class PreparedCheckout:
+    """Result of checking out a target and merging its base ref once."""
+
+    success: bool
+    commit: str
+    out: str
+    err: str
+
+
+class WorktreePool:
+    """Bounded, recyclable set of worktrees for one clone directory.
+
+    At most ``max_worktrees`` worktrees exist at any time; callers beyond that
+    wait in :meth:`lease` until a running check releases its worktree.
+
+    The expensive "checkout PR head and merge the base branch" step is done
+    once per ``(checkout target, base ref)`` and recorded with :meth:`set_prepared`; every other
+    check for the same head just checks out the resulting merge commit.
+    """
+
+    def __init__(self, repo_dir: str, max_worktrees: int = DEFAULT_WORKTREE_POOL_SIZE) -> None:
+        self.repo_dir = repo_dir
+        self.max_worktrees = max(1, max_worktrees)
+        self._slots = asyncio.Semaphore(self.max_worktrees)
+        self._idle: list[PooledWorktree] = []
+        self._live = 0
+        self._prepare_locks: dict[PrepareKey, asyncio.Lock] = {}
+        self._prepared: dict[PrepareKey, PreparedCheckout] = {}
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """Number of live worktrees (idle and leased)."""
+        return self._live
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    @contextlib.asynccontextmanager
+    async def lease(self) -> AsyncGenerator[WorktreeLease]:
+        """Hold one pool slot, reusing an idle worktree when available.
+
+        The lease starts with an idle worktree (to be recycled) or ``None``
+        (caller creates one with :meth:`add`).  Whatever worktree the lease
+        holds on exit goes back to the idle list.
+        """
+        async with self._slots:
+            lease = WorktreeLease(worktree=self._idle.pop() if self._idle else None)
+            try:
+                yield lease
+            finally:
+                if lease.worktree is not None:
+                    if self._closed:
+                        await self.discard(lease.worktree)
+                    else:
+                        self._idle.append(lease.worktree)
+
+    async def add(
+        self, checkout_cm: AbstractAsyncContextManager[WorktreeResult]
+    ) -> tuple[PooledWorktree | None, WorktreeResult]:
+        """Enter a ``git_worktree_checkout`` context and keep it open for reuse.
+
+        Returns:
+            The pooled worktree (``None`` if creation failed; the context is closed
+            immediately in that case) and the checkout result.
+        """
+        stack = contextlib.AsyncExitStack()
+        result: WorktreeResult = await stack.enter_async_context(checkout_cm)
+        success, worktree_path, _, _ = result
+        if not success:
+            await stack.aclose()
+            return None, result
+
+        self._live += 1
+        return PooledWorktree(path=worktree_path, stack=stack), result
+
+    async def discard(self, worktree: PooledWorktree) -> None:
+        """Remove a worktree that is broken or no longer needed."""
+        self._live -= 1
+        await worktree.stack.aclose()
+
+    def prepare_lock(self, key: PrepareKey) -> asyncio.Lock:
+        """Lock serializing the one-time checkout+merge for *key*."""
+        return self._prepare_locks.setdefault(key, asyncio.Lock())
+
+    def prepared(self, key: PrepareKey) -> PreparedCheckout | None:
+        return self._prepared.get(key)
+
+    def set_prepared(self, key: PrepareKey, success: bool, commit: str, out: str, err: str) -> None:
+        self._prepared[key] = PreparedCheckout(success=success, commit=commit, out=out, err=err)
+
+    async def close(self) -> None:
+        """Remove all idle worktrees; leased ones are removed when released."""
+        self._closed = True
+        while self._idle:
+            await self.discard(self._idle.pop())
+
+
+class WorktreePoolRegistry:
+    """Process-wide registry of :class:`WorktreePool` objects keyed by clone directory.
+
+    Usage (module-level singleton)::
+
+        pool = worktree_pools.get(repo_dir=clone_repo_dir, max_worktrees=8)
+        ...
+        await worktree_pools.close(repo_dir=clone_repo_dir, logger=logger, log_prefix="[TEST]")
+    """
+
+    def __init__(self) -> None:
+        self._pools: dict[str, WorktreePool] = {}
+
+    def get(self, repo_dir: str, max_worktrees: int = DEFAULT_WORKTREE_POOL_SIZE) -> WorktreePool:
+        pool = self._pools.get(repo_dir)
+        if pool is None:
+            pool = WorktreePool(repo_dir=repo_dir, max_worktrees=max_worktrees)
+            self._pools[repo_dir] = pool
+        return pool
+
+    async def close(self, repo_dir: str, logger: logging.Logger, log_prefix: str) -> None:
+        """Remove every worktree of the pool for *repo_dir* (call before deleting the clone)."""
+        pool = self._pools.pop(repo_dir, None)
+        if pool is None:
+            return
+
+        logger.debug(f"{log_prefix} Closing worktree pool for {repo_dir} ({pool.size} worktrees)")
+        await pool.close()
+
+    def clear(self) -> None:
+        self._pools.clear()
+
+
+worktree_pools = WorktreePoolRegistry()